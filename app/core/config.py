@@ -18,6 +18,22 @@ CONFIG_FILE = CONFIG_DIR / "config.json"
 # Ensure the configuration directory exists
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Incremented on every settings or credentials write made by this process, so caches
+# derived from the settings (e.g. the LLM provider) know when to re-read them.
+_settings_generation = 0
+
+
+def notify_settings_changed():
+    """Signals that a setting or credential was written."""
+    global _settings_generation
+    _settings_generation += 1
+
+
+def settings_generation() -> int:
+    """Returns a counter that changes whenever this process writes settings or credentials."""
+    return _settings_generation
+
+
 def save_config(settings: dict):
     """Saves the application settings to the config file."""
     try:
@@ -25,6 +41,7 @@ def save_config(settings: dict):
             json.dump(settings, f, indent=4)
     except IOError as e:
         print(f"Error saving configuration: {e}")
+    notify_settings_changed()
 
 def load_config() -> dict:
     """Loads the application settings from the config file."""
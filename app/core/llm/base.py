@@ -10,8 +10,9 @@
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 import httpx
+from app.core.llm.transport import CircuitOpenError, LLMTransport, policy_for, shared_transport
 
 
 @dataclass
@@ -35,9 +36,64 @@ class AssistantResponse:
                       ferramentas realizadas ou None, caso não existam
                       chamadas de ferramenta.
     :type tool_calls: List[Dict[str, Any]] | None
+    :ivar usage: Contagem de tokens informada pelo provedor (prompt_tokens,
+                 completion_tokens, total_tokens), ou None se não informada.
+    :type usage: Dict[str, int] | None
     """
     content: str
     tool_calls: List[Dict[str, Any]] | None = None
+    usage: Dict[str, int] | None = None
+
+
+@dataclass
+class StreamDelta:
+    """
+    Um pedaço de uma resposta transmitida (streaming) pelo modelo.
+
+    Os deltas intermediários trazem apenas texto novo em `content`. O último delta traz,
+    em `response`, a resposta completa, com as chamadas de ferramenta já montadas a
+    partir dos fragmentos recebidos.
+
+    :ivar content: Texto novo deste pedaço (pode ser vazio).
+    :type content: str
+    :ivar response: Resposta completa (somente no último delta).
+    :type response: AssistantResponse | None
+    """
+    content: str = ""
+    response: AssistantResponse | None = None
+
+
+class ToolCallAccumulator:
+    """
+    Monta as chamadas de ferramenta a partir dos fragmentos de um stream.
+
+    Em modo streaming, cada chamada chega em pedaços identificados por `index`: o primeiro
+    traz o id e o nome da função, os seguintes trazem trechos do JSON de argumentos.
+    """
+
+    def __init__(self):
+        self._calls: dict[int, dict] = {}
+
+    def add(self, fragment) -> None:
+        """Incorpora um fragmento (objeto do SDK ou dict) de chamada de ferramenta."""
+        if hasattr(fragment, 'model_dump'):
+            fragment = fragment.model_dump()
+        index = fragment.get('index') or 0
+        call = self._calls.setdefault(index, {"id": "", "type": "function",
+                                              "function": {"name": "", "arguments": ""}})
+        if fragment.get('id'):
+            call["id"] = fragment['id']
+        function = fragment.get('function') or {}
+        if function.get('name'):
+            call["function"]["name"] += function['name']
+        if function.get('arguments'):
+            call["function"]["arguments"] += function['arguments']
+
+    def result(self) -> List[Dict[str, Any]] | None:
+        """As chamadas completas, na ordem dos índices, ou None se não houve nenhuma."""
+        if not self._calls:
+            return None
+        return [self._calls[index] for index in sorted(self._calls)]
 
 
 class LLMProvider(ABC):
@@ -51,9 +107,16 @@ class LLMProvider(ABC):
     :type client: Any
     :ivar model: Modelo atualmente selecionado para geração de respostas.
     :type model: str
+    :ivar transport: Política de transporte (retries, limite de requisições, circuit breaker).
+    :type transport: LLMTransport
+    :ivar stream_usage: Pede ao servidor o consumo de tokens no fim do stream
+        (`stream_options.include_usage`); desligue em APIs que recusam o parâmetro.
+    :type stream_usage: bool
     """
     client: Any = None
     model: str = ""
+    transport: LLMTransport = shared_transport
+    stream_usage: bool = True
 
     @property
     @abstractmethod
@@ -63,17 +126,36 @@ class LLMProvider(ABC):
         """
         pass
 
+    def _build_client(self, **kwargs):
+        """
+        Creates the OpenAI-compatible client with the transport policy's timeouts. The SDK's own
+        retries are disabled: retries go through `transport`, so that every attempt counts for
+        the in-flight limit and the circuit breaker.
+        """
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(timeout=policy_for(self.name).timeout(), max_retries=0, **kwargs)
+
+    def _transport_key(self) -> str:
+        """Identifies the endpoint for the circuit breaker (one per provider and server)."""
+        return f"{self.name}@{getattr(self.client, 'base_url', '')}"
+
     async def _create_chat_completion(self, messages: list, tools: list | None = None) -> AssistantResponse:
         """
         A helper method to create a chat completion and handle common exceptions.
+        Transient failures (429, 5xx, timeouts) are retried by the transport policy; the final
+        error, if any, becomes the response text.
         """
         # Note: self.client and self.model are expected to be set by subclasses.
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=tools,
-                tool_choice="auto" if tools else None,
+            response = await self.transport.call(
+                self._transport_key(),
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    tools=tools,
+                    tool_choice="auto" if tools else None,
+                ),
+                policy_for(self.name),
             )
 
             message = response.choices[0].message
@@ -91,19 +173,87 @@ class LLMProvider(ABC):
                     else:
                         tool_calls.append(tc)
 
-            return AssistantResponse(content=content, tool_calls=tool_calls)
+            return AssistantResponse(content=content, tool_calls=tool_calls, usage=self._extract_usage(response))
+
+        except Exception as e:
+            return AssistantResponse(content=self._error_message(e))
 
-        except httpx.ConnectError:
+    def _error_message(self, error: Exception) -> str:
+        if isinstance(error, CircuitOpenError):
+            error_message = (
+                f"{self.name} is temporarily unavailable after repeated failures. "
+                f"Try again in {max(error.retry_in, 1):.0f} seconds."
+            )
+        elif isinstance(error, httpx.ConnectError):
             error_message = (
                 f"Could not connect to {self.name} server at {getattr(self.client, 'base_url', 'unknown URL')}. "
                 f"Is the service running?"
             )
-            print(error_message)
-            return AssistantResponse(content=error_message)
+        else:
+            error_message = f"An error occurred with the {self.name} API: {error}"
+        print(error_message)
+        return error_message
+
+    async def _stream_chat_completion(self, messages: list, tools: list | None = None) -> AsyncIterator[StreamDelta]:
+        """
+        A helper method to stream a chat completion from an OpenAI-compatible API.
+
+        Yields text deltas as they arrive and, at the end, a delta holding the full response
+        (with tool calls assembled from their fragments). Opening the stream is retried by the
+        transport policy; errors end the stream with the error message, like `_create_chat_completion`.
+        """
+        parts: list[str] = []
+        tool_calls = ToolCallAccumulator()
+        usage = None
+        key, policy = self._transport_key(), policy_for(self.name)
+        # Sem isso, servidores compatíveis com OpenAI não enviam o uso de tokens no stream.
+        extra = {"stream_options": {"include_usage": True}} if self.stream_usage else {}
+        try:
+            # O limite de requisições vale enquanto o stream é lido; só a abertura é repetida em falhas.
+            async with self.transport.slot(policy):
+                stream = await self.transport.call(
+                    key,
+                    lambda: self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        tools=tools,
+                        tool_choice="auto" if tools else None,
+                        stream=True,
+                        **extra,
+                    ),
+                    policy,
+                    hold_slot=False,
+                )
+                try:
+                    async for chunk in stream:
+                        usage = self._extract_usage(chunk) or usage
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta
+                        for fragment in getattr(delta, 'tool_calls', None) or []:
+                            tool_calls.add(fragment)
+                        if delta.content:
+                            parts.append(delta.content)
+                            yield StreamDelta(content=delta.content)
+                except Exception as e:
+                    # Falha no meio do stream: não é repetida (o texto já foi exibido), mas conta para o circuito.
+                    self.transport.record(self.transport.breaker(key, policy), e)
+                    raise
         except Exception as e:
-            error_message = f"An error occurred with the {self.name} API: {e}"
-            print(error_message)
-            return AssistantResponse(content=error_message)
+            error_message = self._error_message(e)
+            text = f"\n{error_message}" if parts else error_message
+            parts.append(text)
+            yield StreamDelta(content=text)
+        yield StreamDelta(response=AssistantResponse(content="".join(parts), tool_calls=tool_calls.result(), usage=usage))
+
+    @staticmethod
+    def _extract_usage(response) -> Dict[str, int] | None:
+        """Returns the token usage of a completion, if the server reported it."""
+        usage = getattr(response, "usage", None)
+        counts = {key: getattr(usage, key, None) for key in ("prompt_tokens", "completion_tokens", "total_tokens")}
+        if not isinstance(counts["total_tokens"], int):
+            return None
+        return {key: value for key, value in counts.items() if isinstance(value, int)}
 
     @abstractmethod
     async def get_chat_response(self, messages: list, tools: list | None = None) -> AssistantResponse:
@@ -112,6 +262,16 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def stream_chat_response(self, messages: list, tools: list | None = None) -> AsyncIterator[StreamDelta]:
+        """
+        Asynchronously streams a chat response from the model, as StreamDelta objects.
+
+        The last delta holds the complete response. Providers without streaming support
+        yield the whole answer at once.
+        """
+        response = await self.get_chat_response(messages, tools=tools)
+        yield StreamDelta(content=response.content, response=response)
+
     @abstractmethod
     async def list_models(self) -> List[str]:
         """
@@ -0,0 +1,181 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import json
+from dataclasses import dataclass
+
+# Orçamento de contexto (tokens do histórico enviado a cada chamada) por provedor. Fica bem abaixo
+# da janela dos modelos: o objetivo é limitar custo e latência, não apenas caber na janela.
+CONTEXT_BUDGETS = {
+    "OpenAI": 16000,
+    "OpenRouter": 8000,
+    "Maritaca": 8000,
+    "Ollama": 4000,
+}
+# Modelos com janela menor ou maior que a padrão do provedor (prefixo do nome -> orçamento).
+MODEL_CONTEXT_BUDGETS = {
+    "gpt-4o": 24000,
+    "gpt-4.1": 24000,
+    "gpt-4": 6000,
+    "sabiazim": 4000,
+}
+DEFAULT_CONTEXT_BUDGET = 8000
+
+# Resultados de ferramentas de turnos anteriores são reduzidos a este número de caracteres.
+TOOL_DIGEST_CHARS = 300
+# Tamanho máximo do resumo das mensagens removidas e de cada linha dele.
+SUMMARY_MAX_CHARS = 2000
+SUMMARY_LINE_CHARS = 160
+SUMMARY_PREFIX = "Resumo da conversa anterior (mensagens antigas removidas para economizar contexto):"
+DIGEST_MARKER = "[resultado antigo resumido:"
+
+
+def context_budget(provider_name: str, model: str = "") -> int:
+    """Orçamento de tokens do histórico para um provedor e modelo."""
+    model = model if isinstance(model, str) else ""
+    # O prefixo mais longo vence ("gpt-4o" antes de "gpt-4").
+    for prefix in sorted(MODEL_CONTEXT_BUDGETS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_CONTEXT_BUDGETS[prefix]
+    return CONTEXT_BUDGETS.get(provider_name, DEFAULT_CONTEXT_BUDGET)
+
+
+def estimate_tokens(message: dict) -> int:
+    """Estimativa barata (~4 caracteres por token, mais a sobrecarga de cada mensagem)."""
+    content = message.get("content") or ""
+    if message.get("tool_calls"):
+        content += json.dumps(message["tool_calls"], ensure_ascii=False)
+    return len(content) // 4 + 4
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+@dataclass
+class CompactionStats:
+    """
+    Efeito da última compactação.
+
+    :ivar tokens_before: Tokens estimados do histórico antes de compactar.
+    :ivar tokens_after: Tokens estimados depois.
+    :ivar digested: Resultados de ferramentas reduzidos a um resumo.
+    :ivar dropped: Mensagens removidas (e resumidas).
+    """
+    tokens_before: int = 0
+    tokens_after: int = 0
+    digested: int = 0
+    dropped: int = 0
+
+
+class ConversationMemory:
+    """
+    Mantém o histórico do assistente dentro de um orçamento de tokens.
+
+    A cada chamada ao modelo, `compact`:
+    1. fixa o prompt de sistema (a primeira mensagem nunca é alterada);
+    2. troca os resultados de ferramentas de turnos já respondidos por um resumo curto
+       (o modelo já os usou para responder; o texto da resposta continua no histórico);
+    3. se ainda passar do orçamento, remove os turnos mais antigos inteiros (pergunta, chamadas
+       de ferramenta, resultados e resposta, para não quebrar o pareamento tool_call/tool) e
+       acrescenta uma linha por turno a um resumo extrativo logo após o prompt de sistema.
+    O turno atual nunca é removido.
+    """
+
+    def __init__(self):
+        self.last_stats = CompactionStats()
+
+    @staticmethod
+    def _digest(content: str) -> str:
+        content = content or ""
+        if len(content) <= TOOL_DIGEST_CHARS or content.startswith(DIGEST_MARKER):
+            return content
+        return f"{DIGEST_MARKER} {len(content)} caracteres] {_shorten(content, TOOL_DIGEST_CHARS)}"
+
+    @staticmethod
+    def _turns(messages: list) -> list[tuple[int, int]]:
+        """Intervalos [início, fim) de cada turno (cada um começa em uma mensagem do usuário)."""
+        starts = [i for i, message in enumerate(messages) if message.get("role") == "user"]
+        bounds = []
+        for index, turn_start in enumerate(starts):
+            turn_end = starts[index + 1] if index + 1 < len(starts) else len(messages)
+            bounds.append((turn_start, turn_end))
+        return bounds
+
+    @staticmethod
+    def _summary_line(turn: list) -> str:
+        question = next((m.get("content") for m in turn if m.get("role") == "user"), "")
+        answers = [m.get("content") for m in turn if m.get("role") == "assistant" and m.get("content")]
+        tools = [tc["function"]["name"] for m in turn for tc in (m.get("tool_calls") or [])]
+        line = f"- Usuário: {_shorten(question, SUMMARY_LINE_CHARS)}"
+        if tools:
+            line += f" | Ferramentas: {', '.join(dict.fromkeys(tools))}"
+        if answers:
+            line += f" | Assistente: {_shorten(answers[-1], SUMMARY_LINE_CHARS)}"
+        return line
+
+    def compact(self, messages: list, budget: int) -> list:
+        """
+        Compacta o histórico para caber no orçamento.
+
+        :param messages: Histórico completo (não é alterado).
+        :param budget: Orçamento em tokens estimados.
+        :return: O histórico compactado.
+        """
+        stats = CompactionStats(tokens_before=sum(estimate_tokens(m) for m in messages))
+        if not messages:
+            self.last_stats = stats
+            return messages
+
+        pinned = [messages[0]] if messages[0].get("role") == "system" else []
+        rest = messages[len(pinned):]
+        summary_lines = []
+        if rest and rest[0].get("role") == "system" and (rest[0].get("content") or "").startswith(SUMMARY_PREFIX):
+            summary_lines = rest[0]["content"].split("\n")[1:]
+            rest = rest[1:]
+
+        # Resultados de ferramentas anteriores ao turno atual viram resumos.
+        turns = self._turns(rest)
+        current_start = turns[-1][0] if turns else len(rest)
+        compacted = []
+        for index, message in enumerate(rest):
+            if index < current_start and message.get("role") == "tool":
+                digest = self._digest(message.get("content"))
+                if digest != message.get("content"):
+                    message = {**message, "content": digest}
+                    stats.digested += 1
+            compacted.append(message)
+
+        def total() -> int:
+            summary_tokens = sum(len(line) for line in summary_lines) // 4 + 4 if summary_lines else 0
+            return sum(estimate_tokens(m) for m in pinned + compacted) + summary_tokens
+
+        # Remove os turnos mais antigos (nunca o atual) até caber no orçamento.
+        while total() > budget:
+            turns = self._turns(compacted)
+            if len(turns) < 2:
+                break
+            # Mensagens antes do primeiro turno (sem pergunta do usuário) saem junto com ele.
+            end = turns[0][1]
+            summary_lines.append(self._summary_line(compacted[:end]))
+            stats.dropped += end
+            compacted = compacted[end:]
+
+        # O resumo guarda as linhas mais recentes que couberem no limite.
+        while summary_lines and sum(len(line) + 1 for line in summary_lines) > SUMMARY_MAX_CHARS:
+            summary_lines.pop(0)
+        if summary_lines:
+            compacted.insert(0, {"role": "system", "content": "\n".join([SUMMARY_PREFIX] + summary_lines)})
+
+        result = pinned + compacted
+        stats.tokens_after = sum(estimate_tokens(m) for m in result)
+        self.last_stats = stats
+        return result
@@ -8,8 +8,8 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
-from typing import List, TYPE_CHECKING
-from app.core.llm.base import LLMProvider, AssistantResponse
+from typing import AsyncIterator, List, TYPE_CHECKING
+from app.core.llm.base import LLMProvider, AssistantResponse, StreamDelta
 
 if TYPE_CHECKING:
     from openai import AsyncOpenAI
@@ -21,12 +21,13 @@ class MaritacaProvider(LLMProvider):
     """
 
     def __init__(self, api_key: str, model: str = "sabia-3"):
-        from openai import AsyncOpenAI
-        self.client = AsyncOpenAI(
+        self.client = self._build_client(
             api_key=api_key,
             base_url="https://chat.maritaca.ai/api",
         )
         self.model = model
+        # A camada de compatibilidade da Maritaca não documenta stream_options.
+        self.stream_usage = False
 
     @property
     def name(self) -> str:
@@ -35,6 +36,10 @@ class MaritacaProvider(LLMProvider):
     async def get_chat_response(self, messages: list, tools: list | None = None) -> AssistantResponse:
         return await self._create_chat_completion(messages, tools)
 
+    async def stream_chat_response(self, messages: list, tools: list | None = None) -> AsyncIterator[StreamDelta]:
+        async for delta in self._stream_chat_completion(messages=messages, tools=tools):
+            yield delta
+
     async def list_models(self) -> List[str]:
         fallback_models = ["sabia-3.1", "sabia-3", "sabiazim-3"]
         try:
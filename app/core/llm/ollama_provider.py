@@ -8,8 +8,8 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
-from typing import List, TYPE_CHECKING
-from app.core.llm.base import LLMProvider, AssistantResponse
+from typing import AsyncIterator, List, TYPE_CHECKING
+from app.core.llm.base import LLMProvider, AssistantResponse, StreamDelta
 import httpx
 
 if TYPE_CHECKING:
@@ -31,8 +31,7 @@ class OllamaProvider(LLMProvider):
     """
 
     def __init__(self, base_url: str = "http://localhost:11434/v1", model: str = "llama3.1"):
-        from openai import AsyncOpenAI
-        self.client = AsyncOpenAI(
+        self.client = self._build_client(
             base_url=base_url,
             api_key="ollama",
         )
@@ -45,6 +44,10 @@ class OllamaProvider(LLMProvider):
     async def get_chat_response(self, messages: list, tools: list | None = None) -> AssistantResponse:
         return await self._create_chat_completion(messages=messages, tools=tools)
 
+    async def stream_chat_response(self, messages: list, tools: list | None = None) -> AsyncIterator[StreamDelta]:
+        async for delta in self._stream_chat_completion(messages=messages, tools=tools):
+            yield delta
+
     async def list_models(self) -> List[str]:
         try:
             models_response = await self.client.models.list()
@@ -8,8 +8,8 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
-from typing import List, TYPE_CHECKING
-from app.core.llm.base import LLMProvider, AssistantResponse
+from typing import AsyncIterator, List, TYPE_CHECKING
+from app.core.llm.base import LLMProvider, AssistantResponse, StreamDelta
 
 if TYPE_CHECKING:
     from openai import AsyncOpenAI
@@ -21,8 +21,7 @@ class OpenRouterProvider(LLMProvider):
     """
 
     def __init__(self, api_key: str, model: str = "mistralai/mistral-7b-instruct:free"):
-        from openai import AsyncOpenAI
-        self.client = AsyncOpenAI(
+        self.client = self._build_client(
             api_key=api_key,
             base_url="https://openrouter.ai/api/v1",
         )
@@ -35,6 +34,10 @@ class OpenRouterProvider(LLMProvider):
     async def get_chat_response(self, messages: list, tools: list | None = None) -> AssistantResponse:
         return await self._create_chat_completion(messages=messages, tools=tools)
 
+    async def stream_chat_response(self, messages: list, tools: list | None = None) -> AsyncIterator[StreamDelta]:
+        async for delta in self._stream_chat_completion(messages=messages, tools=tools):
+            yield delta
+
     async def list_models(self) -> List[str]:
         fallback_models = ["openai/gpt-oss-20b:free"]
         try:
@@ -8,8 +8,8 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
-from typing import List, TYPE_CHECKING
-from app.core.llm.base import LLMProvider, AssistantResponse
+from typing import AsyncIterator, List, TYPE_CHECKING
+from app.core.llm.base import LLMProvider, AssistantResponse, StreamDelta
 
 if TYPE_CHECKING:
     from openai import AsyncOpenAI
@@ -20,9 +20,8 @@ class OpenAIProvider(LLMProvider):
     """
 
     def __init__(self, api_key: str, model: str = "gpt-4"):
-        # Lazy import of openai
-        from openai import AsyncOpenAI
-        self.client = AsyncOpenAI(api_key=api_key)
+        # openai is imported lazily by _build_client
+        self.client = self._build_client(api_key=api_key)
         self.model = model
 
     @property
@@ -32,6 +31,10 @@ class OpenAIProvider(LLMProvider):
     async def get_chat_response(self, messages: list, tools: list | None = None) -> AssistantResponse:
         return await self._create_chat_completion(messages=messages, tools=tools)
 
+    async def stream_chat_response(self, messages: list, tools: list | None = None) -> AsyncIterator[StreamDelta]:
+        async for delta in self._stream_chat_completion(messages=messages, tools=tools):
+            yield delta
+
     async def list_models(self) -> List[str]:
         try:
             models = await self.client.models.list()
@@ -0,0 +1,138 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from dataclasses import dataclass
+from app.core.config import CONFIG_FILE, load_config, settings_generation
+from app.core.security.credentials import get_api_key
+from app.core.llm.base import LLMProvider
+from app.core.llm.openai_provider import OpenAIProvider
+from app.core.llm.maritaca_provider import MaritacaProvider
+from app.core.llm.open_router_provider import OpenRouterProvider
+from app.core.llm.ollama_provider import OllamaProvider
+
+# Provedor -> (classe, modelo padrão). O Ollama usa URL em vez de chave de API.
+PROVIDERS = {
+    "OpenAI": (OpenAIProvider, "gpt-4"),
+    "Maritaca": (MaritacaProvider, "sabia-3"),
+    "OpenRouter": (OpenRouterProvider, "mistralai/mistral-7b-instruct:free"),
+    "Ollama": (OllamaProvider, "llama3.1"),
+}
+DEFAULT_OLLAMA_URL = "http://localhost:11434/v1"
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """
+    Everything that identifies a live provider. Two equal configs can share the same client.
+
+    :ivar name: Provider name (a key of PROVIDERS).
+    :ivar model: Selected model.
+    :ivar base_url: Server URL (Ollama only).
+    :ivar api_key: API key (every provider except Ollama).
+    """
+    name: str
+    model: str
+    base_url: str | None = None
+    api_key: str | None = None
+
+    def __repr__(self):
+        # Nunca expõe a chave em logs.
+        return f"ProviderConfig(name={self.name!r}, model={self.model!r}, base_url={self.base_url!r})"
+
+
+class ProviderManager:
+    """
+    Keeps the active LLM provider (and its HTTP client and connection pool) alive between messages.
+
+    The settings are only re-read when they may have changed: when this process saved a setting or
+    an API key (`settings_generation`) or when config.json was modified on disk (mtime/size, e.g. by
+    the other interface). The provider is rebuilt only if the provider, model, URL or key differs.
+    Replaced providers are kept until `close_retired` so their clients can be closed asynchronously.
+    """
+
+    def __init__(self):
+        self.provider: LLMProvider | None = None
+        self.config: ProviderConfig | None = None
+        self._stamp = None
+        self._retired: list[LLMProvider] = []
+
+    @staticmethod
+    def _settings_stamp() -> tuple:
+        try:
+            stat = CONFIG_FILE.stat()
+            file_stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_stamp = None
+        return settings_generation(), file_stamp
+
+    @staticmethod
+    def read_config() -> ProviderConfig | None:
+        """
+        Reads the active provider configuration (config.json once, plus the keyring if needed).
+
+        :return: The configuration, or None if the provider is unknown or has no API key.
+        """
+        settings = load_config()
+        name = settings.get("active_provider", "OpenAI")
+        if name not in PROVIDERS:
+            return None
+        model = settings.get(f"{name.lower()}_model", PROVIDERS[name][1])
+        if name == "Ollama":
+            return ProviderConfig(name, model, base_url=settings.get("ollama_url", DEFAULT_OLLAMA_URL))
+        api_key = get_api_key(name)
+        if not api_key:
+            return None
+        return ProviderConfig(name, model, api_key=api_key)
+
+    @staticmethod
+    def build(config: ProviderConfig) -> LLMProvider:
+        provider_class = PROVIDERS[config.name][0]
+        if config.name == "Ollama":
+            return provider_class(base_url=config.base_url, model=config.model)
+        return provider_class(api_key=config.api_key, model=config.model)
+
+    def get_provider(self) -> LLMProvider | None:
+        """
+        Returns the provider for the current settings, rebuilding it only when they changed.
+
+        :return: The live provider, or None if no provider is configured.
+        """
+        stamp = self._settings_stamp()
+        if stamp == self._stamp:
+            return self.provider
+        self._stamp = stamp
+
+        config = self.read_config()
+        if config == self.config:
+            return self.provider
+        if self.provider is not None:
+            self._retired.append(self.provider)
+        self.provider = self.build(config) if config else None
+        self.config = config
+        return self.provider
+
+    def invalidate(self):
+        """Forces the settings to be re-read on the next `get_provider` call."""
+        self._stamp = None
+
+    async def close_retired(self):
+        """Closes the clients of providers replaced after a settings change."""
+        retired, self._retired = self._retired, []
+        for provider in retired:
+            await provider.close()
+
+    async def close(self):
+        """Closes every provider, including the active one."""
+        await self.close_retired()
+        if self.provider is not None:
+            await self.provider.close()
+        self.provider = None
+        self.config = None
+        self._stamp = None
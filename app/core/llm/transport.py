@@ -0,0 +1,257 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable, TypeVar
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Códigos HTTP que indicam falha passageira (vale tentar de novo).
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class TransportPolicy:
+    """
+    Timeouts, retries and limits shared by every LLM provider.
+
+    :ivar connect_timeout: Seconds to open a connection.
+    :ivar read_timeout: Seconds without receiving data (for streams, between chunks).
+    :ivar max_retries: Extra attempts after a transient failure (429, 5xx, timeout, connection error).
+    :ivar backoff_base: Delay before the first retry; doubles on each attempt ("full jitter").
+    :ivar backoff_max: Upper bound of a single delay, including a server's Retry-After.
+    :ivar max_in_flight: Model requests running at the same time in the process.
+    :ivar breaker_threshold: Consecutive transient failures that open the circuit.
+    :ivar breaker_cooldown: Seconds the circuit stays open before a trial request.
+    """
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    max_in_flight: int = 4
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 30.0
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+
+DEFAULT_POLICY = TransportPolicy()
+# O Ollama roda localmente: conectar é rápido (ou falha logo), mas carregar o modelo pode demorar.
+PROVIDER_POLICIES = {
+    "Ollama": replace(DEFAULT_POLICY, connect_timeout=3.0, read_timeout=300.0, max_retries=1),
+}
+
+
+def policy_for(provider_name: str) -> TransportPolicy:
+    return PROVIDER_POLICIES.get(provider_name, DEFAULT_POLICY)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(f"circuit open for {key}; next attempt in {retry_in:.0f} s")
+        self.key = key
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated transient failures of one provider endpoint.
+
+    Closed: requests go through. After `threshold` consecutive failures it opens and every
+    request fails immediately with CircuitOpenError. After `cooldown` seconds a single trial
+    request is let through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, key: str, threshold: int, cooldown: float, clock: Callable[[], float] = time.monotonic):
+        self.key = key
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.clock() - self.opened_at >= self.cooldown else "open"
+
+    def before_call(self):
+        """Raises CircuitOpenError if the request must not be sent."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            elapsed = self.clock() - self.opened_at
+            if elapsed < self.cooldown or self._trial_running:
+                raise CircuitOpenError(self.key, max(self.cooldown - elapsed, 0.0))
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.threshold:
+                if self.opened_at is None:
+                    logger.warning("Circuito aberto para %s após %d falhas.", self.key, self.failures)
+                self.opened_at = self.clock()
+            self._trial_running = False
+
+    def record_neutral(self):
+        """An attempt that says nothing about the provider's health (e.g. 400 or 401)."""
+        with self._lock:
+            self._trial_running = False
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed request may succeed if repeated (timeouts, connection errors, 429, 5xx)."""
+    from openai import APIConnectionError, APIStatusError
+    if isinstance(error, (APIConnectionError, httpx.TimeoutException, httpx.TransportError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Delay requested by the server (Retry-After header, in seconds or as an HTTP date)."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMTransport:
+    """
+    Shared transport policy of the LLM providers: retries with jittered exponential backoff,
+    a process-wide limit of in-flight requests and one circuit breaker per provider endpoint.
+    Timeouts are applied by the HTTP client itself (see `LLMProvider._build_client`).
+
+    :ivar sleep: Coroutine used to wait between attempts (replaceable in tests).
+    :ivar clock: Monotonic clock of the circuit breakers (replaceable in tests).
+    """
+
+    def __init__(self, sleep=asyncio.sleep, clock: Callable[[], float] = time.monotonic,
+                 rng: Callable[[], float] = random.random):
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # asyncio.Semaphore pertence a um loop: um semáforo por loop (GUI, TUI e testes usam loops distintos).
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def breaker(self, key: str, policy: TransportPolicy = DEFAULT_POLICY) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(key, policy.breaker_threshold, policy.breaker_cooldown, self.clock)
+                self._breakers[key] = breaker
+            return breaker
+
+    @asynccontextmanager
+    async def slot(self, policy: TransportPolicy = DEFAULT_POLICY):
+        """Holds one of the in-flight request slots of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(policy.max_in_flight)
+                self._semaphores[loop] = semaphore
+        async with semaphore:
+            yield
+
+    def backoff(self, attempt: int, error: BaseException, policy: TransportPolicy) -> float:
+        """Delay before retry number `attempt + 1`: Retry-After if sent, otherwise full jitter."""
+        requested = retry_after(error)
+        if requested is not None:
+            return min(requested, policy.backoff_max)
+        return self.rng() * min(policy.backoff_max, policy.backoff_base * 2 ** attempt)
+
+    def record(self, breaker: CircuitBreaker, error: BaseException | None):
+        """Updates a breaker with the outcome of a request finished outside `call` (e.g. a stream)."""
+        if error is None:
+            breaker.record_success()
+        elif is_transient(error):
+            breaker.record_failure()
+        else:
+            breaker.record_neutral()
+
+    async def call(self, key: str, request: Callable[[], Awaitable[T]], policy: TransportPolicy = DEFAULT_POLICY,
+                   hold_slot: bool = True) -> T:
+        """
+        Sends a request through the policy.
+
+        :param key: Provider endpoint (one circuit breaker per key).
+        :param request: Function that starts one attempt (called again on each retry).
+        :param policy: Retry and limit settings.
+        :param hold_slot: Acquire an in-flight slot per attempt. Streams pass False and hold
+                          `slot()` themselves while they are consumed.
+        :return: The result of the first successful attempt.
+        :raises CircuitOpenError: If the circuit is (or becomes) open.
+        """
+        breaker = self.breaker(key, policy)
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                if hold_slot:
+                    async with self.slot(policy):
+                        result = await request()
+                else:
+                    result = await request()
+            except Exception as error:
+                self.record(breaker, error)
+                if not is_transient(error) or attempt >= policy.max_retries:
+                    raise
+                delay = self.backoff(attempt, error, policy)
+                attempt += 1
+                logger.info("%s: falha passageira (%s); tentativa %d em %.2f s.", key, error, attempt + 1, delay)
+                await self.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelamento: não diz nada sobre o provedor, mas libera a tentativa do half-open.
+                breaker.record_neutral()
+                raise
+            breaker.record_success()
+            return result
+
+
+# Transporte único do processo: o limite de requisições e os circuitos valem para todos os provedores.
+shared_transport = LLMTransport()
@@ -10,7 +10,7 @@
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 import keyring
 import json
-from app.core.config import CONFIG_DIR
+from app.core.config import CONFIG_DIR, notify_settings_changed
 
 # The service name under which the credentials will be stored.
 # In a real application, this should be unique to your app.
@@ -64,6 +64,7 @@ def save_api_key(service_name: str, api_key: str):
         # Handle potential errors with the keyring backend
         print(f"Keyring error ({e}). Using file fallback.")
         _save_to_file(service_name, api_key)
+    notify_settings_changed()
 
 def get_api_key(service_name: str) -> str | None:
     """
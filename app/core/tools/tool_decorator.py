@@ -9,23 +9,133 @@
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 import inspect
+import threading
+from collections import OrderedDict
 from functools import wraps
 
-def tool(func):
+# Máximo de resultados guardados por ferramenta com cacheable=True.
+TOOL_CACHE_SIZE = 128
+
+
+class ToolResultCache:
+    """
+    Memoiza uma ferramenta de leitura pelos seus argumentos e pelas versões das tabelas que ela lê.
+
+    As versões vêm de `data_service.get_data_versions` do módulo da ferramenta (o mesmo serviço que
+    ela usa para ler os dados). Como toda escrita incrementa a versão da tabela (triggers do SQLite),
+    qualquer escrita invalida os resultados afetados sem nenhuma chamada explícita. Se o módulo não
+    tiver um data_service que informe versões (ex: substituído por um mock nos testes), a ferramenta
+    é executada normalmente, sem cache.
+
+    :ivar hits: Chamadas respondidas pelo cache.
+    :ivar misses: Chamadas que executaram a ferramenta.
+    """
+
+    def __init__(self, func, tables: tuple | None = None, maxsize: int = TOOL_CACHE_SIZE):
+        self.func = func
+        self.tables = tables
+        self.maxsize = maxsize
+        self.signature = inspect.signature(func)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._versions = None
+        self._lock = threading.Lock()
+
+    def _current_versions(self) -> tuple | None:
+        service = self.func.__globals__.get("data_service")
+        getter = getattr(service, "get_data_versions", None)
+        versions = getter(self.tables) if getter else None
+        return tuple(sorted(versions.items())) if isinstance(versions, dict) else None
+
+    def __call__(self, *args, **kwargs):
+        versions = self._current_versions()
+        if versions is None:
+            return self.func(*args, **kwargs)
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())
+        try:
+            hash(key)
+        except TypeError:
+            return self.func(*args, **kwargs)
+
+        with self._lock:
+            if versions != self._versions:
+                # Os dados mudaram: nenhum resultado anterior pode ser reaproveitado.
+                self._entries.clear()
+                self._versions = versions
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        result = self.func(*args, **kwargs)
+        # Relê as versões: uma escrita durante a execução pode ter tornado o resultado obsoleto.
+        versions_after = self._current_versions()
+        with self._lock:
+            self.misses += 1
+            # Só guarda se nenhuma escrita mudou as versões enquanto a ferramenta executava
+            # (nem as lidas antes e depois da execução, nem as de outra chamada concorrente).
+            if versions == versions_after == self._versions:
+                self._entries[key] = result
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Descarta os resultados guardados e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._versions = None
+            self.hits = self.misses = 0
+
+
+def tool(func=None, *, cacheable: bool = False, tables: tuple | None = None, timeout: float | None = None):
     """
     Decora uma função para gerar um esquema JSON Schema com base na assinatura e no
     docstring da função. Este esquema pode ser utilizado para documentar ou validar
     os parâmetros e a descrição da função decorada.
 
+    Pode ser usado como `@tool` ou, para ferramentas somente de leitura, como
+    `@tool(cacheable=True, tables=(...))`, que memoiza o resultado (ver ToolResultCache).
+
     :param func: A função que será decorada.
     :type func: Callable
+    :param cacheable: Memoiza o resultado pelos argumentos e pelas versões dos dados.
+    :type cacheable: bool
+    :param tables: Tabelas lidas pela ferramenta (None = todas as tabelas versionadas).
+    :type tables: tuple | None
+    :param timeout: Segundos que o ToolExecutor espera por esta ferramenta (None = padrão do executor).
+    :type timeout: float | None
     :return: Uma função decorada, com o esquema JSON Schema gerado anexado como
-    atributo `schema`.
+    atributo `schema`, o limite de tempo como atributo `timeout` (e o cache como
+    atributo `cache`, se cacheable).
     :rtype: Callable
     """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
+    if func is None:
+        return lambda f: tool(f, cacheable=cacheable, tables=tables, timeout=timeout)
+
+    if cacheable and inspect.iscoroutinefunction(func):
+        raise TypeError(f"Tool {func.__name__}: cacheable=True is only supported for synchronous tools.")
+
+    if cacheable:
+        cache = ToolResultCache(func, tables)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache(*args, **kwargs)
+        wrapper.cache = cache
+    elif inspect.iscoroutinefunction(func):
+        # Ferramentas assíncronas continuam assíncronas, para o executor aguardá-las no próprio loop.
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await func(*args, **kwargs)
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+    wrapper.timeout = timeout
 
     # --- Schema Generation ---
     func_sig = inspect.signature(func)
@@ -8,50 +8,143 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import asyncio
+import functools
+import inspect
 import json
-from typing import Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
 from app.core.tools.tool_registry import ToolRegistry
 
+# Maximum number of synchronous tools running at the same time (DB queries, reports, HTTP).
+MAX_TOOL_WORKERS = 4
+# Seconds a single tool call may take before the model receives a timeout error instead.
+DEFAULT_TOOL_TIMEOUT = 60.0
+
 
 class ToolExecutor:
     """
     Handles the secure execution of tools requested by the LLM.
+
+    `execute_tool_calls` runs every call of a model turn concurrently without blocking the
+    event loop: synchronous tools go to a bounded thread pool, async tools are awaited
+    directly, and each call has its own timeout.
     """
-    def __init__(self, registry: ToolRegistry):
+    def __init__(self, registry: ToolRegistry, max_workers: int = MAX_TOOL_WORKERS,
+                 timeout: float | None = DEFAULT_TOOL_TIMEOUT):
         self.registry = registry
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
 
-    def execute_tool_call(self, tool_call: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Executes a single tool call from the LLM's response.
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Criado sob demanda: a maioria das instâncias (e dos testes) nunca executa ferramentas em paralelo.
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool-call")
+            return self._pool
 
-        Args:
-            tool_call: The tool call object from the LLM (e.g., from response.tool_calls).
+    def _resolve(self, tool_call: Dict[str, Any]):
+        """
+        Looks up the tool and parses its arguments.
 
-        Returns:
-            A dictionary representing the result to be sent back to the LLM.
+        :return: (tool_name, tool_function, arguments, None), or (tool_name, None, None, error_result).
         """
         tool_name = tool_call['function']['name']
         tool_function = self.registry.get_tool(tool_name)
 
         if not tool_function:
-            return self._create_error_result(tool_call['id'], f"Tool '{tool_name}' not found.")
+            return tool_name, None, None, self._create_error_result(tool_call['id'], f"Tool '{tool_name}' not found.")
 
         try:
             # Securely parse the JSON arguments string
             arguments = json.loads(tool_call['function']['arguments'])
+        except json.JSONDecodeError:
+            return tool_name, None, None, self._create_error_result(
+                tool_call['id'], "Invalid arguments format. Expected a valid JSON string.")
+        return tool_name, tool_function, arguments, None
+
+    def _error_from_exception(self, tool_call: Dict[str, Any], tool_name: str, error: Exception) -> Dict[str, Any]:
+        if isinstance(error, TypeError):
+            return self._create_error_result(tool_call['id'], f"Invalid arguments for tool '{tool_name}': {error}")
+        # Catch any other unexpected errors during tool execution
+        return self._create_error_result(tool_call['id'], f"An unexpected error occurred: {error}")
+
+    def execute_tool_call(self, tool_call: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executes a single tool call from the LLM's response.
+
+        Args:
+            tool_call: The tool call object from the LLM (e.g., from response.tool_calls).
+
+        Returns:
+            A dictionary representing the result to be sent back to the LLM.
+        """
+        tool_name, tool_function, arguments, error = self._resolve(tool_call)
+        if error:
+            return error
 
+        try:
             # Execute the tool function with the parsed arguments
             result = tool_function(**arguments)
-
             return self._create_success_result(tool_call['id'], tool_name, result)
+        except Exception as e:
+            return self._error_from_exception(tool_call, tool_name, e)
 
-        except json.JSONDecodeError:
-            return self._create_error_result(tool_call['id'], "Invalid arguments format. Expected a valid JSON string.")
-        except TypeError as e:
-            return self._create_error_result(tool_call['id'], f"Invalid arguments for tool '{tool_name}': {e}")
+    async def execute_tool_call_async(self, tool_call: Dict[str, Any], timeout: float | None = None) -> Dict[str, Any]:
+        """
+        Executes a single tool call without blocking the event loop.
+
+        Args:
+            tool_call: The tool call object from the LLM.
+            timeout: Seconds before giving up on the call (defaults to the tool's own
+                timeout, set with `@tool(timeout=...)`, then to the executor's timeout).
+
+        Returns:
+            A dictionary representing the result to be sent back to the LLM.
+        """
+        tool_name, tool_function, arguments, error = self._resolve(tool_call)
+        if error:
+            return error
+        if timeout is None:
+            timeout = getattr(tool_function, "timeout", None) or self.timeout
+
+        try:
+            if inspect.iscoroutinefunction(tool_function):
+                result = await asyncio.wait_for(tool_function(**arguments), timeout)
+            else:
+                loop = asyncio.get_running_loop()
+                call = loop.run_in_executor(self._get_pool(), functools.partial(tool_function, **arguments))
+                result = await asyncio.wait_for(call, timeout)
+            return self._create_success_result(tool_call['id'], tool_name, result)
+        except asyncio.TimeoutError:
+            # Uma ferramenta síncrona não pode ser interrompida: sua thread termina em segundo plano
+            # e o resultado é descartado.
+            return self._create_error_result(tool_call['id'], f"Tool '{tool_name}' timed out after {timeout:g} seconds.")
         except Exception as e:
-            # Catch any other unexpected errors during tool execution
-            return self._create_error_result(tool_call['id'], f"An unexpected error occurred: {e}")
+            return self._error_from_exception(tool_call, tool_name, e)
+
+    async def execute_tool_calls(self, tool_calls: List[Dict[str, Any]], timeout: float | None = None) -> List[Dict[str, Any]]:
+        """
+        Executes all tool calls of a model turn concurrently.
+
+        Args:
+            tool_calls: The tool calls requested by the LLM.
+            timeout: Per-call timeout in seconds (defaults to each tool's own timeout, then the executor's).
+
+        Returns:
+            One result per tool call, in the same order as the calls.
+        """
+        return list(await asyncio.gather(*(self.execute_tool_call_async(tc, timeout) for tc in tool_calls)))
+
+    def shutdown(self, wait: bool = False):
+        """Releases the worker threads."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
 
     @staticmethod
     def _create_success_result(tool_call_id: str, tool_name: str, result: Any) -> Dict[str, Any]:
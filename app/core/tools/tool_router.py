@@ -0,0 +1,164 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import json
+import math
+from collections import defaultdict
+from typing import Any, Dict, List
+from app.core.tools.tool_registry import ToolRegistry
+from app.utils.text_search import STOPWORDS, stem_pt, tokenize
+
+# Palavras que o usuário costuma usar para pedir cada ferramenta, além do nome e da descrição dela.
+TOOL_KEYWORDS = {
+    "get_student_grades_by_course": "nota notas média aluno disciplina desempenho",
+    "list_courses_for_student": "disciplinas matérias aluno cursa",
+    "list_all_classes": "turmas classes séries quais existem cadastradas",
+    "get_class_roster": "alunos lista chamada matriculados turma quem",
+    "get_student_performance_summary_tool": "desempenho resumo situação aluno notas faltas frequência",
+    "get_students_at_risk_tool": "risco reprovação dificuldade baixo rendimento incidentes alerta",
+    "get_school_bncc_coverage_tool": "bncc habilidades cobertura competências currículo",
+    "suggest_lesson_activities_tool": "atividades sugestões ideias dinâmica aula criativa",
+    "generate_grade_chart_tool": "gráfico barras desempenho aluno imagem",
+    "generate_class_distribution_tool": "gráfico distribuição histograma notas turma imagem",
+    "export_class_grades_tool": "exportar csv planilha notas turma arquivo",
+    "generate_report_card_tool": "boletim relatório aluno notas",
+    "export_class_bundle_tool": "zip pacote exportar boletins turma arquivo",
+    "export_bncc_coverage_tool": "exportar csv bncc cobertura planilha arquivo",
+    "search_internet": "internet pesquisar pesquise buscar web site notícia online google",
+    "add_new_student": "cadastrar adicionar novo aluno aluna estudante matricular",
+    "add_new_course": "cadastrar criar nova disciplina matéria catálogo",
+    "add_new_grade": "lançar registrar adicionar nota notas avaliação",
+    "bulk_add_grades_tool": "lançar registrar notas turma toda todos alunos tabela lista avaliação prova",
+    "bulk_register_attendance_tool": "chamada frequência presença falta faltaram faltas presentes aula turma",
+    "create_new_class": "criar nova turma classe",
+    "add_subject_to_class": "adicionar vincular disciplina turma grade",
+    "create_new_assessment": "criar avaliação prova trabalho teste peso",
+    "add_new_lesson": "registrar salvar aula plano conteúdo",
+    "register_incident": "ocorrência incidente comportamento indisciplina registrar",
+    "update_student_name": "renomear corrigir alterar nome aluno",
+    "enroll_existing_student": "matricular matrícula transferir aluno existente turma",
+    "list_all_courses": "disciplinas matérias catálogo quais existem",
+}
+# Ferramentas de consulta baratas, sempre enviadas: permitem ao modelo descobrir nomes de turmas e disciplinas.
+ALWAYS_INCLUDED = ("list_all_classes", "list_all_courses")
+# Máximo de ferramentas escolhidas pela relevância (além das sempre incluídas e das usadas no turno anterior).
+MAX_ROUTED_TOOLS = 8
+# Uma ferramenta entra se sua pontuação for pelo menos esta fração da melhor.
+RELATIVE_SCORE_CUTOFF = 0.35
+# Peso das mensagens anteriores do usuário (o assunto da conversa) em relação à mensagem atual.
+HISTORY_WEIGHT = 0.5
+HISTORY_USER_MESSAGES = 2
+
+
+def _stems(text: str) -> set[str]:
+    return {stem_pt(word) for word in tokenize(text) if word not in STOPWORDS and len(word) > 1}
+
+
+class ToolRouter:
+    """
+    Escolhe, a cada turno, o subconjunto de ferramentas relevante para a conversa, em vez de enviar
+    todos os esquemas em toda requisição.
+
+    Cada ferramenta é indexada pelos radicais do seu nome, da sua descrição e de TOOL_KEYWORDS. A
+    mensagem atual do usuário (e, com peso menor, as anteriores) pontua as ferramentas por soma de
+    IDF dos radicais em comum. Entram as melhores, as sempre incluídas e as usadas no turno anterior
+    (para perguntas de continuação). Sem nenhum radical reconhecido, todas as ferramentas são enviadas.
+    As listas de esquemas são montadas uma vez por combinação de ferramentas e reaproveitadas.
+    """
+
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+        self._order: dict[str, int] = {}
+        self._postings: dict[str, set[str]] = defaultdict(set)
+        self._idf: dict[str, float] = {}
+        self._schema_bytes: dict[str, int] = {}
+        self._selections: dict[frozenset, List[Dict[str, Any]]] = {}
+        self._indexed = 0
+        self.last_selection: frozenset = frozenset()
+
+    def _build(self):
+        # Reindexa se ferramentas forem registradas depois da criação do roteador.
+        schemas = self.registry.get_all_schemas()
+        if self._indexed == len(schemas):
+            return
+        self._order.clear(); self._postings.clear(); self._selections.clear()
+        for position, schema in enumerate(schemas):
+            function = schema["function"]
+            name = function["name"]
+            self._order[name] = position
+            # O esquema é serializado uma única vez, para as medições de tamanho da requisição.
+            self._schema_bytes[name] = len(json.dumps(schema, ensure_ascii=False).encode("utf-8"))
+            text = " ".join([name.replace("_", " "), function.get("description", ""), TOOL_KEYWORDS.get(name, "")])
+            for stem in _stems(text):
+                self._postings[stem].add(name)
+        total = len(schemas)
+        self._idf = {stem: math.log(1 + total / len(names)) for stem, names in self._postings.items()}
+        self._indexed = total
+
+    def _score(self, text: str, weight: float, scores: dict[str, float]):
+        for stem in _stems(text):
+            for name in self._postings.get(stem, ()):
+                scores[name] += weight * self._idf[stem]
+
+    def schemas_for(self, names) -> List[Dict[str, Any]]:
+        """Esquemas das ferramentas informadas, na ordem do registro (lista em cache por combinação)."""
+        self._build()
+        key = frozenset(names)
+        selection = self._selections.get(key)
+        if selection is None:
+            ordered = sorted((n for n in key if n in self._order), key=self._order.__getitem__)
+            selection = [self.registry.get_tool(n).schema for n in ordered]
+            self._selections[key] = selection
+        return selection
+
+    def request_bytes(self, names=None) -> int:
+        """Bytes que os esquemas das ferramentas informadas (ou de todas) ocupam na requisição."""
+        self._build()
+        names = self._schema_bytes if names is None else names
+        return sum(self._schema_bytes.get(n, 0) for n in names)
+
+    def select(self, messages: list) -> List[Dict[str, Any]]:
+        """
+        Escolhe as ferramentas para o turno atual.
+
+        :param messages: Histórico da conversa, terminando no turno atual.
+        :return: Lista de esquemas a enviar ao modelo.
+        """
+        self._build()
+        user_positions = [i for i, m in enumerate(messages) if m.get("role") == "user"]
+        if not user_positions:
+            self.last_selection = frozenset(self._order)
+            return self.schemas_for(self.last_selection)
+
+        scores: dict[str, float] = defaultdict(float)
+        self._score(messages[user_positions[-1]].get("content") or "", 1.0, scores)
+        for position in user_positions[-1 - HISTORY_USER_MESSAGES:-1]:
+            self._score(messages[position].get("content") or "", HISTORY_WEIGHT, scores)
+
+        if not scores:
+            # Nada reconhecido: melhor enviar tudo do que deixar o modelo sem a ferramenta certa.
+            self.last_selection = frozenset(self._order)
+            return self.schemas_for(self.last_selection)
+
+        best = max(scores.values())
+        ranked = sorted((name for name, score in scores.items() if score >= best * RELATIVE_SCORE_CUTOFF),
+                        key=lambda name: (-scores[name], self._order[name]))
+        selected = set(ranked[:MAX_ROUTED_TOOLS])
+        selected.update(name for name in ALWAYS_INCLUDED if name in self._order)
+
+        # Ferramentas usadas desde a mensagem anterior do usuário continuam disponíveis.
+        previous_start = user_positions[-2] if len(user_positions) > 1 else 0
+        for message in messages[previous_start:]:
+            for tool_call in message.get("tool_calls") or []:
+                if tool_call["function"]["name"] in self._order:
+                    selected.add(tool_call["function"]["name"])
+
+        self.last_selection = frozenset(selected)
+        return self.schemas_for(self.last_selection)
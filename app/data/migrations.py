@@ -10,6 +10,8 @@
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 from sqlalchemy import text, inspect
 import logging
+from app.models.data_version import DataVersion, install_version_triggers
+from app.models.bncc_link import CourseBNCC, LessonBNCC, AssessmentBNCC, backfill_bncc_links
 
 def migrate_database(engine):
     """
@@ -21,6 +23,8 @@ def migrate_database(engine):
     4. Adding performance indexes to 'class_enrollments' and 'class_subjects'.
     5. Adding performance indexes to 'attendance', 'assessments', and 'lessons'.
     6. Adding BNCC columns to 'courses', 'lessons', and 'assessments'.
+    7. Creating the 'data_versions' table and its write-tracking triggers.
+    8. Creating the BNCC link tables and filling them from the comma-separated BNCC columns.
     """
     try:
         inspector = inspect(engine)
@@ -73,6 +77,23 @@ def migrate_database(engine):
             logging.info("Migration applied successfully.")
         else:
             logging.info("Schema check: 'bncc_codes' column already exists.")
+
+        # --- 7. Data version counters ---
+        # Idempotente: cria a tabela se faltar e (re)instala triggers ausentes.
+        DataVersion.__table__.create(engine, checkfirst=True)
+        with engine.begin() as conn:
+            install_version_triggers(conn)
+        logging.info("Schema check: data version triggers installed.")
+
+        # --- 8. BNCC link tables ---
+        # O main.py roda create_all antes das migrações, então as tabelas podem já existir
+        # vazias; o preenchimento a partir do texto acontece para cada tabela de vínculo vazia.
+        # Depois disso os vínculos são mantidos pelas escritas do ORM (ver app/models/bncc_link.py).
+        with engine.begin() as conn:
+            for table in (CourseBNCC.__table__, LessonBNCC.__table__, AssessmentBNCC.__table__):
+                table.create(conn, checkfirst=True)
+            backfill_bncc_links(conn)
+        logging.info("Schema check: BNCC link tables in place.")
     except Exception as e:
         logging.error(f"Migration failed: {e}")
         raise e
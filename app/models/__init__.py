@@ -19,3 +19,5 @@ from .lesson import Lesson
 from .incident import Incident
 from .schedule import TimeSlot, WeeklySchedule
 from .seating_chart import SeatingChart, SeatAssignment
+from .data_version import DataVersion
+from .bncc_link import CourseBNCC, LessonBNCC, AssessmentBNCC
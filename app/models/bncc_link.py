@@ -0,0 +1,145 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from sqlalchemy import Column, Integer, String, ForeignKey, event, delete, insert, inspect, select
+from sqlalchemy.orm import Session
+from app.models.base import Base
+from app.models.course import Course
+from app.models.lesson import Lesson
+from app.models.assessment import Assessment
+
+
+class CourseBNCC(Base):
+    """
+    Código da BNCC esperado para uma disciplina (uma linha por código).
+
+    Espelha, de forma normalizada, a lista separada por vírgulas em Course.bncc_expected,
+    permitindo que cobertura e buscas por código sejam feitas com índices no SQL.
+
+    :ivar course_id: Disciplina. Parte da chave primária.
+    :type course_id: int
+    :ivar code: Código da BNCC, em maiúsculas. Parte da chave primária e indexado.
+    :type code: str
+    """
+    __tablename__ = 'course_bncc'
+
+    course_id = Column(Integer, ForeignKey('courses.id'), primary_key=True)
+    code = Column(String(16), primary_key=True, index=True)
+
+    def __repr__(self):
+        return f"<CourseBNCC(course_id={self.course_id}, code='{self.code}')>"
+
+
+class LessonBNCC(Base):
+    """
+    Código da BNCC trabalhado em uma aula (espelho normalizado de Lesson.bncc_codes).
+
+    :ivar lesson_id: Aula. Parte da chave primária.
+    :type lesson_id: int
+    :ivar code: Código da BNCC, em maiúsculas. Parte da chave primária e indexado.
+    :type code: str
+    """
+    __tablename__ = 'lesson_bncc'
+
+    lesson_id = Column(Integer, ForeignKey('lessons.id'), primary_key=True)
+    code = Column(String(16), primary_key=True, index=True)
+
+    def __repr__(self):
+        return f"<LessonBNCC(lesson_id={self.lesson_id}, code='{self.code}')>"
+
+
+class AssessmentBNCC(Base):
+    """
+    Código da BNCC avaliado em uma avaliação (espelho normalizado de Assessment.bncc_codes).
+
+    :ivar assessment_id: Avaliação. Parte da chave primária.
+    :type assessment_id: int
+    :ivar code: Código da BNCC, em maiúsculas. Parte da chave primária e indexado.
+    :type code: str
+    """
+    __tablename__ = 'assessment_bncc'
+
+    assessment_id = Column(Integer, ForeignKey('assessments.id'), primary_key=True)
+    code = Column(String(16), primary_key=True, index=True)
+
+    def __repr__(self):
+        return f"<AssessmentBNCC(assessment_id={self.assessment_id}, code='{self.code}')>"
+
+
+# Modelo dono -> (tabela de vínculo, coluna do dono na tabela de vínculo, atributo com os códigos em texto).
+BNCC_LINKS = {
+    Course: (CourseBNCC, CourseBNCC.course_id, 'bncc_expected'),
+    Lesson: (LessonBNCC, LessonBNCC.lesson_id, 'bncc_codes'),
+    Assessment: (AssessmentBNCC, AssessmentBNCC.assessment_id, 'bncc_codes'),
+}
+
+
+def _link_rows(owner_column, owner_id: int, codes: str | None) -> list[dict]:
+    # Mesma normalização de BNCCService.parse_codes (os modelos não dependem da camada de serviços).
+    normalized = dict.fromkeys(c.strip().upper() for c in (codes or '').split(',') if c.strip())
+    return [{owner_column.key: owner_id, "code": code} for code in normalized]
+
+
+# Os vínculos são derivados das colunas de texto, que continuam sendo a fonte da verdade
+# exibida na interface. Após cada flush, os donos criados, alterados ou removidos nesta
+# sessão têm seus vínculos reescritos na mesma transação, seja qual for o serviço (ou
+# teste) que fez a escrita. Exclusões em massa (Query.delete) não passam por aqui e
+# precisam apagar os vínculos explicitamente (ver delete_bncc_links).
+@event.listens_for(Session, 'after_flush')
+def _sync_bncc_links(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        link = BNCC_LINKS.get(type(obj))
+        if link is None:
+            continue
+        link_model, owner_column, attr = link
+        state = inspect(obj)
+        if obj in session.dirty and not state.attrs[attr].history.has_changes():
+            continue
+        owner_id = state.identity[0] if state.identity else state.dict.get('id')
+        if owner_id is None:
+            continue
+        session.execute(delete(link_model).where(owner_column == owner_id))
+        if obj in session.deleted:
+            continue
+        rows = _link_rows(owner_column, owner_id, getattr(obj, attr))
+        if rows:
+            session.execute(insert(link_model), rows)
+
+
+def delete_bncc_links(session, owner_model, owner_ids) -> None:
+    """
+    Remove os vínculos de donos apagados por exclusão em massa, que não disparam o flush.
+
+    :param session: Sessão ativa.
+    :param owner_model: Course, Lesson ou Assessment.
+    :param owner_ids: IDs (lista ou subconsulta) dos donos removidos.
+    """
+    link_model, owner_column, _ = BNCC_LINKS[owner_model]
+    session.execute(delete(link_model).where(owner_column.in_(owner_ids)))
+
+
+def backfill_bncc_links(connection) -> None:
+    """
+    Preenche as tabelas de vínculo a partir das colunas de texto já existentes.
+
+    Idempotente: cada tabela só é preenchida se estiver vazia.
+
+    :param connection: Conexão SQLAlchemy ativa (dentro de uma transação).
+    """
+    for owner_model, (link_model, owner_column, attr) in BNCC_LINKS.items():
+        if connection.execute(select(owner_column).limit(1)).first() is not None:
+            continue
+        codes_column = getattr(owner_model, attr)
+        rows = []
+        for owner_id, codes in connection.execute(
+                select(owner_model.id, codes_column).where(codes_column.isnot(None), codes_column != '')):
+            rows.extend(_link_rows(owner_column, owner_id, codes))
+        if rows:
+            connection.execute(insert(link_model), rows)
@@ -0,0 +1,92 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from sqlalchemy import Column, Integer, String, event, inspect, text
+from app.models.base import Base
+
+# Tabelas cujas escritas incrementam um contador de versão.
+# Caches (relatórios, ferramentas do assistente) usam esses contadores para saber
+# se os dados que leram mudaram, sem precisar comparar o conteúdo.
+VERSIONED_TABLES = (
+    'students',
+    'courses',
+    'classes',
+    'class_subjects',
+    'class_enrollments',
+    'assessments',
+    'grades',
+    'attendance',
+    'lessons',
+    'incidents',
+    'seating_charts',
+    'seat_assignments',
+    'time_slots',
+    'weekly_schedule',
+)
+
+
+class DataVersion(Base):
+    """
+    Contador monotônico de versão por tabela.
+
+    Os valores são mantidos por triggers do SQLite (AFTER INSERT/UPDATE/DELETE), de modo que
+    qualquer escrita — ORM, bulk ou SQL puro — incrementa a versão dentro da mesma transação.
+
+    :ivar table_name: Nome da tabela monitorada.
+    :type table_name: String
+    :ivar version: Número de escritas já confirmadas na tabela.
+    :type version: Integer
+    """
+    __tablename__ = 'data_versions'
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DataVersion(table_name='{self.table_name}', version={self.version})>"
+
+
+def install_version_triggers(connection) -> None:
+    """
+    Cria (de forma idempotente) as linhas iniciais e os triggers de versão.
+
+    Apenas tabelas que já existem no banco recebem triggers, o que permite chamar esta
+    função tanto após o `create_all` quanto a partir das migrações.
+
+    :param connection: Conexão SQLAlchemy ativa (dentro de uma transação).
+    """
+    if connection.dialect.name != 'sqlite':
+        return
+
+    existing = set(inspect(connection).get_table_names())
+    if 'data_versions' not in existing:
+        return
+
+    for table in VERSIONED_TABLES:
+        if table not in existing:
+            continue
+        connection.execute(
+            text("INSERT OR IGNORE INTO data_versions (table_name, version) VALUES (:t, 0)"),
+            {"t": table},
+        )
+        for op in ('INSERT', 'UPDATE', 'DELETE'):
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{op.lower()} "
+                f"AFTER {op} ON {table} BEGIN "
+                f"UPDATE data_versions SET version = version + 1 WHERE table_name = '{table}'; "
+                f"END"
+            ))
+
+
+# O evento em nível de metadados roda depois que todas as tabelas foram criadas,
+# garantindo que os triggers encontrem suas tabelas-alvo.
+@event.listens_for(Base.metadata, 'after_create')
+def _create_version_triggers(target, connection, **kw):
+    install_version_triggers(connection)
@@ -8,24 +8,21 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import logging
+import time
+from dataclasses import dataclass, field
 # Importa a classe base para provedores de LLM e a estrutura de resposta do assistente.
 from app.core.llm.base import LLMProvider, AssistantResponse
-# Importa o provedor específico para a API da OpenAI.
-from app.core.llm.openai_provider import OpenAIProvider
-# Importa o provedor específico para a API da Maritaca.
-from app.core.llm.maritaca_provider import MaritacaProvider
-# Importa o provedor específico para a API do OpenRouter.
-from app.core.llm.open_router_provider import OpenRouterProvider
-# Importa o provedor específico para rodar modelos localmente com Ollama.
-from app.core.llm.ollama_provider import OllamaProvider
-# Importa a função para obter chaves de API de forma segura.
-from app.core.security.credentials import get_api_key
-# Importa a função para carregar configurações salvas.
-from app.core.config import load_setting
+# Importa o gerenciador que mantém o provedor ativo (e seu cliente HTTP) entre as mensagens.
+from app.core.llm.provider_manager import ProviderManager
+# Importa a memória que mantém o histórico dentro de um orçamento de tokens.
+from app.core.llm.conversation_memory import ConversationMemory, context_budget
 # Importa o registro de ferramentas, que gerencia as ferramentas disponíveis para a IA.
 from app.core.tools.tool_registry import ToolRegistry
 # Importa o executor de ferramentas, que executa as chamadas de função da IA.
 from app.core.tools.tool_executor import ToolExecutor
+# Importa o roteador que escolhe as ferramentas relevantes para cada turno.
+from app.core.tools.tool_router import ToolRouter
 
 # --- Importação das Ferramentas (Tools) ---
 # Importa as ferramentas de leitura e escrita do banco de dados.
@@ -33,6 +30,7 @@ from app.tools.database_tools import (
     get_student_grades_by_course, list_courses_for_student,
     list_all_classes, get_class_roster,
     add_new_student, add_new_course, add_new_grade,
+    bulk_add_grades_tool, bulk_register_attendance_tool,
     create_new_class, add_subject_to_class, create_new_assessment,
     add_new_lesson, register_incident,
     update_student_name, enroll_existing_student,
@@ -41,13 +39,69 @@ from app.tools.database_tools import (
 # Importa as ferramentas de busca na internet.
 from app.tools.internet_tools import search_internet
 # Importa as ferramentas de análise de dados.
-from app.tools.analysis_tools import get_student_performance_summary_tool, get_students_at_risk_tool
+from app.tools.analysis_tools import get_student_performance_summary_tool, get_students_at_risk_tool, get_school_bncc_coverage_tool
 # Importa as ferramentas com foco pedagógico.
 from app.tools.pedagogical_tools import suggest_lesson_activities_tool
 # Importa as ferramentas de relatórios e gráficos.
 from app.tools.report_tools import (
     generate_grade_chart_tool, generate_class_distribution_tool,
-    export_class_grades_tool, generate_report_card_tool
+    export_class_grades_tool, generate_report_card_tool,
+    export_class_bundle_tool, export_bncc_coverage_tool
+)
+
+logger = logging.getLogger(__name__)
+
+# Máximo de chamadas ao modelo por mensagem do usuário (cada uma pode trazer uma rodada de ferramentas).
+MAX_AGENT_STEPS = 6
+# Orçamento de tokens (somados entre os passos) e de tempo (segundos) de um turno; ao esgotar,
+# o modelo é chamado sem ferramentas para concluir a resposta. Os tokens são os informados pelo
+# provedor (também no streaming, via stream_options); sem eles, usa-se a estimativa de _count_tokens.
+AGENT_TOKEN_BUDGET = 32000
+AGENT_TIME_BUDGET = 120.0
+
+
+@dataclass
+class AgentStep:
+    """
+    Tempos de um passo do laço do agente.
+
+    :ivar number: Posição do passo no turno (a partir de 1).
+    :ivar llm_seconds: Duração da chamada ao modelo.
+    :ivar tool_seconds: Duração da rodada de ferramentas (0 se não houve).
+    :ivar tool_names: Ferramentas chamadas neste passo.
+    :ivar tokens: Tokens gastos na chamada (informados pelo provedor ou estimados).
+    :ivar first_token_seconds: Tempo até o primeiro trecho de texto (ou até a resposta, sem streaming).
+    """
+    number: int
+    llm_seconds: float = 0.0
+    tool_seconds: float = 0.0
+    tool_names: list = field(default_factory=list)
+    tokens: int = 0
+    first_token_seconds: float | None = None
+
+
+# Prompt de sistema: as instruções e regras fundamentais para a IA.
+SYSTEM_PROMPT = (
+    "Você é um assistente de gestão acadêmica especializado, integrado a um aplicativo de desktop. "
+    "Sua função principal é ajudar os usuários a gerenciar dados de alunos, cursos e notas usando um "
+    "conjunto predefinido de ferramentas. Você deve seguir as seguintes regras estritamente:\n"
+    "1.  **Use Ferramentas Exclusivamente**: Você DEVE usar as ferramentas fornecidas para responder a perguntas e realizar ações. "
+    "Não ofereça realizar ações que não são suportadas pelas ferramentas.\n"
+    "2.  **Sem Geração de Código**: Você NÃO DEVE gerar, escrever ou sugerir qualquer código (ex: Python, SQL). "
+    "Seu papel é usar as ferramentas, não ser um programador.\n"
+    "3.  **Admita Limitações**: Se você não puder atender a uma solicitação com as ferramentas disponíveis, declare claramente que "
+    "não pode fazê-lo e explique a limitação. Não invente ferramentas ou funcionalidades.\n"
+    "4.  **Clareza e Confirmação**: Após executar uma ferramenta que modifica dados (ex: adicionar um aluno), "
+    "sempre confirme o sucesso da ação em uma mensagem clara e amigável, com base na saída da ferramenta. "
+    "Se a ferramenta responder \"você quis dizer\", nada foi gravado: confirme com o usuário qual é o aluno certo "
+    "antes de repetir a ação com o nome completo.\n"
+    "5.  **Planejamento de Aulas**: Se o usuário solicitar a criação de um plano de aula, gere primeiro o conteúdo "
+    "estruturado (Objetivos, Conteúdo, Atividades, Avaliação) no chat. Após a aprovação do usuário, "
+    "use a ferramenta `add_new_lesson` para salvar esse conteúdo na disciplina e turma apropriadas.\n"
+    "6.  **Agrupe Chamadas**: Quando precisar de várias ferramentas independentes (ex: consultar várias turmas), "
+    "chame todas na mesma resposta. Use os resultados para decidir as próximas chamadas até concluir o pedido. "
+    "Para lançar notas ou frequência de vários alunos, use `bulk_add_grades_tool` ou `bulk_register_attendance_tool` "
+    "uma única vez com a tabela completa, em vez de uma chamada por aluno."
 )
 
 # Define a classe AssistantService, que orquestra toda a lógica do assistente de IA.
@@ -67,15 +121,22 @@ class AssistantService:
     :ivar provider: Instância atual do provedor de LLM, que pode ser configurada como `None`
         caso nenhum provedor ativo esteja devidamente configurado.
     :type provider: LLMProvider | None
+    :ivar provider_manager: Mantém o provedor ativo entre as mensagens e o recria apenas quando
+        as configurações do provedor mudam.
+    :type provider_manager: ProviderManager
     :ivar messages: Lista de mensagens que contém o histórico da interação, incluindo mensagens do
-        sistema, do usuário e do assistente.
+        sistema, do usuário e do assistente. É compactada antes de cada chamada ao modelo.
     :type messages: list
+    :ivar memory: Compacta o histórico para o orçamento de tokens do provedor/modelo ativo.
+    :type memory: ConversationMemory
     :ivar tool_registry: Registro que armazena todas as ferramentas disponíveis que podem ser usadas
         pelo assistente.
     :type tool_registry: ToolRegistry
     :ivar tool_executor: Executor responsável por realizar chamadas das ferramentas cadastradas no
         registro.
     :type tool_executor: ToolExecutor
+    :ivar tool_router: Escolhe o subconjunto de ferramentas enviado ao modelo em cada turno.
+    :type tool_router: ToolRouter
     """
     # O método construtor, chamado ao criar uma nova instância do serviço.
     def __init__(self):
@@ -83,6 +144,16 @@ class AssistantService:
         self.provider: LLMProvider | None = None
         # Inicializa a lista de mensagens, que manterá o histórico da conversa.
         self.messages: list = []
+        # Mantém o provedor e seu cliente HTTP vivos entre as mensagens.
+        self.provider_manager = ProviderManager()
+        # Mantém o histórico dentro do orçamento de tokens do provedor/modelo.
+        self.memory = ConversationMemory()
+        # Limites do laço do agente em cada turno do usuário.
+        self.max_steps = MAX_AGENT_STEPS
+        self.token_budget = AGENT_TOKEN_BUDGET
+        self.time_budget = AGENT_TIME_BUDGET
+        # Passos (tempos e tokens) do último turno.
+        self.last_steps: list[AgentStep] = []
 
         # Cria uma instância do registro de ferramentas.
         self.tool_registry = ToolRegistry()
@@ -90,6 +161,8 @@ class AssistantService:
         self._register_tools()
         # Cria uma instância do executor de ferramentas, passando o registro como dependência.
         self.tool_executor = ToolExecutor(self.tool_registry)
+        # Cria o roteador que envia ao modelo apenas as ferramentas relevantes para o turno.
+        self.tool_router = ToolRouter(self.tool_registry)
 
         # Chama o método para inicializar o provedor de LLM com base nas configurações salvas.
         self._initialize_provider()
@@ -104,6 +177,7 @@ class AssistantService:
         # Ferramentas de análise
         self.tool_registry.register(get_student_performance_summary_tool)
         self.tool_registry.register(get_students_at_risk_tool)
+        self.tool_registry.register(get_school_bncc_coverage_tool)
         # Ferramentas pedagógicas
         self.tool_registry.register(suggest_lesson_activities_tool)
         # Ferramentas de relatórios
@@ -111,12 +185,16 @@ class AssistantService:
         self.tool_registry.register(generate_class_distribution_tool)
         self.tool_registry.register(export_class_grades_tool)
         self.tool_registry.register(generate_report_card_tool)
+        self.tool_registry.register(export_class_bundle_tool)
+        self.tool_registry.register(export_bncc_coverage_tool)
         # Ferramentas de internet
         self.tool_registry.register(search_internet)
         # Ferramentas de escrita e outros
         self.tool_registry.register(add_new_student)
         self.tool_registry.register(add_new_course)
         self.tool_registry.register(add_new_grade)
+        self.tool_registry.register(bulk_add_grades_tool)
+        self.tool_registry.register(bulk_register_attendance_tool)
         self.tool_registry.register(create_new_class)
         self.tool_registry.register(add_subject_to_class)
         self.tool_registry.register(create_new_assessment)
@@ -127,71 +205,35 @@ class AssistantService:
         self.tool_registry.register(enroll_existing_student)
         self.tool_registry.register(list_all_courses)
 
-    # Método privado para inicializar o provedor de LLM ativo.
+    # Método privado para obter o provedor de LLM ativo.
     def _initialize_provider(self):
-        """Inicializa o provedor de LLM ativo e o modelo com base nas configurações salvas."""
-        # Carrega o nome do provedor ativo salvo nas configurações, com "OpenAI" como padrão.
-        active_provider_name = load_setting("active_provider", "OpenAI")
-        # Define a chave para buscar o modelo específico do provedor (ex: "openai_model").
-        model_config_key = f"{active_provider_name.lower()}_model"
-
-        # Se o provedor ativo for "Ollama".
-        if active_provider_name == "Ollama":
-            # Carrega a URL do Ollama e o modelo selecionado.
-            ollama_url = load_setting("ollama_url", "http://localhost:11434/v1")
-            selected_model = load_setting(model_config_key, "llama3.1")
-            # Cria a instância do provedor Ollama.
-            self.provider = OllamaProvider(base_url=ollama_url, model=selected_model)
-        # Para outros provedores que usam chave de API.
-        else:
-            # Obtém a chave de API para o provedor ativo.
-            api_key = get_api_key(active_provider_name)
-            # Se a chave não existir, o provedor não pode ser inicializado.
-            if not api_key:
-                self.provider = None; return
-
-            # Se for "OpenAI".
-            if active_provider_name == "OpenAI":
-                selected_model = load_setting(model_config_key, "gpt-4")
-                self.provider = OpenAIProvider(api_key=api_key, model=selected_model)
-            # Se for "Maritaca".
-            elif active_provider_name == "Maritaca":
-                selected_model = load_setting(model_config_key, "sabia-3")
-                self.provider = MaritacaProvider(api_key=api_key, model=selected_model)
-            # Se for "OpenRouter".
-            elif active_provider_name == "OpenRouter":
-                selected_model = load_setting(model_config_key, "mistralai/mistral-7b-instruct:free")
-                self.provider = OpenRouterProvider(api_key=api_key, model=selected_model)
-            # Se nenhum provedor conhecido for encontrado.
-            else:
-                self.provider = None
-
-        # Se um provedor foi inicializado com sucesso.
-        if self.provider:
-            # Define o "prompt de sistema", que são as instruções e regras fundamentais para a IA.
-            system_prompt = (
-                "Você é um assistente de gestão acadêmica especializado, integrado a um aplicativo de desktop. "
-                "Sua função principal é ajudar os usuários a gerenciar dados de alunos, cursos e notas usando um "
-                "conjunto predefinido de ferramentas. Você deve seguir as seguintes regras estritamente:\n"
-                "1.  **Use Ferramentas Exclusivamente**: Você DEVE usar as ferramentas fornecidas para responder a perguntas e realizar ações. "
-                "Não ofereça realizar ações que não são suportadas pelas ferramentas.\n"
-                "2.  **Sem Geração de Código**: Você NÃO DEVE gerar, escrever ou sugerir qualquer código (ex: Python, SQL). "
-                "Seu papel é usar as ferramentas, não ser um programador.\n"
-                "3.  **Admita Limitações**: Se você não puder atender a uma solicitação com as ferramentas disponíveis, declare claramente que "
-                "não pode fazê-lo e explique a limitação. Não invente ferramentas ou funcionalidades.\n"
-                "4.  **Clareza e Confirmação**: Após executar uma ferramenta que modifica dados (ex: adicionar um aluno), "
-                "sempre confirme o sucesso da ação em uma mensagem clara e amigável, com base na saída da ferramenta.\n"
-                "5.  **Planejamento de Aulas**: Se o usuário solicitar a criação de um plano de aula, gere primeiro o conteúdo "
-                "estruturado (Objetivos, Conteúdo, Atividades, Avaliação) no chat. Após a aprovação do usuário, "
-                "use a ferramenta `add_new_lesson` para salvar esse conteúdo na disciplina e turma apropriadas."
-            )
-            # Inicia o histórico de mensagens com o prompt de sistema.
-            self.messages = [{"role": "system", "content": system_prompt}]
+        """
+        Obtém o provedor de LLM ativo a partir das configurações salvas.
+
+        O ProviderManager só relê as configurações quando elas mudam e só recria o provedor
+        (e seu cliente HTTP) quando o provedor, o modelo, a URL ou a chave mudam. O histórico
+        da conversa é mantido mesmo quando o provedor é trocado.
+        """
+        self.provider = self.provider_manager.get_provider()
+        # Se um provedor está disponível e a conversa ainda não começou, inicia o histórico com o prompt de sistema.
+        if self.provider and not self.messages:
+            self.messages = [{"role": "system", "content": SYSTEM_PROMPT}]
 
     # Método assíncrono para obter uma resposta do assistente.
-    async def get_response(self, user_input: str) -> AssistantResponse:
-        # Garante que o provedor esteja atualizado com as últimas configurações.
+    async def get_response(self, user_input: str, max_steps: int = None, on_delta=None) -> AssistantResponse:
+        """
+        Responde a uma mensagem do usuário, executando quantas rodadas de ferramentas forem necessárias.
+
+        :param user_input: Mensagem do usuário.
+        :param max_steps: Máximo de chamadas ao modelo neste turno (padrão: self.max_steps).
+        :param on_delta: Se informado, as respostas do modelo são transmitidas (streaming) e esta
+            função recebe cada trecho de texto assim que ele chega.
+        :return: A resposta final do modelo. Os tempos de cada passo ficam em self.last_steps.
+        """
+        # Garante que o provedor esteja atualizado com as últimas configurações (sem recriá-lo se nada mudou).
         self._initialize_provider()
+        # Fecha os clientes de provedores substituídos por uma mudança de configuração.
+        await self.provider_manager.close_retired()
         # Se nenhum provedor estiver configurado, retorna uma mensagem de erro.
         if not self.provider:
             return AssistantResponse(content="Provedor de IA não configurado...")
@@ -199,60 +241,108 @@ class AssistantService:
         # Adiciona a mensagem do usuário ao histórico da conversa.
         self.messages.append({"role": "user", "content": user_input})
 
-        # Passo 1: Obter a resposta inicial do modelo.
-        # Envia os esquemas das ferramentas se o provedor suportar (OpenAI, OpenRouter, Ollama).
-        tool_schemas = self.tool_registry.get_all_schemas() if self.provider.name in ["OpenAI", "OpenRouter", "Ollama"] else None
-        response = await self.provider.get_chat_response(self.messages, tools=tool_schemas)
-
-        # Passo 2: Verificar se o modelo quer chamar uma ferramenta.
-        if not response.tool_calls:
-            # Se não houver chamadas de ferramenta, temos nossa resposta final.
-            if response.content:
-                # Adiciona a resposta do assistente ao histórico.
-                self.messages.append({"role": "assistant", "content": response.content})
-            return response
+        # Envia os esquemas das ferramentas se o provedor suportar (OpenAI, OpenRouter, Ollama): apenas as
+        # relevantes para a conversa, escolhidas uma vez por turno e mantidas em todos os passos.
+        tool_schemas = self.tool_router.select(self.messages) if self.provider.name in ["OpenAI", "OpenRouter", "Ollama"] else None
+        max_steps = max(1, max_steps or self.max_steps)
+        self.last_steps = []
+        started = time.perf_counter()
+        tokens_used = 0
+
+        # Laço do agente: cada passo é uma chamada ao modelo, seguida (se ele pedir) de uma rodada de
+        # ferramentas executadas em paralelo. Termina quando o modelo responde com texto. No último
+        # passo, ou com o orçamento de tokens/tempo esgotado, o modelo é chamado sem ferramentas para
+        # que responda com o que já obteve.
+        for number in range(1, max_steps + 1):
+            elapsed = time.perf_counter() - started
+            final_step = (number == max_steps or tokens_used >= self.token_budget
+                          or elapsed >= self.time_budget)
+            step = AgentStep(number)
+            # Resume resultados antigos de ferramentas e, se preciso, os turnos mais antigos, antes de enviar.
+            self.messages = self.memory.compact(
+                self.messages, context_budget(self.provider.name, getattr(self.provider, "model", "")))
+
+            step_start = time.perf_counter()
+            response = await self._call_model(None if final_step else tool_schemas, step, on_delta)
+            step.llm_seconds = time.perf_counter() - step_start
+            step.tokens = self._count_tokens(response)
+            tokens_used += step.tokens
+            self.last_steps.append(step)
+
+            # Sem chamadas de ferramenta (ou sem mais orçamento para executá-las): esta é a resposta final.
+            if not response.tool_calls or final_step:
+                if response.content:
+                    # Adiciona a resposta do assistente ao histórico.
+                    self.messages.append({"role": "assistant", "content": response.content})
+                break
+
+            # Garante que a lista de chamadas de ferramenta seja sempre uma lista.
+            tool_calls_list = response.tool_calls if isinstance(response.tool_calls, list) else [response.tool_calls]
+
+            # Executa as ferramentas em paralelo, fora do loop de eventos (as síncronas em um pool de threads),
+            # com tempo limite por chamada. Os resultados voltam na mesma ordem das chamadas.
+            tools_start = time.perf_counter()
+            tool_results = await self.tool_executor.execute_tool_calls(tool_calls_list)
+            step.tool_seconds = time.perf_counter() - tools_start
+            step.tool_names = [tc["function"]["name"] for tc in tool_calls_list]
+            # A intenção de chamada e seus resultados entram juntos no histórico, só depois da rodada:
+            # se o turno for cancelado no meio dela, o histórico não fica com tool_calls sem resposta
+            # (as APIs compatíveis com OpenAI recusariam todas as mensagens seguintes da conversa).
+            self.messages.append({"role": "assistant", "tool_calls": tool_calls_list})
+            self.messages.extend(tool_results)
 
-        # Passo 3: Executar a ferramenta e obter o resultado.
-        # Garante que a lista de chamadas de ferramenta seja sempre uma lista.
-        tool_calls_list = response.tool_calls if isinstance(response.tool_calls, list) else [response.tool_calls]
-        # Adiciona a intenção de chamada de ferramenta ao histórico.
-        self.messages.append({"role": "assistant", "tool_calls": tool_calls_list})
-
-        # Lista para armazenar os resultados das ferramentas.
-        tool_results = []
-        # Itera sobre cada chamada de ferramenta solicitada pelo modelo.
-        for tool_call in tool_calls_list:
-            # Executa a ferramenta e armazena o resultado.
-            result = self.tool_executor.execute_tool_call(tool_call)
-            tool_results.append(result)
-
-        # Passo 4: Adicionar os resultados das ferramentas ao histórico e obter a resposta final em linguagem natural.
-        self.messages.extend(tool_results)
-
-        # Envia a conversa atualizada (com os resultados) para o modelo.
-        final_response = await self.provider.get_chat_response(self.messages, tools=tool_schemas)
-        # Se houver conteúdo na resposta final, adiciona ao histórico.
-        if final_response.content:
-            self.messages.append({"role": "assistant", "content": final_response.content})
+        for step in self.last_steps:
+            first_token = f"{step.first_token_seconds * 1000:.0f} ms" if step.first_token_seconds is not None else "-"
+            logger.info("Assistant step %d: first token %s, LLM %.0f ms, tools %.0f ms %s, ~%d tokens",
+                        step.number, first_token, step.llm_seconds * 1000, step.tool_seconds * 1000,
+                        step.tool_names, step.tokens)
         # Retorna a resposta final para a interface do usuário.
-        return final_response
+        return response
+
+    async def _call_model(self, tools: list | None, step: "AgentStep", on_delta=None) -> AssistantResponse:
+        """
+        Uma chamada ao modelo. Com `on_delta`, a resposta é transmitida e cada trecho de texto é
+        repassado assim que chega; o tempo até o primeiro trecho fica em step.first_token_seconds.
+        """
+        start = time.perf_counter()
+        if on_delta is None:
+            response = await self.provider.get_chat_response(self.messages, tools=tools)
+            step.first_token_seconds = time.perf_counter() - start
+            return response
+
+        response = None
+        async for delta in self.provider.stream_chat_response(self.messages, tools=tools):
+            if delta.content:
+                if step.first_token_seconds is None:
+                    step.first_token_seconds = time.perf_counter() - start
+                on_delta(delta.content)
+            if delta.response is not None:
+                response = delta.response
+        return response or AssistantResponse(content="")
+
+    def _count_tokens(self, response: AssistantResponse) -> int:
+        """Tokens gastos em uma chamada: os informados pelo provedor ou, na falta deles, uma estimativa (~4 caracteres por token)."""
+        if response.usage and response.usage.get("total_tokens"):
+            return response.usage["total_tokens"]
+        chars = sum(len(str(m.get("content") or m.get("tool_calls") or "")) for m in self.messages)
+        return (chars + len(response.content or "")) // 4
 
     # Método assíncrono para fechar a conexão do provedor de LLM.
     async def close(self):
         """Fecha os recursos do provedor de LLM subjacente."""
-        # Se um provedor estiver ativo.
-        if self.provider:
-            # Chama o método 'close' do provedor para liberar conexões de rede.
-            await self.provider.close()
+        # Fecha o provedor ativo e os substituídos, liberando as conexões de rede.
+        await self.provider_manager.close()
+        self.provider = None
+        # Libera as threads usadas para executar ferramentas.
+        self.tool_executor.shutdown()
 
     async def generate_lesson_content(self, topic: str, course_name: str, class_name: str) -> str:
         """
         Gera uma sugestão de plano de aula baseada no tópico, disciplina e turma.
         """
+        self._initialize_provider()
         if not self.provider:
-            self._initialize_provider()
-            if not self.provider:
-                return "Erro: Provedor de IA não configurado."
+            return "Erro: Provedor de IA não configurado."
 
         system_prompt = (
             "Você é um especialista pedagógico. Sua tarefa é criar um plano de aula detalhado e estruturado. "
@@ -8,49 +8,412 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import hashlib
 import json
+import logging
 import os
+import pickle
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from typing import Iterable
+from app.core.config import CONFIG_DIR
+from app.utils.text_search import InvertedIndex, tokenize
+
+# Faixas de relevância da busca (menor = mais relevante).
+RANK_CODE_EXACT = 0
+RANK_CODE_PREFIX = 1
+RANK_CODE_SUBSTRING = 2
+RANK_TITLE = 3
+RANK_DESCRIPTION = 4
+
+# Etapas de ensino, na ordem em que aparecem nos resultados, e o arquivo de origem de cada uma.
+STAGES = ("infantil", "fundamental", "medio")
+STAGE_FILES = {
+    "infantil": "bncc_infantil.json",
+    "fundamental": "bncc_fundamental.json",
+    "medio": "bncc_medio.json",
+}
+STAGE_LABELS = {
+    "infantil": "Educação Infantil",
+    "fundamental": "Ensino Fundamental",
+    "medio": "Ensino Médio",
+}
+# Os códigos da BNCC começam pela sigla da etapa (EI01EO01, EF01LP01, EM13LP01).
+CODE_PREFIX_STAGES = {"EI": "infantil", "EF": "fundamental", "EM": "medio"}
+
+# Incrementar sempre que a normalização ou a estrutura do índice mudar, invalidando os caches.
+CACHE_FORMAT_VERSION = 4
+
+
+class BNCCSkill(Mapping):
+    """
+    Lightweight read-only view of one skill: just a reference to its stage and position.
+    Behaves like the dict returned before ({'code', 'description', 'title'}), so callers can
+    keep using item['code']; use `to_dict()` when a real dict is needed (e.g. JSON).
+    """
+    __slots__ = ("_stage", "_doc_id")
+    _KEYS = ("code", "description", "title")
+
+    def __init__(self, stage: "BNCCStage", doc_id: int):
+        self._stage = stage
+        self._doc_id = doc_id
+
+    @property
+    def code(self) -> str:
+        return self._stage.codes[self._doc_id]
+
+    @property
+    def description(self) -> str:
+        return self._stage.descriptions[self._doc_id]
+
+    @property
+    def title(self) -> str:
+        return self._stage.titles[self._stage.group_ids[self._doc_id]]
+
+    @property
+    def range(self) -> str:
+        return self._stage.ranges[self._stage.range_ids[self._doc_id]]
+
+    @property
+    def stage(self) -> str:
+        return self._stage.name
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self._KEYS}
+
+    def __repr__(self) -> str:
+        return f"BNCCSkill({self.to_dict()!r})"
+
+
+class BNCCStage:
+    """
+    Dados normalizados e estruturas de busca de uma etapa de ensino.
+    É o que vai para o cache compilado: montar o índice custa bem mais do que ler o JSON.
+
+    Para ocupar pouca memória (o app fica aberto o dia todo), as habilidades ficam em listas
+    paralelas: cada título e cada faixa de anos distintos são guardados uma única vez e as
+    habilidades apontam para eles por inteiros (`group_ids`, `range_ids`). As buscas devolvem
+    `BNCCSkill`, que são só referências para essas listas.
+    """
+    __slots__ = ("name", "titles", "ranges", "group_ids", "range_ids", "codes", "descriptions",
+                 "index", "code_blob", "code_offsets", "by_code")
+
+    def __init__(self, name: str, groups: list[dict]):
+        self.name = name
+        self.titles = [] # Por grupo
+        self.ranges = [] # Faixas de anos distintas
+        self.group_ids = array("H")
+        self.range_ids = array("H")
+        self.codes = []
+        self.descriptions = []
+        self.index = InvertedIndex(("title", "description"))
+        self.by_code = {} # Código normalizado -> posição
+
+        range_positions = {}
+        for group in groups:
+            items = group.get('itens', [])
+            if not items:
+                continue
+            group_id = len(self.titles)
+            group_title = sys.intern(group.get('title', ''))
+            self.titles.append(group_title)
+            # O título se repete em todas as habilidades do grupo: tokeniza uma vez só.
+            title_words = tokenize(group_title)
+            for item in items:
+                doc_id = len(self.codes)
+                code = sys.intern(item.get('code', ''))
+                description = item.get('description', '')
+                self.group_ids.append(group_id)
+                item_range = item.get('range', '')
+                if item_range not in range_positions:
+                    range_positions[item_range] = len(self.ranges)
+                    self.ranges.append(item_range)
+                self.range_ids.append(range_positions[item_range])
+                self.codes.append(code)
+                self.descriptions.append(description)
+                self.index.add_words(doc_id, "title", title_words)
+                self.index.add_words(doc_id, "description", tokenize(description))
+
+                code_upper = code.strip().upper()
+                # Em caso de código repetido, vale a primeira ocorrência (como na busca linear antiga).
+                if code_upper:
+                    self.by_code.setdefault(code_upper, doc_id)
+
+        self.index.freeze()
+        # Todos os códigos em uma única string, um por linha: a busca por substring vira str.find
+        # (em C) e code_offsets diz em que código cada posição cai.
+        self.code_offsets = array("I")
+        lines = []
+        position = 0
+        for code in self.codes:
+            self.code_offsets.append(position)
+            line = code.strip().upper()
+            lines.append(line)
+            position += len(line) + 1
+        self.code_blob = "\n".join(lines)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def skill(self, doc_id: int) -> BNCCSkill:
+        return BNCCSkill(self, doc_id)
+
+    def groups(self) -> list[dict]:
+        """Rebuilds the nested {'title', 'itens': [{'code', 'description', 'range'}]} structure (not kept in memory)."""
+        groups = [{"title": title, "itens": []} for title in self.titles]
+        for doc_id, group_id in enumerate(self.group_ids):
+            groups[group_id]["itens"].append({
+                "code": self.codes[doc_id],
+                "description": self.descriptions[doc_id],
+                "range": self.ranges[self.range_ids[doc_id]],
+            })
+        return groups
+
+    def code_matches(self, code_query: str) -> dict[int, int]:
+        """Skills whose code contains the (normalized) query, mapped to their rank."""
+        ranks = {}
+        position = self.code_blob.find(code_query)
+        while position != -1:
+            doc_id = bisect_right(self.code_offsets, position) - 1
+            offset = position - self.code_offsets[doc_id]
+            if offset == 0:
+                rank = RANK_CODE_EXACT if len(self.codes[doc_id].strip()) == len(code_query) else RANK_CODE_PREFIX
+            elif len(code_query) >= 2:
+                # Uma única letra no meio do código casaria com quase tudo.
+                rank = RANK_CODE_SUBSTRING
+            else:
+                rank = None
+            if rank is not None:
+                ranks[doc_id] = min(rank, ranks.get(doc_id, rank))
+            position = self.code_blob.find(code_query, position + 1)
+        return ranks
+
+    def rank(self, query: str, fuzzy: bool = False) -> dict[int, int]:
+        """Every matching skill of this stage, mapped to its rank."""
+        code_query = "".join(query.split()).upper()
+        ranks = self.code_matches(code_query) if code_query.isalnum() else {}
+
+        token_matches = self.index.search(query, fuzzy=fuzzy)
+        if token_matches is None:
+            # Só palavras vazias ('de', 'a'...): não há filtro por texto.
+            token_matches = {doc_id: [] for doc_id in range(len(self))}
+        title_bit = self.index.field_bit("title")
+        for doc_id, masks in token_matches.items():
+            if doc_id in ranks:
+                continue
+            ranks[doc_id] = RANK_TITLE if masks and all(mask & title_bit for mask in masks) else RANK_DESCRIPTION
+        return ranks
+
+
+class BNCCResults(Sequence):
+    """
+    Lazy, ranked result set of a skill search. Only two compact arrays (stage and position
+    of each match) are kept; BNCCSkill views are created for the items actually read, so a
+    search with thousands of matches can be paged through without materializing them.
+    Compares equal to any sequence holding the same skills.
+    """
+    __slots__ = ("_stages", "_stage_ids", "_doc_ids")
+
+    def __init__(self, stages: list[BNCCStage], stage_ids: array, doc_ids: array):
+        self._stages = stages
+        self._stage_ids = stage_ids
+        self._doc_ids = doc_ids
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._stages[self._stage_ids[index]].skill(self._doc_ids[index])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"<BNCCResults({len(self)} skills)>"
+
+    def page(self, number: int, size: int) -> list[BNCCSkill]:
+        """
+        Returns one page of results.
+
+        :param number: Page number, starting at 0.
+        :param size: Results per page.
+        """
+        start = number * size
+        return self[start:start + size]
+
 
 class BNCCService:
-    _data = None
+    # Diretório do cache compilado (um arquivo por etapa). Fica fora de app/data porque,
+    # no executável, a pasta de dados pode ser somente leitura.
+    CACHE_DIR = CONFIG_DIR / "cache" / "bncc"
+
+    _stages: dict[str, BNCCStage] = {}
+    _lock = threading.Lock()
+
+    # --- Carga ---
+
+    @staticmethod
+    def _source_path(stage: str) -> str:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(base_path, 'data', STAGE_FILES[stage])
 
     @classmethod
-    def load_data(cls):
-        if cls._data is None:
-            cls._data = []
-            base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def _cache_path(cls, stage: str) -> str:
+        return os.path.join(cls.CACHE_DIR, f"{stage}.pickle")
 
-            # Load Infantil
-            try:
-                path = os.path.join(base_path, 'data', 'bncc_infantil.json')
-                with open(path, 'r', encoding='utf-8') as f:
-                    cls._data.extend(json.load(f))
-            except Exception as e:
-                print(f"Error loading Infantil BNCC: {e}")
+    @classmethod
+    def load_stage(cls, stage: str) -> BNCCStage:
+        """
+        Returns one educational stage, loading it on first use.
 
-            # Load Fundamental
-            try:
-                path = os.path.join(base_path, 'data', 'bncc_fundamental.json')
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    cls._process_fundamental(data)
-            except Exception as e:
-                print(f"Error loading Fundamental BNCC: {e}")
-
-            # Load Medio
+        The normalized data and its search index come from the compiled cache when the
+        cache was built from the current JSON file (same SHA-256); otherwise the JSON is
+        parsed, indexed and the cache is rewritten.
+
+        :param stage: One of STAGES.
+        :return: The loaded stage (empty if its source file could not be read).
+        """
+        if stage not in STAGE_FILES:
+            raise ValueError(f"Unknown BNCC stage: {stage}")
+        loaded = cls._stages.get(stage)
+        if loaded is not None:
+            return loaded
+
+        with cls._lock:
+            loaded = cls._stages.get(stage)
+            if loaded is None:
+                loaded = cls._load_stage_uncached(stage)
+                cls._stages[stage] = loaded
+            return loaded
+
+    @classmethod
+    def _load_stage_uncached(cls, stage: str) -> BNCCStage:
+        try:
+            with open(cls._source_path(stage), 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"Error loading {STAGE_LABELS[stage]} BNCC: {e}")
+            return BNCCStage(stage, [])
+
+        source_hash = hashlib.sha256(raw).hexdigest()
+        cached = cls._read_cache(stage, source_hash)
+        if cached is not None:
+            return cached
+
+        try:
+            data = json.loads(raw.decode('utf-8'))
+            if stage == "infantil":
+                groups = data
+            elif stage == "fundamental":
+                groups = cls._process_fundamental(data)
+            else:
+                groups = cls._process_medio(data)
+        except Exception as e:
+            print(f"Error loading {STAGE_LABELS[stage]} BNCC: {e}")
+            return BNCCStage(stage, [])
+
+        loaded = BNCCStage(stage, groups)
+        cls._write_cache(stage, source_hash, loaded)
+        return loaded
+
+    @classmethod
+    def _read_cache(cls, stage: str, source_hash: str) -> BNCCStage | None:
+        try:
+            with open(cls._cache_path(stage), 'rb') as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logging.warning("Discarding unreadable BNCC cache for stage %s", stage, exc_info=True)
+            return None
+        if (not isinstance(payload, dict) or payload.get("format") != CACHE_FORMAT_VERSION
+                or payload.get("source_sha256") != source_hash):
+            return None
+        return payload["stage"]
+
+    @classmethod
+    def _write_cache(cls, stage: str, source_hash: str, loaded: BNCCStage):
+        """Writes the compiled stage atomically. Failing to cache is not an error."""
+        path = cls._cache_path(stage)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(cls.CACHE_DIR, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({"format": CACHE_FORMAT_VERSION, "source_sha256": source_hash, "stage": loaded},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            logging.warning("Could not write BNCC cache for stage %s", stage, exc_info=True)
             try:
-                path = os.path.join(base_path, 'data', 'bncc_medio.json')
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    cls._process_medio(data)
-            except Exception as e:
-                print(f"Error loading Medio BNCC: {e}")
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
-        return cls._data
+    @classmethod
+    def compile_cache(cls) -> list[str]:
+        """
+        Builds (or refreshes) the compiled cache of every stage, e.g. at install/build time.
+
+        :return: Paths of the cache files.
+        """
+        for stage in STAGES:
+            cls.load_stage(stage)
+        return [cls._cache_path(stage) for stage in STAGES]
 
     @classmethod
-    def _process_fundamental(cls, data):
+    def clear_loaded(cls):
+        """Forgets the stages loaded in memory (the compiled cache on disk is kept)."""
+        with cls._lock:
+            cls._stages = {}
+
+    @classmethod
+    def load_data(cls, stages: Iterable[str] = None) -> list[dict]:
+        """
+        Returns the normalized groups ({'title', 'itens'}) of the given stages (all by default).
+        The nested structure is rebuilt on each call; prefer search_skills/get_skills_by_codes.
+        """
+        data = []
+        for stage in cls._resolve_stages(stages):
+            data.extend(cls.load_stage(stage).groups())
+        return data
+
+    @staticmethod
+    def _resolve_stages(stages: Iterable[str] | str | None) -> tuple[str, ...]:
+        if stages is None:
+            return STAGES
+        if isinstance(stages, str):
+            stages = (stages,)
+        return tuple(stage for stage in STAGES if stage in set(stages))
+
+    @staticmethod
+    def stage_for_code(code: str) -> str | None:
+        """Educational stage of a BNCC code, from its prefix (EI/EF/EM), or None."""
+        return CODE_PREFIX_STAGES.get(code.strip().upper()[:2])
+
+    @classmethod
+    def _process_fundamental(cls, data) -> list[dict]:
         """Normalize Fundamental data into the standard list structure."""
+        groups = []
         # Fundamental JSON structure: { discipline_key: { "ano": [ { "nome_ano": [...], "unidades_tematicas": [...] } ] } }
         for discipline_key, content in data.items():
             discipline_name = discipline_key.replace('_', ' ').title()
@@ -84,14 +447,16 @@ class BNCCService:
                             })
 
                     if items:
-                        cls._data.append({
+                        groups.append({
                             "title": title,
                             "itens": items
                         })
+        return groups
 
     @classmethod
-    def _process_medio(cls, data):
+    def _process_medio(cls, data) -> list[dict]:
         """Normalize Medio data into the standard list structure."""
+        groups = []
         # Medio JSON structure: { discipline_key: { "ano": [ { "nome_ano": [...], "codigo_habilidade": [...] } ] } }
         for discipline_key, content in data.items():
             discipline_name = content.get('nome_disciplina', discipline_key.replace('_', ' ').title())
@@ -112,46 +477,96 @@ class BNCCService:
                     })
 
                 if items:
-                    cls._data.append({
+                    groups.append({
                         "title": f"{discipline_name} ({anos})",
                         "itens": items
                     })
+        return groups
+
+    # --- Busca ---
 
     @classmethod
-    def search_skills(cls, query: str = "") -> list[dict]:
+    def search_skills(cls, query: str = "", limit: int = None, stages: Iterable[str] = None, fuzzy: bool = True) -> BNCCResults:
         """
-        Searches for BNCC skills.
-        Returns a list of dicts: {'code': str, 'description': str, 'title': str}
+        Searches for BNCC skills using the token index built at load time.
+
+        Matching is accent-insensitive and stemmed (Portuguese), every query word must match
+        the title or the description, and the last word may be incomplete (prefix search).
+        Codes also match by substring. Results are ranked: exact code, code prefix, code
+        substring, title match, description match; ties keep the BNCC file order.
+
+        :param query: Text typed by the user. An empty query lists every skill.
+        :param limit: Maximum number of results (None for all).
+        :param stages: Educational stages to search (see STAGES); only these are loaded. Default: all.
+        :param fuzzy: When nothing matches, query words that match nothing are replaced by the closest
+                      indexed words (trigram similarity), so misspellings such as 'matematca' still find results.
+        :return: Lazy sequence (see BNCCResults) of read-only views that behave like
+                 {'code': str, 'description': str, 'title': str}; use `page()` or slices to read a window.
         """
-        data = cls.load_data()
-        results = []
-        query = query.lower().strip()
-
-        for group in data:
-            group_title = group.get('title', '')
-            for item in group.get('itens', []):
-                code = item.get('code', '')
-                description = item.get('description', '')
+        loaded = [cls.load_stage(stage) for stage in cls._resolve_stages(stages)]
 
-                # Search in code, description, and group title (for context)
-                if not query or (query in code.lower() or query in description.lower() or query in group_title.lower()):
-                    results.append({
-                        "code": code,
-                        "description": description,
-                        "title": group_title
-                    })
-        return results
+        if not query.strip():
+            stage_ids, doc_ids = array("B"), array("I")
+            for stage_pos, stage in enumerate(loaded):
+                stage_ids.extend([stage_pos] * len(stage))
+                doc_ids.extend(range(len(stage)))
+        else:
+            ranked = []
+            for stage_pos, stage in enumerate(loaded):
+                ranked.extend((rank, stage_pos, doc_id) for doc_id, rank in stage.rank(query).items())
+            if not ranked and fuzzy:
+                # A busca aproximada só entra quando a exata não achou nada em nenhuma etapa; do
+                # contrário, uma palavra ausente de uma etapa traria ruído dessa etapa.
+                for stage_pos, stage in enumerate(loaded):
+                    ranked.extend((rank, stage_pos, doc_id) for doc_id, rank in stage.rank(query, fuzzy=True).items())
+            ranked.sort()
+            stage_ids = array("B", [stage_pos for _, stage_pos, _ in ranked])
+            doc_ids = array("I", [doc_id for _, _, doc_id in ranked])
+
+        if limit is not None:
+            stage_ids, doc_ids = stage_ids[:limit], doc_ids[:limit]
+        return BNCCResults(loaded, stage_ids, doc_ids)
+
+    @staticmethod
+    def parse_codes(codes: str | Iterable[str] | None) -> list[str]:
+        """
+        Normalizes BNCC codes given as a comma-separated string (as stored in lessons,
+        assessments and courses) or as an iterable. Codes are stripped, upper-cased and
+        deduplicated, keeping their first-seen order.
+        """
+        if not codes:
+            return []
+        if isinstance(codes, str):
+            codes = codes.split(',')
+        return list(dict.fromkeys(c.strip().upper() for c in codes if c and c.strip()))
 
     @classmethod
-    def get_skill_by_code(cls, code: str) -> dict | None:
-        data = cls.load_data()
-        code_clean = code.strip().upper()
-        for group in data:
-            for item in group.get('itens', []):
-                if item.get('code', '').strip().upper() == code_clean:
-                    return {
-                        "code": item['code'],
-                        "description": item['description'],
-                        "title": group.get('title', '')
-                    }
+    def _find_code(cls, code: str) -> BNCCSkill | None:
+        """Looks a normalized code up in its own stage only (or in every stage if the prefix is unknown)."""
+        stage = cls.stage_for_code(code)
+        for name in ((stage,) if stage else STAGES):
+            loaded = cls.load_stage(name)
+            doc_id = loaded.by_code.get(code)
+            if doc_id is not None:
+                return loaded.skill(doc_id)
         return None
+
+    @classmethod
+    def get_skill_by_code(cls, code: str) -> BNCCSkill | None:
+        return cls._find_code(code.strip().upper())
+
+    @classmethod
+    def get_skills_by_codes(cls, codes: str | Iterable[str]) -> dict[str, BNCCSkill]:
+        """
+        Resolves many codes at once with hash lookups.
+
+        :param codes: Comma-separated string or iterable of codes.
+        :return: Normalized code -> skill view ({'code', 'description', 'title'}), in input order.
+                 Unknown codes are left out.
+        """
+        result = {}
+        for code in cls.parse_codes(codes):
+            skill = cls._find_code(code)
+            if skill is not None:
+                result[code] = skill
+        return result
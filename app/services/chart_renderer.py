@@ -0,0 +1,175 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import hashlib
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import plotext as plt
+from app.utils.artifact_store import ArtifactStore
+from app.utils.charts import (
+    CHARTS_DIR, CHARTS_MAX_BYTES, CHARTS_MAX_AGE_SECONDS,
+    draw_grade_distribution, draw_approval_pie
+)
+
+
+def _render_grade_distribution(data, options, path):
+    draw_grade_distribution(data, options.get('course_name', '')).savefig(path)
+
+
+def _render_approval_pie(data, options, path):
+    draw_approval_pie(data['approved'], data['failed']).savefig(path, transparent=True)
+
+
+def _render_plotext(draw):
+    """
+    Adapts a plotext drawing function. plotext only offers a global figure, so these renders
+    are safe solely because the renderer runs every job on its single dedicated thread.
+    """
+    def render(data, options, path):
+        plt.clear_figure()
+        if options.get('theme'):
+            plt.theme(options['theme'])
+        draw(data, options)
+        if options.get('title'):
+            plt.title(options['title'])
+        if options.get('xlabel'):
+            plt.xlabel(options['xlabel'])
+        if options.get('ylabel'):
+            plt.ylabel(options['ylabel'])
+        text = plt.build()
+        if not options.get('keep_colors'):
+            text = plt.uncolorize(text)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return render
+
+
+def _draw_text_histogram(data, options):
+    plt.hist(data, bins=options.get('bins', 10))
+
+
+def _draw_text_bar(data, options):
+    plt.bar(data['labels'], data['values'], orientation=options.get('orientation', 'vertical'), width=options.get('width', 0.5))
+    if options.get('ylim'):
+        plt.ylim(*options['ylim'])
+
+
+def _draw_text_simple_bar(data, options):
+    plt.simple_bar(data['labels'], data['values'], width=options.get('width', 60))
+
+
+# Tipo de gráfico -> (extensão do arquivo, função que desenha e salva em 'path').
+CHART_KINDS = {
+    "grade_distribution": (".png", _render_grade_distribution),
+    "approval_pie": (".png", _render_approval_pie),
+    "text_histogram": (".txt", _render_plotext(_draw_text_histogram)),
+    "text_bar": (".txt", _render_plotext(_draw_text_bar)),
+    "text_simple_bar": (".txt", _render_plotext(_draw_text_simple_bar)),
+}
+
+
+class ChartRenderer:
+    """
+    Renders charts on one dedicated worker thread, caching the output by content hash.
+
+    - The cache key is a hash of the chart kind, its input data and its options, so an
+      unchanged chart is served from the artifact store without touching the worker.
+    - matplotlib charts are drawn on their own Figure objects (no pyplot global state).
+    - plotext has a single global figure; confining every render to the worker thread
+      keeps concurrent callers (report jobs, TUI, dashboard) from corrupting each other.
+
+    `submit` never blocks: cache hits return an already-completed Future.
+    """
+
+    def __init__(self, store: ArtifactStore = None):
+        self.store = store or ArtifactStore.for_directory(
+            CHARTS_DIR, max_bytes=CHARTS_MAX_BYTES, max_age_seconds=CHARTS_MAX_AGE_SECONDS
+        )
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-renderer")
+        # RLock: add_done_callback roda o callback na hora se o Future já terminou.
+        self._lock = threading.RLock()
+        # Renderizações em andamento por chave: pedidos idênticos compartilham o mesmo Future.
+        self._pending: dict[str, Future] = {}
+
+    @staticmethod
+    def cache_key(kind: str, data, options: dict) -> str:
+        payload = json.dumps({"kind": kind, "data": data, "options": options}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_cached(self, kind: str, data, **options) -> str | None:
+        """Returns the cached output path for this chart, or None."""
+        return self.store.get(self.cache_key(kind, data, options))
+
+    def submit(self, kind: str, data, **options) -> Future:
+        """
+        Schedules a chart render and returns a Future with the output path.
+
+        :param kind: One of CHART_KINDS.
+        :param data: JSON-serializable input data.
+        :param options: Chart options (title, labels, ...); part of the cache key.
+        :return: Future resolving to the file path (PNG or text).
+        """
+        if kind not in CHART_KINDS:
+            raise ValueError(f"Unknown chart kind: {kind}")
+        key = self.cache_key(kind, data, options)
+
+        cached = self.store.get(key)
+        if cached:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._render, key, kind, data, options)
+                self._pending[key] = future
+                future.add_done_callback(lambda _f, k=key: self._forget(k))
+            return future
+
+    def render(self, kind: str, data, timeout: float = None, **options) -> str:
+        """Blocking variant of submit, for callers already off the UI thread."""
+        return self.submit(kind, data, **options).result(timeout)
+
+    def render_text(self, kind: str, data, timeout: float = None, **options) -> str:
+        """Renders a plotext chart and returns its text instead of the path."""
+        with open(self.render(kind, data, timeout, **options), encoding='utf-8') as f:
+            return f.read()
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _render(self, key: str, kind: str, data, options: dict) -> str:
+        # Outro pedido pode ter concluído a mesma chave enquanto este esperava na fila.
+        cached = self.store.get(key)
+        if cached:
+            return cached
+        suffix, render = CHART_KINDS[kind]
+        path = self.store.new_path(kind, suffix)
+        render(data, options, path)
+        return self.store.put(key, path, kind=kind)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_renderer: ChartRenderer | None = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    """Returns the process-wide renderer (one worker thread for the whole app)."""
+    global _default_renderer
+    with _default_renderer_lock:
+        if _default_renderer is None:
+            _default_renderer = ChartRenderer()
+        return _default_renderer
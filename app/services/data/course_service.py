@@ -1,4 +1,4 @@
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import joinedload
 from app.models.course import Course
 from app.models.class_ import Class
@@ -8,6 +8,7 @@ from app.models.grade import Grade
 from app.models.lesson import Lesson
 from app.models.incident import Incident
 from app.models.class_enrollment import ClassEnrollment
+from app.models.bncc_link import delete_bncc_links
 from .base_service import BaseDataService
 
 class CourseService(BaseDataService):
@@ -217,6 +218,10 @@ class CourseService(BaseDataService):
                  if assessment_ids:
                      db.query(Grade).filter(Grade.assessment_id.in_(assessment_ids)).delete(synchronize_session=False)
 
+                 lesson_ids = select(Lesson.id).where(Lesson.class_subject_id.in_(subject_ids))
+                 delete_bncc_links(db, Assessment, assessment_ids)
+                 delete_bncc_links(db, Lesson, lesson_ids)
+
                  db.query(Assessment).filter(Assessment.class_subject_id.in_(subject_ids)).delete(synchronize_session=False)
                  db.query(Lesson).filter(Lesson.class_subject_id.in_(subject_ids)).delete(synchronize_session=False)
                  db.query(ClassSubject).filter(ClassSubject.class_id == class_id).delete(synchronize_session=False)
@@ -1,4 +1,5 @@
-from sqlalchemy import func
+from itertools import groupby
+from sqlalchemy import func, and_
 from sqlalchemy.orm import joinedload
 from app.models.student import Student
 from app.models.course import Course
@@ -89,6 +90,75 @@ class DashboardService(BaseDataService):
                 "grades_map": grades_map
             }
 
+    def iter_gradebook_rows(self, class_id: int = None, course_id: int = None, batch_size: int = 500):
+        """
+        Yields one gradebook row per (class, student, subject) without materializing the school.
+        Scope: a single class (class_id), one course across classes (course_id) or the whole school.
+        Grades are read through a server-side cursor (yield_per), grouped per student as they arrive.
+        """
+        with self._get_db() as db:
+            classes_query = db.query(Class.id, Class.name).order_by(Class.name)
+            if class_id is not None:
+                classes_query = classes_query.filter(Class.id == class_id)
+            if course_id is not None:
+                classes_query = classes_query.filter(
+                    db.query(ClassSubject.id).filter(
+                        ClassSubject.class_id == Class.id,
+                        ClassSubject.course_id == course_id
+                    ).exists()
+                )
+            # A lista de turmas é pequena (id, nome); materializá-la evita cursores aninhados abertos.
+            classes = classes_query.all()
+
+            for cls in classes:
+                subjects_query = (db.query(ClassSubject.id, Course.course_name)
+                                  .join(Course, ClassSubject.course_id == Course.id)
+                                  .filter(ClassSubject.class_id == cls.id)
+                                  .order_by(Course.course_name))
+                if course_id is not None:
+                    subjects_query = subjects_query.filter(ClassSubject.course_id == course_id)
+                subjects = subjects_query.all()
+                if not subjects:
+                    continue
+
+                subject_ids = [s.id for s in subjects]
+                assessments_by_subject = {s.id: [] for s in subjects}
+                for a in db.query(Assessment.id, Assessment.weight, Assessment.class_subject_id).filter(Assessment.class_subject_id.in_(subject_ids)):
+                    assessments_by_subject[a.class_subject_id].append({"id": a.id, "weight": a.weight})
+                total_weights = {sid: sum(a['weight'] for a in assessments) for sid, assessments in assessments_by_subject.items()}
+                assessment_ids = [a['id'] for assessments in assessments_by_subject.values() for a in assessments]
+
+                rows = (db.query(ClassEnrollment.student_id, ClassEnrollment.call_number,
+                                 Student.first_name, Student.last_name,
+                                 Grade.assessment_id, Grade.score)
+                        .join(Student, ClassEnrollment.student_id == Student.id)
+                        .outerjoin(Grade, and_(Grade.student_id == ClassEnrollment.student_id,
+                                               Grade.assessment_id.in_(assessment_ids)))
+                        .filter(ClassEnrollment.class_id == cls.id)
+                        .order_by(ClassEnrollment.call_number, ClassEnrollment.student_id)
+                        .yield_per(batch_size))
+
+                for student_id, student_rows in groupby(rows, key=lambda r: r.student_id):
+                    first = None
+                    student_grades = {}
+                    for r in student_rows:
+                        if first is None:
+                            first = r
+                        if r.assessment_id is not None:
+                            student_grades[r.assessment_id] = r.score
+
+                    for s in subjects:
+                        assessments = assessments_by_subject[s.id]
+                        avg = GradeService.calculate_weighted_average(student_id, student_grades, assessments, total_weight=total_weights[s.id])
+                        yield {
+                            "class_name": cls.name,
+                            "call_number": first.call_number,
+                            "student_id": student_id,
+                            "student_name": f"{first.first_name} {first.last_name}",
+                            "course_name": s.course_name,
+                            "average": avg
+                        }
+
     def get_course_averages(self, course_id: int) -> list[float]:
         averages = []
         with self._get_db() as db:
@@ -1,12 +1,25 @@
 from datetime import date
-from sqlalchemy.orm import joinedload
+from sqlalchemy import and_, select
 from app.models.lesson import Lesson
 from app.models.attendance import Attendance
 from app.models.class_subject import ClassSubject
 from app.models.assessment import Assessment
+from app.models.class_ import Class
+from app.models.course import Course
+from app.models.bncc_link import CourseBNCC, LessonBNCC, AssessmentBNCC
+from .version_service import VersionService
+from app.services.bncc_service import BNCCService
 from .base_service import BaseDataService
 
+# Tabelas cujas escritas alteram a matriz de cobertura da BNCC (os vínculos acompanham seus donos).
+_SCHOOL_COVERAGE_TABLES = ("classes", "class_subjects", "courses", "lessons", "assessments")
+
 class LessonService(BaseDataService):
+    def __init__(self, db_session=None):
+        super().__init__(db_session)
+        # (versões dos dados, matriz) da última chamada a get_school_bncc_coverage.
+        self._school_coverage_cache: tuple[tuple, dict] | None = None
+
     def create_lesson(self, class_subject_id: int, title: str, content: str, lesson_date: date, bncc_codes: str = None) -> dict | None:
         if not all([class_subject_id, title, lesson_date]): return None
         new_lesson = Lesson(class_subject_id=class_subject_id, title=title, content=content, date=lesson_date, bncc_codes=bncc_codes)
@@ -157,30 +170,28 @@ class LessonService(BaseDataService):
 
     def get_bncc_coverage(self, class_subject_id: int) -> dict:
         with self._get_db() as db:
-            subject = db.query(ClassSubject).options(joinedload(ClassSubject.course)).filter(ClassSubject.id == class_subject_id).first()
-            if not subject:
+            course_id = db.query(ClassSubject.course_id).filter(ClassSubject.id == class_subject_id).scalar()
+            if course_id is None:
                 return {}
 
-            expected_raw = subject.course.bncc_expected or ""
-            expected_set = {code.strip().upper() for code in expected_raw.split(',') if code.strip()}
-
-            lessons = db.query(Lesson).filter(Lesson.class_subject_id == class_subject_id).all()
-            covered_lessons_set = set()
-            for l in lessons:
-                if l.bncc_codes:
-                    codes = {code.strip().upper() for code in l.bncc_codes.split(',') if code.strip()}
-                    covered_lessons_set.update(codes)
-
-            assessments = db.query(Assessment).filter(Assessment.class_subject_id == class_subject_id).all()
-            covered_assessments_set = set()
-            for a in assessments:
-                if a.bncc_codes:
-                    codes = {code.strip().upper() for code in a.bncc_codes.split(',') if code.strip()}
-                    covered_assessments_set.update(codes)
+            # Consultas indexadas sobre as tabelas de vínculo, em vez de ler e dividir o texto de cada aula/avaliação.
+            expected_set = {row.code for row in db.query(CourseBNCC.code).filter(CourseBNCC.course_id == course_id)}
+            lesson_codes = (db.query(LessonBNCC.code)
+                            .join(Lesson, Lesson.id == LessonBNCC.lesson_id)
+                            .filter(Lesson.class_subject_id == class_subject_id))
+            assessment_codes = (db.query(AssessmentBNCC.code)
+                                .join(Assessment, Assessment.id == AssessmentBNCC.assessment_id)
+                                .filter(Assessment.class_subject_id == class_subject_id))
+            covered_lessons_set = {row.code for row in lesson_codes.distinct()}
+            covered_assessments_set = {row.code for row in assessment_codes.distinct()}
+            missing = {row.code for row in db.query(CourseBNCC.code).filter(
+                CourseBNCC.course_id == course_id,
+                CourseBNCC.code.notin_(lesson_codes.union(assessment_codes))
+            )}
 
             total_covered = covered_lessons_set.union(covered_assessments_set)
-            missing = expected_set - total_covered
-            relevant_covered = total_covered.intersection(expected_set)
+            relevant_covered = expected_set - missing
+            skills = BNCCService.get_skills_by_codes(expected_set | total_covered)
 
             return {
                 "expected": sorted(list(expected_set)),
@@ -188,5 +199,136 @@ class LessonService(BaseDataService):
                 "covered_assessments": sorted(list(covered_assessments_set)),
                 "total_covered": sorted(list(total_covered)),
                 "missing": sorted(list(missing)),
-                "coverage_percentage": (len(relevant_covered) / len(expected_set) * 100) if expected_set else 0.0
+                "coverage_percentage": (len(relevant_covered) / len(expected_set) * 100) if expected_set else 0.0,
+                "descriptions": {code: skill['description'] for code, skill in skills.items()}
+            }
+
+    def get_bncc_code_usage(self, code: str, class_id: int = None) -> dict:
+        """
+        Finds where a BNCC skill was planned, taught and assessed.
+
+        :param code: BNCC code (case-insensitive).
+        :param class_id: Optionally restricts lessons and assessments to one class.
+        :return: Dict with the normalized code, its description, the courses that expect it and
+                 the lessons/assessments (with class and course) that cover it, lessons by date.
+        """
+        codes = BNCCService.parse_codes(code)
+        if not codes:
+            return {}
+        code = codes[0]
+
+        with self._get_db() as db:
+            courses = (db.query(Course.id, Course.course_name)
+                       .join(CourseBNCC, CourseBNCC.course_id == Course.id)
+                       .filter(CourseBNCC.code == code)
+                       .order_by(Course.course_name)
+                       .all())
+
+            lessons_query = (db.query(Lesson.id, Lesson.title, Lesson.date, ClassSubject.id.label('class_subject_id'),
+                                      Class.id.label('class_id'), Class.name.label('class_name'), Course.course_name)
+                             .join(LessonBNCC, LessonBNCC.lesson_id == Lesson.id)
+                             .join(ClassSubject, ClassSubject.id == Lesson.class_subject_id)
+                             .join(Class, Class.id == ClassSubject.class_id)
+                             .join(Course, Course.id == ClassSubject.course_id)
+                             .filter(LessonBNCC.code == code))
+            assessments_query = (db.query(Assessment.id, Assessment.name, Assessment.grading_period, ClassSubject.id.label('class_subject_id'),
+                                          Class.id.label('class_id'), Class.name.label('class_name'), Course.course_name)
+                                 .join(AssessmentBNCC, AssessmentBNCC.assessment_id == Assessment.id)
+                                 .join(ClassSubject, ClassSubject.id == Assessment.class_subject_id)
+                                 .join(Class, Class.id == ClassSubject.class_id)
+                                 .join(Course, Course.id == ClassSubject.course_id)
+                                 .filter(AssessmentBNCC.code == code))
+            if class_id is not None:
+                lessons_query = lessons_query.filter(Class.id == class_id)
+                assessments_query = assessments_query.filter(Class.id == class_id)
+
+            lessons = lessons_query.order_by(Lesson.date, Lesson.id).all()
+            assessments = assessments_query.order_by(Class.name, Assessment.grading_period, Assessment.name).all()
+
+            skill = BNCCService.get_skill_by_code(code)
+            return {
+                "code": code,
+                "description": skill['description'] if skill else None,
+                "courses": [{"id": c.id, "course_name": c.course_name} for c in courses],
+                "lessons": [{"id": l.id, "title": l.title, "date": l.date.isoformat(), "class_subject_id": l.class_subject_id,
+                             "class_id": l.class_id, "class_name": l.class_name, "course_name": l.course_name} for l in lessons],
+                "assessments": [{"id": a.id, "name": a.name, "grading_period": a.grading_period, "class_subject_id": a.class_subject_id,
+                                 "class_id": a.class_id, "class_name": a.class_name, "course_name": a.course_name} for a in assessments]
+            }
+
+    def get_school_bncc_coverage(self) -> dict:
+        """
+        Builds the school-wide BNCC coverage matrix: every class x course x expected skill,
+        flagged as covered by lessons and/or assessments. It is computed in a single query
+        over the link tables and cached until one of the underlying tables changes.
+
+        :return: Dict with "rows" (one per class subject and expected code, ordered by class,
+                 course and code), "subjects" (per class subject totals, missing codes and
+                 percentage) and "descriptions" (code -> skill description).
+                 The result is shared between calls and must not be modified.
+        """
+        with self._get_db() as db:
+            versions = tuple(VersionService(db).get_data_versions(_SCHOOL_COVERAGE_TABLES).items())
+            cached = self._school_coverage_cache
+            if cached and cached[0] == versions:
+                return cached[1]
+
+            lesson_codes = (select(Lesson.class_subject_id, LessonBNCC.code)
+                            .join(LessonBNCC, LessonBNCC.lesson_id == Lesson.id)
+                            .distinct().subquery())
+            assessment_codes = (select(Assessment.class_subject_id, AssessmentBNCC.code)
+                                .join(AssessmentBNCC, AssessmentBNCC.assessment_id == Assessment.id)
+                                .distinct().subquery())
+            # Disciplinas sem habilidades esperadas aparecem com code NULL (outer join), para constarem do resumo.
+            results = (db.query(Class.id.label('class_id'), Class.name.label('class_name'),
+                                ClassSubject.id.label('class_subject_id'), Course.id.label('course_id'),
+                                Course.course_name, CourseBNCC.code,
+                                lesson_codes.c.code.isnot(None).label('in_lessons'),
+                                assessment_codes.c.code.isnot(None).label('in_assessments'))
+                       .select_from(ClassSubject)
+                       .join(Class, Class.id == ClassSubject.class_id)
+                       .join(Course, Course.id == ClassSubject.course_id)
+                       .outerjoin(CourseBNCC, CourseBNCC.course_id == ClassSubject.course_id)
+                       .outerjoin(lesson_codes, and_(lesson_codes.c.class_subject_id == ClassSubject.id,
+                                                     lesson_codes.c.code == CourseBNCC.code))
+                       .outerjoin(assessment_codes, and_(assessment_codes.c.class_subject_id == ClassSubject.id,
+                                                         assessment_codes.c.code == CourseBNCC.code))
+                       .order_by(Class.name, Course.course_name, CourseBNCC.code)
+                       .all())
+
+            rows = []
+            subjects = {}
+            for r in results:
+                subject = subjects.get(r.class_subject_id)
+                if subject is None:
+                    subject = subjects[r.class_subject_id] = {
+                        "class_id": r.class_id, "class_name": r.class_name, "class_subject_id": r.class_subject_id,
+                        "course_id": r.course_id, "course_name": r.course_name,
+                        "expected": 0, "covered": 0, "missing": [], "coverage_percentage": 0.0
+                    }
+                if r.code is None:
+                    continue
+                covered = bool(r.in_lessons or r.in_assessments)
+                rows.append({
+                    "class_id": r.class_id, "class_name": r.class_name, "class_subject_id": r.class_subject_id,
+                    "course_id": r.course_id, "course_name": r.course_name, "code": r.code,
+                    "in_lessons": bool(r.in_lessons), "in_assessments": bool(r.in_assessments), "covered": covered
+                })
+                subject["expected"] += 1
+                if covered:
+                    subject["covered"] += 1
+                else:
+                    subject["missing"].append(r.code)
+
+            for subject in subjects.values():
+                if subject["expected"]:
+                    subject["coverage_percentage"] = subject["covered"] / subject["expected"] * 100
+
+            skills = BNCCService.get_skills_by_codes(row["code"] for row in rows)
+            matrix = {
+                "rows": rows,
+                "subjects": list(subjects.values()),
+                "descriptions": {code: skill['description'] for code, skill in skills.items()}
             }
+            self._school_coverage_cache = (versions, matrix)
+            return matrix
@@ -0,0 +1,131 @@
+import threading
+from dataclasses import dataclass, field
+from sqlalchemy.orm import Session
+from app.models.student import Student
+from app.models.course import Course
+from app.models.class_ import Class
+from app.models.class_subject import ClassSubject
+from app.models.assessment import Assessment
+from app.utils.text_search import fold_accents
+from .base_service import BaseDataService
+from .version_service import VersionService
+
+# Tabelas cujos nomes o diretório indexa; uma escrita em qualquer uma delas o reconstrói.
+NAME_DIRECTORY_TABLES = ("classes", "class_subjects", "courses", "assessments", "students")
+
+
+def name_key(name: str) -> str:
+    """Case-insensitive key used by the directory (same rule as the `lower(...) ==` lookups)."""
+    return " ".join((name or "").split()).lower()
+
+
+@dataclass
+class NameDirectory:
+    """
+    Snapshot of every class, class subject, assessment and student name, mapped to its row.
+    Lookups are dict accesses; the returned dicts are copies, in the same shape as the
+    corresponding DataService getters (get_class_by_name, get_subjects_for_class,
+    get_assessments_for_subject and get_student_by_name). The add_* methods fill it in;
+    a later row with the same name replaces the earlier one.
+
+    Student names also match without accents ("joao pereira" finds "João Pereira"), as long
+    as only one student has that folded name; typos never match (see resolve_student_name).
+    """
+    versions: dict = field(default_factory=dict)
+    classes: dict = field(default_factory=dict)
+    subjects: dict = field(default_factory=dict)
+    assessments: dict = field(default_factory=dict)
+    students: dict = field(default_factory=dict)
+    folded_students: dict = field(default_factory=dict)
+
+    def add_class(self, row: dict):
+        self.classes[name_key(row["name"])] = row
+
+    def add_subject(self, class_id: int, row: dict):
+        self.subjects[(class_id, name_key(row["course_name"]))] = row
+
+    def add_assessment(self, class_subject_id: int, row: dict):
+        self.assessments[(class_subject_id, name_key(row["name"]))] = row
+
+    def add_student(self, row: dict):
+        key = name_key(f"{row['first_name']} {row['last_name']}")
+        self.students[key] = row
+        same_folded = self.folded_students.setdefault(fold_accents(key), {})
+        same_folded[key] = row
+
+    def class_(self, name: str) -> dict | None:
+        found = self.classes.get(name_key(name))
+        return dict(found) if found else None
+
+    def subject(self, class_id: int, course_name: str) -> dict | None:
+        found = self.subjects.get((class_id, name_key(course_name)))
+        return dict(found) if found else None
+
+    def assessment(self, class_subject_id: int, name: str) -> dict | None:
+        found = self.assessments.get((class_subject_id, name_key(name)))
+        return dict(found) if found else None
+
+    def student(self, name: str) -> dict | None:
+        key = name_key(name)
+        found = self.students.get(key)
+        if not found:
+            # Sem acento só vale se não houver dois alunos com o mesmo nome sem acentos.
+            same_folded = self.folded_students.get(fold_accents(key), {})
+            found = next(iter(same_folded.values())) if len(same_folded) == 1 else None
+        return dict(found) if found else None
+
+
+class NameService(BaseDataService):
+    def __init__(self, db_session: Session = None):
+        super().__init__(db_session)
+        self._directory: NameDirectory | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_directory(db, versions: dict) -> NameDirectory:
+        directory = NameDirectory(versions=versions)
+        # Em nomes repetidos, vale o menor id (o mesmo que `.first()` devolve na prática).
+        for row in db.query(Class.id, Class.name).order_by(Class.id.desc()):
+            directory.add_class({"id": row.id, "name": row.name})
+
+        subjects = (db.query(ClassSubject.id, ClassSubject.class_id, Course.id.label('course_id'),
+                             Course.course_name, Course.course_code)
+                    .join(Course, ClassSubject.course_id == Course.id)
+                    .order_by(ClassSubject.id.desc()))
+        for row in subjects:
+            directory.add_subject(row.class_id, {
+                "id": row.id, "course_id": row.course_id,
+                "course_name": row.course_name, "course_code": row.course_code
+            })
+
+        assessments = db.query(Assessment.id, Assessment.class_subject_id, Assessment.name,
+                               Assessment.weight, Assessment.grading_period).order_by(Assessment.id.desc())
+        for row in assessments:
+            directory.add_assessment(row.class_subject_id, {
+                "id": row.id, "name": row.name, "weight": row.weight, "grading_period": row.grading_period
+            })
+
+        students = db.query(Student.id, Student.first_name, Student.last_name,
+                            Student.birth_date).order_by(Student.id.desc())
+        for row in students:
+            directory.add_student({
+                "id": row.id, "first_name": row.first_name, "last_name": row.last_name,
+                "birth_date": row.birth_date.isoformat() if row.birth_date else None
+            })
+        return directory
+
+    def get_name_directory(self) -> NameDirectory:
+        """
+        Returns the name directory, rebuilt only when one of NAME_DIRECTORY_TABLES was written.
+        Checking it costs a single version query, so callers should fetch it once per operation
+        and then resolve every name they need from it.
+        """
+        with self._get_db() as db:
+            versions = VersionService(db).get_data_versions(NAME_DIRECTORY_TABLES)
+            directory = self._directory
+            if directory is not None and directory.versions == versions:
+                return directory
+            with self._lock:
+                if self._directory is None or self._directory.versions != versions:
+                    self._directory = self._build_directory(db, versions)
+                return self._directory
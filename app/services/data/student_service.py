@@ -7,9 +7,21 @@ from app.models.grade import Grade
 from app.models.class_enrollment import ClassEnrollment
 from app.models.class_ import Class
 from app.utils.student_csv_parser import parse_student_csv
+from app.utils.text_search import TrigramIndex
 from .base_service import BaseDataService
+from .version_service import VersionService
+
+# Um nome aproximado só é aceito sem confirmação se for parecido o bastante com o digitado
+# e claramente melhor que o segundo colocado (evita lançar nota para o aluno errado).
+NAME_MATCH_MIN_SIMILARITY = 0.5
+NAME_MATCH_MIN_MARGIN = 0.1
 
 class StudentService(BaseDataService):
+    def __init__(self, db_session: Session = None):
+        super().__init__(db_session)
+        # (versão da tabela students, índice de trigramas dos nomes, alunos na ordem do índice).
+        self._name_index_cache: tuple[int, TrigramIndex, list] | None = None
+
     def import_students_from_csv(self, class_id: int, file_content: str) -> dict:
         errors = []
         imported_count = 0
@@ -165,6 +177,58 @@ class StudentService(BaseDataService):
                 }
             return None
 
+    def _get_name_index(self, db) -> tuple[TrigramIndex, list]:
+        """Trigram index over full student names, rebuilt only when the students table changes."""
+        version = VersionService(db).get_data_versions(("students",))["students"]
+        cached = self._name_index_cache
+        if cached and cached[0] == version:
+            return cached[1], cached[2]
+
+        students = db.query(Student.id, Student.first_name, Student.last_name).order_by(Student.id).all()
+        index = TrigramIndex()
+        for doc_id, student in enumerate(students):
+            index.add(doc_id, f"{student.first_name} {student.last_name}")
+        index.freeze()
+        self._name_index_cache = (version, index, students)
+        return index, students
+
+    def find_students_by_name(self, name: str, limit: int = 5, min_similarity: float = 0.3) -> list[dict]:
+        """
+        Ranks students by how closely their full name matches a possibly misspelled,
+        partial or unaccented name ("joao da silva" finds "João Silva").
+
+        :param name: Name as typed.
+        :param limit: Maximum number of candidates.
+        :param min_similarity: Minimum trigram similarity (0 to 1).
+        :return: Candidates, best first, each with id, first_name, last_name and score.
+        """
+        with self._get_db() as db:
+            index, students = self._get_name_index(db)
+            return [{
+                "id": students[doc_id].id, "first_name": students[doc_id].first_name,
+                "last_name": students[doc_id].last_name, "score": score
+            } for doc_id, score in index.search(name, limit=limit, min_similarity=min_similarity)]
+
+    def resolve_student_name(self, name: str) -> dict | None:
+        """
+        Finds a student by name, tolerating typos and missing accents. An exact match wins;
+        otherwise the closest name is used only when it is similar enough and clearly ahead of
+        the next candidate, so ambiguous names still resolve to None.
+        Meant for read-only lookups: writes must never act on a guessed student.
+
+        :param name: Name as typed.
+        :return: Same dict as get_student_by_name, or None.
+        """
+        student = self.get_student_by_name(name)
+        if student:
+            return student
+        candidates = self.find_students_by_name(name, limit=2, min_similarity=NAME_MATCH_MIN_SIMILARITY)
+        if not candidates:
+            return None
+        if len(candidates) > 1 and candidates[0]["score"] - candidates[1]["score"] < NAME_MATCH_MIN_MARGIN:
+            return None
+        return self.get_student_by_id(candidates[0]["id"])
+
     def get_student_by_id(self, student_id: int) -> dict | None:
         with self._get_db() as db:
             student = db.query(Student).filter(Student.id == student_id).first()
@@ -0,0 +1,20 @@
+from typing import Iterable
+from app.models.data_version import DataVersion, VERSIONED_TABLES
+from .base_service import BaseDataService
+
+class VersionService(BaseDataService):
+    def get_data_versions(self, tables: Iterable[str] | None = None) -> dict[str, int]:
+        """
+        Returns the current write counter for each requested table.
+        Tables without a counter row (e.g. not yet migrated) report 0, so callers
+        can always build a stable key from the result.
+        """
+        names = sorted(set(tables)) if tables is not None else list(VERSIONED_TABLES)
+        if not names:
+            return {}
+        with self._get_db() as db:
+            rows = db.query(DataVersion.table_name, DataVersion.version).filter(
+                DataVersion.table_name.in_(names)
+            ).all()
+        found = dict(rows)
+        return {name: found.get(name, 0) for name in names}
@@ -18,6 +18,8 @@ from app.services.data.incident_service import IncidentService
 from app.services.data.schedule_service import ScheduleService
 from app.services.data.dashboard_service import DashboardService
 from app.services.data.seating_chart_service import SeatingChartService
+from app.services.data.version_service import VersionService
+from app.services.data.name_service import NameService
 from contextlib import contextmanager
 
 class DataService:
@@ -38,6 +40,8 @@ class DataService:
         self.schedule_service = ScheduleService(db_session)
         self.dashboard_service = DashboardService(db_session)
         self.seating_chart_service = SeatingChartService(db_session)
+        self.version_service = VersionService(db_session)
+        self.name_service = NameService(db_session)
 
     @contextmanager
     def _get_db(self):
@@ -63,6 +67,12 @@ class DataService:
     def get_student_by_name(self, *args, **kwargs):
         return self.student_service.get_student_by_name(*args, **kwargs)
 
+    def find_students_by_name(self, *args, **kwargs):
+        return self.student_service.find_students_by_name(*args, **kwargs)
+
+    def resolve_student_name(self, *args, **kwargs):
+        return self.student_service.resolve_student_name(*args, **kwargs)
+
     def get_student_by_id(self, *args, **kwargs):
         return self.student_service.get_student_by_id(*args, **kwargs)
 
@@ -232,6 +242,12 @@ class DataService:
     def get_bncc_coverage(self, *args, **kwargs):
         return self.lesson_service.get_bncc_coverage(*args, **kwargs)
 
+    def get_bncc_code_usage(self, *args, **kwargs):
+        return self.lesson_service.get_bncc_code_usage(*args, **kwargs)
+
+    def get_school_bncc_coverage(self, *args, **kwargs):
+        return self.lesson_service.get_school_bncc_coverage(*args, **kwargs)
+
     # --- Incident Service Delegations ---
     def create_incident(self, *args, **kwargs):
         return self.incident_service.create_incident(*args, **kwargs)
@@ -271,6 +287,9 @@ class DataService:
     def get_class_report_data(self, *args, **kwargs):
         return self.dashboard_service.get_class_report_data(*args, **kwargs)
 
+    def iter_gradebook_rows(self, *args, **kwargs):
+        return self.dashboard_service.iter_gradebook_rows(*args, **kwargs)
+
     def get_course_averages(self, *args, **kwargs):
         return self.dashboard_service.get_course_averages(*args, **kwargs)
 
@@ -302,6 +321,14 @@ class DataService:
     def delete_seating_chart(self, *args, **kwargs):
         return self.seating_chart_service.delete_seating_chart(*args, **kwargs)
 
+    # --- Version Service Delegations ---
+    def get_data_versions(self, *args, **kwargs):
+        return self.version_service.get_data_versions(*args, **kwargs)
+
+    # --- Name Service Delegations ---
+    def get_name_directory(self, *args, **kwargs):
+        return self.name_service.get_name_directory(*args, **kwargs)
+
     # Legacy private method used by CSV import in StudentService
     # Since StudentService now handles this internally, we might not need to expose it here
     # unless some other part of the system calls it directly.
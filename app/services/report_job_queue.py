@@ -0,0 +1,313 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import itertools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# Estados de um job, na ordem em que normalmente acontecem.
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Tipo de relatório -> nome do método do ReportService que o gera.
+JOB_KINDS = {
+    "report_card": "generate_student_report_card",
+    "student_chart": "generate_student_grade_chart",
+    "distribution": "generate_class_grade_distribution",
+    "class_csv": "export_class_grades_csv",
+    "gradebook_csv": "export_gradebook_csv",
+    "bncc_coverage_csv": "export_bncc_coverage_csv",
+    "seating_chart": "generate_seating_chart_pdf",
+    "seating_chart_svg": "generate_seating_chart_svg",
+    "class_bundle": "export_class_bundle",
+}
+
+
+@dataclass(frozen=True)
+class ReportJobSpec:
+    """
+    Describes a report to generate. Specs are hashable, so two identical specs
+    submitted while the first is still in flight share the same job.
+
+    :ivar kind: One of JOB_KINDS.
+    :ivar params: Keyword arguments for the ReportService method, as sorted (name, value) pairs.
+    """
+    kind: str
+    params: tuple = ()
+
+    @classmethod
+    def create(cls, kind: str, **params) -> "ReportJobSpec":
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown report job kind: {kind}")
+        return cls(kind, tuple(sorted(params.items())))
+
+    @classmethod
+    def report_card(cls, student_id: int, class_id: int) -> "ReportJobSpec":
+        return cls.create("report_card", student_id=student_id, class_id=class_id)
+
+    @classmethod
+    def student_chart(cls, student_id: int, class_id: int) -> "ReportJobSpec":
+        return cls.create("student_chart", student_id=student_id, class_id=class_id)
+
+    @classmethod
+    def distribution(cls, class_id: int) -> "ReportJobSpec":
+        return cls.create("distribution", class_id=class_id)
+
+    @classmethod
+    def class_csv(cls, class_id: int) -> "ReportJobSpec":
+        return cls.create("class_csv", class_id=class_id)
+
+    @classmethod
+    def gradebook_csv(cls, class_id: int = None, course_id: int = None) -> "ReportJobSpec":
+        return cls.create("gradebook_csv", class_id=class_id, course_id=course_id)
+
+    @classmethod
+    def bncc_coverage_csv(cls) -> "ReportJobSpec":
+        return cls.create("bncc_coverage_csv")
+
+    @classmethod
+    def class_bundle(cls, class_id: int) -> "ReportJobSpec":
+        return cls.create("class_bundle", class_id=class_id)
+
+    @classmethod
+    def seating_chart(cls, chart_id: int) -> "ReportJobSpec":
+        return cls.create("seating_chart", chart_id=chart_id)
+
+    @classmethod
+    def seating_chart_svg(cls, chart_id: int) -> "ReportJobSpec":
+        return cls.create("seating_chart_svg", chart_id=chart_id)
+
+
+@dataclass
+class ReportJobEvent:
+    """
+    Progress notification emitted for a job.
+
+    :ivar job_id: ID of the job.
+    :ivar spec: Spec of the job.
+    :ivar status: One of queued/running/done/failed/cancelled.
+    :ivar progress: Fraction between 0.0 and 1.0.
+    :ivar result: Path of the generated file (only when status is 'done').
+    :ivar error: Exception raised by the job (only when status is 'failed').
+    """
+    job_id: int
+    spec: ReportJobSpec
+    status: str
+    progress: float = 0.0
+    result: str | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class ReportJob:
+    """
+    Handle for a submitted job. Use `result()` to block for the file path,
+    or register listeners on the queue to receive events.
+    """
+    id: int
+    spec: ReportJobSpec
+    status: str = QUEUED
+    future: Future = field(default_factory=Future, repr=False)
+    _listeners: list = field(default_factory=list, repr=False)
+    _cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+    _finished: bool = field(default=False, repr=False)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def result(self, timeout: float = None) -> str:
+        """
+        Waits for the job and returns the path of the generated file.
+
+        :raises concurrent.futures.CancelledError: If the job was cancelled.
+        :raises Exception: Whatever the report generator raised.
+        """
+        return self.future.result(timeout)
+
+
+class ReportJobQueue:
+    """
+    Runs report generation on a bounded worker pool instead of the caller's thread.
+
+    - `submit` returns immediately with a ReportJob; identical in-flight specs are deduplicated.
+    - Listeners (per job or global) receive ReportJobEvent objects from the worker thread;
+      UI code must marshal them to its own thread (see `tk_listener`).
+    - While rendering, RUNNING events carry the progress reported by the ReportService.
+    - `cancel` drops queued jobs. A job that is already rendering cannot be interrupted,
+      so its result is discarded and it is reported as cancelled; submitting the same
+      spec again starts a fresh job instead of joining the cancelled one.
+    """
+
+    # Menor avanço de progresso que gera um novo evento (evita um evento por linha de CSV).
+    PROGRESS_STEP = 0.05
+
+    def __init__(self, report_service=None, max_workers: int = 2):
+        if report_service is None:
+            from app.services.report_service import ReportService
+            report_service = ReportService()
+        self.report_service = report_service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: dict[int, ReportJob] = {}
+        self._in_flight: dict[ReportJobSpec, ReportJob] = {}
+        self._global_listeners: list[Callable[[ReportJobEvent], Any]] = []
+
+    # --- Listeners ---
+
+    def subscribe(self, listener: Callable[[ReportJobEvent], Any]):
+        """Registers a listener for events of every job."""
+        with self._lock:
+            self._global_listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ReportJobEvent], Any]):
+        with self._lock:
+            if listener in self._global_listeners:
+                self._global_listeners.remove(listener)
+
+    def _emit(self, job: ReportJob, status: str, progress: float, result: str = None, error: Exception = None):
+        job.status = status
+        event = ReportJobEvent(job.id, job.spec, status, progress, result, error)
+        with self._lock:
+            listeners = list(job._listeners) + list(self._global_listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                # Um listener com defeito não pode derrubar o worker nem os demais listeners.
+                logging.exception("Report job listener failed")
+
+    # --- Jobs ---
+
+    def submit(self, spec: ReportJobSpec, listener: Callable[[ReportJobEvent], Any] = None) -> ReportJob:
+        """
+        Queues a job, or joins an identical job that is still queued or running.
+
+        :param spec: What to generate.
+        :param listener: Optional callback for this job's events.
+        :return: The job handle.
+        """
+        with self._lock:
+            job = self._in_flight.get(spec)
+            if job is not None:
+                if listener:
+                    job._listeners.append(listener)
+                return job
+            job = ReportJob(id=next(self._ids), spec=spec)
+            if listener:
+                job._listeners.append(listener)
+            self._jobs[job.id] = job
+            self._in_flight[spec] = job
+
+        self._emit(job, QUEUED, 0.0)
+        self._executor.submit(self._run, job)
+        return job
+
+    def get_job(self, job_id: int) -> ReportJob | None:
+        """Returns an unfinished job by ID (finished jobs are forgotten)."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Requests cancellation of a job.
+
+        :return: True if the job had not finished yet.
+        """
+        job = self.get_job(job_id)
+        if job is None or job._finished:
+            return False
+        job._cancel_requested.set()
+        with self._lock:
+            # Um novo pedido igual não pode se juntar a um job que vai terminar como cancelado.
+            if self._in_flight.get(job.spec) is job:
+                del self._in_flight[job.spec]
+        if job.status == QUEUED:
+            # Ainda não começou: finaliza imediatamente; o worker vai apenas ignorá-lo.
+            self._finish(job, CANCELLED)
+        return True
+
+    def _finish(self, job: ReportJob, status: str, result: str = None, error: Exception = None) -> bool:
+        with self._lock:
+            if job._finished:
+                return False
+            job._finished = True
+            if self._in_flight.get(job.spec) is job:
+                del self._in_flight[job.spec]
+            self._jobs.pop(job.id, None)
+        # Os listeners recebem o evento final antes de result() liberar quem está esperando.
+        self._emit(job, status, 1.0, result, error)
+        if status == DONE:
+            job.future.set_result(result)
+        elif status == FAILED:
+            job.future.set_exception(error)
+        else:
+            job.future.cancel()
+            job.future.set_running_or_notify_cancel()
+        return True
+
+    def _run(self, job: ReportJob):
+        if job.cancel_requested or job._finished:
+            return
+        self._emit(job, RUNNING, 0.1)
+        method = getattr(self.report_service, JOB_KINDS[job.spec.kind])
+        try:
+            with self.report_service.progress_reporter(self._progress_listener(job)):
+                path = method(**dict(job.spec.params))
+        except Exception as e:
+            self._finish(job, CANCELLED if job.cancel_requested else FAILED, error=e)
+            return
+        self._finish(job, CANCELLED if job.cancel_requested else DONE, result=path)
+
+    def _progress_listener(self, job: ReportJob) -> Callable[[float], None]:
+        """Turns render fractions into RUNNING events, skipping steps too small to show."""
+        last = [0.1]
+
+        def on_progress(fraction: float):
+            # A renderização ocupa a faixa entre o 'running' (0.1) e o evento final (1.0).
+            progress = round(0.1 + 0.85 * fraction, 2)
+            if job.cancel_requested or progress - last[0] < self.PROGRESS_STEP:
+                return
+            last[0] = progress
+            self._emit(job, RUNNING, progress)
+        return on_progress
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def tk_listener(async_queue, callback: Callable[[ReportJobEvent], Any]) -> Callable[[ReportJobEvent], Any]:
+    """
+    Adapts a UI callback to the thread-safe queue polled by the Tk main loop
+    (MainApp.async_queue), the same channel used by run_async_task.
+    """
+    def listener(event: ReportJobEvent):
+        async_queue.put((callback, (event,)))
+    return listener
+
+
+_default_queue: ReportJobQueue | None = None
+_default_queue_lock = threading.Lock()
+
+
+def get_report_job_queue() -> ReportJobQueue:
+    """Returns the process-wide queue shared by the GUI, the TUI and the assistant tools."""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = ReportJobQueue()
+        return _default_queue
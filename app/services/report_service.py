@@ -8,11 +8,54 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import contextlib
 import csv
+import functools
+import hashlib
+import inspect
+import io
+import json
 import os
-from datetime import datetime
-import plotext as plt
+import re
+import threading
+import zipfile
+from datetime import date, datetime
 from app.services.data_service import DataService
+from app.services.chart_renderer import get_chart_renderer
+from app.utils.artifact_store import ArtifactStore
+from app.utils.seating_chart_render import render_seating_chart_svg
+
+# Tabelas lidas por cada tipo de relatório. O cache só é reaproveitado enquanto
+# os contadores de versão dessas tabelas não mudarem.
+_GRADE_TABLES = ("classes", "class_subjects", "courses", "assessments", "grades", "class_enrollments", "students")
+_REPORT_CARD_TABLES = _GRADE_TABLES + ("attendance", "lessons", "incidents")
+_SEATING_TABLES = ("seating_charts", "seat_assignments", "students")
+_BNCC_COVERAGE_TABLES = ("classes", "class_subjects", "courses", "lessons", "assessments")
+
+
+def cached_report(kind: str, tables: tuple, daily: bool = False):
+    """
+    Decorator that makes a ReportService generator content-addressed.
+    The cache key combines the report kind, its arguments and the data versions of
+    the tables it reads; an unchanged key returns the previously generated file.
+
+    :param kind: Report type identifier stored in the index.
+    :param tables: Tables whose data versions invalidate the report.
+    :param daily: Also key on today's date (for reports that print the issue date).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if k != "self"}
+            if daily:
+                params["_date"] = date.today().isoformat()
+            return self._get_or_render(kind, params, tables, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
 
 class ReportService:
     """
@@ -25,6 +68,12 @@ class ReportService:
     def __init__(self):
         self.data_service = DataService()
         self._ensure_reports_dir()
+        # Instância compartilhada por diretório: UI e ferramentas do assistente usam o mesmo índice.
+        self.store = ArtifactStore.for_directory(self.REPORTS_DIR)
+        # Gráficos plotext são desenhados no worker dedicado do ChartRenderer (estado global do plotext).
+        self.chart_renderer = get_chart_renderer()
+        # Callback de progresso por thread: a fila de jobs renderiza dois relatórios ao mesmo tempo.
+        self._progress = threading.local()
 
     def _ensure_reports_dir(self):
         """Ensures the reports directory exists."""
@@ -35,6 +84,64 @@ class ReportService:
         """Returns the full path for a report file."""
         return os.path.join(self.REPORTS_DIR, filename)
 
+    def _new_report_path(self, prefix: str, suffix: str) -> str:
+        """Returns a unique path for a new report, so concurrent renders never collide."""
+        return self.store.new_path(prefix, suffix)
+
+    @contextlib.contextmanager
+    def progress_reporter(self, callback):
+        """
+        Routes the render progress of the current thread to `callback` while the block runs.
+
+        :param callback: Called with the completed fraction of the render (0.0 to 1.0).
+        """
+        previous = getattr(self._progress, "callback", None)
+        self._progress.callback = callback
+        try:
+            yield
+        finally:
+            self._progress.callback = previous
+
+    def _report_progress(self, fraction: float):
+        """Reports how much of the current render is done, if someone is listening on this thread."""
+        callback = getattr(self._progress, "callback", None)
+        if callback:
+            callback(min(max(fraction, 0.0), 1.0))
+
+    def _compute_cache_key(self, kind: str, params: dict, versions: dict) -> str:
+        payload = json.dumps({"kind": kind, "params": params, "versions": versions}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _get_or_render(self, kind: str, params: dict, tables: tuple, render) -> str:
+        """
+        Returns the cached artifact for (kind, params, data versions) or renders and indexes a new one.
+
+        :param kind: Report type identifier.
+        :param params: Arguments that identify the report.
+        :param tables: Tables whose versions are part of the key.
+        :param render: Callable that generates the report and returns its path.
+        :return: Path to the report file.
+        """
+        versions = self.data_service.get_data_versions(tables)
+        key = self._compute_cache_key(kind, params, versions)
+        cached = self.store.get(key)
+        if cached:
+            return cached
+
+        filepath = render()
+        return self.store.put(key, filepath, kind=kind, params=params, versions=versions)
+
+    def list_generated_reports(self, kind: str = None) -> list[dict]:
+        """
+        Lists indexed reports whose files still exist, newest first.
+
+        :param kind: Optional report type filter (e.g. 'report_card').
+        :return: List of index entries including their cache key.
+        """
+        filters = {"kind": kind} if kind is not None else {}
+        return [e for e in self.store.entries(**filters) if "kind" in e]
+
+    @cached_report("seating_chart", _SEATING_TABLES)
     def generate_seating_chart_pdf(self, chart_id: int) -> str:
         """
         Generates a visual representation of the seating chart.
@@ -47,11 +154,12 @@ class ReportService:
         if not chart_details:
             raise ValueError("Seating chart not found.")
 
+        self._report_progress(0.5)
+
         rows = chart_details['rows']
         cols = chart_details['columns']
         assignments = chart_details['assignments']
 
-        import json
         try:
             layout_config = json.loads(chart_details.get('layout_config', '{}'))
         except json.JSONDecodeError:
@@ -104,24 +212,34 @@ class ReportService:
 
         output.append(border_line)
 
-        filename = f"seating_chart_{chart_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        filepath = self._get_file_path(filename)
+        filepath = self._new_report_path(f"seating_chart_{chart_id}", ".txt")
 
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write("\n".join(output))
 
         return filepath
 
+    @cached_report("seating_chart_svg", _SEATING_TABLES)
     def generate_seating_chart_svg(self, chart_id: int) -> str:
         """
-        Generates a visual representation of the seating chart as an SVG (vector).
-        Legacy method kept for API compatibility, redirects to text version.
+        Generates a vector (SVG) drawing of the seating chart, using the same geometry
+        and colors as the seating chart editor.
 
         :param chart_id: ID of the seating chart.
-        :return: Path to the generated file.
+        :return: Path to the generated SVG file.
         """
-        return self.generate_seating_chart_pdf(chart_id)
+        chart_details = self.data_service.get_seating_chart_details(chart_id)
+        if not chart_details:
+            raise ValueError("Seating chart not found.")
+        self._report_progress(0.5)
+
+        filepath = self._new_report_path(f"seating_chart_{chart_id}", ".svg")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(render_seating_chart_svg(chart_details))
 
+        return filepath
+
+    @cached_report("student_chart", _GRADE_TABLES)
     def generate_student_grade_chart(self, student_id: int, class_id: int) -> str:
         """
         Generates a bar chart of a student's grades in a specific class, separated by Subject.
@@ -142,195 +260,115 @@ class ReportService:
 
         if not subjects_data:
             raise ValueError(f"No subjects found for {class_info['name']}.")
+        self._report_progress(0.4)
 
         subject_names = []
         averages = []
 
         for subject in subjects_data:
-            assessments = subject['assessments']
-            total_weight = sum(a['weight'] for a in assessments)
-
-            student_grades = {}
-            for assessment in assessments:
-                score = grades_map.get((student_id, assessment['id']))
-                if score is not None:
-                    student_grades[assessment['id']] = score
-
-            avg = self.data_service.calculate_weighted_average(student_id, student_grades, assessments, total_weight=total_weight)
             subject_names.append(subject['course_name'])
-            averages.append(avg)
+            averages.append(self._subject_average(student_id, subject, grades_map))
 
-        # Plotting with plotext
-        plt.clear_figure()
-        plt.bar(subject_names, averages, orientation="vertical", width=0.5)
-        plt.title(f"Desempenho de {student_data['name']} - {class_info['name']}")
-        plt.xlabel("Disciplinas")
-        plt.ylabel("Média")
-        plt.ylim(0, 10)
+        chart = self.chart_renderer.render_text(
+            "text_bar", {"labels": subject_names, "values": averages},
+            title=f"Desempenho de {student_data['name']} - {class_info['name']}",
+            xlabel="Disciplinas", ylabel="Média", ylim=[0, 10]
+        )
+        self._report_progress(0.9)
 
         # Save file
-        filename = f"chart_student_{student_id}_class_{class_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        filepath = self._get_file_path(filename)
-
-        # plotext saves as text with ANSI codes
-        plt.save_fig(filepath)
+        filepath = self._new_report_path(f"chart_student_{student_id}_class_{class_id}", ".txt")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(chart)
 
         return filepath
 
-    def generate_class_grade_distribution(self, class_id: int) -> str:
+    def _subject_average(self, student_id: int, subject: dict, grades_map: dict) -> float:
+        """Weighted average of one student in one subject, using the preloaded grades map."""
+        assessments = subject['assessments']
+        total_weight = sum(a['weight'] for a in assessments)
+        student_grades = {}
+        for assessment in assessments:
+            score = grades_map.get((student_id, assessment['id']))
+            if score is not None:
+                student_grades[assessment['id']] = score
+        return self.data_service.calculate_weighted_average(student_id, student_grades, assessments, total_weight=total_weight)
+
+    def _render_class_distribution(self, class_info: dict, report_data: dict) -> str:
         """
-        Generates a histogram of global grade distribution for a class (averaging all subjects).
+        Builds the global grade histogram of a class as plain text.
 
-        :param class_id: ID of the class.
-        :return: Path to the generated text/ansi file.
+        :param class_info: Class dict (needs 'name').
+        :param report_data: Result of get_class_report_data.
+        :return: The chart, without ANSI colors.
         """
-        class_info = self.data_service.get_class_by_id(class_id)
-        if not class_info:
-            raise ValueError("Class not found.")
-
-        report_data = self.data_service.get_class_report_data(class_id)
-        students = report_data['students']
         subjects = report_data['subjects']
         grades_map = report_data['grades_map']
 
         global_averages = []
-
-        for student in students:
-            student_id = student['student_id']
-            student_subject_averages = []
-
-            for subject in subjects:
-                assessments = subject['assessments']
-                total_weight = sum(a['weight'] for a in assessments)
-
-                student_grades = {}
-                for assessment in assessments:
-                    score = grades_map.get((student_id, assessment['id']))
-                    if score is not None:
-                        student_grades[assessment['id']] = score
-
-                avg = self.data_service.calculate_weighted_average(student_id, student_grades, assessments, total_weight=total_weight)
-                student_subject_averages.append(avg)
-
+        for student in report_data['students']:
+            student_subject_averages = [self._subject_average(student['student_id'], subject, grades_map) for subject in subjects]
             if student_subject_averages:
-                global_avg = sum(student_subject_averages) / len(student_subject_averages)
-                global_averages.append(global_avg)
+                global_averages.append(sum(student_subject_averages) / len(student_subject_averages))
             else:
                 global_averages.append(0.0)
 
         if not global_averages:
              raise ValueError("No data to generate distribution.")
 
-        # Plotting with plotext
-        plt.clear_figure()
-        plt.hist(global_averages, bins=10) # bins work differently in plotext, integer count
-        plt.title(f"Distribuição de Notas Global - {class_info['name']}")
-        plt.xlabel("Média Global")
-        plt.ylabel("Número de Alunos")
+        # bins work differently in plotext, integer count
+        return self.chart_renderer.render_text(
+            "text_histogram", global_averages, bins=10,
+            title=f"Distribuição de Notas Global - {class_info['name']}",
+            xlabel="Média Global", ylabel="Número de Alunos"
+        )
 
-        # Save file
-        filename = f"chart_distribution_class_{class_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        filepath = self._get_file_path(filename)
-
-        plt.save_fig(filepath)
-
-        return filepath
-
-    def export_class_grades_csv(self, class_id: int) -> str:
+    def _write_class_grades_csv(self, file, report_data: dict):
         """
-        Exports grades for a class to a CSV file, listing all subjects and averages.
+        Writes the class grades table (one row per student, one column per subject) to an open text stream.
 
-        :param class_id: ID of the class.
-        :return: Path to the generated CSV file.
+        :param file: Text stream opened with newline=''.
+        :param report_data: Result of get_class_report_data.
         """
-        class_info = self.data_service.get_class_by_id(class_id)
-        if not class_info:
-            raise ValueError("Class not found.")
-
-        # Otimização 3: Usa o helper para evitar N+1 queries na exportação CSV
-        report_data = self.data_service.get_class_report_data(class_id)
-        students = report_data['students']
         subjects = report_data['subjects']
         grades_map = report_data['grades_map']
 
-        # Prepare CSV Data
         # Header: Nº, Aluno, Subject 1 Avg, Subject 2 Avg, ..., Global Average
-        header = ["Nº", "Aluno"] + [s['course_name'] for s in subjects] + ["Média Global"]
+        writer = csv.writer(file)
+        writer.writerow(["Nº", "Aluno"] + [s['course_name'] for s in subjects] + ["Média Global"])
 
-        rows = []
-        for student in students:
+        # Escreve cada linha assim que calculada, sem acumular a turma inteira em memória.
+        for student in report_data['students']:
             student_id = student['student_id']
-
             row = [student['call_number'], student['name']]
 
             subject_averages = []
             for subject in subjects:
-                assessments = subject['assessments']
-                total_weight = sum(a['weight'] for a in assessments)
-
-                # Monta notas do aluno para essa matéria usando o mapa (Dict otimizado)
-                student_grades = {}
-                for assessment in assessments:
-                    score = grades_map.get((student_id, assessment['id']))
-                    if score is not None:
-                        student_grades[assessment['id']] = score
-
-                avg = self.data_service.calculate_weighted_average(student_id, student_grades, assessments, total_weight=total_weight)
+                avg = self._subject_average(student_id, subject, grades_map)
                 row.append(f"{avg:.2f}")
                 subject_averages.append(avg)
 
             if subject_averages:
-                global_avg = sum(subject_averages) / len(subject_averages)
-                row.append(f"{global_avg:.2f}")
+                row.append(f"{sum(subject_averages) / len(subject_averages):.2f}")
             else:
                 row.append("0.00")
 
-            rows.append(row)
-
-        # Save file
-        filename = f"grades_class_{class_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        filepath = self._get_file_path(filename)
-
-        with open(filepath, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(header)
-            writer.writerows(rows)
-
-        return filepath
+            writer.writerow(row)
 
-    def generate_student_report_card(self, student_id: int, class_id: int) -> str:
+    def _render_report_card(self, student_id: int, student_name: str, class_info: dict, report_data: dict,
+                            incidents: list[dict], attendance_by_subject: dict) -> str:
         """
-        Generates a text-based report card for a student, grouping grades by subject.
+        Builds the text of a student's report card from preloaded data.
 
         :param student_id: ID of the student.
-        :param class_id: ID of the class.
-        :return: Path to the generated text file.
+        :param student_name: Display name of the student.
+        :param class_info: Class dict (needs 'name').
+        :param report_data: Result of get_class_report_data.
+        :param incidents: The student's incidents in this class.
+        :param attendance_by_subject: Attendance stats of the student keyed by class_subject ID.
+        :return: The report card text.
         """
-        # Otimização 4 e 5: Usar helper de dados em lote para buscar estrutura e notas,
-        # e usar novo método específico para incidentes do aluno.
-        report_data = self.data_service.get_class_report_data(class_id)
-
-        # Dados da turma e aluno
-        class_info = self.data_service.get_class_by_id(class_id)
-        student_data = next((s for s in report_data['students'] if s['student_id'] == student_id), None)
-
-        if not class_info or not student_data:
-             # Tenta buscar aluno isolado se não estiver matriculado/ativo no report data
-             # Fallback otimizado: Busca apenas o aluno específico pelo ID
-             student_obj = self.data_service.get_student_by_id(student_id)
-             if not student_obj:
-                raise ValueError("Class or Student not found.")
-             student_name = f"{student_obj['first_name']} {student_obj['last_name']}"
-        else:
-             student_name = student_data['name']
-
-        subjects_data = report_data['subjects']
         grades_map = report_data['grades_map']
-
-        # Otimização 5: Buscar apenas incidentes deste aluno, não da turma toda
-        student_incidents = self.data_service.get_student_incidents(student_id, class_id)
-
-        # Build Report Content
         lines = [
             "=" * 50,
             "BOLETIM ESCOLAR",
@@ -343,22 +381,13 @@ class ReportService:
             ""
         ]
 
-        if not subjects_data:
+        if not report_data['subjects']:
             lines.append("Nenhuma disciplina cadastrada nesta turma.")
 
-        for subject in subjects_data:
+        for subject in report_data['subjects']:
             lines.append(f"DISCIPLINA: {subject['course_name'].upper()}")
 
             assessments = subject['assessments']
-            total_weight = sum(a['weight'] for a in assessments)
-
-            # Monta notas do aluno para essa matéria usando o mapa
-            student_grades = {}
-            for assessment in assessments:
-                score = grades_map.get((student_id, assessment['id']))
-                if score is not None:
-                    student_grades[assessment['id']] = score
-
             if not assessments:
                 lines.append("  - Nenhuma avaliação registrada.")
             else:
@@ -367,12 +396,12 @@ class ReportService:
                     score_str = f"{score:.2f}" if score is not None else "N/A"
                     lines.append(f"  - {assessment['name']} (Peso {assessment['weight']}): {score_str}")
 
-            avg = self.data_service.calculate_weighted_average(student_id, student_grades, assessments, total_weight=total_weight)
+            avg = self._subject_average(student_id, subject, grades_map)
             lines.append(f"  >> MÉDIA FINAL: {avg:.2f}")
 
             # Adiciona Frequência
-            freq_stats = self.data_service.get_student_attendance_stats(student_id, subject['id'])
-            if freq_stats['total_lessons'] > 0:
+            freq_stats = attendance_by_subject.get(subject['id'])
+            if freq_stats and freq_stats['total_lessons'] > 0:
                 lines.append(f"  >> FREQUÊNCIA: {freq_stats['percentage']:.1f}% ({freq_stats['present_count']} P / {freq_stats['total_lessons']} Aulas)")
             else:
                 lines.append("  >> FREQUÊNCIA: N/A")
@@ -382,18 +411,222 @@ class ReportService:
         lines.extend([
             "",
             "=" * 50,
-            f"OCORRÊNCIAS DISCIPLINARES: {len(student_incidents)}"
+            f"OCORRÊNCIAS DISCIPLINARES: {len(incidents)}"
         ])
-        for inc in student_incidents:
+        for inc in incidents:
              lines.append(f"- {inc['date']}: {inc['description']}")
 
         lines.append("="*50)
+        return "\n".join(lines)
+
+    @cached_report("class_distribution", _GRADE_TABLES)
+    def generate_class_grade_distribution(self, class_id: int) -> str:
+        """
+        Generates a histogram of global grade distribution for a class (averaging all subjects).
+
+        :param class_id: ID of the class.
+        :return: Path to the generated text/ansi file.
+        """
+        class_info = self.data_service.get_class_by_id(class_id)
+        if not class_info:
+            raise ValueError("Class not found.")
+
+        report_data = self.data_service.get_class_report_data(class_id)
+        self._report_progress(0.4)
+        chart = self._render_class_distribution(class_info, report_data)
+        self._report_progress(0.9)
 
         # Save file
-        filename = f"boletim_{student_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        filepath = self._get_file_path(filename)
+        filepath = self._new_report_path(f"chart_distribution_class_{class_id}", ".txt")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(chart)
+
+        return filepath
+
+    @cached_report("class_grades_csv", _GRADE_TABLES)
+    def export_class_grades_csv(self, class_id: int) -> str:
+        """
+        Exports grades for a class to a CSV file, listing all subjects and averages.
+
+        :param class_id: ID of the class.
+        :return: Path to the generated CSV file.
+        """
+        class_info = self.data_service.get_class_by_id(class_id)
+        if not class_info:
+            raise ValueError("Class not found.")
+
+        # Otimização 3: Usa o helper para evitar N+1 queries na exportação CSV
+        report_data = self.data_service.get_class_report_data(class_id)
+        self._report_progress(0.5)
+
+        filepath = self._new_report_path(f"grades_class_{class_id}", ".csv")
+        with open(filepath, mode='w', newline='', encoding='utf-8') as file:
+            self._write_class_grades_csv(file, report_data)
+
+        return filepath
+
+    @cached_report("gradebook_csv", _GRADE_TABLES)
+    def export_gradebook_csv(self, class_id: int = None, course_id: int = None, delimiter: str = ";", decimal_separator: str = ",") -> str:
+        """
+        Exports the gradebook (one row per student and subject) streaming rows straight to disk.
+        Covers a single class, one course across all classes or the whole school (no filters).
+        Defaults follow Brazilian spreadsheets: ';' as delimiter and ',' as decimal separator.
+
+        :param class_id: Optional ID of the class to export.
+        :param course_id: Optional ID of the course to export across classes.
+        :param delimiter: CSV field delimiter.
+        :param decimal_separator: Decimal separator used for averages.
+        :return: Path to the generated CSV file.
+        """
+        if class_id is not None:
+            scope = f"class_{class_id}"
+        elif course_id is not None:
+            scope = f"course_{course_id}"
+        else:
+            scope = "school"
+
+        filepath = self._new_report_path(f"gradebook_{scope}", ".csv")
+
+        # utf-8-sig: o BOM faz o Excel reconhecer a acentuação ao abrir o arquivo diretamente.
+        with open(filepath, mode='w', newline='', encoding='utf-8-sig') as file:
+            writer = csv.writer(file, delimiter=delimiter)
+            writer.writerow(["Turma", "Nº", "Aluno", "Disciplina", "Média"])
+            for row in self.data_service.iter_gradebook_rows(class_id=class_id, course_id=course_id):
+                writer.writerow([
+                    row['class_name'],
+                    row['call_number'],
+                    row['student_name'],
+                    row['course_name'],
+                    f"{row['average']:.2f}".replace(".", decimal_separator)
+                ])
+
+        return filepath
 
+    @cached_report("bncc_coverage_csv", _BNCC_COVERAGE_TABLES)
+    def export_bncc_coverage_csv(self, delimiter: str = ";") -> str:
+        """
+        Exports the school-wide BNCC coverage matrix: one row per class, course and expected skill.
+
+        :param delimiter: CSV field delimiter.
+        :return: Path to the generated CSV file.
+        """
+        matrix = self.data_service.get_school_bncc_coverage()
+        descriptions = matrix['descriptions']
+        self._report_progress(0.5)
+        total_rows = len(matrix['rows']) or 1
+
+        filepath = self._new_report_path("bncc_coverage_school", ".csv")
+        with open(filepath, mode='w', newline='', encoding='utf-8-sig') as file:
+            writer = csv.writer(file, delimiter=delimiter)
+            writer.writerow(["Turma", "Disciplina", "Código", "Habilidade", "Aulas", "Avaliações", "Situação"])
+            for done, row in enumerate(matrix['rows'], start=1):
+                writer.writerow([
+                    row['class_name'],
+                    row['course_name'],
+                    row['code'],
+                    descriptions.get(row['code'], ""),
+                    "Sim" if row['in_lessons'] else "Não",
+                    "Sim" if row['in_assessments'] else "Não",
+                    "Coberta" if row['covered'] else "Pendente"
+                ])
+                self._report_progress(0.5 + 0.5 * done / total_rows)
+
+        return filepath
+
+    @cached_report("report_card", _REPORT_CARD_TABLES, daily=True)
+    def generate_student_report_card(self, student_id: int, class_id: int) -> str:
+        """
+        Generates a text-based report card for a student, grouping grades by subject.
+
+        :param student_id: ID of the student.
+        :param class_id: ID of the class.
+        :return: Path to the generated text file.
+        """
+        # Otimização 4 e 5: Usar helper de dados em lote para buscar estrutura e notas,
+        # e usar novo método específico para incidentes do aluno.
+        report_data = self.data_service.get_class_report_data(class_id)
+
+        # Dados da turma e aluno
+        class_info = self.data_service.get_class_by_id(class_id)
+        student_data = next((s for s in report_data['students'] if s['student_id'] == student_id), None)
+
+        if not class_info or not student_data:
+             # Tenta buscar aluno isolado se não estiver matriculado/ativo no report data
+             # Fallback otimizado: Busca apenas o aluno específico pelo ID
+             student_obj = self.data_service.get_student_by_id(student_id)
+             if not student_obj:
+                raise ValueError("Class or Student not found.")
+             student_name = f"{student_obj['first_name']} {student_obj['last_name']}"
+        else:
+             student_name = student_data['name']
+
+        # Otimização 5: Buscar apenas incidentes deste aluno, não da turma toda
+        student_incidents = self.data_service.get_student_incidents(student_id, class_id)
+        attendance_by_subject = {
+            subject['id']: self.data_service.get_student_attendance_stats(student_id, subject['id'])
+            for subject in report_data['subjects']
+        }
+
+        self._report_progress(0.6)
+        content = self._render_report_card(student_id, student_name, class_info, report_data, student_incidents, attendance_by_subject)
+        self._report_progress(0.9)
+
+        # Save file
+        filepath = self._new_report_path(f"boletim_{student_id}", ".txt")
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("\n".join(lines))
+            f.write(content)
+
+        return filepath
+
+    @cached_report("class_bundle", _REPORT_CARD_TABLES, daily=True)
+    def export_class_bundle(self, class_id: int) -> str:
+        """
+        Exports every end-of-term artifact of a class into a single ZIP: the grades CSV,
+        the distribution chart and one report card per enrolled student.
+        Each entry is streamed straight into the archive (no temporary files), and all
+        artifacts are rendered from a single class data load.
+
+        :param class_id: ID of the class.
+        :return: Path to the generated ZIP file.
+        """
+        class_info = self.data_service.get_class_by_id(class_id)
+        if not class_info:
+            raise ValueError("Class not found.")
+
+        # Carga única: estrutura e notas, ocorrências da turma e frequência por disciplina.
+        report_data = self.data_service.get_class_report_data(class_id)
+        incidents_by_student = {}
+        for inc in self.data_service.get_incidents_for_class(class_id):
+            incidents_by_student.setdefault(inc['student_id'], []).append(inc)
+        attendance_by_subject = {
+            subject['id']: self.data_service.get_class_attendance_stats(subject['id'])
+            for subject in report_data['subjects']
+        }
+        self._report_progress(0.2)
+
+        filepath = self._new_report_path(f"pacote_turma_{class_id}", ".zip")
+        with zipfile.ZipFile(filepath, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            with zf.open("notas_turma.csv", 'w') as raw, io.TextIOWrapper(raw, encoding='utf-8', newline='') as file:
+                self._write_class_grades_csv(file, report_data)
+
+            if report_data['students']:
+                zf.writestr("distribuicao_notas.txt", self._render_class_distribution(class_info, report_data))
+            self._report_progress(0.3)
+
+            # Os boletins são a maior parte do pacote: o progresso avança um aluno por vez.
+            total_students = len(report_data['students']) or 1
+            for done, student in enumerate(report_data['students'], start=1):
+                student_id = student['student_id']
+                student_attendance = {
+                    subject_id: stats[student_id]
+                    for subject_id, stats in attendance_by_subject.items() if student_id in stats
+                }
+                content = self._render_report_card(
+                    student_id, student['name'], class_info, report_data,
+                    incidents_by_student.get(student_id, []), student_attendance
+                )
+                safe_name = re.sub(r'[^\w\-]+', '_', student['name']).strip('_')
+                zf.writestr(f"boletins/{student['call_number'] or 0:02d}_{safe_name}.txt", content)
+                self._report_progress(0.3 + 0.7 * done / total_students)
 
         return filepath
@@ -12,16 +12,14 @@
 import json
 # Importa o decorador 'tool' que transforma uma função em uma ferramenta utilizável pela IA.
 from app.core.tools.tool_decorator import tool
-# Importa a classe DataService para interagir com o banco de dados.
-from app.services.data_service import DataService
-
-# Cria uma instância do DataService para ser usada pelas ferramentas neste módulo.
-data_service = DataService()
+from app.tools.name_lookup import NameLookup
+# Usa a instância compartilhada do DataService (e, com ela, o mesmo diretório de nomes das outras ferramentas).
+from app.services import data_service
 
 # O decorador '@tool' registra esta função no ToolRegistry,
 # gerando um esquema JSON a partir da docstring e das anotações de tipo.
 # Este esquema é enviado para o LLM, permitindo que ele entenda como usar a função.
-@tool
+@tool(cacheable=True)
 def get_student_performance_summary_tool(student_name: str, class_name: str) -> str:
     """
     Obtém um resumo detalhado do desempenho de um aluno em uma turma específica.
@@ -44,14 +42,15 @@ def get_student_performance_summary_tool(student_name: str, class_name: str) ->
     """
     # Bloco try/except para capturar e tratar qualquer erro inesperado que possa ocorrer.
     try:
-        # Busca o aluno pelo nome usando o DataService.
-        student = data_service.get_student_by_name(student_name)
+        names = NameLookup(data_service)
+        # Busca o aluno pelo nome (diretório de nomes, com tolerância a erros de digitação).
+        student = names.student(student_name)
         # Se o aluno não for encontrado, retorna uma mensagem de erro clara.
         if not student:
             return f"Erro: Aluno '{student_name}' não encontrado."
 
         # Busca a turma pelo nome.
-        target_class = data_service.get_class_by_name(class_name)
+        target_class = names.class_(class_name)
 
         # Se a turma não for encontrada, retorna uma mensagem de erro.
         if not target_class:
@@ -72,15 +71,16 @@ def get_student_performance_summary_tool(student_name: str, class_name: str) ->
         # Retorna uma mensagem de erro informando sobre a falha inesperada.
         return f"Erro: Ocorreu um erro inesperado: {e}"
 
-@tool
+@tool(cacheable=True)
 def get_students_at_risk_tool(class_name: str) -> str:
     """
     Identifica e lista alunos que estão em risco em uma turma específica com base em notas baixas ou um alto número de incidentes.
     Use esta ferramenta para responder a perguntas como "Quais alunos precisam de ajuda?" ou "Mostre-me os alunos com problemas de desempenho."
     """
     try:
+        names = NameLookup(data_service)
         # Busca a turma pelo nome.
-        target_class = data_service.get_class_by_name(class_name)
+        target_class = names.class_(class_name)
 
         # Se a turma não for encontrada, retorna um erro.
         if not target_class:
@@ -138,3 +138,34 @@ def get_class_incident_ranking_tool(limit: int = 5) -> str:
         return json.dumps(ranking, indent=2)
     except Exception as e:
         return f"Erro ao obter ranking de incidentes: {e}"
+
+@tool
+def get_school_bncc_coverage_tool(class_name: str = None) -> str:
+    """
+    Obtém a cobertura da BNCC por turma e disciplina: quantas habilidades esperadas já foram trabalhadas
+    em aulas ou avaliações, o percentual e os códigos ainda pendentes.
+    Use para perguntas como "Quais habilidades da BNCC ainda faltam?" ou "Como está a cobertura da BNCC na escola?".
+
+    :param class_name: Nome da turma para restringir o resultado (opcional; sem ele, toda a escola).
+    """
+    try:
+        subjects = data_service.get_school_bncc_coverage()['subjects']
+        if class_name:
+            target_class = NameLookup(data_service).class_(class_name)
+            if not target_class:
+                return f"Erro: Turma '{class_name}' não encontrada."
+            subjects = [s for s in subjects if s['class_id'] == target_class['id']]
+
+        summary = [{
+            "turma": s['class_name'],
+            "disciplina": s['course_name'],
+            "esperadas": s['expected'],
+            "cobertas": s['covered'],
+            "percentual": round(s['coverage_percentage'], 1),
+            "pendentes": s['missing']
+        } for s in subjects if s['expected']]
+        if not summary:
+            return "Nenhuma disciplina possui habilidades da BNCC esperadas cadastradas."
+        return json.dumps(summary, indent=2, ensure_ascii=False)
+    except Exception as e:
+        return f"Erro ao obter cobertura da BNCC: {e}"
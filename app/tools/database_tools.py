@@ -8,12 +8,21 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from collections import Counter
 from datetime import datetime
 import json
+import re
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.tools.tool_decorator import tool
+from app.tools.name_lookup import NameLookup
+from app.services.data.name_service import name_key
+from app.utils.text_search import TrigramIndex, fold_accents
 from app.services import data_service
 
+def _full_name(student: dict) -> str:
+    # Nas respostas vai o nome do aluno encontrado, não o que foi digitado.
+    return f"{student['first_name']} {student['last_name']}"
+
 # --- READ TOOLS ---
 
 @tool
@@ -60,14 +69,15 @@ def global_search_tool(search_term: str) -> str:
     except Exception as e:
         return f"Erro na busca global: {e}"
 
-@tool
+@tool(cacheable=True, tables=("classes", "class_subjects", "courses", "assessments", "class_enrollments", "students"))
 def get_class_full_details_tool(class_name: str) -> str:
     """
     Obtém TODOS os detalhes de uma turma: alunos (com status), disciplinas e avaliações.
     Retorna um JSON complexo ideal para análise detalhada.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
         # Get Subjects and Assessments
@@ -105,7 +115,8 @@ def get_student_grades_by_course(student_name: str, course_name: str) -> str:
     :param course_name: Nome da disciplina (ex: "Matemática").
     :return: Lista de notas encontradas.
     """
-    student = data_service.get_student_by_name(student_name)
+    names = NameLookup(data_service)
+    student = names.student(student_name)
     if not student:
         return f"Aluno '{student_name}' não encontrado."
 
@@ -121,9 +132,9 @@ def get_student_grades_by_course(student_name: str, course_name: str) -> str:
     ]
 
     if not student_grades:
-        return f"Nenhuma nota encontrada para {student_name} em {course_name}."
+        return f"Nenhuma nota encontrada para {_full_name(student)} em {course['course_name']}."
 
-    result = [f"Notas de {student_name} em {course_name}:"]
+    result = [f"Notas de {_full_name(student)} em {course['course_name']}:"]
     for g in student_grades:
         result.append(f"- Turma: {g['class_name']} | Avaliação: {g['assessment_name']} | Nota: {g['score']}")
 
@@ -136,7 +147,8 @@ def list_courses_for_student(student_name: str) -> str:
 
     :param student_name: O nome do aluno.
     """
-    student = data_service.get_student_by_name(student_name)
+    names = NameLookup(data_service)
+    student = names.student(student_name)
     if not student:
         return f"Aluno '{student_name}' não encontrado."
 
@@ -157,11 +169,11 @@ def list_courses_for_student(student_name: str) -> str:
                 student_courses.add(s['course_name'])
 
     if not student_courses:
-        return f"{student_name} não está matriculado em turmas com disciplinas cadastradas."
+        return f"{_full_name(student)} não está matriculado em turmas com disciplinas cadastradas."
 
-    return f"Disciplinas de {student_name}:\n" + "\n".join(f"- {name}" for name in sorted(list(student_courses)))
+    return f"Disciplinas de {_full_name(student)}:\n" + "\n".join(f"- {name}" for name in sorted(list(student_courses)))
 
-@tool
+@tool(cacheable=True, tables=("classes", "class_subjects", "courses", "class_enrollments"))
 def list_all_classes() -> str:
     """
     Lista todas as turmas cadastradas no sistema e suas disciplinas.
@@ -183,13 +195,14 @@ def list_all_classes() -> str:
     except Exception as e:
         return f"Erro ao listar turmas: {e}"
 
-@tool
+@tool(cacheable=True, tables=("classes", "class_enrollments", "students"))
 def get_class_roster(class_name: str) -> str:
     """
     Obtém a lista de chamada (roster) de uma turma específica.
     """
     try:
-        target_class = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        target_class = names.class_(class_name)
         if not target_class:
             return f"Erro: Turma '{class_name}' não encontrada."
 
@@ -213,7 +226,8 @@ def get_incidents_for_class(class_name: str) -> str:
     Lista todos os incidentes registrados para uma turma.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
         incidents = data_service.get_incidents_for_class(cls['id'])
@@ -232,11 +246,11 @@ def get_assessments_for_subject(class_name: str, subject_name: str) -> str:
     Lista as avaliações cadastradas em uma disciplina de uma turma.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
 
         if not target_subject: return f"Disciplina '{subject_name}' não encontrada na turma."
 
@@ -255,11 +269,11 @@ def get_lessons_for_subject(class_name: str, subject_name: str) -> str:
     Lista as aulas registradas em uma disciplina de uma turma.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina '{subject_name}' não encontrada na turma."
 
         lessons = data_service.get_lessons_for_subject(target_subject['id'])
@@ -278,7 +292,8 @@ def get_unenrolled_students(class_name: str) -> str:
     Lista alunos que NÃO estão matriculados na turma especificada.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
         students = data_service.get_unenrolled_students(cls['id'])
@@ -312,6 +327,16 @@ def search_students(search_term: str) -> str:
 
 # --- WRITE TOOLS ---
 
+# As ferramentas de escrita só aceitam o nome exato do aluno (ignorando maiúsculas e acentos):
+# um palpite aproximado poderia gravar no aluno errado. Quando o nome não bate, nada é gravado
+# e o modelo recebe os nomes parecidos para confirmar com o usuário.
+
+def _student_not_found(names: NameLookup, name: str) -> str:
+    suggestions = names.student_suggestions(name)
+    if not suggestions:
+        return f"Erro: Aluno '{name}' não encontrado. Nada foi alterado."
+    return f"Erro: Aluno '{name}' não encontrado (você quis dizer: {', '.join(suggestions)}?). Nada foi alterado."
+
 @tool
 def import_students_csv_tool(class_name: str, csv_content: str) -> str:
     """
@@ -319,7 +344,8 @@ def import_students_csv_tool(class_name: str, csv_content: str) -> str:
     O CSV deve ter cabeçalho (ex: Full Name,Birth Date,Status) ou seguir o padrão da escola.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
         result = data_service.import_students_from_csv(cls['id'], csv_content)
@@ -340,13 +366,14 @@ def transfer_student_tool(student_name: str, from_class_name: str, to_class_name
     O aluno será marcado como 'Inactive' na turma antiga e matriculado como 'Active' na nova.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return "Aluno não encontrado."
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
 
-        from_cls = data_service.get_class_by_name(from_class_name)
+        from_cls = names.class_(from_class_name)
         if not from_cls: return f"Turma de origem '{from_class_name}' não encontrada."
 
-        to_cls = data_service.get_class_by_name(to_class_name)
+        to_cls = names.class_(to_class_name)
         if not to_cls: return f"Turma de destino '{to_class_name}' não encontrada."
 
         # Find old enrollment
@@ -354,7 +381,7 @@ def transfer_student_tool(student_name: str, from_class_name: str, to_class_name
         old_enrollment = next((e for e in enrollments if e['student_id'] == student['id']), None)
 
         if not old_enrollment:
-            return f"Aluno {student_name} não está matriculado na turma {from_class_name}."
+            return f"Aluno {_full_name(student)} não está matriculado na turma {from_cls['name']}."
 
         # Inactivate old
         data_service.update_enrollment_status(old_enrollment['id'], "Inactive")
@@ -363,7 +390,7 @@ def transfer_student_tool(student_name: str, from_class_name: str, to_class_name
         next_num = data_service.get_next_call_number(to_cls['id'])
         data_service.add_student_to_class(student['id'], to_cls['id'], next_num, "Active")
 
-        return f"Transferência realizada com sucesso: {student_name} movido de {from_class_name} para {to_class_name}."
+        return f"Transferência realizada com sucesso: {_full_name(student)} movido de {from_cls['name']} para {to_cls['name']}."
 
     except Exception as e: return f"Erro na transferência: {e}"
 
@@ -374,10 +401,11 @@ def copy_class_structure_tool(source_class_name: str, target_class_name: str) ->
     Útil para configurar rapidamente uma nova turma baseada em uma existente.
     """
     try:
-        source_cls = data_service.get_class_by_name(source_class_name)
+        names = NameLookup(data_service)
+        source_cls = names.class_(source_class_name)
         if not source_cls: return f"Turma de origem '{source_class_name}' não encontrada."
 
-        target_cls = data_service.get_class_by_name(target_class_name)
+        target_cls = names.class_(target_class_name)
         if not target_cls: return f"Turma de destino '{target_class_name}' não encontrada."
 
         subjects = data_service.get_subjects_for_class(source_cls['id'])
@@ -415,13 +443,14 @@ def add_new_student(first_name: str, last_name: str, date_of_birth: str = None,
             return f"Erro: Formato de data inválido '{date_of_birth}'. Use DD/MM/AAAA."
 
     try:
+        names = NameLookup(data_service)
         student = data_service.add_student(first_name, last_name, birth_date=birth_date_obj)
 
         if student:
             response_msg = f"Novo aluno adicionado com sucesso: {first_name} {last_name} com ID {student['id']}."
 
             if enroll_in_class:
-                target_class = data_service.get_class_by_name(enroll_in_class)
+                target_class = names.class_(enroll_in_class)
 
                 if target_class:
                     next_call_number = data_service.get_next_call_number(target_class['id'])
@@ -450,9 +479,10 @@ def update_student_enrollment_tool(student_name: str, class_name: str, new_statu
     :param new_call_number: Novo número de chamada (opcional).
     """
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return f"Aluno não encontrado."
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
+        cls = names.class_(class_name)
         if not cls: return f"Turma não encontrada."
 
         enrollments = data_service.get_enrollments_for_class(cls['id'])
@@ -470,9 +500,9 @@ def update_student_enrollment_tool(student_name: str, class_name: str, new_statu
         if new_call_number is not None:
             # We reuse add_student_to_class which handles updates if record exists
             data_service.add_student_to_class(student['id'], cls['id'], new_call_number, new_status)
-            return f"Matrícula atualizada: Status={new_status}, Nº={new_call_number}."
+            return f"Matrícula de {_full_name(student)} atualizada: Status={new_status}, Nº={new_call_number}."
 
-        return f"Matrícula atualizada para status '{new_status}'."
+        return f"Matrícula de {_full_name(student)} atualizada para status '{new_status}'."
 
     except Exception as e: return f"Erro ao atualizar matrícula: {e}"
 
@@ -482,11 +512,12 @@ def delete_student(student_name: str) -> str:
     Deleta um aluno do sistema. CUIDADO: Esta ação é irreversível e remove todas as notas e histórico.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return f"Aluno '{student_name}' não encontrado."
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
 
         data_service.delete_student(student['id'])
-        return f"Aluno '{student_name}' e todos os seus registros foram removidos com sucesso."
+        return f"Aluno '{_full_name(student)}' e todos os seus registros foram removidos com sucesso."
     except Exception as e: return f"Erro ao deletar aluno: {e}"
 
 @tool
@@ -500,7 +531,8 @@ def create_new_class(class_name: str) -> str:
         return "Erro: Nome da turma é obrigatório."
 
     try:
-        existing_class = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        existing_class = names.class_(class_name)
         if existing_class:
             return f"Erro: Já existe uma turma com o nome '{class_name}'."
 
@@ -518,7 +550,8 @@ def update_class(current_name: str, new_name: str) -> str:
     Atualiza o nome de uma turma.
     """
     try:
-        cls = data_service.get_class_by_name(current_name)
+        names = NameLookup(data_service)
+        cls = names.class_(current_name)
         if not cls: return f"Turma '{current_name}' não encontrada."
         data_service.update_class(cls['id'], new_name)
         return f"Turma renomeada para '{new_name}'."
@@ -530,7 +563,8 @@ def delete_class(class_name: str) -> str:
     Deleta uma turma. CUIDADO: Remove matrículas associadas.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
         data_service.delete_class(cls['id'])
         return f"Turma '{class_name}' deletada com sucesso."
@@ -545,7 +579,8 @@ def add_subject_to_class(class_name: str, course_name: str) -> str:
     :param course_name: Nome da disciplina (ex: "Matemática").
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
         course = data_service.get_course_by_name(course_name)
@@ -570,12 +605,12 @@ def add_new_lesson(class_name: str, subject_name: str, topic: str, content: str,
     :param date_str: Data (DD/MM/AAAA).
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
         # Busca a disciplina na turma
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
 
         if not target_subject:
             return f"Erro: A disciplina '{subject_name}' não faz parte da turma '{class_name}'."
@@ -601,11 +636,11 @@ def update_lesson(class_name: str, subject_name: str, current_topic: str, new_to
     Atualiza uma aula existente.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina não encontrada."
 
         lessons = data_service.get_lessons_for_subject(target_subject['id'])
@@ -626,11 +661,11 @@ def delete_lesson(class_name: str, subject_name: str, topic: str) -> str:
     Deleta uma aula.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina não encontrada."
 
         lessons = data_service.get_lessons_for_subject(target_subject['id'])
@@ -652,11 +687,11 @@ def create_new_assessment(class_name: str, subject_name: str, assessment_name: s
     :param weight: Peso (float).
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
 
         if not target_subject:
             return f"Erro: A disciplina '{subject_name}' não faz parte da turma '{class_name}'."
@@ -674,15 +709,14 @@ def update_assessment(class_name: str, subject_name: str, current_name: str, new
     Atualiza uma avaliação (nome e peso).
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina não encontrada."
 
-        assessments = data_service.get_assessments_for_subject(target_subject['id'])
-        target_assessment = next((a for a in assessments if a['name'].lower() == current_name.lower()), None)
+        target_assessment = names.assessment(target_subject['id'], current_name)
         if not target_assessment: return f"Avaliação '{current_name}' não encontrada."
 
         data_service.update_assessment(target_assessment['id'], new_name, new_weight)
@@ -695,15 +729,14 @@ def delete_assessment(class_name: str, subject_name: str, assessment_name: str)
     Deleta uma avaliação e todas as notas associadas.
     """
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina não encontrada."
 
-        assessments = data_service.get_assessments_for_subject(target_subject['id'])
-        target_assessment = next((a for a in assessments if a['name'].lower() == assessment_name.lower()), None)
+        target_assessment = names.assessment(target_subject['id'], assessment_name)
         if not target_assessment: return f"Avaliação '{assessment_name}' não encontrada."
 
         data_service.delete_assessment(target_assessment['id'])
@@ -716,28 +749,27 @@ def add_new_grade(student_name: str, class_name: str, subject_name: str, assessm
     Adiciona uma nota para um aluno.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return f"Aluno '{student_name}' não encontrado."
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
 
-        cls = data_service.get_class_by_name(class_name)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
 
         if not target_subject:
             return f"Erro: Disciplina '{subject_name}' não encontrada na turma."
 
         # Busca avaliações dessa disciplina
-        assessments = data_service.get_assessments_for_subject(target_subject['id'])
-        target_assessment = next((a for a in assessments if a['name'].lower() == assessment_name.lower()), None)
+        target_assessment = names.assessment(target_subject['id'], assessment_name)
 
         if not target_assessment:
             return f"Erro: Avaliação '{assessment_name}' não encontrada em {subject_name}."
 
         grade = data_service.add_grade(student['id'], target_assessment['id'], score)
         if grade:
-            return f"Nota {score} adicionada para {student_name} em {assessment_name} ({subject_name})."
+            return f"Nota {score} adicionada para {_full_name(student)} em {target_assessment['name']} ({target_subject['course_name']})."
         return "Erro ao adicionar nota."
     except Exception as e:
         return f"Erro: {e}"
@@ -748,15 +780,14 @@ def update_grade_tool(student_name: str, class_name: str, subject_name: str, ass
     Atualiza uma nota existente de um aluno.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return f"Aluno não encontrado."
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
+        cls = names.class_(class_name)
         if not cls: return f"Turma não encontrada."
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina não encontrada."
-        assessments = data_service.get_assessments_for_subject(target_subject['id'])
-        target_assessment = next((a for a in assessments if a['name'].lower() == assessment_name.lower()), None)
+        target_assessment = names.assessment(target_subject['id'], assessment_name)
         if not target_assessment: return f"Avaliação não encontrada."
 
         # Find existing grade
@@ -771,7 +802,7 @@ def update_grade_tool(student_name: str, class_name: str, subject_name: str, ass
         }]
 
         data_service.upsert_grades_for_subject(target_subject['id'], grade_data)
-        return f"Nota atualizada para {new_score}."
+        return f"Nota de {_full_name(student)} em {target_assessment['name']} atualizada para {new_score}."
 
     except Exception as e: return f"Erro ao atualizar nota: {e}"
 
@@ -781,18 +812,17 @@ def delete_grade(student_name: str, class_name: str, subject_name: str, assessme
     Deleta uma nota de um aluno.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return f"Aluno não encontrado."
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
 
-        cls = data_service.get_class_by_name(class_name)
+        cls = names.class_(class_name)
         if not cls: return f"Turma não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina não encontrada."
 
-        assessments = data_service.get_assessments_for_subject(target_subject['id'])
-        target_assessment = next((a for a in assessments if a['name'].lower() == assessment_name.lower()), None)
+        target_assessment = names.assessment(target_subject['id'], assessment_name)
         if not target_assessment: return f"Avaliação não encontrada."
 
         # Busca nota especifica (não temos get_grade_by_... direto, então vamos iterar ou melhorar o service no futuro)
@@ -802,7 +832,7 @@ def delete_grade(student_name: str, class_name: str, subject_name: str, assessme
 
         if target_grade:
             data_service.delete_grade(target_grade['id'])
-            return f"Nota de {student_name} em {assessment_name} deletada."
+            return f"Nota de {_full_name(student)} em {target_assessment['name']} deletada."
         else:
             return f"Nota não encontrada."
 
@@ -814,10 +844,11 @@ def register_incident(student_name: str, class_name: str, description: str, date
     Registra um incidente (comportamental/geral) para um aluno em uma turma.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return f"Aluno '{student_name}' não encontrado."
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
 
-        target_class = data_service.get_class_by_name(class_name)
+        target_class = names.class_(class_name)
         if not target_class: return f"Turma '{class_name}' não encontrada."
 
         try:
@@ -827,7 +858,7 @@ def register_incident(student_name: str, class_name: str, description: str, date
 
         incident = data_service.create_incident(target_class['id'], student['id'], description, incident_date)
         if incident:
-            return f"Incidente registrado para {student_name} na turma {class_name}."
+            return f"Incidente registrado para {_full_name(student)} na turma {target_class['name']}."
         return "Erro ao registrar incidente."
     except Exception as e:
         return f"Erro: {e}"
@@ -876,27 +907,29 @@ def delete_course(course_name: str) -> str:
 @tool
 def update_student_name(current_name: str, new_first_name: str, new_last_name: str) -> str:
     try:
-        student = data_service.get_student_by_name(current_name)
-        if not student: return "Aluno não encontrado."
+        names = NameLookup(data_service)
+        student = names.student(current_name, fuzzy=False)
+        if not student: return _student_not_found(names, current_name)
         data_service.update_student(student['id'], new_first_name, new_last_name)
-        return f"Nome atualizado para {new_first_name} {new_last_name}."
+        return f"Nome de {_full_name(student)} atualizado para {new_first_name} {new_last_name}."
     except Exception as e: return f"Erro: {e}"
 
 @tool
 def enroll_existing_student(student_name: str, class_name: str) -> str:
     try:
-        student = data_service.get_student_by_name(student_name)
-        if not student: return "Aluno não encontrado."
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        student = names.student(student_name, fuzzy=False)
+        if not student: return _student_not_found(names, student_name)
+        cls = names.class_(class_name)
         if not cls: return "Turma não encontrada."
 
         next_num = data_service.get_next_call_number(cls['id'])
         res = data_service.add_student_to_class(student['id'], cls['id'], next_num)
-        if res: return f"Aluno matriculado na turma {class_name}."
+        if res: return f"Aluno {_full_name(student)} matriculado na turma {cls['name']}."
         return "Erro na matrícula."
     except Exception as e: return f"Erro: {e}"
 
-@tool
+@tool(cacheable=True, tables=("courses",))
 def list_all_courses() -> str:
     """Lista todas as disciplinas do catálogo."""
     try:
@@ -921,11 +954,11 @@ def register_attendance_tool(class_name: str, subject_name: str, lesson_title: s
         return f"Erro: Status inválido '{status}'. Use P, F, J ou A."
 
     try:
-        cls = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina '{subject_name}' não encontrada na turma."
 
         lessons = data_service.get_lessons_for_subject(target_subject['id'])
@@ -934,6 +967,7 @@ def register_attendance_tool(class_name: str, subject_name: str, lesson_title: s
 
         # Identify students
         target_student_ids = []
+        resolved_names = []
 
         if student_names.upper() == "TODOS":
             enrollments = data_service.get_enrollments_for_class(cls['id'])
@@ -941,11 +975,12 @@ def register_attendance_tool(class_name: str, subject_name: str, lesson_title: s
         else:
             names_list = [n.strip() for n in student_names.split(',')]
             for name in names_list:
-                s = data_service.get_student_by_name(name)
+                s = names.student(name, fuzzy=False)
                 if s:
                     target_student_ids.append(s['id'])
+                    resolved_names.append(_full_name(s))
                 else:
-                    return f"Erro: Aluno '{name}' não encontrado."
+                    return _student_not_found(names, name)
 
         if not target_student_ids:
             return "Nenhum aluno identificado para registro."
@@ -953,7 +988,8 @@ def register_attendance_tool(class_name: str, subject_name: str, lesson_title: s
         attendance_data = [{"student_id": sid, "status": status} for sid in target_student_ids]
         data_service.register_attendance(target_lesson['id'], attendance_data)
 
-        return f"Frequência registrada: {len(attendance_data)} alunos marcados como '{status}' na aula '{lesson_title}'."
+        msg = f"Frequência registrada: {len(attendance_data)} alunos marcados como '{status}' na aula '{target_lesson['title']}'"
+        return msg + (f" ({', '.join(resolved_names)})." if resolved_names else ".")
 
     except Exception as e:
         return f"Erro ao registrar frequência: {e}"
@@ -964,19 +1000,19 @@ def get_attendance_stats_tool(student_name: str, class_name: str, subject_name:
     Obtém estatísticas de frequência de um aluno em uma disciplina.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
+        names = NameLookup(data_service)
+        student = names.student(student_name)
         if not student: return f"Aluno '{student_name}' não encontrado."
 
-        cls = data_service.get_class_by_name(class_name)
+        cls = names.class_(class_name)
         if not cls: return f"Turma '{class_name}' não encontrada."
 
-        subjects = data_service.get_subjects_for_class(cls['id'])
-        target_subject = next((s for s in subjects if s['course_name'].lower() == subject_name.lower()), None)
+        target_subject = names.subject(cls['id'], subject_name)
         if not target_subject: return f"Disciplina '{subject_name}' não encontrada na turma."
 
         stats = data_service.get_student_attendance_stats(student['id'], target_subject['id'])
 
-        return (f"Frequência de {student_name} em {subject_name}:\n"
+        return (f"Frequência de {_full_name(student)} em {target_subject['course_name']}:\n"
                 f"- Aulas Totais: {stats['total_lessons']}\n"
                 f"- Presenças (P/A/J): {stats['present_count']}\n"
                 f"- Faltas: {stats['absent_count']}\n"
@@ -984,3 +1020,178 @@ def get_attendance_stats_tool(student_name: str, class_name: str, subject_name:
 
     except Exception as e:
         return f"Erro ao obter estatísticas: {e}"
+
+# --- BULK TOOLS ---
+
+# Status de frequência aceitos nas tabelas em lote (código ou palavra).
+ATTENDANCE_STATUS_WORDS = {
+    'P': 'P', 'PRESENTE': 'P',
+    'F': 'F', 'FALTA': 'F',
+    'J': 'J', 'JUSTIFICADA': 'J',
+    'A': 'A', 'ATRASO': 'A',
+}
+
+def _parse_name_table(table: str) -> list[tuple[str, str]]:
+    """Lê uma tabela compacta 'aluno: valor', com linhas separadas por ';' ou quebras de linha."""
+    entries = []
+    for line in re.split(r"[;\n]", table or ""):
+        if not line.strip():
+            continue
+        name, sep, value = line.rpartition(":")
+        if not sep:
+            name, sep, value = line.rpartition("=")
+        entries.append((name.strip(), value.strip()) if sep else (line.strip(), ""))
+    return entries
+
+def _match_roster(class_id: int, entries: list[tuple[str, str]]) -> tuple[list, list, list]:
+    """
+    Associa cada linha da tabela a uma matrícula da turma, procurando só entre os alunos dela:
+    pelo número de chamada, pelo nome exato ou pelo nome sem acentos (se só um aluno da turma
+    tiver esse nome). Nomes parecidos nunca são aceitos; viram sugestões no problema da linha.
+
+    :return: (pares (matrícula, valor), problemas encontrados, todas as matrículas da turma).
+    """
+    enrollments = data_service.get_enrollments_for_class(class_id)
+    by_call_number = {str(e['call_number']): e for e in enrollments}
+    by_name, by_folded_name = {}, {}
+    for e in enrollments:
+        key = name_key(f"{e['student_first_name']} {e['student_last_name']}")
+        by_name.setdefault(key, e)
+        by_folded_name.setdefault(fold_accents(key), []).append(e)
+    roster_index = None
+
+    matched, problems, seen = [], [], set()
+    for name, value in entries:
+        key = name_key(name)
+        enrollment = by_call_number.get(name.lstrip('#').strip()) or by_name.get(key)
+        if enrollment is None:
+            same_folded = by_folded_name.get(fold_accents(key), [])
+            enrollment = same_folded[0] if len(same_folded) == 1 else None
+        if enrollment is None:
+            if roster_index is None:
+                roster_index = TrigramIndex()
+                for position, e in enumerate(enrollments):
+                    roster_index.add(position, f"{e['student_first_name']} {e['student_last_name']}")
+            candidates = [enrollments[position] for position, _ in roster_index.search(name, limit=3)]
+            hint = f" (você quis dizer: {', '.join(c['student_first_name'] + ' ' + c['student_last_name'] for c in candidates)}?)" if candidates else ""
+            problems.append(f"'{name}' não encontrado na turma{hint}")
+            continue
+        if enrollment['student_id'] in seen:
+            problems.append(f"'{name}' aparece mais de uma vez")
+            continue
+        seen.add(enrollment['student_id'])
+        matched.append((enrollment, value))
+    return matched, problems, enrollments
+
+def _problems_message(problems: list[str]) -> str:
+    return "Nada foi registrado. Corrija as linhas abaixo e envie a tabela novamente:\n" + "\n".join(f"- {p}" for p in problems)
+
+@tool
+def bulk_add_grades_tool(class_name: str, subject_name: str, assessment_name: str, grades: str) -> str:
+    """
+    Lança (ou corrige) as notas de vários alunos de uma avaliação em uma única chamada; grades no formato "Ana Silva: 8,5; Bruno Costa: 7" (aluno pelo nome ou número de chamada).
+
+    Todas as linhas são validadas antes de gravar: se algum aluno não for encontrado na turma ou
+    alguma nota for inválida, nada é gravado e os problemas são listados.
+
+    :param class_name: Nome da turma.
+    :param subject_name: Nome da disciplina.
+    :param assessment_name: Nome da avaliação.
+    :param grades: Tabela "aluno: nota", separada por ';' ou quebras de linha.
+    """
+    try:
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
+        if not cls: return f"Turma '{class_name}' não encontrada."
+        target_subject = names.subject(cls['id'], subject_name)
+        if not target_subject: return f"Disciplina '{subject_name}' não encontrada na turma."
+        target_assessment = names.assessment(target_subject['id'], assessment_name)
+        if not target_assessment: return f"Avaliação '{assessment_name}' não encontrada em {subject_name}."
+
+        entries = _parse_name_table(grades)
+        if not entries: return "Nenhuma nota informada."
+        matched, problems, enrollments = _match_roster(cls['id'], entries)
+
+        grade_data = []
+        for enrollment, value in matched:
+            try:
+                score = float(value.replace(',', '.'))
+            except ValueError:
+                problems.append(f"Nota inválida para {enrollment['student_first_name']} {enrollment['student_last_name']}: '{value}'")
+                continue
+            if not (0 <= score <= 10):
+                problems.append(f"Nota fora do intervalo 0-10 para {enrollment['student_first_name']} {enrollment['student_last_name']}: {score}")
+                continue
+            grade_data.append({"student_id": enrollment['student_id'], "assessment_id": target_assessment['id'], "score": score})
+        if problems:
+            return _problems_message(problems)
+
+        # Uma única sessão (e transação) para todas as notas.
+        data_service.upsert_grades_for_subject(target_subject['id'], grade_data)
+
+        scores = [g['score'] for g in grade_data]
+        graded = {g['student_id'] for g in grade_data}
+        missing = sum(1 for e in enrollments if e['status'] == 'Active' and e['student_id'] not in graded)
+        summary = (f"{len(scores)} notas registradas em {target_assessment['name']} ({target_subject['course_name']}, {cls['name']}). "
+                   f"Média {sum(scores) / len(scores):.1f}, mínima {min(scores):g}, máxima {max(scores):g}.")
+        if missing:
+            summary += f" {missing} alunos ativos ainda sem nota nesta avaliação."
+        return summary
+    except Exception as e:
+        return f"Erro ao lançar notas: {e}"
+
+@tool
+def bulk_register_attendance_tool(class_name: str, subject_name: str, lesson_title: str, attendance: str, others_status: str = None) -> str:
+    """
+    Registra a frequência de vários alunos de uma aula em uma única chamada; attendance no formato "Ana Silva: F; Bruno Costa: J" (P, F, J ou A) e others_status aplica um status aos demais alunos ativos.
+
+    :param class_name: Nome da turma.
+    :param subject_name: Nome da disciplina.
+    :param lesson_title: Título da aula.
+    :param attendance: Tabela "aluno: status", separada por ';' ou quebras de linha (pode ser vazia com others_status).
+    :param others_status: Status dos alunos ativos que não aparecem na tabela (ex: 'P' para "os demais presentes").
+    """
+    try:
+        default_status = None
+        if others_status:
+            default_status = ATTENDANCE_STATUS_WORDS.get(others_status.strip().upper())
+            if not default_status: return f"Erro: Status inválido '{others_status}'. Use P, F, J ou A."
+
+        names = NameLookup(data_service)
+        cls = names.class_(class_name)
+        if not cls: return f"Turma '{class_name}' não encontrada."
+        target_subject = names.subject(cls['id'], subject_name)
+        if not target_subject: return f"Disciplina '{subject_name}' não encontrada na turma."
+
+        lessons = data_service.get_lessons_for_subject(target_subject['id'])
+        target_lesson = next((l for l in lessons if l['title'].lower() == lesson_title.lower()), None)
+        if not target_lesson: return f"Aula '{lesson_title}' não encontrada."
+
+        entries = _parse_name_table(attendance)
+        if not entries and not default_status: return "Nenhuma frequência informada."
+        matched, problems, enrollments = _match_roster(cls['id'], entries)
+
+        attendance_data = []
+        for enrollment, value in matched:
+            status = ATTENDANCE_STATUS_WORDS.get(value.upper())
+            if not status:
+                problems.append(f"Status inválido para {enrollment['student_first_name']} {enrollment['student_last_name']}: '{value}' (use P, F, J ou A)")
+                continue
+            attendance_data.append({"student_id": enrollment['student_id'], "status": status})
+        if problems:
+            return _problems_message(problems)
+
+        if default_status:
+            listed = {a['student_id'] for a in attendance_data}
+            attendance_data += [{"student_id": e['student_id'], "status": default_status}
+                                for e in enrollments if e['status'] == 'Active' and e['student_id'] not in listed]
+        if not attendance_data: return "Nenhum aluno identificado para registro."
+
+        # Uma única sessão (e transação) para toda a chamada.
+        data_service.register_attendance(target_lesson['id'], attendance_data)
+
+        counts = Counter(a['status'] for a in attendance_data)
+        breakdown = ", ".join(f"{status}: {counts[status]}" for status in ('P', 'F', 'J', 'A') if counts[status])
+        return f"Frequência registrada na aula '{target_lesson['title']}' ({target_subject['course_name']}, {cls['name']}): {len(attendance_data)} alunos ({breakdown})."
+    except Exception as e:
+        return f"Erro ao registrar frequência: {e}"
@@ -0,0 +1,55 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+class NameLookup:
+    """
+    Resolve os nomes citados pelo modelo (turma, disciplina, avaliação, aluno) em registros.
+
+    Crie uma instância por chamada de ferramenta: ela consulta o diretório de nomes uma única vez
+    (uma consulta de versões, reconstruído só após escritas nas tabelas de nomes) e depois cada
+    nome é resolvido por acesso a dicionário, em vez de 3 a 6 consultas por ferramenta.
+
+    Ferramentas de leitura podem aceitar o aluno mais parecido (`student(name)`); ferramentas que
+    gravam devem usar `student(name, fuzzy=False)`, que só aceita o nome exato (ignorando
+    maiúsculas e acentos), e oferecer `student_suggestions` quando ele não bater.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.directory = service.get_name_directory()
+
+    def class_(self, name: str) -> dict | None:
+        """Turma pelo nome (mesmo formato de get_class_by_name)."""
+        return self.directory.class_(name)
+
+    def subject(self, class_id: int, course_name: str) -> dict | None:
+        """Disciplina da turma pelo nome do curso (mesmo formato de get_subjects_for_class)."""
+        return self.directory.subject(class_id, course_name)
+
+    def assessment(self, class_subject_id: int, name: str) -> dict | None:
+        """Avaliação da disciplina pelo nome (mesmo formato de get_assessments_for_subject)."""
+        return self.directory.assessment(class_subject_id, name)
+
+    def student(self, name: str, fuzzy: bool = True) -> dict | None:
+        """
+        Aluno pelo nome (mesmo formato de get_student_by_name).
+
+        :param name: Nome como foi digitado.
+        :param fuzzy: Se o nome não bater (nem sem acentos), aceita o aluno mais parecido
+                      (erros de digitação). Use False em ferramentas que gravam dados.
+        """
+        found = self.directory.student(name)
+        if found or not fuzzy:
+            return found
+        return self.service.resolve_student_name(name)
+
+    def student_suggestions(self, name: str, limit: int = 3) -> list[str]:
+        """Nomes completos dos alunos mais parecidos com `name`, para perguntar ao usuário."""
+        return [f"{c['first_name']} {c['last_name']}" for c in self.service.find_students_by_name(name, limit=limit)]
@@ -9,13 +9,27 @@
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 from app.core.tools.tool_decorator import tool
-from app.services.data_service import DataService
-from app.services.report_service import ReportService
+from app.tools.name_lookup import NameLookup
+from app.services import data_service
+from app.services.report_job_queue import get_report_job_queue, ReportJobSpec
 
-data_service = DataService()
-report_service = ReportService()
 
-@tool
+# Tempo máximo que uma ferramenta espera pelo relatório na fila de jobs.
+REPORT_JOB_TIMEOUT = 120
+# Limite do ToolExecutor para as ferramentas de relatório: acima da espera pelo job, para que
+# a própria ferramenta responda ao modelo quando o job demorar, em vez do timeout genérico.
+REPORT_TOOL_TIMEOUT = REPORT_JOB_TIMEOUT + 15
+
+def _run_report_job(spec: ReportJobSpec) -> str:
+    """Gera o relatório pela fila compartilhada (com deduplicação e limite de workers) e aguarda o caminho."""
+    try:
+        return get_report_job_queue().submit(spec).result(timeout=REPORT_JOB_TIMEOUT)
+    except TimeoutError:
+        # O job continua na fila; pedir de novo reaproveita o mesmo job (ou o arquivo já gerado).
+        raise TimeoutError(f"o relatório ainda está sendo gerado após {REPORT_JOB_TIMEOUT} segundos; "
+                           "tente novamente em instantes") from None
+
+@tool(timeout=REPORT_TOOL_TIMEOUT)
 def generate_grade_chart_tool(student_name: str, class_name: str) -> str:
     """
     Gera um gráfico de desempenho (barras) para um aluno em uma turma e retorna o caminho do arquivo de imagem gerado.
@@ -25,20 +39,21 @@ def generate_grade_chart_tool(student_name: str, class_name: str) -> str:
     :return: Caminho para o arquivo de imagem gerado ou mensagem de erro.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
+        names = NameLookup(data_service)
+        student = names.student(student_name)
         if not student:
             return f"Erro: Aluno '{student_name}' não encontrado."
 
-        target_class = data_service.get_class_by_name(class_name)
+        target_class = names.class_(class_name)
         if not target_class:
             return f"Erro: Turma '{class_name}' não encontrada."
 
-        filepath = report_service.generate_student_grade_chart(student['id'], target_class['id'])
+        filepath = _run_report_job(ReportJobSpec.student_chart(student['id'], target_class['id']))
         return f"Gráfico gerado com sucesso: {filepath}"
     except Exception as e:
         return f"Erro ao gerar gráfico: {e}"
 
-@tool
+@tool(timeout=REPORT_TOOL_TIMEOUT)
 def generate_class_distribution_tool(class_name: str) -> str:
     """
     Gera um gráfico de distribuição de notas (histograma) para uma turma e retorna o caminho do arquivo.
@@ -47,16 +62,17 @@ def generate_class_distribution_tool(class_name: str) -> str:
     :return: Caminho para o arquivo de imagem gerado ou mensagem de erro.
     """
     try:
-        target_class = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        target_class = names.class_(class_name)
         if not target_class:
             return f"Erro: Turma '{class_name}' não encontrada."
 
-        filepath = report_service.generate_class_grade_distribution(target_class['id'])
+        filepath = _run_report_job(ReportJobSpec.distribution(target_class['id']))
         return f"Gráfico de distribuição gerado com sucesso: {filepath}"
     except Exception as e:
         return f"Erro ao gerar gráfico: {e}"
 
-@tool
+@tool(timeout=REPORT_TOOL_TIMEOUT)
 def export_class_grades_tool(class_name: str) -> str:
     """
     Gera um arquivo CSV contendo todas as notas dos alunos de uma turma.
@@ -65,16 +81,17 @@ def export_class_grades_tool(class_name: str) -> str:
     :return: Caminho para o arquivo CSV gerado ou mensagem de erro.
     """
     try:
-        target_class = data_service.get_class_by_name(class_name)
+        names = NameLookup(data_service)
+        target_class = names.class_(class_name)
         if not target_class:
             return f"Erro: Turma '{class_name}' não encontrada."
 
-        filepath = report_service.export_class_grades_csv(target_class['id'])
+        filepath = _run_report_job(ReportJobSpec.class_csv(target_class['id']))
         return f"Arquivo CSV exportado com sucesso: {filepath}"
     except Exception as e:
         return f"Erro ao exportar CSV: {e}"
 
-@tool
+@tool(timeout=REPORT_TOOL_TIMEOUT)
 def generate_report_card_tool(student_name: str, class_name: str) -> str:
     """
     Gera um boletim escolar em formato de texto para um aluno.
@@ -84,15 +101,49 @@ def generate_report_card_tool(student_name: str, class_name: str) -> str:
     :return: Caminho para o arquivo de texto gerado ou mensagem de erro.
     """
     try:
-        student = data_service.get_student_by_name(student_name)
+        names = NameLookup(data_service)
+        student = names.student(student_name)
         if not student:
             return f"Erro: Aluno '{student_name}' não encontrado."
 
-        target_class = data_service.get_class_by_name(class_name)
+        target_class = names.class_(class_name)
         if not target_class:
              return f"Erro: Turma '{class_name}' não encontrada."
 
-        filepath = report_service.generate_student_report_card(student['id'], target_class['id'])
+        filepath = _run_report_job(ReportJobSpec.report_card(student['id'], target_class['id']))
         return f"Boletim gerado com sucesso: {filepath}"
     except Exception as e:
         return f"Erro ao gerar boletim: {e}"
+
+@tool(timeout=REPORT_TOOL_TIMEOUT)
+def export_class_bundle_tool(class_name: str) -> str:
+    """
+    Gera um arquivo ZIP com o CSV de notas, o gráfico de distribuição e os boletins de todos os alunos de uma turma.
+
+    :param class_name: Nome da turma.
+    :return: Caminho para o arquivo ZIP gerado ou mensagem de erro.
+    """
+    try:
+        names = NameLookup(data_service)
+        target_class = names.class_(class_name)
+        if not target_class:
+            return f"Erro: Turma '{class_name}' não encontrada."
+
+        filepath = _run_report_job(ReportJobSpec.class_bundle(target_class['id']))
+        return f"Pacote da turma gerado com sucesso: {filepath}"
+    except Exception as e:
+        return f"Erro ao gerar pacote da turma: {e}"
+
+@tool(timeout=REPORT_TOOL_TIMEOUT)
+def export_bncc_coverage_tool() -> str:
+    """
+    Gera um arquivo CSV com a cobertura da BNCC de toda a escola: para cada turma, disciplina e habilidade
+    esperada, indica se foi trabalhada em aulas e/ou avaliações.
+
+    :return: Caminho para o arquivo CSV gerado ou mensagem de erro.
+    """
+    try:
+        filepath = _run_report_job(ReportJobSpec.bncc_coverage_csv())
+        return f"Cobertura da BNCC exportada com sucesso: {filepath}"
+    except Exception as e:
+        return f"Erro ao exportar cobertura da BNCC: {e}"
@@ -3,12 +3,12 @@ from textual.widgets import Header, Footer, Static, Button, Label
 from textual.containers import Container, Vertical, Horizontal
 from textual.screen import Screen
 from textual.widgets import TabbedContent, TabPane
-import plotext as plt
 from rich.text import Text
 
 # Import services
 from app.services import data_service
 from app.services.assistant_service import AssistantService
+from app.services.chart_renderer import get_chart_renderer
 from app.tui.chat_screen import ChatScreen
 from app.tui.management_screens import StudentListScreen, ClassListScreen
 
@@ -30,11 +30,12 @@ class DashboardScreen(Screen):
         stats_panel = self.query_one("#stats_panel", Static)
 
         # Example of Plotext integration (simple text for now)
+        # O plotext usa estado global; o ChartRenderer desenha em seu worker dedicado (com cache).
         try:
-            plt.clear_figure()
-            plt.theme('dark')
-            plt.simple_bar(["Turma A", "Turma B"], [8.5, 7.2], width=60, title="Médias Recentes")
-            chart = plt.build()
+            chart = get_chart_renderer().render_text(
+                "text_simple_bar", {"labels": ["Turma A", "Turma B"], "values": [8.5, 7.2]},
+                width=60, title="Médias Recentes", theme="dark", keep_colors=True
+            )
             stats_panel.update(Text.from_ansi(chart))
         except Exception as e:
             stats_panel.update(f"Erro ao gerar gráfico: {e}")
@@ -19,6 +19,12 @@ class ChatMessage(ListItem):
         yield Label(f"[{role_color}]{role_label}:[/{role_color}]", classes="role_label")
         yield Label(self.content_text, classes="message_content")
 
+    def append_text(self, text: str):
+        """Appends a streamed chunk to the message."""
+        self.content_text += text
+        if self.is_mounted:
+            self.query_one(".message_content", Label).update(self.content_text)
+
 class ChatScreen(Screen):
     CSS = """
     ChatMessage {
@@ -59,11 +65,13 @@ class ChatScreen(Screen):
         # Initial greeting
         self.add_message("assistant", "Olá! Como posso ajudar na gestão acadêmica hoje?")
 
-    def add_message(self, role: str, content: str):
+    def add_message(self, role: str, content: str) -> ChatMessage:
         history = self.query_one("#chat_history", ListView)
-        history.append(ChatMessage(role, content))
+        message = ChatMessage(role, content)
+        history.append(message)
         # Scroll to bottom
         history.scroll_end(animate=False)
+        return message
 
     async def on_button_pressed(self, event: Button.Pressed):
         if event.button.id == "send_btn":
@@ -77,7 +85,9 @@ class ChatScreen(Screen):
         input_widget = self.query_one("#chat_input", Input)
         user_text = input_widget.value.strip()
 
-        if not user_text:
+        # While an answer is in flight the input is disabled; a new message would otherwise
+        # interrupt the turn in the middle of a tool round.
+        if not user_text or input_widget.disabled:
             return
 
         self.add_message("user", user_text)
@@ -85,13 +95,36 @@ class ChatScreen(Screen):
 
         # Show loading indicator (simple version)
         self.title = "ProfGent - Processando..."
+        self.set_input_enabled(False)
+        # Runs in a worker so the screen keeps repainting while the answer streams in.
+        self.run_worker(self.respond(user_text), group="assistant")
+
+    def set_input_enabled(self, enabled: bool):
+        self.query_one("#chat_input", Input).disabled = not enabled
+        self.query_one("#send_btn", Button).disabled = not enabled
+        if enabled:
+            self.query_one("#chat_input", Input).focus()
+
+    async def respond(self, user_text: str):
+        streamed: list[ChatMessage] = []
+
+        def on_delta(text: str):
+            # The first chunk creates the assistant message; the following ones extend it.
+            if not streamed:
+                streamed.append(self.add_message("assistant", ""))
+            streamed[0].append_text(text)
+            self.query_one("#chat_history", ListView).scroll_end(animate=False)
 
         # Call assistant service
         # Note: We access the app's assistant service instance
-        response = await self.app.assistant_service.get_response(user_text)
-
-        self.title = "ProfGent"
+        try:
+            response = await self.app.assistant_service.get_response(user_text, on_delta=on_delta)
+        finally:
+            self.title = "ProfGent"
+            self.set_input_enabled(True)
 
+        if streamed:
+            return
         if response and response.content:
             self.add_message("assistant", response.content)
         else:
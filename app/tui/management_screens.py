@@ -3,6 +3,7 @@ from textual.widgets import Header, Footer, DataTable, Label, Button
 from textual.containers import Container, Vertical
 from textual.screen import Screen
 from textual.binding import Binding
+from app.services.report_job_queue import get_report_job_queue, ReportJobSpec, QUEUED, RUNNING, DONE, FAILED, CANCELLED
 
 class StudentListScreen(Screen):
     BINDINGS = [
@@ -60,6 +61,9 @@ class ClassListScreen(Screen):
             Label("Lista de Turmas", classes="header-text"),
             DataTable(id="classes_table"),
             Button("Atualizar", id="refresh_btn"),
+            Button("Exportar Notas (CSV)", id="export_csv_btn"),
+            Button("Distribuição de Notas", id="distribution_btn"),
+            Label("", id="report_status"),
             id="classes_container"
         )
         yield Footer()
@@ -82,3 +86,32 @@ class ClassListScreen(Screen):
     def on_button_pressed(self, event: Button.Pressed):
         if event.button.id == "refresh_btn":
             self.load_classes()
+        elif event.button.id in ("export_csv_btn", "distribution_btn"):
+            self.submit_report(event.button.id)
+
+    def submit_report(self, button_id: str):
+        table = self.query_one("#classes_table", DataTable)
+        if table.row_count == 0:
+            return
+        class_id = int(table.get_row_at(table.cursor_row)[0])
+        spec = ReportJobSpec.class_csv(class_id) if button_id == "export_csv_btn" else ReportJobSpec.distribution(class_id)
+        self.query_one("#report_status", Label).update("Relatório na fila...")
+
+        def listener(ev):
+            # 'queued' é emitido aqui mesmo, na thread do app; os demais chegam da thread do worker
+            # e precisam de call_from_thread para alcançar o loop do Textual.
+            if ev.status != QUEUED:
+                self.app.call_from_thread(self.on_report_event, ev)
+
+        get_report_job_queue().submit(spec, listener)
+
+    def on_report_event(self, event):
+        status_label = self.query_one("#report_status", Label)
+        if event.status == RUNNING:
+            status_label.update(f"Gerando relatório... {event.progress:.0%}")
+        elif event.status == DONE:
+            status_label.update(f"Relatório gerado: {event.result}")
+        elif event.status == FAILED:
+            status_label.update(f"Erro ao gerar relatório: {event.error}")
+        elif event.status == CANCELLED:
+            status_label.update("Geração cancelada.")
@@ -13,6 +13,9 @@ import customtkinter as ctk
 # Importa a função utilitária para executar tarefas assíncronas sem bloquear a UI.
 from app.utils.async_utils import run_async_task
 
+# Intervalo (ms) entre as atualizações da caixa de chat enquanto a resposta chega em streaming.
+STREAM_FLUSH_MS = 50
+
 # Define a classe AssistantView, que herda de CTkFrame para ser um painel dentro da janela principal.
 class AssistantView(ctk.CTkFrame):
     # O método construtor.
@@ -50,6 +53,12 @@ class AssistantView(ctk.CTkFrame):
         self.send_button = ctk.CTkButton(self.input_frame, text="Enviar", command=self.send_message)
         self.send_button.grid(row=0, column=1, padx=(5, 10), pady=10)
 
+        # Trechos da resposta recebidos em streaming e ainda não exibidos.
+        self._stream_parts: list[str] = []
+        # Indica se a resposta atual já começou a ser exibida.
+        self._streamed = False
+        self._flush_job = None
+
         # Adiciona uma mensagem inicial de boas-vindas ao chat.
         self.add_message("Sistema", "Bem-vindo! Como posso ajudar você hoje?")
 
@@ -73,7 +82,12 @@ class AssistantView(ctk.CTkFrame):
 
         # Usa a função utilitária para executar a tarefa assíncrona de obter a resposta da IA.
         # `coro` é a coroutine (a função async a ser executada).
-        coro = self.assistant_service.get_response(user_text)
+        # Os trechos da resposta chegam em `_stream_parts` e são exibidos em lotes por `_flush_stream`,
+        # em vez de uma atualização da interface por token.
+        self._stream_parts = []
+        self._streamed = False
+        self._flush_job = self.after(STREAM_FLUSH_MS, self._flush_stream)
+        coro = self.assistant_service.get_response(user_text, on_delta=self._stream_parts.append)
         # `run_async_task` executa a coroutine em segundo plano e, quando termina,
         # coloca o resultado e o callback na fila da UI principal.
         # O lambda define o callback que será executado na thread principal.
@@ -82,20 +96,22 @@ class AssistantView(ctk.CTkFrame):
     # Método de callback que atualiza a UI com a resposta final do assistente.
     def update_ui_with_response(self, response):
         """Atualiza o histórico do chat com a resposta final do assistente."""
+        # Exibe o que ainda restava da resposta transmitida e encerra as atualizações periódicas.
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+            self._flush_job = None
+        self._flush_stream(reschedule=False)
+
         # Habilita a caixa de texto para poder modificá-la.
         self.chat_history.configure(state="normal")
-        # Obtém todo o texto atual do histórico.
-        current_text = self.chat_history.get("1.0", "end-1c")
-        # Divide o texto em blocos de mensagens.
-        lines = current_text.strip().split('\n\n')
-        # Verifica se a última mensagem é a de "Pensando...".
-        if lines and lines[-1].startswith("Assistente: Pensando..."):
-            # Remove a última mensagem (o "Pensando...").
-            new_text = "\n\n".join(lines[:-1])
-            # Limpa toda a caixa de texto.
-            self.chat_history.delete("1.0", "end")
-            # Reinsere o texto sem a mensagem de "Pensando...".
-            if new_text: self.chat_history.insert("1.0", new_text + "\n\n")
+        if self._streamed:
+            # A resposta já está na tela: apenas fecha o bloco da mensagem.
+            self.chat_history.insert("end", "\n\n")
+            if isinstance(response, Exception):
+                self.add_message("Sistema", f"Ocorreu um erro: {response}")
+            self._finish_response()
+            return
+        self._remove_thinking_message()
 
         # Verifica se ocorreu um erro durante a execução da tarefa assíncrona.
         if isinstance(response, Exception):
@@ -107,12 +123,51 @@ class AssistantView(ctk.CTkFrame):
         else:
             self.add_message("Sistema", "Uma ação foi realizada, mas nenhuma resposta verbal foi gerada.")
 
+        self._finish_response()
+
+    def _finish_response(self):
         # Desabilita a caixa de texto novamente.
         self.chat_history.configure(state="disabled")
+        self.chat_history.see("end")
         # Reabilita os controles de entrada para o usuário.
         self.user_input.configure(state="normal")
         self.send_button.configure(state="normal")
 
+    def _remove_thinking_message(self):
+        """Remove a mensagem temporária "Pensando..." do final do histórico (a caixa deve estar editável)."""
+        # Obtém todo o texto atual do histórico.
+        current_text = self.chat_history.get("1.0", "end-1c")
+        # Divide o texto em blocos de mensagens.
+        lines = current_text.strip().split('\n\n')
+        # Verifica se a última mensagem é a de "Pensando...".
+        if lines and lines[-1].startswith("Assistente: Pensando..."):
+            # Remove a última mensagem (o "Pensando...").
+            new_text = "\n\n".join(lines[:-1])
+            # Limpa toda a caixa de texto.
+            self.chat_history.delete("1.0", "end")
+            # Reinsere o texto sem a mensagem de "Pensando...".
+            if new_text: self.chat_history.insert("1.0", new_text + "\n\n")
+
+    def _flush_stream(self, reschedule: bool = True):
+        """Acrescenta ao histórico os trechos da resposta recebidos desde a última atualização."""
+        # Retira só os trechos copiados: o get_response continua acrescentando na lista pela thread
+        # do loop asyncio, e um trecho que chegue entre a cópia e a remoção fica para a próxima vez.
+        count = len(self._stream_parts)
+        parts = self._stream_parts[:count]
+        del self._stream_parts[:count]
+        if parts:
+            self.chat_history.configure(state="normal")
+            # No primeiro trecho, troca o "Pensando..." pelo início da resposta.
+            if not self._streamed:
+                self._remove_thinking_message()
+                self.chat_history.insert("end", "Assistente: ")
+                self._streamed = True
+            self.chat_history.insert("end", "".join(parts))
+            self.chat_history.configure(state="disabled")
+            self.chat_history.see("end")
+        if reschedule:
+            self._flush_job = self.after(STREAM_FLUSH_MS, self._flush_stream)
+
     # Método auxiliar para adicionar uma mensagem formatada ao histórico do chat.
     def add_message(self, sender: str, message: str):
         # Habilita a edição da caixa de texto.
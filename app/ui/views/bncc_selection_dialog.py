@@ -9,11 +9,18 @@
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 import customtkinter as ctk
-from app.services.bncc_service import BNCCService
+from app.services.bncc_service import BNCCService, STAGES, STAGE_LABELS
+from app.ui.ui_utils import bind_global_mouse_scroll
 from app.ui.views.base_dialog import BaseDialog
 
 class BNCCSelectionDialog(BaseDialog):
-    def __init__(self, parent, title="Selecionar Habilidades BNCC", initial_selection=None, callback=None):
+    ALL_STAGES_LABEL = "Todas as etapas"
+    # Linhas de resultado desenhadas de uma vez; ao rolar, as mesmas linhas recebem outros itens.
+    VISIBLE_ROWS = 12
+    # Espera após a última tecla antes de buscar.
+    SEARCH_DEBOUNCE_MS = 250
+
+    def __init__(self, parent, title="Selecionar Habilidades BNCC", initial_selection=None, callback=None, stage=None):
         super().__init__(parent, title)
         self.geometry("1600x900")
         self.callback = callback
@@ -21,6 +28,18 @@ class BNCCSelectionDialog(BaseDialog):
         # Clean up empty strings
         self.selected_codes = {c.strip() for c in self.selected_codes if c.strip()}
 
+        # Etapa de ensino: só ela é carregada. Sem indicação explícita, usa a etapa dos códigos já
+        # selecionados quando todos são da mesma (ex: currículo do Ensino Médio).
+        if stage is None:
+            selected_stages = {BNCCService.stage_for_code(c) for c in self.selected_codes}
+            stage = selected_stages.pop() if len(selected_stages) == 1 else None
+        self.stage = stage
+
+        # Resultados da busca atual (sequência preguiçosa) e índice do primeiro item visível.
+        self.results = []
+        self.first_index = 0
+        self._search_job = None
+
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
 
@@ -28,16 +47,34 @@ class BNCCSelectionDialog(BaseDialog):
         self.search_frame = ctk.CTkFrame(self)
         self.search_frame.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
 
+        self.stage_labels = {STAGE_LABELS[s]: s for s in STAGES}
+        self.stage_menu = ctk.CTkOptionMenu(self.search_frame, values=[self.ALL_STAGES_LABEL] + list(self.stage_labels),
+                                            command=lambda _: self.on_stage_change())
+        self.stage_menu.set(STAGE_LABELS[self.stage] if self.stage else self.ALL_STAGES_LABEL)
+        self.stage_menu.pack(side="left", padx=(0, 10))
+
         self.search_entry = ctk.CTkEntry(self.search_frame, placeholder_text="Buscar por código ou descrição...")
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
         self.search_entry.bind("<Return>", lambda e: self.perform_search())
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
 
         self.search_btn = ctk.CTkButton(self.search_frame, text="Buscar", command=self.perform_search)
         self.search_btn.pack(side="right")
 
-        # List Area
-        self.scrollable_frame = ctk.CTkScrollableFrame(self)
-        self.scrollable_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        # List Area: um conjunto fixo de linhas reaproveitadas + barra de rolagem por índice.
+        self.list_frame = ctk.CTkFrame(self)
+        self.list_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self.list_frame.grid_columnconfigure(0, weight=1)
+        self.list_frame.grid_rowconfigure(0, weight=1)
+
+        self.rows_frame = ctk.CTkFrame(self.list_frame, fg_color="transparent")
+        self.rows_frame.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self.list_frame, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.empty_label = ctk.CTkLabel(self.rows_frame, text="Nenhum resultado encontrado.")
+        self.rows = [self._create_row() for _ in range(self.VISIBLE_ROWS)]
+        bind_global_mouse_scroll(self.list_frame, command=self.scroll_rows)
 
         # Buttons & Status Frame
         self.btn_frame = ctk.CTkFrame(self)
@@ -54,43 +91,94 @@ class BNCCSelectionDialog(BaseDialog):
         # Initial Search (Show all or filtered)
         self.perform_search()
 
-    def perform_search(self):
-        query = self.search_entry.get()
-        results = BNCCService.search_skills(query)
+    # --- Linhas reaproveitadas ---
 
-        # Clear current list
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def _create_row(self) -> dict:
+        frame = ctk.CTkFrame(self.rows_frame)
+        row = {"frame": frame, "code": None, "var": ctk.BooleanVar(value=False)}
+        row["checkbox"] = ctk.CTkCheckBox(frame, text="", variable=row["var"], command=lambda: self._toggle(row))
+        row["checkbox"].pack(side="top", anchor="w", padx=5, pady=2)
+        row["description"] = ctk.CTkLabel(frame, text="", wraplength=1400, justify="left", text_color="gray")
+        row["description"].pack(side="top", anchor="w", padx=30, pady=(0, 5))
+        return row
 
-        if not results:
-            ctk.CTkLabel(self.scrollable_frame, text="Nenhum resultado encontrado.").pack(pady=20)
+    def _toggle(self, row: dict):
+        if row["code"] is None:
             return
+        if row["var"].get():
+            self.selected_codes.add(row["code"])
+        else:
+            self.selected_codes.discard(row["code"])
+        self._update_status()
+
+    def _update_status(self):
+        self.status_label.configure(text=f"Resultados: {len(self.results)} | Selecionados: {len(self.selected_codes)}")
+
+    def render_window(self):
+        """Preenche as linhas fixas com os itens a partir de first_index (só eles viram objetos)."""
+        visible = self.results[self.first_index:self.first_index + self.VISIBLE_ROWS]
+        for row, item in zip(self.rows, visible):
+            row["code"] = item['code']
+            row["var"].set(item['code'] in self.selected_codes)
+            row["checkbox"].configure(text=f"{item['code']} - {item['title']}")
+            row["description"].configure(text=item['description'])
+            row["frame"].pack(fill="x", pady=2)
+        for row in self.rows[len(visible):]:
+            row["code"] = None
+            row["frame"].pack_forget()
+
+        if visible:
+            self.empty_label.pack_forget()
+        else:
+            self.empty_label.pack(pady=20)
+
+        total = len(self.results)
+        if total:
+            self.scrollbar.set(self.first_index / total, min(1.0, (self.first_index + self.VISIBLE_ROWS) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self._update_status()
+
+    def scroll_rows(self, amount: int, what: str = "units"):
+        """Rola a lista por linhas ('units') ou por páginas ('pages')."""
+        step = self.VISIBLE_ROWS if what.startswith("page") else 1
+        self._move_to(self.first_index + int(amount) * step)
+
+    def _move_to(self, index: int):
+        index = max(0, min(index, len(self.results) - self.VISIBLE_ROWS))
+        if index != self.first_index:
+            self.first_index = index
+            self.render_window()
+
+    def _on_scrollbar(self, action, *args):
+        # Mesmo protocolo do yview do Tk: ('moveto', fração) ou ('scroll', n, 'units'/'pages').
+        if action == "moveto":
+            self._move_to(round(float(args[0]) * len(self.results)))
+        elif action == "scroll":
+            self.scroll_rows(int(args[0]), args[1])
+
+    # --- Busca ---
+
+    def _on_search_key(self, event):
+        """Schedule the search to run after a delay (debounce)."""
+        if event.keysym == "Return":
+            return
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DEBOUNCE_MS, self.perform_search)
 
-        # Render list (limit to 50 for performance if query is empty)
-        limit = 100 if not query else None
-
-        for i, item in enumerate(results):
-            if limit and i >= limit:
-                ctk.CTkLabel(self.scrollable_frame, text="... Refine sua busca para ver mais ...").pack(pady=10)
-                break
-
-            frame = ctk.CTkFrame(self.scrollable_frame)
-            frame.pack(fill="x", pady=2)
-
-            chk_var = ctk.BooleanVar(value=item['code'] in self.selected_codes)
-
-            def toggle(code=item['code'], var=chk_var):
-                if var.get():
-                    self.selected_codes.add(code)
-                else:
-                    self.selected_codes.discard(code)
-                self.status_label.configure(text=f"Selecionados: {len(self.selected_codes)}")
-
-            chk = ctk.CTkCheckBox(frame, text=f"{item['code']} - {item['title']}", variable=chk_var, command=toggle)
-            chk.pack(side="top", anchor="w", padx=5, pady=2)
-
-            desc = ctk.CTkLabel(frame, text=item['description'], wraplength=700, text_color="gray")
-            desc.pack(side="top", anchor="w", padx=30, pady=(0, 5))
+    def perform_search(self):
+        if self._search_job:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+        # Resultado preguiçoso: nenhum item é materializado até ser exibido.
+        self.results = BNCCService.search_skills(self.search_entry.get(), stages=self.stage)
+        self.first_index = 0
+        self.render_window()
+
+    def on_stage_change(self):
+        self.stage = self.stage_labels.get(self.stage_menu.get())
+        self.perform_search()
 
     def confirm(self):
         if self.callback:
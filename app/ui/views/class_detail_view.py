@@ -21,6 +21,7 @@ from app.ui.views.edit_dialog import EditDialog
 from app.ui.views.enrollment_dialog import EnrollmentDialog
 from app.ui.views.attendance_dialog import AttendanceDialog
 from app.ui.views.bncc_selection_dialog import BNCCSelectionDialog
+from app.services.bncc_service import BNCCService
 from app.ui.views.copy_lesson_dialog import CopyLessonDialog
 from app.ui.views.seating_chart_view import SeatingChartView
 from customtkinter import CTkInputDialog
@@ -34,6 +35,7 @@ from app.ui.ui_utils import bind_global_mouse_scroll
 from app.ui.widgets.loading_overlay import LoadingOverlay
 # Importa o serviço de relatórios.
 from app.services.report_service import ReportService
+from app.services.report_job_queue import get_report_job_queue, tk_listener, ReportJobSpec, RUNNING, DONE, FAILED, CANCELLED
 import os
 import asyncio
 from PIL import Image
@@ -45,6 +47,9 @@ class ClassDetailView(ctk.CTkFrame):
         super().__init__(parent)
         self.main_app = main_app
         self.report_service = ReportService()
+        # Relatórios são gerados na fila de jobs (pool de workers), fora da thread do Tk.
+        self.report_job_queue = get_report_job_queue()
+        self._active_report_job = None
         # ID da turma que está sendo visualizada. Inicialmente nulo.
         self.class_id = None
         # ID da disciplina selecionada atualmente.
@@ -212,6 +217,11 @@ class ClassDetailView(ctk.CTkFrame):
         bncc_btn = ctk.CTkButton(bncc_frame, text="Selecionar", width=80, command=self.open_lesson_bncc_selector)
         bncc_btn.grid(row=0, column=1)
 
+        # Descrição das habilidades informadas, resolvidas de uma vez só.
+        self.lesson_editor_bncc_preview = ctk.CTkLabel(bncc_frame, text="", justify="left", anchor="w", text_color="gray", wraplength=600)
+        self.lesson_editor_bncc_preview.grid(row=1, column=0, columnspan=2, sticky="ew")
+        self.lesson_editor_bncc_entry.bind("<FocusOut>", lambda e: self._update_lesson_bncc_preview())
+
         editor_buttons_frame = ctk.CTkFrame(self.lesson_editor_view)
         editor_buttons_frame.grid(row=4, column=1, padx=10, pady=10, sticky="ew")
 
@@ -298,6 +308,7 @@ class ClassDetailView(ctk.CTkFrame):
 
         ctk.CTkButton(self.class_reports_frame, text="Exportar Notas (CSV)", command=self.export_csv).pack(side="left", padx=10, pady=10)
         ctk.CTkButton(self.class_reports_frame, text="Gráfico de Distribuição", command=self.show_distribution_chart).pack(side="left", padx=10, pady=10)
+        ctk.CTkButton(self.class_reports_frame, text="Pacote da Turma (ZIP)", command=self.export_class_bundle).pack(side="left", padx=10, pady=10)
 
         # Seção de Relatórios do Aluno
         ctk.CTkLabel(reports_tab, text="Relatórios Individuais do Aluno", font=ctk.CTkFont(size=16, weight="bold")).grid(row=2, column=0, padx=10, pady=(20, 10), sticky="w")
@@ -312,6 +323,13 @@ class ClassDetailView(ctk.CTkFrame):
         ctk.CTkButton(self.student_reports_frame, text="Gerar Boletim (TXT)", command=self.generate_report_card).pack(side="left", padx=10)
         ctk.CTkButton(self.student_reports_frame, text="Gráfico de Desempenho", command=self.show_student_chart).pack(side="left", padx=10)
 
+        # Progresso do job de relatório em andamento
+        self.report_progress_frame = ctk.CTkFrame(reports_tab, fg_color="transparent")
+        self.report_progress_frame.grid(row=4, column=0, padx=10, pady=10, sticky="ew")
+        self.report_status_label = ctk.CTkLabel(self.report_progress_frame, text="")
+        self.report_status_label.pack(side="left", padx=10)
+        self.report_cancel_button = ctk.CTkButton(self.report_progress_frame, text="Cancelar", width=80, command=self.cancel_report_job)
+
         # --- Aba BNCC ---
         self.bncc_tab = self.tab_view.tab("BNCC")
         self.bncc_tab.grid_rowconfigure(0, weight=1)
@@ -545,16 +563,19 @@ class ClassDetailView(ctk.CTkFrame):
         covered_frame.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
         ctk.CTkLabel(covered_frame, text="Trabalhadas", font=ctk.CTkFont(weight="bold")).pack(pady=5)
 
-        covered_text = "\n".join(report['total_covered']) if report['total_covered'] else "Nenhuma habilidade registrada."
-        ctk.CTkLabel(covered_frame, text=covered_text, justify="left", anchor="n").pack(padx=10, pady=5, fill="both", expand=True)
+        # Descrições já resolvidas em lote por get_bncc_coverage.
+        descriptions = report.get('descriptions', {})
+
+        covered_text = self._format_bncc_codes(report['total_covered'], descriptions) if report['total_covered'] else "Nenhuma habilidade registrada."
+        ctk.CTkLabel(covered_frame, text=covered_text, justify="left", anchor="n", wraplength=450).pack(padx=10, pady=5, fill="both", expand=True)
 
         # Missing
         missing_frame = ctk.CTkFrame(lists_frame)
         missing_frame.grid(row=0, column=1, padx=5, pady=5, sticky="nsew")
         ctk.CTkLabel(missing_frame, text="Pendentes (do currículo)", font=ctk.CTkFont(weight="bold")).pack(pady=5)
 
-        missing_text = "\n".join(report['missing']) if report['missing'] else "Nenhuma pendência."
-        ctk.CTkLabel(missing_frame, text=missing_text, justify="left", anchor="n", text_color=("red" if report['missing'] else "green")).pack(padx=10, pady=5, fill="both", expand=True)
+        missing_text = self._format_bncc_codes(report['missing'], descriptions) if report['missing'] else "Nenhuma pendência."
+        ctk.CTkLabel(missing_frame, text=missing_text, justify="left", anchor="n", wraplength=450, text_color=("red" if report['missing'] else "green")).pack(padx=10, pady=5, fill="both", expand=True)
 
         # Details
         details_frame = ctk.CTkFrame(self.bncc_scroll_frame)
@@ -563,66 +584,117 @@ class ClassDetailView(ctk.CTkFrame):
         ctk.CTkLabel(details_frame, text=f"Em Aulas: {', '.join(report['covered_lessons'])}").pack(anchor="w", padx=10)
         ctk.CTkLabel(details_frame, text=f"Em Avaliações: {', '.join(report['covered_assessments'])}").pack(anchor="w", padx=10)
 
+    @staticmethod
+    def _format_bncc_codes(codes, descriptions, max_length=90):
+        """Uma linha por código, com a descrição da habilidade (truncada) quando conhecida."""
+        lines = []
+        for code in codes:
+            description = descriptions.get(code)
+            if description and len(description) > max_length:
+                description = description[:max_length - 3].rstrip() + "..."
+            lines.append(f"{code} - {description}" if description else code)
+        return "\n".join(lines)
+
+    def _submit_report_job(self, spec, on_done, error_prefix):
+        """
+        Envia um relatório para a fila de jobs e acompanha o progresso na aba de Relatórios.
+        Os eventos chegam pela async_queue do MainApp, então os callbacks rodam na thread do Tk.
+        """
+        def on_event(event):
+            if event.status == RUNNING:
+                self.report_status_label.configure(text=f"Gerando relatório... {event.progress:.0%}")
+                self.report_cancel_button.pack(side="left", padx=10)
+                return
+            if event.status not in (DONE, FAILED, CANCELLED):
+                return
+            if self._active_report_job and self._active_report_job.id == event.job_id:
+                self._active_report_job = None
+                self.report_cancel_button.pack_forget()
+            if event.status == DONE:
+                self.report_status_label.configure(text="")
+                on_done(event.result)
+            elif event.status == FAILED:
+                self.report_status_label.configure(text="")
+                messagebox.showerror("Erro", f"{error_prefix}: {event.error}")
+            else:
+                self.report_status_label.configure(text="Geração cancelada.")
+
+        self.report_status_label.configure(text="Na fila...")
+        self._active_report_job = self.report_job_queue.submit(spec, tk_listener(self.main_app.async_queue, on_event))
+
+    def cancel_report_job(self):
+        if self._active_report_job:
+            self.report_job_queue.cancel(self._active_report_job.id)
+
+    def _find_report_student_id(self):
+        """Retorna o ID do aluno selecionado no combo de relatórios (ou None)."""
+        student_name = self.report_student_combo.get()
+        if not student_name:
+            messagebox.showwarning("Aviso", "Selecione um aluno primeiro.")
+            return None
+        # Recupera o ID do aluno baseado no nome selecionado
+        enrollments = data_service.get_enrollments_for_class(self.class_id)
+        target_enrollment = next((e for e in enrollments if f"{e['student_first_name']} {e['student_last_name']}" == student_name), None)
+        return target_enrollment['student_id'] if target_enrollment else None
+
     def export_csv(self):
         if not self.class_id: return
-        try:
-            filepath = self.report_service.export_class_grades_csv(self.class_id)
+
+        def on_done(filepath):
             messagebox.showinfo("Sucesso", f"Arquivo exportado em:\n{filepath}")
             # Tenta abrir a pasta do arquivo
             if os.name == 'nt':
                 os.startfile(os.path.dirname(filepath))
             else:
                 os.system(f'xdg-open "{os.path.dirname(filepath)}"')
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao exportar CSV: {e}")
+
+        self._submit_report_job(ReportJobSpec.class_csv(self.class_id), on_done, "Falha ao exportar CSV")
+
+    def export_class_bundle(self):
+        if not self.class_id: return
+
+        def on_done(filepath):
+            messagebox.showinfo("Sucesso", f"Pacote da turma gerado em:\n{filepath}")
+            if os.name == 'nt':
+                os.startfile(os.path.dirname(filepath))
+            else:
+                os.system(f'xdg-open "{os.path.dirname(filepath)}"')
+
+        self._submit_report_job(ReportJobSpec.class_bundle(self.class_id), on_done, "Falha ao gerar pacote da turma")
 
     def show_distribution_chart(self):
         if not self.class_id: return
-        try:
-            filepath = self.report_service.generate_class_grade_distribution(self.class_id)
-            self._show_image_popup("Distribuição de Notas", filepath)
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao gerar gráfico: {e}")
+        self._submit_report_job(
+            ReportJobSpec.distribution(self.class_id),
+            lambda filepath: self._show_image_popup("Distribuição de Notas", filepath),
+            "Falha ao gerar gráfico"
+        )
 
     def generate_report_card(self):
         if not self.class_id: return
-        student_name = self.report_student_combo.get()
-        if not student_name:
-             messagebox.showwarning("Aviso", "Selecione um aluno primeiro.")
-             return
+        student_id = self._find_report_student_id()
+        if not student_id: return
 
-        try:
-            # Recupera o ID do aluno baseado no nome selecionado
-            enrollments = data_service.get_enrollments_for_class(self.class_id)
-            target_enrollment = next((e for e in enrollments if f"{e['student_first_name']} {e['student_last_name']}" == student_name), None)
-
-            if target_enrollment:
-                filepath = self.report_service.generate_student_report_card(target_enrollment['student_id'], self.class_id)
-                messagebox.showinfo("Sucesso", f"Boletim gerado em:\n{filepath}")
-                # Tenta abrir o arquivo
-                if os.name == 'nt':
-                    os.startfile(filepath)
-                else:
-                    os.system(f'xdg-open "{filepath}"')
-        except Exception as e:
-             messagebox.showerror("Erro", f"Falha ao gerar boletim: {e}")
+        def on_done(filepath):
+            messagebox.showinfo("Sucesso", f"Boletim gerado em:\n{filepath}")
+            # Tenta abrir o arquivo
+            if os.name == 'nt':
+                os.startfile(filepath)
+            else:
+                os.system(f'xdg-open "{filepath}"')
+
+        self._submit_report_job(ReportJobSpec.report_card(student_id, self.class_id), on_done, "Falha ao gerar boletim")
 
     def show_student_chart(self):
         if not self.class_id: return
         student_name = self.report_student_combo.get()
-        if not student_name:
-             messagebox.showwarning("Aviso", "Selecione um aluno primeiro.")
-             return
-
-        try:
-            enrollments = data_service.get_enrollments_for_class(self.class_id)
-            target_enrollment = next((e for e in enrollments if f"{e['student_first_name']} {e['student_last_name']}" == student_name), None)
-
-            if target_enrollment:
-                filepath = self.report_service.generate_student_grade_chart(target_enrollment['student_id'], self.class_id)
-                self._show_image_popup(f"Desempenho - {student_name}", filepath)
-        except Exception as e:
-             messagebox.showerror("Erro", f"Falha ao gerar gráfico: {e}")
+        student_id = self._find_report_student_id()
+        if not student_id: return
+        self._submit_report_job(
+            ReportJobSpec.student_chart(student_id, self.class_id),
+            lambda filepath: self._show_image_popup(f"Desempenho - {student_name}", filepath),
+            "Falha ao gerar gráfico"
+        )
 
     def _show_image_popup(self, title, filepath):
         """Exibe uma imagem em uma janela popup."""
@@ -921,6 +993,13 @@ class ClassDetailView(ctk.CTkFrame):
         # Se estiver criando, preenche a data com o dia de hoje.
         else:
             self.lesson_editor_date_entry.insert(0, date.today().isoformat())
+        self._update_lesson_bncc_preview()
+
+    def _update_lesson_bncc_preview(self):
+        skills = BNCCService.get_skills_by_codes(self.lesson_editor_bncc_entry.get())
+        self.lesson_editor_bncc_preview.configure(
+            text=self._format_bncc_codes(skills.keys(), {code: skill['description'] for code, skill in skills.items()})
+        )
 
     # Esconde a view de edição de aula e volta para a lista.
     def hide_lesson_editor(self):
@@ -932,6 +1011,7 @@ class ClassDetailView(ctk.CTkFrame):
         def on_select(result_string):
              self.lesson_editor_bncc_entry.delete(0, "end")
              self.lesson_editor_bncc_entry.insert(0, result_string)
+             self._update_lesson_bncc_preview()
 
         BNCCSelectionDialog(self, initial_selection=self.lesson_editor_bncc_entry.get(), callback=on_select)
 
@@ -17,7 +17,7 @@ from typing import List, Dict, Any, Optional
 from PIL import Image
 
 from app.ui.ui_utils import bind_global_mouse_scroll
-from app.utils.charts import create_grade_distribution_chart, create_approval_pie_chart
+from app.services.chart_renderer import get_chart_renderer
 from app.ui.views.base_dialog import BaseDialog
 
 # Constants for Thresholds and Colors
@@ -39,6 +39,8 @@ class DashboardView(ctk.CTkFrame):
         self.main_app = main_app
         self.data_service = self.main_app.data_service
         self.courses: List[Dict[str, Any]] = []
+        # Gráficos são renderizados no worker do ChartRenderer (com cache); a UI só exibe o PNG pronto.
+        self.chart_renderer = get_chart_renderer()
         self.selected_course_id: Optional[int] = None
 
         # Data placeholders
@@ -232,13 +234,8 @@ class DashboardView(ctk.CTkFrame):
                     ctk.CTkLabel(row, text=score_text, text_color=COLOR_HONOR, font=ctk.CTkFont(weight="bold")).pack(side="right", padx=5)
 
             # Atualiza Gráfico Pizza
-            pie_chart_path = create_approval_pie_chart(approved, failed)
-            if os.path.exists(pie_chart_path):
-                img = Image.open(pie_chart_path)
-                self.pie_chart_image = ctk.CTkImage(light_image=img, size=img.size)
-                self.pie_chart_label.configure(image=self.pie_chart_image, text="")
-            else:
-                self.pie_chart_label.configure(image=None, text="Erro no Gráfico")
+            future = self.chart_renderer.submit("approval_pie", {"approved": approved, "failed": failed})
+            self._on_chart_ready(future, self._show_pie_chart)
 
             # Atualiza Ranking Incidentes
             incident_ranking = self.data_service.get_class_incident_ranking()
@@ -298,16 +295,44 @@ class DashboardView(ctk.CTkFrame):
                 return
 
             averages = self.data_service.get_course_averages(self.selected_course_id)
-            chart_path = create_grade_distribution_chart(averages, selected_course['course_name'])
+            scores = [min(v, 10) for v in averages]
+            future = self.chart_renderer.submit("grade_distribution", scores, course_name=selected_course['course_name'])
+            self._on_chart_ready(future, self._show_distribution_chart)
+        except Exception as e:
+            self.chart_label.configure(text=f"Erro ao gerar gráfico: {e}", image=None)
 
-            if os.path.exists(chart_path):
-                img = Image.open(chart_path)
-                self.chart_image = ctk.CTkImage(light_image=img, size=img.size)
-                self.chart_label.configure(image=self.chart_image, text="")
-            else:
-                self.chart_label.configure(image=None, text="Não foi possível gerar o gráfico.")
+    def _on_chart_ready(self, future, callback) -> None:
+        """
+        Agenda `callback(future)` na thread do Tk quando o gráfico estiver pronto.
+        Em cache, o Future já vem concluído e o callback roda na próxima varredura da fila.
+        """
+        future.add_done_callback(lambda f: self.main_app.async_queue.put((callback, (f,))))
+
+    def _show_pie_chart(self, future) -> None:
+        try:
+            pie_chart_path = future.result()
+        except Exception as e:
+            print(f"Erro ao gerar gráfico de aprovação: {e}")
+            pie_chart_path = None
+        if pie_chart_path and os.path.exists(pie_chart_path):
+            img = Image.open(pie_chart_path)
+            self.pie_chart_image = ctk.CTkImage(light_image=img, size=img.size)
+            self.pie_chart_label.configure(image=self.pie_chart_image, text="")
+        else:
+            self.pie_chart_label.configure(image=None, text="Erro no Gráfico")
+
+    def _show_distribution_chart(self, future) -> None:
+        try:
+            chart_path = future.result()
         except Exception as e:
             self.chart_label.configure(text=f"Erro ao gerar gráfico: {e}", image=None)
+            return
+        if os.path.exists(chart_path):
+            img = Image.open(chart_path)
+            self.chart_image = ctk.CTkImage(light_image=img, size=img.size)
+            self.chart_label.configure(image=self.chart_image, text="")
+        else:
+            self.chart_label.configure(image=None, text="Não foi possível gerar o gráfico.")
 
     def update_birthdays(self) -> None:
         try:
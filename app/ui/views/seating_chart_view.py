@@ -15,7 +15,10 @@ from app.ui.widgets.scrollable_canvas_frame import ScrollableCanvasFrame
 from app.services import data_service
 from app.ui.views.add_dialog import AddDialog
 from app.services.report_service import ReportService
+from app.utils import seating_chart_render
+from app.utils.seating_chart_render import build_cell_states, diff_cells, cell_bounds, display_name, CELL_STYLES
 import os
+import shutil
 
 class SeatingChartView(ctk.CTkFrame):
     def __init__(self, parent, class_id):
@@ -28,6 +31,8 @@ class SeatingChartView(ctk.CTkFrame):
 
         self.selected_student_id = None # From the sidebar list
         self.selected_cell = None # (row, col)
+        self._cell_states = None # Estado desenhado de cada célula, para redesenho incremental
+        self._drawn_chart_id = None
 
         # Main Layout: Sidebar (Left) + Grid (Right)
         self.grid_columnconfigure(1, weight=1)
@@ -57,7 +62,7 @@ class SeatingChartView(ctk.CTkFrame):
         self.student_list_frame.grid(row=4, column=0, padx=10, pady=5, sticky="nsew")
 
         # Export Button
-        ctk.CTkButton(self.sidebar_frame, text="Exportar PDF/Vetor", command=self.export_chart).grid(row=5, column=0, padx=10, pady=10, sticky="ew")
+        ctk.CTkButton(self.sidebar_frame, text="Exportar SVG/Texto", command=self.export_chart).grid(row=5, column=0, padx=10, pady=10, sticky="ew")
 
         # --- Grid Area ---
         self.grid_container = ctk.CTkFrame(self)
@@ -104,6 +109,7 @@ class SeatingChartView(ctk.CTkFrame):
             self.current_chart_id = None
             self.chart_data = None
             self.canvas.delete("all")
+            self._cell_states = None
         else:
             self.layout_combo.configure(state="normal")
             names = [c['name'] for c in charts]
@@ -136,7 +142,7 @@ class SeatingChartView(ctk.CTkFrame):
         for a in self.chart_data['assignments']:
             self.chart_data['assignments_map'][(a['row_index'], a['col_index'])] = a
 
-        self.draw_grid()
+        self.refresh_grid()
         self.populate_student_list()
 
     def populate_student_list(self):
@@ -203,18 +209,42 @@ class SeatingChartView(ctk.CTkFrame):
         self.populate_layout_combo()
 
     # --- Drawing Logic ---
-    CELL_WIDTH = 140
-    CELL_HEIGHT = 80
-    PADDING = 20
+    # Mesma geometria usada na exportação SVG.
+    CELL_WIDTH = seating_chart_render.CELL_WIDTH
+    CELL_HEIGHT = seating_chart_render.CELL_HEIGHT
+    PADDING = seating_chart_render.PADDING
+
+    def refresh_grid(self):
+        """
+        Atualiza o canvas após uma mudança nos dados. Quando o mapa exibido é o mesmo e as
+        dimensões não mudaram, apenas as células cujo estado mudou são repintadas.
+        """
+        if not self.chart_data:
+            self.draw_grid()
+            return
+
+        new_states = build_cell_states(self.chart_data)
+        changed = None
+        if self._drawn_chart_id == self.current_chart_id:
+            changed = diff_cells(self._cell_states, new_states)
+
+        if changed is None:
+            self.draw_grid(new_states)
+            return
+
+        for row, col in changed:
+            self.canvas.delete(self._cell_tag(row, col))
+            self._draw_cell(new_states[(row, col)])
+        self._cell_states = new_states
 
-    def draw_grid(self):
+    def draw_grid(self, cell_states=None):
         self.canvas.delete("all")
+        self._cell_states = None
+        self._drawn_chart_id = None
         if not self.chart_data: return
 
         rows = self.chart_data['rows']
         cols = self.chart_data['columns']
-        layout_config = self.chart_data['layout_config_parsed']
-        assignments = self.chart_data['assignments_map']
 
         # Calculate canvas size
         width = cols * self.CELL_WIDTH + (self.PADDING * 2)
@@ -223,54 +253,50 @@ class SeatingChartView(ctk.CTkFrame):
         # Configure scroll region
         self.canvas_frame.canvas.configure(scrollregion=(0, 0, width, height))
 
-        for r in range(rows):
-            for c in range(cols):
-                x1 = self.PADDING + (c * self.CELL_WIDTH)
-                y1 = self.PADDING + (r * self.CELL_HEIGHT)
-                x2 = x1 + self.CELL_WIDTH
-                y2 = y1 + self.CELL_HEIGHT
-
-                cell_key = f"{r},{c}"
-                cell_type = layout_config.get(cell_key, "student_seat")
-
-                # Draw based on type
-                if cell_type == "void":
-                    # Draw nothing or faint outline
-                    self.canvas.create_rectangle(x1, y1, x2, y2, outline="#333", dash=(2, 4))
-
-                elif cell_type == "door":
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="#8B4513", outline="black")
-                    self.canvas.create_text((x1+x2)/2, (y1+y2)/2, text="Porta", fill="white", font=("Arial", 12, "bold"))
-
-                elif cell_type == "teacher_desk":
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="#D3D3D3", outline="black")
-                    self.canvas.create_text((x1+x2)/2, (y1+y2)/2, text="Mesa\nProf.", justify="center", font=("Arial", 11))
-
-                elif cell_type == "student_seat":
-                    # Draw Seat
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="white", outline="black")
-
-                    # Check assignment
-                    assignment = assignments.get((r, c))
-                    if assignment:
-                        name = assignment['student_name']
-                        call_num = assignment.get('call_number')
-                        call_str = f"{call_num}" if call_num is not None else "?"
-
-                        # Display: Call Number (top left)
-                        self.canvas.create_text(x1+8, y1+8, text=call_str, anchor="nw", fill="blue", font=("Arial", 10, "bold"))
-
-                        # Name: Try to display more complete name
-                        # Split name and take up to 2 parts, join with newline if needed
-                        parts = name.split()
-                        if len(parts) >= 2:
-                            display_name = f"{parts[0]}\n{parts[-1]}"
-                        else:
-                            display_name = name
-
-                        self.canvas.create_text((x1+x2)/2, (y1+y2)/2, text=display_name, justify="center", fill="black", font=("Arial", 12), width=self.CELL_WIDTH-10)
-                    else:
-                        self.canvas.create_text((x1+x2)/2, (y1+y2)/2, text="Vazio", fill="#AAA", font=("Arial", 10))
+        if cell_states is None:
+            cell_states = build_cell_states(self.chart_data)
+        for state in cell_states.values():
+            self._draw_cell(state)
+
+        self._cell_states = cell_states
+        self._drawn_chart_id = self.current_chart_id
+
+    @staticmethod
+    def _cell_tag(row, col):
+        return f"cell_{row}_{col}"
+
+    def _draw_cell(self, state):
+        """Desenha uma única célula; todos os itens recebem a tag da célula para poderem ser apagados juntos."""
+        x1, y1, x2, y2 = cell_bounds(state.row, state.col)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        tag = self._cell_tag(state.row, state.col)
+        fill, outline, label, label_color = CELL_STYLES.get(state.cell_type, CELL_STYLES["student_seat"])
+
+        if state.cell_type == "void":
+            # Draw nothing or faint outline
+            self.canvas.create_rectangle(x1, y1, x2, y2, outline=outline, dash=(2, 4), tags=tag)
+
+        elif state.cell_type == "door":
+            self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline=outline, tags=tag)
+            self.canvas.create_text(cx, cy, text=label, fill=label_color, font=("Arial", 12, "bold"), tags=tag)
+
+        elif state.cell_type == "teacher_desk":
+            self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline=outline, tags=tag)
+            self.canvas.create_text(cx, cy, text=label, justify="center", font=("Arial", 11), tags=tag)
+
+        else:
+            # Draw Seat
+            self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline=outline, tags=tag)
+
+            if state.student_id is not None:
+                call_str = f"{state.call_number}" if state.call_number is not None else "?"
+
+                # Display: Call Number (top left)
+                self.canvas.create_text(x1+8, y1+8, text=call_str, anchor="nw", fill="blue", font=("Arial", 10, "bold"), tags=tag)
+                self.canvas.create_text(cx, cy, text=display_name(state.student_name), justify="center", fill="black",
+                                        font=("Arial", 12), width=self.CELL_WIDTH-10, tags=tag)
+            else:
+                self.canvas.create_text(cx, cy, text="Vazio", fill="#AAA", font=("Arial", 10), tags=tag)
 
     def on_canvas_click(self, event):
         if not self.chart_data: return
@@ -369,8 +395,8 @@ class SeatingChartView(ctk.CTkFrame):
         # Ask user for format
         filepath = filedialog.asksaveasfilename(
             title="Exportar Mapa de Sala",
-            defaultextension=".pdf",
-            filetypes=[("PDF Document", "*.pdf"), ("Scalable Vector Graphics", "*.svg")],
+            defaultextension=".svg",
+            filetypes=[("Scalable Vector Graphics", "*.svg"), ("Texto", "*.txt")],
             initialfile=f"mapa_sala_{self.current_chart_id}"
         )
 
@@ -379,28 +405,15 @@ class SeatingChartView(ctk.CTkFrame):
         # Determine format from extension
         _, ext = os.path.splitext(filepath)
         fmt = ext.lower().replace('.', '')
-        if fmt not in ['pdf', 'svg']:
-            fmt = 'pdf' # Default
 
         try:
-            # We need to expose a method in report_service that accepts a path or returns content,
-            # currently it generates its own path.
-            # Ideally report service should allow overriding path.
-            # But since report_service methods return a path inside 'reports/', let's just generate it there
-            # and then move/copy it, or assume the user wants it in the reports folder if they didn't pick location?
-            # Actually, standard flow in this app seems to be auto-gen in reports/ folder.
-            # But since we are asking for a save location now (standard for "Export"), we should respect it.
-            # However, ReportService currently hardcodes path.
-
-            # Let's call the internal generator directly or update ReportService?
-            # Updating ReportService is cleaner but might touch more files.
-            # Let's just generate it using the existing method which returns a path, then rename/move it to user selection.
-
-            generated_path = self.report_service._generate_seating_chart_plot(self.current_chart_id, fmt)
-
-            # Move to selected path
-            import shutil
-            shutil.move(generated_path, filepath)
+            if fmt == 'txt':
+                generated_path = self.report_service.generate_seating_chart_pdf(self.current_chart_id)
+            else:
+                generated_path = self.report_service.generate_seating_chart_svg(self.current_chart_id)
+
+            # Copia (em vez de mover) para que o artefato em cache continue válido.
+            shutil.copyfile(generated_path, filepath)
 
             messagebox.showinfo("Sucesso", f"Mapa exportado com sucesso para:\n{filepath}")
 
@@ -0,0 +1,272 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+class ArtifactStore:
+    """
+    Armazena arquivos gerados (relatórios, gráficos) em um diretório com índice e retenção.
+
+    - Cada renderização recebe um caminho único (`new_path`), então escritores concorrentes
+      nunca sobrescrevem o arquivo um do outro.
+    - O índice (`index.json`) registra chave, tamanho e último acesso de cada artefato.
+    - A limpeza remove artefatos mais antigos que `max_age_seconds` e, em seguida, os menos
+      recentemente usados até o total caber em `max_bytes`. Ela roda em uma thread de fundo.
+    - `get` só marca o acesso em memória (é chamado na thread da interface); o índice é
+      gravado pelo próximo `put`, pela limpeza ou por `flush`.
+
+    Use `ArtifactStore.for_directory` para obter a instância compartilhada de um diretório,
+    de forma que todas as partes do processo usem a mesma trava e o mesmo índice.
+    """
+
+    INDEX_FILENAME = "index.json"
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+    DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600
+    CLEANUP_INTERVAL_SECONDS = 60
+    # Arquivos não indexados mais novos que isso podem ser renderizações em andamento.
+    UNTRACKED_GRACE_SECONDS = 300
+
+    _instances: dict[str, "ArtifactStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        # Serializa as gravações do índice, que acontecem fora de `_lock`. Ordem: _save_lock -> _lock.
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._index: dict[str, dict] | None = None
+        self._cleanup_thread: threading.Thread | None = None
+        self._last_cleanup = 0.0
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def for_directory(cls, root: str, **kwargs) -> "ArtifactStore":
+        """
+        Retorna a instância compartilhada para o diretório informado, criando-a se necessário.
+
+        :param root: Diretório dos artefatos.
+        :return: A instância de ArtifactStore do diretório.
+        """
+        key = os.path.abspath(root)
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls(root, **kwargs)
+                cls._instances[key] = store
+            return store
+
+    # --- Índice ---
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, self.INDEX_FILENAME)
+
+    def _load_index(self) -> dict:
+        """Carrega o índice do disco uma única vez. O chamador deve segurar a trava."""
+        if self._index is None:
+            try:
+                with open(self.index_path, encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        """
+        Grava o índice de forma atômica (arquivo temporário + os.replace). Não deve ser chamado
+        segurando `_lock`: a trava só protege a serialização, a escrita em disco acontece fora dela.
+        """
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self._load_index(), ensure_ascii=False, indent=2)
+                self._dirty = False
+            tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+
+    # --- API pública ---
+
+    def new_path(self, prefix: str, suffix: str) -> str:
+        """
+        Gera um caminho único dentro do diretório, sem criar o arquivo.
+
+        :param prefix: Prefixo legível do nome (ex: 'boletim_12').
+        :param suffix: Extensão com ponto (ex: '.txt').
+        :return: Caminho do novo arquivo.
+        """
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return os.path.join(self.root, f"{prefix}_{stamp}_{uuid.uuid4().hex[:8]}{suffix}")
+
+    def get(self, key: str) -> str | None:
+        """
+        Procura um artefato pela chave e marca o acesso (LRU) em memória, sem gravar o índice.
+
+        :param key: Chave do artefato.
+        :return: Caminho do arquivo, ou None se não existir mais.
+        """
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if not entry:
+                return None
+            if not os.path.exists(entry['path']):
+                # O arquivo foi apagado por fora: descarta a entrada.
+                del index[key]
+                self._dirty = True
+                return None
+            entry['last_access'] = time.time()
+            self._dirty = True
+        # A limpeza agendada (no máximo uma por intervalo) grava os acessos de quem só lê.
+        self.schedule_cleanup()
+        return entry['path']
+
+    def flush(self):
+        """Grava no disco os acessos marcados por `get` que ainda não foram persistidos."""
+        if self._dirty:
+            self._save_index()
+
+    def put(self, key: str, path: str, **metadata) -> str:
+        """
+        Registra um artefato recém-gerado e agenda a limpeza em segundo plano.
+
+        :param key: Chave do artefato (ex: hash de conteúdo do relatório).
+        :param path: Caminho do arquivo já gravado.
+        :param metadata: Campos extras guardados no índice (ex: kind, params).
+        :return: O próprio caminho, por conveniência.
+        """
+        now = time.time()
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        with self._lock:
+            index = self._load_index()
+            # Se a limpeza já havia adotado o arquivo como avulso, a entrada passa a ser esta.
+            index.pop(f"file:{os.path.basename(path)}", None)
+            index[key] = {
+                **metadata,
+                "path": path,
+                "size": size,
+                "created_at": datetime.now().isoformat(timespec='seconds'),
+                "last_access": now,
+            }
+        self._save_index()
+        self.schedule_cleanup()
+        return path
+
+    def entries(self, **filters) -> list[dict]:
+        """
+        Lista as entradas cujo arquivo ainda existe, das mais recentes para as mais antigas.
+
+        :param filters: Igualdades exigidas nos metadados (ex: kind='report_card').
+        :return: Lista de entradas, cada uma incluindo sua chave.
+        """
+        with self._lock:
+            index = self._load_index()
+            result = [dict(entry, key=key) for key, entry in index.items()
+                      if all(entry.get(k) == v for k, v in filters.items()) and os.path.exists(entry['path'])]
+        result.sort(key=lambda e: e['created_at'], reverse=True)
+        return result
+
+    # --- Retenção ---
+
+    def schedule_cleanup(self, force: bool = False) -> threading.Thread | None:
+        """
+        Dispara a limpeza em uma thread daemon. Chamadas concorrentes são agrupadas e,
+        salvo `force`, no máximo uma limpeza roda por CLEANUP_INTERVAL_SECONDS.
+
+        :param force: Ignora o intervalo mínimo entre limpezas.
+        :return: A thread de limpeza em andamento, ou None se nada foi agendado.
+        """
+        with self._lock:
+            if self._cleanup_thread and self._cleanup_thread.is_alive():
+                return self._cleanup_thread
+            if not force and time.time() - self._last_cleanup < self.CLEANUP_INTERVAL_SECONDS:
+                return None
+            self._last_cleanup = time.time()
+            self._cleanup_thread = threading.Thread(target=self.cleanup, name="artifact-store-cleanup", daemon=True)
+            self._cleanup_thread.start()
+            return self._cleanup_thread
+
+    def cleanup(self) -> list[str]:
+        """
+        Aplica a retenção: remove artefatos expirados e depois os menos usados até caber no limite de bytes.
+        Arquivos soltos no diretório (gerados antes do índice existir) também entram na conta,
+        usando a data de modificação como último acesso.
+
+        :return: Caminhos removidos.
+        """
+        now = time.time()
+        # A varredura do diretório e as remoções acontecem fora da trava, para não bloquear
+        # `get` (chamado na thread da interface); a trava só cobre leituras e mudanças do índice.
+        with self._lock:
+            snapshot = {k: dict(e) for k, e in self._load_index().items()}
+        untracked = self._scan_untracked_files(snapshot)
+        missing = {k for k, e in snapshot.items() if not os.path.exists(e['path'])}
+
+        with self._lock:
+            index = self._load_index()
+            for key, entry in untracked.items():
+                # Um put concorrente pode ter registrado o arquivo nesse meio-tempo.
+                if not any(os.path.abspath(e['path']) == os.path.abspath(entry['path']) for e in index.values()):
+                    index.setdefault(key, entry)
+            # Descarta entradas cujo arquivo sumiu (salvo se foram regravadas durante a varredura).
+            for key in missing:
+                if key in index and index[key]['path'] == snapshot[key]['path']:
+                    del index[key]
+
+            doomed = [k for k, e in index.items() if now - e['last_access'] > self.max_age_seconds]
+            remaining = sorted((k for k in index if k not in doomed), key=lambda k: index[k]['last_access'])
+            total = sum(index[k]['size'] for k in remaining)
+            while remaining and total > self.max_bytes:
+                key = remaining.pop(0)
+                total -= index[key]['size']
+                doomed.append(key)
+            doomed_paths = [index.pop(key)['path'] for key in doomed]
+
+        removed = []
+        for path in doomed_paths:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except FileNotFoundError:
+                pass
+        self._save_index()
+        return removed
+
+    def _scan_untracked_files(self, index: dict) -> dict[str, dict]:
+        """Entradas para os arquivos do diretório ausentes do índice, fora do período de carência."""
+        tracked = {os.path.abspath(e['path']) for e in index.values()}
+        cutoff = time.time() - self.UNTRACKED_GRACE_SECONDS
+        found = {}
+        for entry in os.scandir(self.root):
+            if not entry.is_file() or entry.name == self.INDEX_FILENAME or entry.name.endswith('.tmp'):
+                continue
+            if os.path.abspath(entry.path) in tracked:
+                continue
+            stat = entry.stat()
+            if stat.st_mtime > cutoff:
+                continue
+            found[f"file:{entry.name}"] = {
+                "path": entry.path,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds'),
+                "last_access": stat.st_mtime,
+            }
+        return found
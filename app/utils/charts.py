@@ -9,40 +9,47 @@
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 import matplotlib
-# Configura o backend 'Agg' antes de importar pyplot para evitar problemas com threads e GUI
+# Configura o backend 'Agg' antes de qualquer uso para evitar problemas com threads e GUI
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import os
 import tempfile
 from typing import List, Dict, Any, Union
 
-def create_grade_distribution_chart(data: Union[List[Dict[str, Any]], List[float]], course_name: str) -> str:
+# Diretório próprio para as imagens dos gráficos. Cada renderização ganha um arquivo único,
+# e o store limita o espaço ocupado (gráficos são descartáveis, então os limites são curtos).
+CHARTS_DIR = os.path.join(tempfile.gettempdir(), "academic_app_charts")
+CHARTS_MAX_BYTES = 20 * 1024 * 1024
+CHARTS_MAX_AGE_SECONDS = 24 * 3600
+
+
+def _extract_scores(data: Union[List[Dict[str, Any]], List[float]]) -> List[float]:
+    """Extrai os scores. Se for lista de dicts, extrai 'score'. Se for lista de floats, usa direto."""
+    if not data:
+        return []
+    if isinstance(data[0], dict):
+        return [min(d['score'], 10) for d in data]
+    return [min(v, 10) for v in data]
+
+
+def draw_grade_distribution(data: Union[List[Dict[str, Any]], List[float]], course_name: str) -> Figure:
     """
-    Gera e salva um gráfico da distribuição de notas (ou médias) de um curso específico.
-    O gráfico é salvo em um arquivo temporário e retorna o caminho para o arquivo salvo.
-    Caso não haja dados disponíveis, uma mensagem de aviso será exibida no gráfico.
+    Desenha a distribuição de notas (ou médias) de um curso em uma figura própria.
+    Usa a API orientada a objetos (Figure) em vez do estado global do pyplot, de modo que
+    cada renderização é isolada das demais.
 
     :param data: Lista de notas. Pode ser uma lista de dicionários (legado) contendo 'score',
                  ou uma lista direta de valores float (médias finais).
     :param course_name: Nome do curso cujas notas serão analisadas.
-    :return: Caminho do arquivo temporário onde o gráfico gerado foi salvo.
+    :return: A figura desenhada.
     """
-    # Create a temporary file path
-    temp_dir = tempfile.gettempdir()
-    output_path = os.path.join(temp_dir, "academic_app_chart.png")
-
-    fig, ax = plt.subplots()
+    fig = Figure()
+    ax = fig.subplots()
 
-    if not data:
+    scores = _extract_scores(data)
+    if not scores:
         ax.text(0.5, 0.5, 'Nenhum dado disponível para este curso.', horizontalalignment='center', verticalalignment='center')
     else:
-        # Extrai os scores. Se for lista de dicts, extrai 'score'. Se for lista de floats, usa direto.
-        scores = []
-        if isinstance(data[0], dict):
-             scores = [min(d['score'], 10) for d in data]
-        else:
-             scores = [min(v, 10) for v in data]
-
         ax.hist(scores, bins=10, range=(0, 10), edgecolor='black')
         ax.set_xlabel('Média Final')
         ax.set_ylabel('Número de Alunos')
@@ -50,24 +57,19 @@ def create_grade_distribution_chart(data: Union[List[Dict[str, Any]], List[float
         ax.set_xticks(range(0, 11, 1))
 
     ax.set_title(f'Distribuição de Médias para {course_name}')
+    return fig
 
-    plt.savefig(output_path)
-    plt.close(fig)
 
-    return output_path
-
-def create_approval_pie_chart(approved: int, failed: int) -> str:
+def draw_approval_pie(approved: int, failed: int) -> Figure:
     """
-    Gera um gráfico de pizza mostrando a proporção de aprovados vs reprovados.
+    Desenha um gráfico de pizza com a proporção de aprovados vs reprovados em uma figura própria.
 
     :param approved: Número de aprovações.
     :param failed: Número de reprovações.
-    :return: Caminho do arquivo temporário com a imagem.
+    :return: A figura desenhada.
     """
-    temp_dir = tempfile.gettempdir()
-    output_path = os.path.join(temp_dir, "academic_app_pie_chart.png")
-
-    fig, ax = plt.subplots(figsize=(5, 4))
+    fig = Figure(figsize=(5, 4))
+    ax = fig.subplots()
 
     total = approved + failed
     if total == 0:
@@ -82,12 +84,35 @@ def create_approval_pie_chart(approved: int, failed: int) -> str:
         labels = [l if s > 0 else '' for l, s in zip(labels, sizes)]
 
         ax.pie(sizes, labels=labels, colors=colors, autopct=lambda p: f'{p:.1f}%' if p > 0 else '',
-               startangle=90, textprops={'color':"white" if plt.rcParams['figure.facecolor'] == 'black' else 'black'})
+               startangle=90, textprops={'color':"white" if matplotlib.rcParams['figure.facecolor'] == 'black' else 'black'})
         ax.axis('equal')
 
     # Set transparent background to blend with CustomTkinter dark theme
     fig.patch.set_alpha(0.0)
+    return fig
+
 
-    plt.savefig(output_path, transparent=True)
-    plt.close(fig)
-    return output_path
+def create_grade_distribution_chart(data: Union[List[Dict[str, Any]], List[float]], course_name: str) -> str:
+    """
+    Gera e salva um gráfico da distribuição de notas (ou médias) de um curso específico.
+    A renderização acontece no worker do ChartRenderer e o resultado fica em cache pelo
+    hash dos dados; esta função bloqueia até o arquivo estar pronto.
+
+    :param data: Lista de notas (dicts com 'score' ou floats).
+    :param course_name: Nome do curso cujas notas serão analisadas.
+    :return: Caminho do arquivo onde o gráfico gerado foi salvo.
+    """
+    from app.services.chart_renderer import get_chart_renderer
+    return get_chart_renderer().render("grade_distribution", _extract_scores(data), course_name=course_name)
+
+
+def create_approval_pie_chart(approved: int, failed: int) -> str:
+    """
+    Gera um gráfico de pizza mostrando a proporção de aprovados vs reprovados.
+
+    :param approved: Número de aprovações.
+    :param failed: Número de reprovações.
+    :return: Caminho do arquivo com a imagem.
+    """
+    from app.services.chart_renderer import get_chart_renderer
+    return get_chart_renderer().render("approval_pie", {"approved": approved, "failed": failed})
@@ -0,0 +1,164 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import json
+from typing import NamedTuple
+from xml.sax.saxutils import escape
+
+# Geometria compartilhada entre o canvas do Tk e o SVG exportado.
+CELL_WIDTH = 140
+CELL_HEIGHT = 80
+PADDING = 20
+
+# Aparência de cada tipo de célula: (preenchimento, contorno, rótulo, cor do rótulo).
+CELL_STYLES = {
+    "student_seat": ("white", "black", None, "black"),
+    "teacher_desk": ("#D3D3D3", "black", "Mesa\nProf.", "black"),
+    "door": ("#8B4513", "black", "Porta", "white"),
+    "void": (None, "#333", None, None),
+}
+
+
+class CellState(NamedTuple):
+    """
+    Conteúdo visível de uma célula do mapa de sala. Duas células com o mesmo estado
+    são desenhadas de forma idêntica, o que permite redesenhar apenas as que mudaram.
+    """
+    row: int
+    col: int
+    cell_type: str
+    student_id: int | None = None
+    student_name: str | None = None
+    call_number: int | None = None
+
+
+def parse_layout_config(layout_config) -> dict:
+    """Converte o JSON de layout_config em dicionário, tolerando valores vazios ou inválidos."""
+    if isinstance(layout_config, dict):
+        return layout_config
+    try:
+        return json.loads(layout_config or '{}')
+    except json.JSONDecodeError:
+        return {}
+
+
+def build_cell_states(chart_details: dict) -> dict[tuple[int, int], CellState]:
+    """
+    Monta o estado de todas as células a partir de get_seating_chart_details.
+
+    :param chart_details: Dicionário com rows, columns, layout_config e assignments.
+    :return: Mapa (linha, coluna) -> CellState.
+    """
+    layout_config = parse_layout_config(chart_details.get('layout_config'))
+    assigned_map = {(a['row_index'], a['col_index']): a for a in chart_details.get('assignments', [])}
+
+    cells = {}
+    for r in range(chart_details['rows']):
+        for c in range(chart_details['columns']):
+            cell_type = layout_config.get(f"{r},{c}", "student_seat")
+            assignment = assigned_map.get((r, c)) if cell_type == "student_seat" else None
+            if assignment:
+                cells[(r, c)] = CellState(r, c, cell_type, assignment['student_id'],
+                                          assignment['student_name'], assignment.get('call_number'))
+            else:
+                cells[(r, c)] = CellState(r, c, cell_type)
+    return cells
+
+
+def diff_cells(old: dict[tuple[int, int], CellState] | None,
+               new: dict[tuple[int, int], CellState]) -> list[tuple[int, int]] | None:
+    """
+    Lista as células cuja aparência mudou entre dois estados do mesmo mapa.
+
+    :param old: Estado anterior (ou None se nada foi desenhado ainda).
+    :param new: Estado atual.
+    :return: Coordenadas a repintar, em ordem; None quando as dimensões mudaram
+             (ou não havia estado anterior) e o mapa inteiro precisa ser redesenhado.
+    """
+    if old is None or old.keys() != new.keys():
+        return None
+    return sorted(key for key, state in new.items() if old[key] != state)
+
+
+def cell_bounds(row: int, col: int) -> tuple[int, int, int, int]:
+    """Retorna (x1, y1, x2, y2) da célula."""
+    x1 = PADDING + col * CELL_WIDTH
+    y1 = PADDING + row * CELL_HEIGHT
+    return x1, y1, x1 + CELL_WIDTH, y1 + CELL_HEIGHT
+
+
+def display_name(name: str) -> str:
+    """Primeiro e último nome em linhas separadas, para caber na carteira."""
+    parts = name.split()
+    if len(parts) >= 2:
+        return f"{parts[0]}\n{parts[-1]}"
+    return name
+
+
+def _svg_text(x: float, y: float, text: str, size: int, fill: str, weight: str = "normal", anchor: str = "middle") -> str:
+    lines = text.split("\n")
+    # Centraliza verticalmente blocos de várias linhas em torno de y.
+    first_dy = -(len(lines) - 1) * 0.6
+    spans = "".join(
+        f'<tspan x="{x}" dy="{first_dy if i == 0 else 1.2}em">{escape(line)}</tspan>'
+        for i, line in enumerate(lines)
+    )
+    return (f'<text x="{x}" y="{y}" font-family="Arial, sans-serif" font-size="{size}" font-weight="{weight}" '
+            f'fill="{fill}" text-anchor="{anchor}" dominant-baseline="central">{spans}</text>')
+
+
+def render_cell_svg(state: CellState) -> str:
+    """Gera os elementos SVG de uma célula (um <g> identificado pela posição)."""
+    x1, y1, x2, y2 = cell_bounds(state.row, state.col)
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    fill, outline, label, label_color = CELL_STYLES.get(state.cell_type, CELL_STYLES["student_seat"])
+
+    parts = [f'<g id="cell-{state.row}-{state.col}" class="{state.cell_type}">']
+    if fill is None:
+        parts.append(f'<rect x="{x1}" y="{y1}" width="{CELL_WIDTH}" height="{CELL_HEIGHT}" fill="none" stroke="{outline}" stroke-dasharray="2,4"/>')
+    else:
+        parts.append(f'<rect x="{x1}" y="{y1}" width="{CELL_WIDTH}" height="{CELL_HEIGHT}" fill="{fill}" stroke="{outline}"/>')
+
+    if state.cell_type == "student_seat":
+        if state.student_id is not None:
+            call_str = f"{state.call_number}" if state.call_number is not None else "?"
+            parts.append(_svg_text(x1 + 8, y1 + 14, call_str, 10, "blue", "bold", "start"))
+            parts.append(_svg_text(cx, cy, display_name(state.student_name), 12, "black"))
+        else:
+            parts.append(_svg_text(cx, cy, "Vazio", 10, "#AAA"))
+    elif label:
+        parts.append(_svg_text(cx, cy, label, 12 if state.cell_type == "door" else 11, label_color,
+                               "bold" if state.cell_type == "door" else "normal"))
+    parts.append('</g>')
+    return "".join(parts)
+
+
+def render_seating_chart_svg(chart_details: dict) -> str:
+    """
+    Desenha o mapa de sala completo como documento SVG (vetorial, pronto para impressão).
+
+    :param chart_details: Resultado de get_seating_chart_details.
+    :return: O conteúdo SVG.
+    """
+    rows, cols = chart_details['rows'], chart_details['columns']
+    width = cols * CELL_WIDTH + PADDING * 2
+    height = rows * CELL_HEIGHT + PADDING * 2 + 30
+
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        f'<title>{escape(chart_details["name"])}</title>',
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+        _svg_text(PADDING, height - 15, f"Mapa de Sala: {chart_details['name']}", 14, "black", "bold", "start"),
+    ]
+    for state in build_cell_states(chart_details).values():
+        out.append(render_cell_svg(state))
+    out.append('</svg>')
+    return "\n".join(out)
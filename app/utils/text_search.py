@@ -0,0 +1,312 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import heapq
+import re
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Palavras muito frequentes que não ajudam a filtrar resultados.
+STOPWORDS = frozenset({
+    "a", "o", "e", "as", "os", "um", "uma", "de", "da", "do", "das", "dos", "em", "no", "na",
+    "nos", "nas", "ao", "aos", "para", "por", "com", "que", "se", "ou", "seu", "sua", "seus", "suas",
+})
+
+# Plurais (aplicados primeiro) e sufixos derivacionais, do mais longo para o mais curto.
+_PLURAL_RULES = (("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("res", "r"),
+                 ("zes", "z"), ("ns", "m"), ("s", ""))
+_SUFFIXES = ("amento", "imento", "mente", "idade", "acao", "icao", "ador", "ante", "ismo", "ista",
+             "avel", "ivel", "cao", "ico", "ica", "ivo", "iva", "oso", "osa", "ar", "er", "ir",
+             "a", "o", "e")
+_MIN_STEM = 3
+
+# Palavras da consulta sem nenhuma ocorrência no índice são trocadas pelas palavras mais
+# parecidas do vocabulário (erros de digitação): no máximo FUZZY_MAX_TERMS, com semelhança
+# mínima FUZZY_MIN_SIMILARITY e não muito abaixo da melhor (FUZZY_RELATIVE_CUTOFF), para que
+# 'matematca' vire só 'matematica' e não também 'materia'.
+FUZZY_MIN_SIMILARITY = 0.3
+FUZZY_MAX_TERMS = 3
+FUZZY_RELATIVE_CUTOFF = 0.8
+
+
+def fold_accents(text: str) -> str:
+    """Converte para minúsculas e remove acentos ('Matemática' -> 'matematica')."""
+    # Após a decomposição NFKD os acentos viram caracteres combinantes, descartados na conversão para ASCII.
+    return unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore").decode("ascii")
+
+
+def tokenize(text: str) -> list[str]:
+    """Divide o texto em palavras minúsculas e sem acento."""
+    return _TOKEN_RE.findall(fold_accents(text))
+
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word: str) -> frozenset[str]:
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigramas das palavras do texto (minúsculas e sem acento). Cada palavra recebe dois
+    espaços antes e um depois, como no pg_trgm, para que o início da palavra pese mais.
+    """
+    # Nomes repetem muito as mesmas palavras, então os trigramas de cada palavra ficam em cache.
+    return set().union(*map(_word_trigrams, tokenize(text)))
+
+
+def stem_pt(word: str) -> str:
+    """
+    Radical aproximado de uma palavra em português (já sem acentos).
+    É um stemmer leve: remove o plural e um sufixo comum, o suficiente para que
+    'matemática', 'matemáticas' e 'matemático' caiam no mesmo termo de busca.
+    """
+    for suffix, replacement in _PLURAL_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= _MIN_STEM:
+            word = word[:-len(suffix)] + replacement
+            break
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+class InvertedIndex:
+    """
+    Índice invertido em memória para busca por palavras em campos de texto.
+
+    Cada documento é identificado pela sua posição (0..n-1). Para cada radical, o índice guarda
+    os documentos que o contêm e, por documento, uma máscara de bits dos campos onde aparece.
+    O vocabulário (palavras originais, sem acento) fica ordenado para responder consultas por
+    prefixo com busca binária, de modo que a última palavra digitada possa estar incompleta.
+
+    O índice tem duas fases: durante a montagem usa dicionários; na primeira busca (ou em
+    `freeze`) é compactado em poucos arrays contíguos (radicais ordenados, deslocamentos,
+    documentos e máscaras), que ocupam uma fração da memória e não aceitam mais documentos.
+    Nessa fase o vocabulário também ganha um TrigramIndex, usado na busca tolerante a erros.
+    """
+    __slots__ = ("fields", "_field_bits", "_building", "_word_stems", "_stems", "_offsets",
+                 "_doc_ids", "_masks", "_vocabulary", "_vocabulary_stem_ids", "_vocabulary_trigrams", "size")
+
+    def __init__(self, fields: tuple[str, ...]):
+        self.fields = fields
+        self._field_bits = {name: 1 << i for i, name in enumerate(fields)}
+        # Fase de montagem: radical -> {doc_id: máscara}; palavra -> radical.
+        self._building: dict[str, dict[int, int]] | None = {}
+        self._word_stems: dict[str, str] | None = {}
+        # Fase compacta: os documentos do radical _stems[i] são _doc_ids[_offsets[i]:_offsets[i + 1]]
+        # (máscaras nas mesmas posições de _masks); cada palavra do vocabulário aponta para seu radical.
+        self._stems: list[str] = []
+        self._offsets = array("I", [0])
+        self._doc_ids = array("I")
+        self._masks = b""
+        self._vocabulary: list[str] = []
+        self._vocabulary_stem_ids = array("I")
+        self._vocabulary_trigrams: TrigramIndex | None = None
+        self.size = 0
+
+    def add(self, doc_id: int, **texts: str):
+        """
+        Indexa um documento.
+
+        :param doc_id: Posição do documento.
+        :param texts: Texto de cada campo (nome do campo -> texto).
+        """
+        for field, text in texts.items():
+            self.add_words(doc_id, field, tokenize(text or ""))
+
+    def add_words(self, doc_id: int, field: str, words: list[str]):
+        """Indexa palavras já tokenizadas (ver `tokenize`) de um campo do documento."""
+        if self._building is None:
+            raise RuntimeError("InvertedIndex is frozen; documents can only be added before the first search.")
+        bit = self._field_bits[field]
+        for word in words:
+            if word in STOPWORDS:
+                continue
+            stem = self._word_stems.get(word)
+            if stem is None:
+                stem = self._word_stems[word] = sys.intern(stem_pt(word))
+            docs = self._building.setdefault(stem, {})
+            docs[doc_id] = docs.get(doc_id, 0) | bit
+        self.size = max(self.size, doc_id + 1)
+
+    def freeze(self):
+        """Compacta o índice em arrays contíguos. Depois disso não é possível adicionar documentos."""
+        if self._building is None:
+            return
+        self._stems = sorted(self._building)
+        self._offsets = array("I", [0])
+        self._doc_ids = array("H" if self.size <= 0xFFFF else "I")
+        masks = bytearray()
+        for stem in self._stems:
+            docs = self._building[stem]
+            doc_ids = sorted(docs)
+            self._doc_ids.extend(doc_ids)
+            masks.extend(docs[d] for d in doc_ids)
+            self._offsets.append(len(self._doc_ids))
+        self._masks = bytes(masks)
+
+        stem_ids = {stem: i for i, stem in enumerate(self._stems)}
+        self._vocabulary = sorted(self._word_stems)
+        self._vocabulary_stem_ids = array("I", (stem_ids[self._word_stems[w]] for w in self._vocabulary))
+        self._vocabulary_trigrams = TrigramIndex()
+        for word_id, word in enumerate(self._vocabulary):
+            self._vocabulary_trigrams.add(word_id, word)
+        self._vocabulary_trigrams.freeze()
+        self._building = None
+        self._word_stems = None
+
+    def _stem_id(self, stem: str) -> int | None:
+        i = bisect_left(self._stems, stem)
+        return i if i < len(self._stems) and self._stems[i] == stem else None
+
+    def _prefix_stem_ids(self, prefix: str) -> set[int]:
+        stem_ids = set()
+        i = bisect_left(self._vocabulary, prefix)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(prefix):
+            stem_ids.add(self._vocabulary_stem_ids[i])
+            i += 1
+        return stem_ids
+
+    def _similar_stem_ids(self, word: str) -> set[int]:
+        similar = self._vocabulary_trigrams.search(word, limit=FUZZY_MAX_TERMS, min_similarity=FUZZY_MIN_SIMILARITY)
+        if not similar:
+            return set()
+        cutoff = similar[0][1] * FUZZY_RELATIVE_CUTOFF
+        return {self._vocabulary_stem_ids[word_id] for word_id, score in similar if score >= cutoff}
+
+    def _term_matches(self, word: str, prefix: bool, fuzzy: bool = False) -> dict[int, int]:
+        """Documentos (com máscara de campos) que casam com uma palavra da consulta."""
+        stem_ids = self._prefix_stem_ids(word) if prefix else set()
+        exact = self._stem_id(stem_pt(word))
+        if exact is not None:
+            stem_ids.add(exact)
+        if not stem_ids and fuzzy:
+            stem_ids = self._similar_stem_ids(word)
+        matches: dict[int, int] = {}
+        for stem_id in stem_ids:
+            start, end = self._offsets[stem_id], self._offsets[stem_id + 1]
+            for doc_id, mask in zip(self._doc_ids[start:end], self._masks[start:end]):
+                matches[doc_id] = matches.get(doc_id, 0) | mask
+        return matches
+
+    def search(self, query: str, fuzzy: bool = False) -> dict[int, list[int]] | None:
+        """
+        Encontra os documentos que contêm todas as palavras da consulta. A última palavra é
+        tratada como prefixo, a não ser que a consulta termine com espaço.
+
+        :param query: Texto digitado.
+        :param fuzzy: Troca palavras sem nenhuma ocorrência pelas mais parecidas do vocabulário
+                      (ex: 'matematca' -> 'matematica').
+        :return: doc_id -> máscaras de campo de cada palavra da consulta (na ordem da consulta);
+                 None se a consulta não tiver palavras úteis (nenhum filtro por texto).
+        """
+        self.freeze()
+        words = [w for w in tokenize(query) if w not in STOPWORDS]
+        if not words:
+            return None
+        last_is_prefix = not query[-1:].isspace()
+
+        result: dict[int, list[int]] | None = None
+        for i, word in enumerate(words):
+            matches = self._term_matches(word, prefix=last_is_prefix and i == len(words) - 1, fuzzy=fuzzy)
+            if result is None:
+                result = {doc_id: [mask] for doc_id, mask in matches.items()}
+            else:
+                result = {doc_id: masks + [matches[doc_id]] for doc_id, masks in result.items() if doc_id in matches}
+            if not result:
+                break
+        return result
+
+    def field_bit(self, field: str) -> int:
+        return self._field_bits[field]
+
+
+class TrigramIndex:
+    """
+    Índice de similaridade por trigramas (ver `trigrams`), para textos curtos como nomes
+    ou palavras. Encontra os documentos mais parecidos com a consulta mesmo com erros de
+    digitação, letras trocadas ou acentos faltando.
+
+    A semelhança é a de Jaccard entre os conjuntos de trigramas (1.0 = iguais). Como no
+    InvertedIndex, os documentos são posições (0..n-1) e o índice é compactado em arrays
+    na primeira busca (ou em `freeze`), quando deixa de aceitar documentos.
+    """
+    __slots__ = ("_building", "_postings", "_sizes")
+
+    def __init__(self):
+        self._building: defaultdict[str, list[int]] | None = defaultdict(list)
+        # Fase compacta: trigrama -> documentos que o contêm.
+        self._postings: dict[str, array] = {}
+        # Quantidade de trigramas distintos de cada documento.
+        self._sizes = array("H")
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add(self, doc_id: int, text: str):
+        """
+        Indexa um documento.
+
+        :param doc_id: Posição do documento.
+        :param text: Texto do documento.
+        """
+        if self._building is None:
+            raise RuntimeError("TrigramIndex is frozen; documents can only be added before the first search.")
+        grams = trigrams(text or "")
+        if doc_id >= len(self._sizes):
+            self._sizes.extend([0] * (doc_id + 1 - len(self._sizes)))
+        self._sizes[doc_id] = min(len(grams), 0xFFFF)
+        building = self._building
+        for gram in grams:
+            building[gram].append(doc_id)
+
+    def freeze(self):
+        """Compacta o índice. Depois disso não é possível adicionar documentos."""
+        if self._building is None:
+            return
+        typecode = "H" if len(self._sizes) <= 0xFFFF else "I"
+        self._postings = {sys.intern(gram): array(typecode, doc_ids) for gram, doc_ids in self._building.items()}
+        self._building = None
+
+    def search(self, query: str, limit: int = 10, min_similarity: float = 0.3) -> list[tuple[int, float]]:
+        """
+        Documentos mais parecidos com a consulta.
+
+        :param query: Texto digitado.
+        :param limit: Quantidade máxima de resultados.
+        :param min_similarity: Semelhança mínima (0 a 1) para um documento entrar no resultado.
+        :return: (doc_id, semelhança), do mais parecido para o menos parecido; empates pela posição.
+        """
+        self.freeze()
+        grams = trigrams(query)
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            doc_ids = self._postings.get(gram)
+            if doc_ids:
+                shared.update(doc_ids)
+
+        # Jaccard >= s exige ao menos s * |consulta| trigramas em comum, o que descarta
+        # a maioria dos candidatos antes de calcular a semelhança.
+        query_size = len(grams)
+        min_shared = min_similarity * query_size
+        sizes = self._sizes
+        scored = ((count / (query_size + sizes[doc_id] - count), doc_id)
+                  for doc_id, count in shared.items() if count >= min_shared)
+        best = heapq.nlargest(limit, scored, key=lambda item: (item[0], -item[1]))
+        return [(doc_id, score) for score, doc_id in best if score >= min_similarity]
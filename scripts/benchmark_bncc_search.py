@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+"""
+Mede a carga dos dados da BNCC (com e sem o cache compilado, por etapa), a memória que
+eles ocupam (tracemalloc) e a latência por tecla da busca de habilidades.
+
+Simula a digitação de algumas consultas, letra por letra, e compara a varredura linear
+antiga (todas as habilidades, substring em código, descrição e título) com o índice
+invertido de BNCCService.search_skills.
+
+Uso: python scripts/benchmark_bncc_search.py
+"""
+import gc
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.bncc_service import BNCCService, STAGES
+
+QUERIES = ["matemática frações", "EF05MA0", "leitura e escrita", "números naturais"]
+REPEAT = 20
+
+
+def linear_search(query: str) -> list[dict]:
+    """Implementação anterior ao índice, mantida aqui como referência."""
+    results = []
+    query = query.lower().strip()
+    for group in BNCCService.load_data():
+        group_title = group.get('title', '')
+        for item in group.get('itens', []):
+            code = item.get('code', '')
+            description = item.get('description', '')
+            if not query or (query in code.lower() or query in description.lower() or query in group_title.lower()):
+                results.append({"code": code, "description": description, "title": group_title})
+    return results
+
+
+def keystrokes(query: str) -> list[str]:
+    return [query[:i] for i in range(1, len(query) + 1)]
+
+
+def measure(search) -> list[float]:
+    """Tempo (ms) de cada tecla digitada, pegando a menor de REPEAT medições."""
+    timings = []
+    for query in QUERIES:
+        for partial in keystrokes(query):
+            best = float("inf")
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                search(partial)
+                best = min(best, time.perf_counter() - start)
+            timings.append(best * 1000)
+    return timings
+
+
+def measure_loading():
+    """Carga de cada etapa sem cache (JSON + índice) e com o cache compilado, em um diretório temporário."""
+    original_cache_dir = BNCCService.CACHE_DIR
+    with tempfile.TemporaryDirectory() as cache_dir:
+        BNCCService.CACHE_DIR = cache_dir
+        try:
+            for label in ("sem cache", "cache compilado"):
+                BNCCService.clear_loaded()
+                parts = []
+                gc.collect()
+                tracemalloc.start()
+                for stage in STAGES:
+                    start = time.perf_counter()
+                    BNCCService.load_stage(stage)
+                    parts.append(f"{stage} {(time.perf_counter() - start) * 1000:.1f} ms")
+                gc.collect()
+                retained, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"Carga ({label}): " + " | ".join(parts))
+                print(f"  memória retida {retained / 1e6:.2f} MB | pico {peak / 1e6:.2f} MB")
+        finally:
+            BNCCService.CACHE_DIR = original_cache_dir
+            BNCCService.clear_loaded()
+
+
+def main():
+    measure_loading()
+    BNCCService.load_data()
+    print(f"{len(BNCCService.search_skills())} habilidades")
+
+    for label, search in (("varredura linear", linear_search),
+                          ("índice invertido", BNCCService.search_skills),
+                          ("índice invertido (limit=50)", lambda q: BNCCService.search_skills(q, limit=50))):
+        timings = measure(search)
+        print(f"{label:<28} média {statistics.mean(timings):7.3f} ms | "
+              f"mediana {statistics.median(timings):7.3f} ms | máx {max(timings):7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+"""
+Simula uma sessão de 50 turnos com o assistente, cada um com uma chamada de ferramenta que
+devolve um JSON grande (como os detalhes completos de uma turma), e mede o tamanho do prompt
+(tokens estimados e bytes da requisição) e a latência de cada chamada ao modelo, com o
+histórico completo e com a ConversationMemory.
+
+O modelo é um servidor local compatível com a API da OpenAI que espera um tempo proporcional
+ao tamanho do prompt (PREFILL_TOKENS_PER_SECOND), imitando o custo de processar o contexto.
+
+Uso: python scripts/benchmark_conversation_memory.py
+"""
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.llm.conversation_memory import ConversationMemory, context_budget, estimate_tokens
+from app.core.llm.ollama_provider import OllamaProvider
+
+TURNS = 50
+PREFILL_TOKENS_PER_SECOND = 20000
+SYSTEM_PROMPT = "Você é um assistente de gestão acadêmica. " * 20
+CLASS_DETAILS = json.dumps({
+    "turma": "7A",
+    "alunos": [{"id": i, "nome": f"Aluno {i:03d} da Silva", "situacao": "Ativo", "media": 7.5} for i in range(40)],
+    "disciplinas": [{"nome": f"Disciplina {i}", "avaliacoes": 4, "aulas": 30} for i in range(8)],
+}, ensure_ascii=False)
+bytes_received = []
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        bytes_received.append(len(raw))
+        time.sleep(len(raw) / 4 / PREFILL_TOKENS_PER_SECOND)
+        body = json.dumps({"id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                           "choices": [{"index": 0, "finish_reason": "stop",
+                                        "message": {"role": "assistant", "content": "A turma 7A tem 40 alunos."}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def session(provider, memory: ConversationMemory | None) -> list[tuple[int, int, float]]:
+    """(tokens estimados, bytes, ms) de cada chamada ao modelo."""
+    budget = context_budget("Ollama", provider.model)
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    calls = []
+
+    async def call():
+        nonlocal messages
+        if memory:
+            messages = memory.compact(messages, budget)
+        tokens = sum(estimate_tokens(m) for m in messages)
+        start = time.perf_counter()
+        response = await provider.get_chat_response(messages)
+        calls.append((tokens, bytes_received[-1], (time.perf_counter() - start) * 1000))
+        return response
+
+    for turn in range(1, TURNS + 1):
+        messages.append({"role": "user", "content": f"Mostre os detalhes da turma 7A (pergunta {turn})."})
+        await call()
+        tool_call = {"id": f"call_{turn}", "type": "function",
+                     "function": {"name": "get_class_full_details_tool", "arguments": '{"class_name": "7A"}'}}
+        messages.append({"role": "assistant", "tool_calls": [tool_call]})
+        messages.append({"role": "tool", "tool_call_id": f"call_{turn}", "name": "get_class_full_details_tool",
+                         "content": CLASS_DETAILS})
+        response = await call()
+        messages.append({"role": "assistant", "content": response.content})
+    return calls
+
+
+async def main(url: str):
+    provider = OllamaProvider(base_url=url, model="llama3.1")
+    await provider.get_chat_response([{"role": "user", "content": "aquecimento"}])
+    print(f"{TURNS} turnos, resultado de ferramenta com {len(CLASS_DETAILS)} caracteres, "
+          f"orçamento {context_budget('Ollama', 'llama3.1')} tokens")
+    for label, memory in (("histórico completo", None), ("ConversationMemory", ConversationMemory())):
+        calls = await session(provider, memory)
+        per_turn = [calls[i + 1] for i in range(0, len(calls), 2)]
+        marks = " | ".join(f"turno {t}: {per_turn[t - 1][0]:6d} tok {per_turn[t - 1][2]:6.1f} ms" for t in (1, 10, 25, 50))
+        print(f"{label:<19} {marks}")
+        print(f"{'':<19} total enviado {sum(c[1] for c in calls) / 1e6:6.2f} MB | "
+              f"latência média {statistics.mean(c[2] for c in calls):6.1f} ms | "
+              f"soma {sum(c[2] for c in calls) / 1000:5.2f} s")
+    await provider.close()
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    asyncio.run(main(f"http://127.0.0.1:{server.server_port}/v1"))
+    server.shutdown()
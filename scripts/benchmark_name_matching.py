@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+"""
+Mede a busca aproximada (trigramas) de nomes de alunos e de habilidades da BNCC.
+
+Cria um banco SQLite em memória com 50 mil alunos sintéticos e compara, para nomes
+digitados com erros e sem acento, a varredura com difflib (comparação com todos os nomes)
+e o TrigramIndex usado por StudentService.find_students_by_name. Para a BNCC, mede consultas
+com erros de digitação em BNCCService.search_skills.
+
+Uso: python scripts/benchmark_name_matching.py
+"""
+import difflib
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registra todas as tabelas na Base)
+from app.models.base import Base
+from app.models.student import Student
+from app.services.bncc_service import BNCCService
+from app.services.data_service import DataService
+from app.utils.text_search import fold_accents
+
+STUDENT_COUNT = 50_000
+FIRST_NAMES = ["João", "Maria", "Ana", "Pedro", "Lucas", "Júlia", "Gabriel", "Beatriz", "Rafael", "Letícia",
+               "Matheus", "Larissa", "Felipe", "Camila", "Gustavo", "Fernanda", "Thiago", "Mariana", "Caio", "Sofia"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+              "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa"]
+STUDENT_QUERIES = 20
+BNCC_QUERIES = ["matematca", "probabilidde e estatistica", "leitrua", "geometira plana", "ortografai"]
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Remove os acentos e troca uma letra, como um nome digitado às pressas."""
+    name = fold_accents(name)
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice("aeiourst") + name[i + 1:]
+
+
+def build_students(session, rng: random.Random) -> list[str]:
+    names = []
+    rows = []
+    for i in range(STUDENT_COUNT):
+        first = rng.choice(FIRST_NAMES)
+        last = f"{rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+        names.append(f"{first} {last}")
+        rows.append({"first_name": first, "last_name": last, "enrollment_date": "2025-02-01"})
+    session.execute(insert(Student), rows)
+    session.commit()
+    return names
+
+
+def main():
+    rng = random.Random(42)
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    names = build_students(session, rng)
+    data_service = DataService(db_session=session)
+    queries = [misspell(rng.choice(names), rng) for _ in range(STUDENT_QUERIES)]
+
+    start = time.perf_counter()
+    data_service.find_students_by_name(queries[0])
+    print(f"{STUDENT_COUNT} alunos | montagem do índice de nomes: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    folded = [fold_accents(n) for n in names]
+    timings = {"difflib (varredura)": [], "índice de trigramas": []}
+    for query in queries:
+        start = time.perf_counter()
+        difflib.get_close_matches(query, folded, n=5, cutoff=0.6)
+        timings["difflib (varredura)"].append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        data_service.find_students_by_name(query)
+        timings["índice de trigramas"].append((time.perf_counter() - start) * 1000)
+    for label, values in timings.items():
+        print(f"{label:<22} média {statistics.mean(values):8.2f} ms | máx {max(values):8.2f} ms")
+
+    BNCCService.load_data()
+    for query in BNCC_QUERIES:
+        start = time.perf_counter()
+        results = BNCCService.search_skills(query, limit=20)
+        print(f"BNCC '{query}': {(time.perf_counter() - start) * 1000:.2f} ms, {len(results)} resultados")
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+"""
+Mede a latência de mensagens consecutivas ao assistente contra um servidor local que imita a
+API de chat compatível com a OpenAI (resposta fixa, sem rede externa).
+
+Compara o caminho antigo (a cada mensagem: duas leituras do config.json, um novo provedor e um
+novo AsyncOpenAI, com um novo pool de conexões) com o ProviderManager, que reaproveita o
+provedor enquanto as configurações não mudam. Também mede o custo de uma leitura de chave no
+keyring, que o caminho antigo fazia a cada mensagem para os provedores com chave.
+
+Uso: python scripts/benchmark_provider_reuse.py
+"""
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.core.config as config
+import app.core.llm.provider_manager as provider_manager
+from app.core.llm.ollama_provider import OllamaProvider
+from app.core.llm.provider_manager import ProviderManager
+from app.core.security.credentials import get_api_key
+
+MESSAGES = 50
+COMPLETION = {
+    "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": "stub",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": "Olá!"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def measure(get_provider) -> list[float]:
+    """Tempo (ms) de cada mensagem: obter o provedor e uma chamada de chat."""
+    timings = []
+    history = [{"role": "system", "content": "Você é um assistente."}]
+    for i in range(MESSAGES):
+        start = time.perf_counter()
+        provider = get_provider()
+        await provider.get_chat_response(history + [{"role": "user", "content": f"Mensagem {i}"}])
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def run(url: str):
+    old_clients = []
+
+    def rebuild_every_message():
+        # Caminho anterior de AssistantService._initialize_provider para o Ollama.
+        config.load_setting("active_provider", "OpenAI")
+        provider = OllamaProvider(base_url=config.load_setting("ollama_url"),
+                                  model=config.load_setting("ollama_model", "llama3.1"))
+        old_clients.append(provider)
+        return provider
+
+    manager = ProviderManager()
+    for label, get_provider in (("recriando a cada mensagem", rebuild_every_message),
+                                ("ProviderManager", manager.get_provider)):
+        timings = await measure(get_provider)
+        print(f"{label:<26} primeira {timings[0]:7.2f} ms | mediana {statistics.median(timings[1:]):6.2f} ms | "
+              f"média {statistics.mean(timings[1:]):6.2f} ms")
+
+    for provider in old_clients:
+        await provider.close()
+    await manager.close()
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1"
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        config_file = Path(config_dir) / "config.json"
+        config.CONFIG_FILE = provider_manager.CONFIG_FILE = config_file
+        config.save_config({"active_provider": "Ollama", "ollama_url": url, "ollama_model": "stub"})
+        print(f"{MESSAGES} mensagens consecutivas contra {url}")
+        asyncio.run(run(url))
+
+    start = time.perf_counter()
+    get_api_key("OpenAI")
+    print(f"Leitura de chave no keyring: {(time.perf_counter() - start) * 1000:.2f} ms (evitada sem mudança de configuração)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
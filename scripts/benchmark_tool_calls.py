@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+"""
+Mede turnos do assistente com várias chamadas de ferramenta: a execução anterior (uma a uma,
+síncrona, no loop do asyncio) contra ToolExecutor.execute_tool_calls (pool de threads para as
+ferramentas síncronas, await direto para as assíncronas).
+
+As ferramentas simulam os custos típicos com esperas fixas (consulta ao banco, geração de
+relatório, busca na internet). Além da duração do turno, mede o maior atraso de um "batimento"
+de 10 ms agendado no loop, que é o quanto a interface (GUI/TUI) ficaria congelada.
+
+Uso: python scripts/benchmark_tool_calls.py
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.tools.tool_decorator import tool
+from app.core.tools.tool_executor import ToolExecutor
+from app.core.tools.tool_registry import ToolRegistry
+
+
+@tool
+def db_query(name: str):
+    """Consulta ao banco (~30 ms)."""
+    time.sleep(0.03)
+    return name
+
+
+@tool
+def render_report(name: str):
+    """Geração de relatório (~150 ms)."""
+    time.sleep(0.15)
+    return name
+
+
+@tool
+def web_search(name: str):
+    """Busca na internet (~400 ms)."""
+    time.sleep(0.4)
+    return name
+
+
+TURNS = {
+    "2 consultas": ["db_query", "db_query"],
+    "4 consultas + relatório": ["db_query"] * 4 + ["render_report"],
+    "busca + 2 relatórios + consulta": ["web_search", "render_report", "render_report", "db_query"],
+}
+
+
+def _calls(names: list[str]) -> list[dict]:
+    return [{"id": str(i), "type": "function", "function": {"name": n, "arguments": json.dumps({"name": n})}}
+            for i, n in enumerate(names)]
+
+
+async def heartbeat(stalls: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append(time.perf_counter() - start - 0.01)
+
+
+async def measure(run_turn, calls) -> tuple[float, float]:
+    stalls, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(stalls, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await run_turn(calls)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    return elapsed * 1000, max(stalls, default=0.0) * 1000
+
+
+async def main():
+    registry = ToolRegistry()
+    for func in (db_query, render_report, web_search):
+        registry.register(func)
+    executor = ToolExecutor(registry)
+
+    async def sequential(calls):
+        return [executor.execute_tool_call(call) for call in calls]
+
+    for label, names in TURNS.items():
+        calls = _calls(names)
+        for mode, run_turn in (("sequencial", sequential), ("concorrente", executor.execute_tool_calls)):
+            elapsed, stall = await measure(run_turn, calls)
+            print(f"{label:<32} {mode:<12} turno {elapsed:7.1f} ms | loop bloqueado até {stall:6.1f} ms")
+    executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
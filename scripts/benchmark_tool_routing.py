@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+"""
+Mede quanto o ToolRouter reduz as requisições ao modelo: bytes enviados (recebidos por um
+servidor local compatível com a API da OpenAI) e latência de cada chamada, enviando todos os
+esquemas de ferramentas ou apenas os escolhidos para cada mensagem.
+
+O servidor espera um tempo proporcional ao tamanho da requisição (PREFILL_TOKENS_PER_SECOND),
+imitando o custo de processar o prompt; o tempo de roteamento em si também é medido.
+
+Uso: python scripts/benchmark_tool_routing.py
+"""
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.llm.ollama_provider import OllamaProvider
+from app.services.assistant_service import AssistantService, SYSTEM_PROMPT
+
+PREFILL_TOKENS_PER_SECOND = 20000
+REPEAT = 5
+MESSAGES = [
+    "Lance nota 8 para a Maria na prova de matemática da turma 7A",
+    "Quais alunos estão em risco na 8B?",
+    "Gere o boletim do João Pedro",
+    "Pesquise na internet sobre metodologias ativas",
+    "Cadastre o aluno Pedro Alves na turma 6A",
+    "Como está a cobertura da BNCC?",
+    "Exporte as notas da turma 9C em CSV",
+    "Registre uma ocorrência de indisciplina para o Lucas",
+    "Sugira atividades sobre frações para o 6º ano",
+    "Olá, tudo bem?",
+]
+bytes_received = []
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        bytes_received.append(len(raw))
+        time.sleep(len(raw) / 4 / PREFILL_TOKENS_PER_SECOND)
+        body = json.dumps({"id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                           "choices": [{"index": 0, "finish_reason": "stop",
+                                        "message": {"role": "assistant", "content": "Ok."}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def main(url: str):
+    assistant = AssistantService()
+    registry, router = assistant.tool_registry, assistant.tool_router
+    provider = OllamaProvider(base_url=url, model="stub")
+    await provider.get_chat_response([{"role": "user", "content": "aquecimento"}])
+
+    print(f"{len(registry.get_all_schemas())} ferramentas, {router.request_bytes()} bytes de esquemas")
+    for label, choose in (("todas as ferramentas", lambda messages: registry.get_all_schemas()),
+                          ("ToolRouter", router.select)):
+        sizes, latencies, routing = [], [], []
+        for _ in range(REPEAT):
+            for text in MESSAGES:
+                messages = [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": text}]
+                start = time.perf_counter()
+                tools = choose(messages)
+                routing.append((time.perf_counter() - start) * 1000)
+                start = time.perf_counter()
+                await provider.get_chat_response(messages, tools=tools)
+                latencies.append((time.perf_counter() - start) * 1000)
+                sizes.append(bytes_received[-1])
+        print(f"{label:<21} requisição média {statistics.mean(sizes):8.0f} bytes | "
+              f"latência média {statistics.mean(latencies):6.1f} ms | roteamento {statistics.mean(routing):6.3f} ms")
+    await provider.close()
+    await assistant.close()
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    asyncio.run(main(f"http://127.0.0.1:{server.server_port}/v1"))
+    server.shutdown()
@@ -0,0 +1,122 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from datetime import date
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.data.migrations import migrate_database
+from app.models.base import Base
+from app.models.bncc_link import CourseBNCC, LessonBNCC, AssessmentBNCC
+from app.models.lesson import Lesson
+
+
+def _setup_subject(data_service, db_session, expected="EF06MA01, ef06ma02,EF06MA03"):
+    class_ = data_service.create_class("6A")
+    course = data_service.add_course("Matemática", "MAT6", bncc_expected=expected)
+    subject = data_service.add_subject_to_class(class_["id"], course["id"])
+    db_session.commit()
+    return class_, course, subject
+
+
+def test_writes_keep_link_tables_in_sync(data_service, db_session):
+    _, course, subject = _setup_subject(data_service, db_session)
+    lesson = data_service.create_lesson(subject["id"], "Aula 1", "", date(2024, 3, 1), bncc_codes="EF06MA01,EF06MA01")
+    db_session.commit()
+
+    assert {l.code for l in db_session.query(CourseBNCC)} == {"EF06MA01", "EF06MA02", "EF06MA03"}
+    assert [(l.lesson_id, l.code) for l in db_session.query(LessonBNCC)] == [(lesson["id"], "EF06MA01")]
+
+    data_service.update_lesson(lesson["id"], "Aula 1", "", date(2024, 3, 1), bncc_codes="EF06MA02")
+    data_service.update_course_bncc(course["id"], "EF06MA02")
+    db_session.commit()
+    assert [l.code for l in db_session.query(LessonBNCC)] == ["EF06MA02"]
+    assert [l.code for l in db_session.query(CourseBNCC)] == ["EF06MA02"]
+
+    data_service.delete_lesson(lesson["id"])
+    db_session.commit()
+    assert db_session.query(LessonBNCC).count() == 0
+
+
+def test_coverage_and_code_usage_come_from_link_tables(data_service, db_session):
+    class_, _, subject = _setup_subject(data_service, db_session)
+    data_service.create_lesson(subject["id"], "Frações", "", date(2024, 3, 1), bncc_codes="EF06MA01")
+    data_service.create_lesson(subject["id"], "Revisão", "", date(2024, 2, 1), bncc_codes="EF06MA01, EF09MA01")
+    data_service.add_assessment(subject["id"], "Prova", 1.0, bncc_codes="ef06ma02")
+    db_session.commit()
+
+    coverage = data_service.get_bncc_coverage(subject["id"])
+    assert coverage["covered_lessons"] == ["EF06MA01", "EF09MA01"]
+    assert coverage["covered_assessments"] == ["EF06MA02"]
+    assert coverage["missing"] == ["EF06MA03"]
+    assert coverage["coverage_percentage"] == 2 / 3 * 100
+
+    usage = data_service.get_bncc_code_usage("ef06ma01")
+    assert usage["code"] == "EF06MA01"
+    assert [c["course_name"] for c in usage["courses"]] == ["Matemática"]
+    assert [l["title"] for l in usage["lessons"]] == ["Revisão", "Frações"]
+    assert usage["lessons"][0]["class_name"] == "6A"
+    assert usage["assessments"] == []
+    assert data_service.get_bncc_code_usage("EF06MA02", class_id=class_["id"] + 1)["assessments"] == []
+
+    # Exclusões em massa (delete_class) também removem os vínculos.
+    data_service.delete_class(class_["id"])
+    db_session.commit()
+    assert db_session.query(LessonBNCC).count() == 0
+    assert db_session.query(AssessmentBNCC).count() == 0
+
+
+def test_school_coverage_matrix_is_cached_per_data_version(data_service, db_session, mocker):
+    class_, course, subject = _setup_subject(data_service, db_session, expected="EF06MA01,EF06MA02")
+    other = data_service.add_course("Arte", "ART6")
+    data_service.add_subject_to_class(class_["id"], other["id"])
+    data_service.create_lesson(subject["id"], "Frações", "", date(2024, 3, 1), bncc_codes="EF06MA01")
+    db_session.commit()
+
+    matrix = data_service.get_school_bncc_coverage()
+    assert [(r["course_name"], r["code"], r["covered"]) for r in matrix["rows"]] == [
+        ("Matemática", "EF06MA01", True), ("Matemática", "EF06MA02", False)]
+    summary = {s["course_name"]: s for s in matrix["subjects"]}
+    assert summary["Arte"]["expected"] == 0
+    assert summary["Matemática"]["missing"] == ["EF06MA02"]
+    assert summary["Matemática"]["coverage_percentage"] == 50.0
+
+    spy = mocker.spy(db_session, "query")
+    assert data_service.get_school_bncc_coverage() is matrix
+    assert spy.call_count == 1  # Apenas a leitura das versões.
+
+    data_service.add_assessment(subject["id"], "Prova", 1.0, bncc_codes="EF06MA02")
+    db_session.commit()
+    updated = data_service.get_school_bncc_coverage()
+    assert updated is not matrix
+    assert all(r["covered"] for r in updated["rows"])
+    assert updated["rows"][1]["in_assessments"] is True
+
+
+def test_migration_backfills_links_from_existing_columns():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Dados escritos antes das tabelas de vínculo existirem (SQL puro não passa pelo ORM).
+        conn.execute(text("INSERT INTO courses (id, course_name, course_code, bncc_expected) VALUES (1, 'Ciências', 'CIE', 'EF06CI01, ef06ci02')"))
+        conn.execute(text("INSERT INTO classes (id, name, calculation_method) VALUES (1, '6B', 'arithmetic')"))
+        conn.execute(text("INSERT INTO class_subjects (id, class_id, course_id) VALUES (1, 1, 1)"))
+        conn.execute(text("INSERT INTO lessons (id, class_subject_id, title, date, bncc_codes) VALUES (1, 1, 'Células', '2024-03-01', 'EF06CI01')"))
+
+    migrate_database(engine)
+    migrate_database(engine)
+
+    session = sessionmaker(bind=engine)()
+    assert sorted(l.code for l in session.query(CourseBNCC)) == ["EF06CI01", "EF06CI02"]
+    assert [(l.lesson_id, l.code) for l in session.query(LessonBNCC)] == [(1, "EF06CI01")]
+
+    session.get(Lesson, 1).bncc_codes = "EF06CI02"
+    session.commit()
+    assert [l.code for l in session.query(LessonBNCC)] == ["EF06CI02"]
+    session.close()
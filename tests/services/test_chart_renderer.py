@@ -0,0 +1,67 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import threading
+import pytest
+from app.services.chart_renderer import ChartRenderer
+from app.utils.artifact_store import ArtifactStore
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    renderer = ChartRenderer(store=ArtifactStore(str(tmp_path)))
+    yield renderer
+    renderer.shutdown()
+
+
+def test_png_chart_is_cached_by_content(renderer, mocker):
+    spy = mocker.spy(renderer.store, "put")
+    first = renderer.render("grade_distribution", [5.0, 7.5, 9.0], course_name="Matemática")
+    with open(first, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    # Mesmos dados: servido do cache, já concluído, sem nova renderização.
+    future = renderer.submit("grade_distribution", [5.0, 7.5, 9.0], course_name="Matemática")
+    assert future.done()
+    assert future.result() == first
+    assert spy.call_count == 1
+
+    # Dados diferentes geram outro arquivo.
+    other = renderer.render("grade_distribution", [1.0], course_name="Matemática")
+    assert other != first
+    assert renderer.get_cached("grade_distribution", [1.0], course_name="Matemática") == other
+
+
+def test_approval_pie_renders(renderer):
+    path = renderer.render("approval_pie", {"approved": 3, "failed": 1})
+    assert path.endswith(".png")
+
+
+def test_concurrent_plotext_renders_do_not_mix(renderer):
+    results = {}
+
+    def worker(n):
+        results[n] = renderer.render_text("text_bar", {"labels": ["A", "B"], "values": [n % 10, 5]},
+                                          title=f"Turma {n}", ylim=[0, 10])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for n, text in results.items():
+        assert f"Turma {n}" in text
+        assert "\x1b[" not in text
+
+
+def test_unknown_kind_is_rejected(renderer):
+    with pytest.raises(ValueError):
+        renderer.submit("3d_donut", [1])
@@ -0,0 +1,58 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import os
+import zipfile
+import pytest
+from app.services.data_service import DataService
+from app.services.report_service import ReportService
+from app.utils.artifact_store import ArtifactStore
+
+
+def test_export_class_bundle_streams_all_artifacts(data_service: DataService, tmp_path, mocker):
+    math = data_service.add_course("Matemática", "MAT")
+    class_a = data_service.create_class("1A")
+    math_a = data_service.add_subject_to_class(class_a['id'], math['id'])
+    ana = data_service.add_student("Ana", "Silva")
+    bruno = data_service.add_student("Bruno", "Costa")
+    data_service.add_student_to_class(ana['id'], class_a['id'], 1)
+    data_service.add_student_to_class(bruno['id'], class_a['id'], 2)
+    p1 = data_service.add_assessment(math_a['id'], "P1", 1.0)
+    data_service.add_grade(ana['id'], p1['id'], 9.0)
+    data_service.add_grade(bruno['id'], p1['id'], 5.0)
+
+    mocker.patch.object(ReportService, "REPORTS_DIR", str(tmp_path))
+    service = ReportService()
+    service.data_service = data_service
+    service.store = ArtifactStore(str(tmp_path))
+    single_student_lookups = mocker.spy(data_service, "get_student_attendance_stats")
+
+    progress = []
+    with service.progress_reporter(progress.append):
+        path = service.export_class_bundle(class_a['id'])
+
+    # Só o ZIP e o índice: nenhum arquivo intermediário no diretório.
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(path), ArtifactStore.INDEX_FILENAME])
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+        assert names == ["notas_turma.csv", "distribuicao_notas.txt",
+                         "boletins/01_Ana_Silva.txt", "boletins/02_Bruno_Costa.txt"]
+        csv_text = zf.read("notas_turma.csv").decode("utf-8")
+        assert "Ana Silva,9.00,9.00" in csv_text
+        card = zf.read("boletins/02_Bruno_Costa.txt").decode("utf-8")
+        assert "Aluno: Bruno Costa" in card
+        assert "P1 (Peso 1.0): 5.00" in card
+    # O progresso avança a cada boletim escrito e só chega ao fim com o pacote completo.
+    assert progress == pytest.approx([0.2, 0.3, 0.65, 1.0])
+    # Frequência vem da consulta por turma, não de uma consulta por aluno.
+    single_student_lookups.assert_not_called()
+
+    # Dados inalterados: o mesmo pacote é reaproveitado.
+    assert service.export_class_bundle(class_a['id']) == path
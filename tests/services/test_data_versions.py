@@ -0,0 +1,50 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from sqlalchemy import create_engine, text
+from app.data.migrations import migrate_database
+from app.models.base import Base
+
+
+def test_writes_bump_table_versions(data_service, db_session):
+    before = data_service.get_data_versions(["grades", "students", "classes"])
+    assert before == {"grades": 0, "students": 0, "classes": 0}
+
+    student = data_service.add_student("Ana", "Silva")
+    class_ = data_service.create_class("1A")
+    course = data_service.add_course("Matemática", "MAT")
+    subject = data_service.add_subject_to_class(class_["id"], course["id"])
+    assessment = data_service.add_assessment(subject["id"], "Prova 1", 1.0)
+    db_session.commit()
+
+    after_setup = data_service.get_data_versions(["grades", "students", "classes"])
+    assert after_setup["students"] > 0
+    assert after_setup["classes"] > 0
+    assert after_setup["grades"] == 0
+
+    data_service.add_grade(student["id"], assessment["id"], 8.5)
+    db_session.commit()
+    assert data_service.get_data_versions(["grades"])["grades"] == 1
+
+
+def test_unknown_table_reports_zero(data_service):
+    assert data_service.get_data_versions(["no_such_table"]) == {"no_such_table": 0}
+
+
+def test_migration_installs_triggers_idempotently():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    migrate_database(engine)
+    migrate_database(engine)
+    with engine.begin() as conn:
+        # SQL puro também é rastreado, pois o contador vive em triggers do banco.
+        conn.execute(text("INSERT INTO courses (course_name, course_code) VALUES ('Física', 'FIS')"))
+        version = conn.execute(text("SELECT version FROM data_versions WHERE table_name = 'courses'")).scalar()
+    assert version == 1
@@ -0,0 +1,74 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from app.services.data_service import DataService
+
+
+def _setup_school(data_service: DataService):
+    math = data_service.add_course("Matemática", "MAT")
+    history = data_service.add_course("História", "HIS")
+
+    class_a = data_service.create_class("1A")
+    class_b = data_service.create_class("1B")
+
+    math_a = data_service.add_subject_to_class(class_a['id'], math['id'])
+    hist_a = data_service.add_subject_to_class(class_a['id'], history['id'])
+    math_b = data_service.add_subject_to_class(class_b['id'], math['id'])
+
+    ana = data_service.add_student("Ana", "Silva")
+    bruno = data_service.add_student("Bruno", "Costa")
+    carla = data_service.add_student("Carla", "Souza")
+    data_service.add_student_to_class(ana['id'], class_a['id'], 1)
+    data_service.add_student_to_class(bruno['id'], class_a['id'], 2)
+    data_service.add_student_to_class(carla['id'], class_b['id'], 1)
+
+    p1 = data_service.add_assessment(math_a['id'], "P1", 1.0)
+    p2 = data_service.add_assessment(math_a['id'], "P2", 3.0)
+    h1 = data_service.add_assessment(hist_a['id'], "H1", 1.0)
+    pb = data_service.add_assessment(math_b['id'], "P1", 1.0)
+
+    data_service.add_grade(ana['id'], p1['id'], 10.0)
+    data_service.add_grade(ana['id'], p2['id'], 6.0)
+    data_service.add_grade(ana['id'], h1['id'], 8.0)
+    data_service.add_grade(bruno['id'], p1['id'], 4.0)
+    data_service.add_grade(carla['id'], pb['id'], 9.0)
+
+    return {"math": math, "class_a": class_a, "class_b": class_b}
+
+
+def test_iter_gradebook_rows_whole_school(data_service: DataService):
+    _setup_school(data_service)
+
+    rows = list(data_service.iter_gradebook_rows(batch_size=2))
+
+    assert [(r['class_name'], r['student_name'], r['course_name']) for r in rows] == [
+        ("1A", "Ana Silva", "História"),
+        ("1A", "Ana Silva", "Matemática"),
+        ("1A", "Bruno Costa", "História"),
+        ("1A", "Bruno Costa", "Matemática"),
+        ("1B", "Carla Souza", "Matemática"),
+    ]
+    averages = {(r['student_name'], r['course_name']): r['average'] for r in rows}
+    assert averages[("Ana Silva", "Matemática")] == 7.0
+    assert averages[("Ana Silva", "História")] == 8.0
+    assert averages[("Bruno Costa", "Matemática")] == 1.0
+    assert averages[("Bruno Costa", "História")] == 0.0
+    assert averages[("Carla Souza", "Matemática")] == 9.0
+
+
+def test_iter_gradebook_rows_scopes(data_service: DataService):
+    school = _setup_school(data_service)
+
+    class_rows = list(data_service.iter_gradebook_rows(class_id=school['class_b']['id']))
+    assert [r['student_name'] for r in class_rows] == ["Carla Souza"]
+
+    course_rows = list(data_service.iter_gradebook_rows(course_id=school['math']['id']))
+    assert {r['course_name'] for r in course_rows} == {"Matemática"}
+    assert [r['class_name'] for r in course_rows] == ["1A", "1A", "1B"]
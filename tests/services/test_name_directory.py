@@ -0,0 +1,74 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from app.services.data.name_service import NameService
+from app.tools.database_tools import add_new_grade
+from app.tools.name_lookup import NameLookup
+
+
+def _school(data_service):
+    cls = data_service.create_class("7A")
+    course = data_service.add_course("Matemática", "MAT")
+    subject = data_service.add_subject_to_class(cls["id"], course["id"])
+    assessment = data_service.add_assessment(subject["id"], "Prova 1", 1.0)
+    student = data_service.add_student("Ana", "Silva")
+    data_service.add_student_to_class(student["id"], cls["id"], 1)
+    return cls, subject, assessment, student
+
+
+def test_directory_resolves_names_case_insensitively(data_service):
+    cls, subject, assessment, student = _school(data_service)
+    directory = data_service.get_name_directory()
+
+    assert directory.class_(" 7a ") == {"id": cls["id"], "name": "7A"}
+    assert directory.subject(cls["id"], "MATEMÁTICA")["id"] == subject["id"]
+    assert directory.assessment(subject["id"], "prova 1")["weight"] == 1.0
+    assert directory.student("ana  silva") == data_service.get_student_by_name("Ana Silva")
+    assert directory.class_("8B") is None
+    assert directory.subject(cls["id"] + 1, "Matemática") is None
+
+
+def test_directory_is_rebuilt_only_after_writes_to_name_tables(data_service, mocker):
+    cls, subject, _, student = _school(data_service)
+    build = mocker.spy(NameService, "_build_directory")
+
+    first = data_service.get_name_directory()
+    assert data_service.get_name_directory() is first
+    # Notas não mudam nenhum nome.
+    data_service.add_grade(student["id"], data_service.get_name_directory().assessment(subject["id"], "Prova 1")["id"], 7.0)
+    assert data_service.get_name_directory() is first
+    assert build.call_count == 1
+
+    data_service.add_assessment(subject["id"], "Prova 2", 2.0)
+    assert data_service.get_name_directory().assessment(subject["id"], "Prova 2") is not None
+    assert build.call_count == 2
+
+
+def test_lookup_falls_back_to_fuzzy_student_match_only_when_allowed(data_service):
+    _school(data_service)
+    names = NameLookup(data_service)
+    assert names.student("Ana Silvaa")["first_name"] == "Ana"
+    assert names.student("Pedro Alves") is None
+    # Caminho de escrita: só o nome exato vale.
+    assert names.student("Ana Silvaa", fuzzy=False) is None
+    assert names.student("ana silva", fuzzy=False)["first_name"] == "Ana"
+
+
+def test_tool_resolves_every_name_from_one_directory(data_service, mocker):
+    _school(data_service)
+    mocker.patch("app.tools.database_tools.data_service", data_service)
+    get_class = mocker.spy(data_service, "get_class_by_name")
+    get_subjects = mocker.spy(data_service, "get_subjects_for_class")
+
+    result = add_new_grade("Ana Silva", "7A", "Matemática", "Prova 1", 9.0)
+
+    assert result.startswith("Nota 9.0 adicionada")
+    assert get_class.call_count == 0
+    assert get_subjects.call_count == 0
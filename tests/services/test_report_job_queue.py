@@ -0,0 +1,167 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import contextlib
+import threading
+from concurrent.futures import CancelledError
+from unittest.mock import MagicMock
+import pytest
+from app.services.report_job_queue import ReportJobQueue, ReportJobSpec, QUEUED, RUNNING, DONE, FAILED, CANCELLED
+
+
+@pytest.fixture
+def blocking_service():
+    """ReportService falso cujo boletim só termina quando o teste libera o evento."""
+    release = threading.Event()
+    started = threading.Event()
+    service = MagicMock()
+
+    def slow_report_card(student_id, class_id):
+        started.set()
+        release.wait(5)
+        return f"/tmp/boletim_{student_id}.txt"
+
+    service.generate_student_report_card.side_effect = slow_report_card
+    service.export_class_grades_csv.return_value = "/tmp/grades.csv"
+    return service, started, release
+
+
+def test_job_runs_off_thread_and_streams_events(blocking_service):
+    service, started, release = blocking_service
+    queue = ReportJobQueue(report_service=service, max_workers=1)
+    events = []
+    job = queue.submit(ReportJobSpec.report_card(1, 10), events.append)
+    assert started.wait(5)
+    release.set()
+
+    assert job.result(timeout=5) == "/tmp/boletim_1.txt"
+    assert [e.status for e in events] == [QUEUED, RUNNING, DONE]
+    assert events[-1].result == "/tmp/boletim_1.txt"
+    service.generate_student_report_card.assert_called_once_with(class_id=10, student_id=1)
+    queue.shutdown()
+
+
+def test_identical_in_flight_jobs_are_deduplicated(blocking_service):
+    service, started, release = blocking_service
+    queue = ReportJobQueue(report_service=service, max_workers=2)
+    first = queue.submit(ReportJobSpec.report_card(1, 10))
+    second = queue.submit(ReportJobSpec.report_card(1, 10))
+    other = queue.submit(ReportJobSpec.report_card(2, 10))
+    release.set()
+
+    assert first is second
+    assert other is not first
+    assert first.result(timeout=5) == "/tmp/boletim_1.txt"
+    assert other.result(timeout=5) == "/tmp/boletim_2.txt"
+    assert service.generate_student_report_card.call_count == 2
+
+    # Depois de concluído, o mesmo pedido gera um novo job.
+    third = queue.submit(ReportJobSpec.report_card(1, 10))
+    assert third is not first
+    third.result(timeout=5)
+    queue.shutdown()
+
+
+def test_cancel_queued_job_never_runs(blocking_service):
+    service, started, release = blocking_service
+    queue = ReportJobQueue(report_service=service, max_workers=1)
+    busy = queue.submit(ReportJobSpec.report_card(1, 10))
+    assert started.wait(5)
+
+    events = []
+    waiting = queue.submit(ReportJobSpec.class_csv(10), events.append)
+    assert queue.cancel(waiting.id)
+    release.set()
+    busy.result(timeout=5)
+    queue.shutdown()
+
+    with pytest.raises(CancelledError):
+        waiting.result(timeout=1)
+    assert events[-1].status == CANCELLED
+    service.export_class_grades_csv.assert_not_called()
+
+
+def test_cancel_running_job_discards_result(blocking_service):
+    service, started, release = blocking_service
+    queue = ReportJobQueue(report_service=service, max_workers=1)
+    job = queue.submit(ReportJobSpec.report_card(1, 10))
+    assert started.wait(5)
+    assert queue.cancel(job.id)
+    release.set()
+
+    with pytest.raises(CancelledError):
+        job.result(timeout=5)
+    queue.shutdown()
+
+
+def test_resubmit_after_cancelling_running_job_starts_fresh_job(blocking_service):
+    service, started, release = blocking_service
+    queue = ReportJobQueue(report_service=service, max_workers=2)
+    doomed = queue.submit(ReportJobSpec.report_card(1, 10))
+    assert started.wait(5)
+    assert queue.cancel(doomed.id)
+
+    retry = queue.submit(ReportJobSpec.report_card(1, 10))
+    release.set()
+
+    assert retry is not doomed
+    assert retry.result(timeout=5) == "/tmp/boletim_1.txt"
+    with pytest.raises(CancelledError):
+        doomed.result(timeout=5)
+    assert service.generate_student_report_card.call_count == 2
+    queue.shutdown()
+
+
+def test_running_events_carry_render_progress():
+    service = MagicMock()
+    reporters = []
+
+    @contextlib.contextmanager
+    def progress_reporter(callback):
+        reporters.append(callback)
+        yield
+
+    def bundle(class_id):
+        # Um passo por boletim; passos muito pequenos não devem virar eventos.
+        for done in range(1, 101):
+            reporters[-1](done / 100)
+        return "/tmp/pacote.zip"
+
+    service.progress_reporter.side_effect = progress_reporter
+    service.export_class_bundle.side_effect = bundle
+    queue = ReportJobQueue(report_service=service)
+    events = []
+    job = queue.submit(ReportJobSpec.class_bundle(10), events.append)
+
+    assert job.result(timeout=5) == "/tmp/pacote.zip"
+    running = [e.progress for e in events if e.status == RUNNING]
+    assert running[0] == 0.1 and running[-1] == 0.95
+    assert running == sorted(running) and 10 <= len(running) <= 20
+    assert events[-1].status == DONE and events[-1].progress == 1.0
+    queue.shutdown()
+
+
+def test_failed_job_propagates_error():
+    service = MagicMock()
+    service.generate_class_grade_distribution.side_effect = ValueError("Class not found.")
+    queue = ReportJobQueue(report_service=service)
+    events = []
+    job = queue.submit(ReportJobSpec.distribution(99), events.append)
+
+    with pytest.raises(ValueError, match="Class not found"):
+        job.result(timeout=5)
+    assert events[-1].status == FAILED
+    assert isinstance(events[-1].error, ValueError)
+    queue.shutdown()
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        ReportJobSpec.create("pdf_magic", class_id=1)
@@ -0,0 +1,37 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+
+
+def test_find_students_by_name_tolerates_typos_and_accents(data_service, db_session):
+    joao = data_service.add_student("João", "da Silva")
+    data_service.add_student("Joana", "Souza")
+    data_service.add_student("Maria", "Silveira")
+    db_session.commit()
+
+    matches = data_service.find_students_by_name("joao silva")
+    assert matches[0]["id"] == joao["id"]
+    assert matches[0]["first_name"] == "João" and 0 < matches[0]["score"] < 1
+    assert data_service.find_students_by_name("zzz") == []
+
+
+def test_resolve_student_name_only_accepts_confident_matches(data_service, db_session):
+    joao = data_service.add_student("João", "Silva")
+    db_session.commit()
+
+    assert data_service.resolve_student_name("João Silva")["id"] == joao["id"]
+    assert data_service.resolve_student_name("Joao Silvaa")["id"] == joao["id"]
+    assert data_service.resolve_student_name("Pedro Alves") is None
+
+    # Um homônimo parecido torna o nome ambíguo; o índice é refeito com o novo aluno.
+    data_service.add_student("Joao", "Silvas")
+    db_session.commit()
+    assert data_service.resolve_student_name("Joao Silvaa") is None
+    assert len(data_service.find_students_by_name("Joao Silvaa")) == 2
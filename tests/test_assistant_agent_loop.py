@@ -0,0 +1,125 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.core.llm.base import AssistantResponse
+
+
+def _tool_call(call_id, name):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": "{}"}}
+
+
+def _tool_result(tool_call):
+    return {"tool_call_id": tool_call["id"], "role": "tool", "name": tool_call["function"]["name"], "content": "ok"}
+
+
+@pytest.fixture
+def agent(assistant_service):
+    assistant_service.provider.name = "OpenAI"
+    assistant_service.messages = [{"role": "system", "content": "sistema"}]
+    assistant_service.tool_executor.execute_tool_calls = AsyncMock(
+        side_effect=lambda calls: [_tool_result(tc) for tc in calls])
+    return assistant_service
+
+
+@pytest.mark.anyio
+async def test_agent_runs_tool_rounds_until_the_model_answers(agent):
+    agent.provider.get_chat_response = AsyncMock(side_effect=[
+        AssistantResponse(content="", tool_calls=[_tool_call("1", "add_new_grade"), _tool_call("2", "add_new_grade")]),
+        AssistantResponse(content="", tool_calls=[_tool_call("3", "get_class_roster")]),
+        AssistantResponse(content="Notas lançadas. Média da turma: 7,5.", usage={"total_tokens": 120}),
+    ])
+
+    response = await agent.get_response("Lance as notas e mostre a média")
+
+    assert response.content == "Notas lançadas. Média da turma: 7,5."
+    assert [m["role"] for m in agent.messages] == ["system", "user", "assistant", "tool", "tool",
+                                                    "assistant", "tool", "assistant"]
+    assert [s.tool_names for s in agent.last_steps] == [["add_new_grade", "add_new_grade"], ["get_class_roster"], []]
+    assert agent.last_steps[-1].tokens == 120
+    assert all(call.kwargs["tools"] for call in agent.provider.get_chat_response.call_args_list)
+
+
+@pytest.mark.anyio
+async def test_agent_forces_a_text_answer_on_the_last_step(agent):
+    agent.provider.get_chat_response = AsyncMock(side_effect=[
+        AssistantResponse(content="", tool_calls=[_tool_call("1", "list_all_classes")]),
+        AssistantResponse(content="Aqui estão as turmas."),
+    ])
+
+    response = await agent.get_response("Quais turmas existem?", max_steps=2)
+
+    assert response.content == "Aqui estão as turmas."
+    calls = agent.provider.get_chat_response.call_args_list
+    assert calls[0].kwargs["tools"] and calls[1].kwargs["tools"] is None
+
+
+@pytest.mark.anyio
+async def test_agent_stops_calling_tools_when_the_token_budget_is_spent(agent):
+    agent.token_budget = 100
+    agent.provider.get_chat_response = AsyncMock(side_effect=[
+        AssistantResponse(content="", tool_calls=[_tool_call("1", "list_all_classes")], usage={"total_tokens": 150}),
+        AssistantResponse(content="Resumo parcial.", usage={"total_tokens": 60}),
+    ])
+
+    response = await agent.get_response("Analise tudo")
+
+    assert response.content == "Resumo parcial."
+    assert agent.provider.get_chat_response.call_args_list[1].kwargs["tools"] is None
+    assert len(agent.last_steps) == 2
+
+
+@pytest.mark.anyio
+async def test_agent_streams_text_deltas_and_records_first_token(agent):
+    from app.core.llm.base import StreamDelta
+
+    async def stream(messages, tools=None):
+        for text in ("Olá", ", ", "professor!"):
+            yield StreamDelta(content=text)
+        yield StreamDelta(response=AssistantResponse(content="Olá, professor!"))
+
+    agent.provider.stream_chat_response = stream
+    received = []
+
+    response = await agent.get_response("Oi", on_delta=received.append)
+
+    assert received == ["Olá", ", ", "professor!"]
+    assert response.content == "Olá, professor!"
+    assert agent.messages[-1] == {"role": "assistant", "content": "Olá, professor!"}
+    assert agent.last_steps[0].first_token_seconds is not None
+
+
+@pytest.mark.anyio
+async def test_cancelling_during_the_tool_round_leaves_a_valid_history(agent):
+    tools_started = asyncio.Event()
+
+    async def slow_tools(calls):
+        tools_started.set()
+        await asyncio.sleep(10)
+
+    agent.tool_executor.execute_tool_calls = AsyncMock(side_effect=slow_tools)
+    agent.provider.get_chat_response = AsyncMock(side_effect=[
+        AssistantResponse(content="", tool_calls=[_tool_call("1", "add_new_grade")]),
+        AssistantResponse(content="Pronto."),
+    ])
+
+    turn = asyncio.create_task(agent.get_response("Lance a nota"))
+    await tools_started.wait()
+    turn.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await turn
+
+    # Nenhum tool_calls sem resultados: a próxima mensagem ainda é aceita pela API.
+    assert [m["role"] for m in agent.messages] == ["system", "user"]
+    response = await agent.get_response("Tudo certo?", max_steps=1)
+    assert response.content == "Pronto."
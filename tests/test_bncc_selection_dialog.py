@@ -0,0 +1,76 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+from unittest.mock import MagicMock
+from app.services.bncc_service import BNCCService
+from app.ui.views.bncc_selection_dialog import BNCCSelectionDialog
+
+
+class FakeVar:
+    def __init__(self, value=False):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def _make_dialog(mocker, **kwargs):
+    # Mesmo esquema de test_dialog_zorder: sem display, os widgets do CTk são simulados.
+    for name in ("__init__", "title", "transient", "lift", "focus_force", "grab_set", "geometry",
+                 "grid_columnconfigure", "grid_rowconfigure", "after", "after_cancel", "destroy"):
+        mocker.patch(f"customtkinter.CTkToplevel.{name}")
+    for widget in ("CTkFrame", "CTkLabel", "CTkButton", "CTkOptionMenu", "CTkScrollbar", "CTkCheckBox"):
+        mocker.patch(f"customtkinter.{widget}")
+    mocker.patch("customtkinter.CTkEntry").return_value.get.return_value = ""
+    mocker.patch("customtkinter.BooleanVar", side_effect=FakeVar)
+    mocker.patch("app.ui.views.bncc_selection_dialog.bind_global_mouse_scroll")
+    return BNCCSelectionDialog(MagicMock(), **kwargs)
+
+
+def test_dialog_recycles_a_fixed_window_of_rows(mocker):
+    dialog = _make_dialog(mocker, initial_selection="EF01MA02", stage="fundamental")
+
+    total = len(BNCCService.search_skills("", stages="fundamental"))
+    assert len(dialog.results) == total
+    assert len(dialog.rows) == BNCCSelectionDialog.VISIBLE_ROWS
+    first_codes = [row["code"] for row in dialog.rows]
+    assert first_codes == [r["code"] for r in dialog.results[:BNCCSelectionDialog.VISIBLE_ROWS]]
+    assert dialog.rows[1]["var"].get() is (first_codes[1] == "EF01MA02")
+
+    dialog.scroll_rows(1, "pages")
+    assert dialog.first_index == BNCCSelectionDialog.VISIBLE_ROWS
+    assert dialog.rows[0]["code"] == dialog.results[BNCCSelectionDialog.VISIBLE_ROWS]["code"]
+
+    # A barra de rolagem não passa do fim; as mesmas linhas mostram os últimos itens.
+    dialog._on_scrollbar("moveto", "1.0")
+    assert dialog.first_index == total - BNCCSelectionDialog.VISIBLE_ROWS
+    assert dialog.rows[-1]["code"] == dialog.results[total - 1]["code"]
+
+    # Marcar uma linha reaproveitada seleciona o item que ela mostra agora.
+    row = dialog.rows[0]
+    row["var"].set(True)
+    dialog._toggle(row)
+    assert row["code"] in dialog.selected_codes
+
+
+def test_dialog_debounces_keystrokes(mocker):
+    dialog = _make_dialog(mocker)
+    dialog.after.return_value = "job-1"
+    event = MagicMock(keysym="a")
+
+    dialog._on_search_key(event)
+    dialog._on_search_key(event)
+
+    assert dialog.after.call_count == 2
+    dialog.after_cancel.assert_called_once_with("job-1")
+    dialog.after.assert_called_with(BNCCSelectionDialog.SEARCH_DEBOUNCE_MS, dialog.perform_search)
@@ -9,8 +9,11 @@
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 
+import pickle
+from collections.abc import Sequence
 import pytest
-from app.services.bncc_service import BNCCService
+from app.services.bncc_service import BNCCService, BNCCSkill
+from app.utils.text_search import fold_accents
 from app.services.data_service import DataService
 from app.models.lesson import Lesson
 from app.models.assessment import Assessment
@@ -20,7 +23,7 @@ from datetime import date
 def test_bncc_service_search():
     # Test BNCC Service search logic
     results = BNCCService.search_skills("matematica")
-    assert isinstance(results, list)
+    assert isinstance(results, Sequence)
 
 def test_bncc_coverage_logic(db_session, mocker):
     # Setup DataService with injected session
@@ -95,3 +98,129 @@ def test_bncc_coverage_logic(db_session, mocker):
     # Percentage: 1/2 = 50%
 
     assert report['coverage_percentage'] == 50.0
+
+    # Descrições resolvidas em lote junto com a cobertura.
+    assert report['descriptions']['EF01MA01'] == BNCCService.get_skill_by_code("EF01MA01")['description']
+    assert set(report['descriptions']) <= set(report['expected']) | set(report['total_covered'])
+
+def test_bncc_search_is_accent_insensitive_and_stemmed():
+    with_accent = BNCCService.search_skills("matemática")
+    without_accent = BNCCService.search_skills("MATEMATICA")
+    assert with_accent and with_accent == without_accent
+
+    # Plural/singular caem no mesmo radical.
+    singular = {r['code'] for r in BNCCService.search_skills("fração ")}
+    plural = {r['code'] for r in BNCCService.search_skills("frações ")}
+    assert singular and singular == plural
+
+def test_bncc_search_returns_lazy_pages():
+    results = BNCCService.search_skills("")
+    assert len(results) > 1000
+    assert results.page(1, 20) == results[20:40]
+    assert [r['code'] for r in results.page(0, 3)] == [r['code'] for r in list(results)[:3]]
+    assert results.page(10_000, 20) == []
+    assert BNCCService.search_skills("", limit=5) == results[:5]
+
+def test_bncc_search_tolerates_misspellings():
+    exact = BNCCService.search_skills("probabilidade", limit=10)
+    assert BNCCService.search_skills("probabilidde", limit=10) == exact
+    assert BNCCService.search_skills("probabilidde", fuzzy=False) == []
+
+def test_bncc_search_prefix_and_all_words_required():
+    results = BNCCService.search_skills("números natur")
+    assert results
+    for r in results:
+        text = fold_accents(r['title'] + " " + r['description'])
+        assert "numer" in text
+        assert "natur" in text
+
+def test_bncc_search_ranks_codes_first():
+    results = BNCCService.search_skills("EF01MA01")
+    assert results[0]['code'] == "EF01MA01"
+
+    prefix = BNCCService.search_skills("ef01ma")
+    assert prefix and all(r['code'].startswith("EF01MA") for r in prefix)
+
+    # Substring no código ainda encontra a habilidade, depois dos prefixos.
+    assert "EF01LP01" in [r['code'] for r in BNCCService.search_skills("LP01")]
+
+def test_bncc_search_limit_and_empty_query():
+    everything = BNCCService.search_skills("")
+    assert len(everything) > 1000
+    assert BNCCService.search_skills("", limit=5) == everything[:5]
+    assert len(BNCCService.search_skills("matematica", limit=3)) == 3
+    assert BNCCService.search_skills("xyzzy") == []
+
+def test_bncc_code_lookup_and_bulk_resolution():
+    skill = BNCCService.get_skill_by_code(" ef01ma01 ")
+    assert skill['code'] == "EF01MA01"
+    assert skill == BNCCService.search_skills("EF01MA01")[0]
+    assert BNCCService.get_skill_by_code("XX00XX00") is None
+
+    resolved = BNCCService.get_skills_by_codes("EF01MA02, ef01ma01,XX00XX00,EF01MA02")
+    assert list(resolved) == ["EF01MA02", "EF01MA01"]
+    assert resolved["EF01MA01"]['description'] == skill['description']
+    assert BNCCService.get_skills_by_codes(["EF01LP01"])["EF01LP01"]['code'] == "EF01LP01"
+    assert BNCCService.get_skills_by_codes("") == {}
+
+@pytest.fixture
+def isolated_bncc_cache(tmp_path, monkeypatch):
+    """Cache compilado em diretório temporário e nenhuma etapa carregada em memória."""
+    monkeypatch.setattr(BNCCService, "CACHE_DIR", tmp_path)
+    BNCCService.clear_loaded()
+    yield tmp_path
+    BNCCService.clear_loaded()
+
+def test_bncc_stages_load_lazily(isolated_bncc_cache, mocker):
+    process_fundamental = mocker.spy(BNCCService, "_process_fundamental")
+
+    medio = BNCCService.search_skills("", stages="medio")
+    assert medio and all(r['code'].startswith("EM") for r in medio)
+    assert set(BNCCService._stages) == {"medio"}
+
+    # A busca por código carrega apenas a etapa indicada pelo prefixo.
+    assert BNCCService.get_skill_by_code("EI01EO01")['code'] == "EI01EO01"
+    assert set(BNCCService._stages) == {"medio", "infantil"}
+    process_fundamental.assert_not_called()
+
+def test_bncc_compiled_cache_is_reused_and_validated(isolated_bncc_cache, mocker):
+    expected = BNCCService.search_skills("frações", stages="fundamental")
+    cache_file = isolated_bncc_cache / "fundamental.pickle"
+    assert cache_file.exists()
+
+    # Com o cache válido, o JSON não é normalizado de novo.
+    BNCCService.clear_loaded()
+    process_fundamental = mocker.spy(BNCCService, "_process_fundamental")
+    assert BNCCService.search_skills("frações", stages="fundamental") == expected
+    process_fundamental.assert_not_called()
+
+    # Um cache gerado de outra versão do arquivo de origem é descartado e reconstruído.
+    with open(cache_file, "rb") as f:
+        payload = pickle.load(f)
+    payload["source_sha256"] = "outdated"
+    with open(cache_file, "wb") as f:
+        pickle.dump(payload, f)
+    BNCCService.clear_loaded()
+    assert BNCCService.search_skills("frações", stages="fundamental") == expected
+    process_fundamental.assert_called_once()
+
+    # Cache corrompido também não impede a carga.
+    cache_file.write_bytes(b"not a pickle")
+    BNCCService.clear_loaded()
+    assert BNCCService.search_skills("frações", stages="fundamental") == expected
+
+def test_bncc_results_are_lightweight_views():
+    skill = BNCCService.get_skill_by_code("EI01EO01")
+    assert isinstance(skill, BNCCSkill)
+    assert skill['code'] == skill.code == "EI01EO01"
+    assert skill.stage == "infantil"
+    assert skill.range
+    assert set(skill) == {"code", "description", "title"}
+    assert skill.to_dict() == dict(skill)
+    with pytest.raises(KeyError):
+        skill['range']
+
+    # A estrutura aninhada original ainda pode ser reconstruída.
+    groups = BNCCService.load_data("infantil")
+    first = groups[0]['itens'][0]
+    assert first == {"code": "EI01EO01", "description": skill.description, "range": skill.range}
@@ -0,0 +1,85 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+
+import json
+from app.core.llm.conversation_memory import (
+    ConversationMemory, SUMMARY_PREFIX, DIGEST_MARKER, context_budget, estimate_tokens
+)
+
+ROSTER = json.dumps([{"id": i, "name": f"Aluno {i:03d}", "status": "Active"} for i in range(60)])
+
+
+def _turn(number: int, tool_output: str = ROSTER) -> list:
+    call = {"id": f"call_{number}", "type": "function",
+            "function": {"name": "get_class_roster", "arguments": '{"class_name": "7A"}'}}
+    return [
+        {"role": "user", "content": f"Pergunta {number}: quem está na turma 7A?"},
+        {"role": "assistant", "tool_calls": [call]},
+        {"role": "tool", "tool_call_id": f"call_{number}", "name": "get_class_roster", "content": tool_output},
+        {"role": "assistant", "content": f"Resposta {number}: a turma tem 60 alunos."},
+    ]
+
+
+def _history(turns: int) -> list:
+    messages = [{"role": "system", "content": "Você é um assistente."}]
+    for number in range(1, turns + 1):
+        messages.extend(_turn(number))
+    # Turno atual: pergunta ainda sem resposta.
+    messages.append({"role": "user", "content": "E a média da turma?"})
+    return messages
+
+
+def test_old_tool_outputs_become_digests_and_current_turn_is_kept():
+    memory = ConversationMemory()
+    messages = _history(2)
+    messages.extend(_turn(3)[1:3])  # ferramenta do turno atual
+
+    compacted = memory.compact(messages, budget=100000)
+
+    tool_messages = [m for m in compacted if m["role"] == "tool"]
+    assert tool_messages[0]["content"].startswith(DIGEST_MARKER)
+    assert tool_messages[1]["content"].startswith(DIGEST_MARKER)
+    assert tool_messages[2]["content"] == ROSTER
+    assert memory.last_stats.digested == 2
+    # O histórico original não é alterado.
+    assert messages[3]["content"] == ROSTER
+
+
+def test_old_turns_are_summarized_to_fit_the_budget():
+    memory = ConversationMemory()
+    messages = _history(30)
+
+    compacted = memory.compact(messages, budget=1500)
+
+    assert compacted[0] == messages[0]
+    assert compacted[1]["role"] == "system" and compacted[1]["content"].startswith(SUMMARY_PREFIX)
+    # O resumo termina no turno imediatamente anterior ao primeiro turno mantido.
+    first_kept = int(compacted[2]["content"].split()[1].rstrip(":"))
+    last_summary_line = compacted[1]["content"].split("\n")[-1]
+    assert last_summary_line.startswith(f"- Usuário: Pergunta {first_kept - 1}:")
+    assert "Ferramentas: get_class_roster" in last_summary_line
+    assert compacted[-1] == messages[-1]
+    assert sum(estimate_tokens(m) for m in compacted) <= 1500
+    # Cada resultado de ferramenta que sobrou continua precedido pela sua chamada.
+    for index, message in enumerate(compacted):
+        if message["role"] == "tool":
+            assert compacted[index - 1]["tool_calls"][0]["id"] == message["tool_call_id"]
+
+    # Compactar de novo reaproveita o resumo existente em vez de empilhar outro.
+    again = memory.compact(compacted + _turn(31), budget=1500)
+    assert sum(1 for m in again if (m.get("content") or "").startswith(SUMMARY_PREFIX)) == 1
+
+
+def test_context_budget_by_provider_and_model():
+    assert context_budget("Ollama", "llama3.1") == 4000
+    assert context_budget("OpenAI", "gpt-4o-mini") == 24000
+    assert context_budget("OpenAI", "gpt-4") == 6000
+    assert context_budget("Desconhecido") == 8000
@@ -81,3 +81,40 @@ async def test_create_chat_completion_handles_no_tool_calls():
     # Verify
     assert response.content == "Hello"
     assert response.tool_calls is None
+
+@pytest.mark.anyio
+async def test_stream_chat_completion_yields_text_and_assembles_tool_calls():
+    from types import SimpleNamespace
+
+    def chunk(content=None, tool_calls=None):
+        delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+    def fragment(index, arguments, call_id=None, name=None):
+        return {"index": index, "id": call_id, "function": {"name": name, "arguments": arguments}}
+
+    async def stream():
+        for item in [chunk("Vou "), chunk("verificar."),
+                     chunk(tool_calls=[fragment(0, "", "call_1", "get_class_roster")]),
+                     chunk(tool_calls=[fragment(1, '{"class_', "call_2", "list_all_classes")]),
+                     chunk(tool_calls=[fragment(0, '{"class_name": "7A"}')]),
+                     chunk(tool_calls=[fragment(1, 'name": null}')]),
+                     SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15))]:
+            yield item
+
+    provider = TestProvider()
+    provider.client = MagicMock()
+    provider.client.chat.completions.create = AsyncMock(return_value=stream())
+
+    deltas = [delta async for delta in provider._stream_chat_completion(messages=[])]
+
+    assert [d.content for d in deltas[:-1]] == ["Vou ", "verificar."]
+    final = deltas[-1].response
+    assert final.content == "Vou verificar."
+    assert final.usage == {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    assert final.tool_calls == [
+        {"id": "call_1", "type": "function", "function": {"name": "get_class_roster", "arguments": '{"class_name": "7A"}'}},
+        {"id": "call_2", "type": "function", "function": {"name": "list_all_classes", "arguments": '{"class_name": null}'}},
+    ]
+    assert provider.client.chat.completions.create.call_args.kwargs["stream"] is True
+    assert provider.client.chat.completions.create.call_args.kwargs["stream_options"] == {"include_usage": True}
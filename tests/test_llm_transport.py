@@ -0,0 +1,244 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from app.core.llm import transport as transport_module
+from app.core.llm.base import LLMProvider
+from app.core.llm.transport import LLMTransport, TransportPolicy
+
+COMPLETION = {
+    "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": "stub",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Olá!"}}],
+}
+
+
+class FaultServer:
+    """
+    Servidor local compatível com a API de chat que injeta falhas.
+
+    Cada requisição consome a próxima falha da lista `faults`: um código HTTP (ex: 503), ou
+    ("sleep", segundos) para demorar antes de responder. Com a lista vazia, responde 200.
+    """
+
+    def __init__(self, faults=(), delay: float = 0.0):
+        self.faults = list(faults)
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    fault = server.faults.pop(0) if server.faults else None
+                try:
+                    if isinstance(fault, tuple):
+                        time.sleep(fault[1])
+                        fault = None
+                    time.sleep(server.delay)
+                    if fault:
+                        self._send(fault, {"error": {"message": f"injected {fault}"}}, {"Retry-After": "0"} if fault == 429 else {})
+                    elif body.get("stream"):
+                        self._send_stream()
+                    else:
+                        self._send(200, COMPLETION)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self):
+                events = b""
+                for text in ("Ol", "á!"):
+                    chunk = {**COMPLETION, "object": "chat.completion.chunk",
+                             "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+                    events += f"data: {json.dumps(chunk)}\n\n".encode()
+                events += b"data: [DONE]\n\n"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(events)))
+                self.end_headers()
+                self.wfile.write(events)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StubProvider(LLMProvider):
+    def __init__(self, base_url: str, transport: LLMTransport):
+        self.transport = transport
+        self.client = self._build_client(api_key="stub", base_url=base_url)
+        self.model = "stub"
+
+    @property
+    def name(self):
+        return "Stub"
+
+    async def get_chat_response(self, messages, tools=None):
+        return await self._create_chat_completion(messages, tools)
+
+    async def list_models(self):
+        return []
+
+    async def close(self):
+        await self.client.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    policy = TransportPolicy(connect_timeout=1.0, read_timeout=0.3, max_retries=3, backoff_base=0.5,
+                             backoff_max=8.0, max_in_flight=2, breaker_threshold=5, breaker_cooldown=30.0)
+    monkeypatch.setitem(transport_module.PROVIDER_POLICIES, "Stub", policy)
+    return policy
+
+
+@pytest.fixture
+def transport():
+    sleeps = []
+
+    async def record_sleep(seconds):
+        sleeps.append(seconds)
+
+    transport = LLMTransport(sleep=record_sleep, clock=FakeClock(), rng=lambda: 1.0)
+    transport.sleeps = sleeps
+    return transport
+
+
+async def _ask(provider):
+    return await provider.get_chat_response([{"role": "user", "content": "Oi"}])
+
+
+@pytest.mark.anyio
+async def test_transient_failures_are_retried_with_backoff(policy, transport):
+    with FaultServer([503, 429, 502]) as server:
+        provider = StubProvider(server.url, transport)
+        response = await _ask(provider)
+        await provider.close()
+
+    assert response.content == "Olá!"
+    assert server.requests == 4
+    # Backoff exponencial (jitter fixado em 1.0) e Retry-After: 0 do 429.
+    assert transport.sleeps == [0.5, 0.0, 2.0]
+
+
+@pytest.mark.anyio
+async def test_client_errors_and_exhausted_retries_are_reported(policy, transport):
+    with FaultServer([400, 500, 500, 500, 500]) as server:
+        provider = StubProvider(server.url, transport)
+        bad_request = await _ask(provider)
+        server_error = await _ask(provider)
+        await provider.close()
+
+    assert "injected 400" in bad_request.content
+    assert "injected 500" in server_error.content
+    # 1 tentativa para o 400 (não é repetido) e 1 + 3 retries para o 500.
+    assert server.requests == 5
+
+
+@pytest.mark.anyio
+async def test_read_timeout_is_retried(policy, transport):
+    with FaultServer([("sleep", 1.0)]) as server:
+        provider = StubProvider(server.url, transport)
+        start = time.perf_counter()
+        response = await _ask(provider)
+        elapsed = time.perf_counter() - start
+        await provider.close()
+
+    assert response.content == "Olá!"
+    assert server.requests == 2
+    assert elapsed < 0.9
+
+
+@pytest.mark.anyio
+async def test_circuit_breaker_fails_fast_and_recovers(policy, transport):
+    with FaultServer([500] * 5) as server:
+        provider = StubProvider(server.url, transport)
+        await _ask(provider)  # 4 falhas
+        await _ask(provider)  # 5ª falha abre o circuito antes do retry
+        assert server.requests == 5
+
+        blocked = await _ask(provider)
+        assert "temporarily unavailable" in blocked.content
+        assert server.requests == 5
+
+        transport.clock.now += policy.breaker_cooldown
+        recovered = await _ask(provider)
+        await provider.close()
+
+    assert recovered.content == "Olá!"
+    assert server.requests == 6
+    assert transport.breaker(provider._transport_key()).state == "closed"
+
+
+@pytest.mark.anyio
+async def test_in_flight_requests_are_limited(policy, transport):
+    with FaultServer(delay=0.05) as server:
+        provider = StubProvider(server.url, transport)
+        responses = await asyncio.gather(*(_ask(provider) for _ in range(6)))
+        await provider.close()
+
+    assert [r.content for r in responses] == ["Olá!"] * 6
+    assert server.max_in_flight == policy.max_in_flight
+
+
+@pytest.mark.anyio
+async def test_stream_opening_is_retried(policy, transport):
+    with FaultServer([503]) as server:
+        provider = StubProvider(server.url, transport)
+        deltas = [d async for d in provider._stream_chat_completion([{"role": "user", "content": "Oi"}])]
+        await provider.close()
+
+    assert [d.content for d in deltas[:-1]] == ["Ol", "á!"]
+    assert deltas[-1].response.content == "Olá!"
+    assert server.requests == 2
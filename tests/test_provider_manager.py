@@ -0,0 +1,93 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.core.config import notify_settings_changed
+from app.core.llm.base import AssistantResponse
+from app.core.llm.provider_manager import ProviderManager, ProviderConfig
+
+
+@pytest.fixture
+def settings(mocker, tmp_path):
+    """Configurações em memória, com um config.json temporário para o carimbo de mtime."""
+    values = {"active_provider": "Ollama", "ollama_url": "http://localhost:1/v1", "ollama_model": "llama3.1"}
+    config_file = tmp_path / "config.json"
+    config_file.write_text("{}")
+    mocker.patch("app.core.llm.provider_manager.CONFIG_FILE", config_file)
+    load = mocker.patch("app.core.llm.provider_manager.load_config", side_effect=lambda: dict(values))
+    mocker.patch("app.core.llm.provider_manager.get_api_key", return_value=None)
+    return values, load
+
+
+def test_provider_is_reused_while_settings_are_unchanged(settings):
+    values, load = settings
+    manager = ProviderManager()
+
+    first = manager.get_provider()
+    assert first is manager.get_provider() is manager.get_provider()
+    assert load.call_count == 1
+    assert manager.config == ProviderConfig("Ollama", "llama3.1", base_url="http://localhost:1/v1")
+
+    # Uma gravação que não muda o provedor relê as configurações, mas mantém o cliente.
+    notify_settings_changed()
+    assert manager.get_provider() is first
+    assert load.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_provider_is_rebuilt_when_the_model_changes(settings):
+    values, _ = settings
+    manager = ProviderManager()
+    first = manager.get_provider()
+    first.close = AsyncMock()
+
+    values["ollama_model"] = "qwen2.5"
+    notify_settings_changed()
+    second = manager.get_provider()
+
+    assert second is not first
+    assert second.model == "qwen2.5"
+    await manager.close_retired()
+    first.close.assert_awaited_once()
+
+
+def test_provider_without_api_key_is_none(settings, mocker):
+    values, _ = settings
+    values["active_provider"] = "OpenAI"
+    manager = ProviderManager()
+    assert manager.get_provider() is None
+
+    mocker.patch("app.core.llm.provider_manager.get_api_key", return_value="sk-test")
+    notify_settings_changed()
+    provider = manager.get_provider()
+    assert provider.name == "OpenAI"
+    assert "sk-test" not in repr(manager.config)
+
+
+@pytest.mark.anyio
+async def test_assistant_keeps_history_and_provider_between_messages(mocker):
+    from app.services.assistant_service import AssistantService
+
+    provider = MagicMock()
+    provider.name = "Test"
+    provider.get_chat_response = AsyncMock(side_effect=[AssistantResponse(content="Olá!"),
+                                                        AssistantResponse(content="Tudo bem.")])
+    get_provider = mocker.patch("app.services.assistant_service.ProviderManager.get_provider", return_value=provider)
+
+    service = AssistantService()
+    await service.get_response("Oi")
+    await service.get_response("Como vai?")
+
+    assert [m["role"] for m in service.messages] == ["system", "user", "assistant", "user", "assistant"]
+    assert service.messages[3]["content"] == "Como vai?"
+    assert get_provider.call_count == 3
+    assert service.provider is provider
@@ -11,14 +11,19 @@
 import pytest
 import os
 from app.services.report_service import ReportService
+from app.utils.artifact_store import ArtifactStore
 
 class TestReportService:
     @pytest.fixture
-    def report_service(self, mocker):
+    def report_service(self, mocker, tmp_path):
         # Mock DataService within ReportService
         MockDataService = mocker.patch('app.services.report_service.DataService')
+        # Os arquivos gerados vão para o diretório temporário do teste, nunca para reports/ do repositório.
+        mocker.patch.object(ReportService, "REPORTS_DIR", str(tmp_path))
         service = ReportService()
         service.data_service = MockDataService.return_value
+        service.data_service.get_data_versions.return_value = {}
+        service.store = ArtifactStore(str(tmp_path))
         return service
 
     def test_generate_student_report_card(self, report_service):
@@ -113,3 +118,94 @@ class TestReportService:
             assert "10.00" in content
 
         os.remove(filepath)
+
+    def test_export_gradebook_csv_streams_rows(self, report_service):
+        report_service.data_service.iter_gradebook_rows.return_value = iter([
+            {"class_name": "Class A", "call_number": 1, "student_id": 1, "student_name": "John Doe", "course_name": "Math", "average": 7.5},
+            {"class_name": "Class B", "call_number": 1, "student_id": 2, "student_name": "Jane Roe", "course_name": "Math", "average": 10.0},
+        ])
+
+        filepath = report_service.export_gradebook_csv(course_id=3)
+        report_service.data_service.iter_gradebook_rows.assert_called_once_with(class_id=None, course_id=3)
+        assert "gradebook_course_3_" in filepath
+
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            lines = f.read().splitlines()
+
+        assert lines[0] == "Turma;Nº;Aluno;Disciplina;Média"
+        assert lines[1] == "Class A;1;John Doe;Math;7,50"
+        assert lines[2] == "Class B;1;Jane Roe;Math;10,00"
+
+        os.remove(filepath)
+
+    def test_report_cache_reuses_artifact_until_data_changes(self, report_service, tmp_path):
+        ds = report_service.data_service
+        ds.get_class_by_id.return_value = {"id": 1, "name": "Class A"}
+        ds.get_class_report_data.return_value = {
+            "students": [{"student_id": 1, "name": "John Doe", "call_number": 1}],
+            "subjects": [{"id": 10, "course_name": "Math", "assessments": [{"id": 100, "name": "T1", "weight": 1.0}]}],
+            "grades_map": {(1, 100): 9.0}
+        }
+        ds.calculate_weighted_average.return_value = 9.0
+        ds.get_data_versions.return_value = {"grades": 1}
+
+        first = report_service.export_class_grades_csv(1)
+        second = report_service.export_class_grades_csv(1)
+        assert first == second
+        assert ds.get_class_report_data.call_count == 1
+        assert os.path.exists(tmp_path / ArtifactStore.INDEX_FILENAME)
+
+        # Uma escrita nas notas muda a versão e invalida o relatório.
+        ds.get_data_versions.return_value = {"grades": 2}
+        report_service.export_class_grades_csv(1)
+        assert ds.get_class_report_data.call_count == 2
+
+        # Arquivo removido do disco também força nova geração.
+        ds.get_data_versions.return_value = {"grades": 1}
+        os.remove(first)
+        report_service.export_class_grades_csv(1)
+        assert ds.get_class_report_data.call_count == 3
+
+        reports = report_service.list_generated_reports("class_grades_csv")
+        assert len(reports) == 2
+        assert all(r["params"] == {"class_id": 1} for r in reports)
+
+    def test_generate_seating_chart_svg(self, report_service, tmp_path):
+        report_service.data_service.get_data_versions.return_value = {"seating_charts": 1, "seat_assignments": 1}
+        report_service.data_service.get_seating_chart_details.return_value = {
+            "id": 5, "name": "Layout 1", "rows": 1, "columns": 2,
+            "layout_config": '{"0,1": "teacher_desk"}',
+            "assignments": [{"student_id": 1, "student_name": "John Doe", "row_index": 0, "col_index": 0, "call_number": 1}],
+        }
+
+        path = report_service.generate_seating_chart_svg(5)
+
+        assert path.endswith(".svg")
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        assert content.startswith('<?xml')
+        assert 'id="cell-0-0"' in content and 'class="teacher_desk"' in content
+        assert "John" in content and "Doe" in content
+        # Sem mudanças nos dados, o mesmo arquivo é reaproveitado.
+        assert report_service.generate_seating_chart_svg(5) == path
+        report_service.data_service.get_seating_chart_details.assert_called_once_with(5)
+
+    def test_export_bncc_coverage_csv(self, report_service, tmp_path):
+        report_service.data_service.get_data_versions.return_value = {"lessons": 3}
+        report_service.data_service.get_school_bncc_coverage.return_value = {
+            "rows": [
+                {"class_name": "6A", "course_name": "Matemática", "code": "EF06MA01", "in_lessons": True, "in_assessments": False, "covered": True},
+                {"class_name": "6A", "course_name": "Matemática", "code": "EF06MA02", "in_lessons": False, "in_assessments": False, "covered": False},
+            ],
+            "subjects": [],
+            "descriptions": {"EF06MA01": "Comparar números naturais."},
+        }
+
+        path = report_service.export_bncc_coverage_csv()
+
+        with open(path, encoding="utf-8-sig") as f:
+            lines = f.read().splitlines()
+        assert lines[0] == "Turma;Disciplina;Código;Habilidade;Aulas;Avaliações;Situação"
+        assert lines[1] == "6A;Matemática;EF06MA01;Comparar números naturais.;Sim;Não;Coberta"
+        assert lines[2] == "6A;Matemática;EF06MA02;;Não;Não;Pendente"
+        assert report_service.export_bncc_coverage_csv() == path
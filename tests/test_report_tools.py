@@ -8,23 +8,33 @@
 # Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import threading
 import pytest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
+from app.core.tools.tool_executor import DEFAULT_TOOL_TIMEOUT
+from app.services.data.name_service import NameDirectory
+from app.services.report_job_queue import ReportJobQueue
+from app.tools import report_tools
 from app.tools.report_tools import (
     generate_grade_chart_tool,
     generate_class_distribution_tool,
     export_class_grades_tool,
-    generate_report_card_tool
+    generate_report_card_tool,
+    export_class_bundle_tool,
+    export_bncc_coverage_tool
 )
 
 @pytest.fixture
 def mock_services():
-    with patch('app.tools.report_tools.data_service') as mock_ds, \
-         patch('app.tools.report_tools.report_service') as mock_rs:
+    mock_rs = MagicMock()
+    with patch('app.tools.report_tools.data_service') as mock_ds:
 
         # Setup DataService mocks
-        mock_ds.get_student_by_name.return_value = {"id": 1, "first_name": "João"}
-        mock_ds.get_class_by_name.return_value = {"id": 10, "name": "Turma A"}
+        directory = NameDirectory()
+        directory.add_class({"id": 10, "name": "Turma A"})
+        mock_ds.get_name_directory.return_value = directory
+        # "João" não está no diretório: as ferramentas de relatório aceitam o aluno mais parecido.
+        mock_ds.resolve_student_name.return_value = {"id": 1, "first_name": "João", "last_name": "Silva"}
 
         # Setup ReportService mocks (just return fake paths)
         mock_rs.generate_student_grade_chart.return_value = "/tmp/chart.png"
@@ -32,7 +42,11 @@ def mock_services():
         mock_rs.export_class_grades_csv.return_value = "/tmp/grades.csv"
         mock_rs.generate_student_report_card.return_value = "/tmp/boletim.txt"
 
-        yield mock_ds, mock_rs
+        # As ferramentas passam pela fila de jobs; usa uma fila isolada sobre o serviço mockado.
+        queue = ReportJobQueue(report_service=mock_rs)
+        with patch('app.tools.report_tools.get_report_job_queue', return_value=queue):
+            yield mock_ds, mock_rs
+        queue.shutdown()
 
 def test_generate_grade_chart_tool_success(mock_services):
     result = generate_grade_chart_tool("João", "Turma A")
@@ -41,7 +55,7 @@ def test_generate_grade_chart_tool_success(mock_services):
 
 def test_generate_grade_chart_tool_student_not_found(mock_services):
     ds, rs = mock_services
-    ds.get_student_by_name.return_value = None
+    ds.resolve_student_name.return_value = None
 
     result = generate_grade_chart_tool("Fantasma", "Turma A")
     assert "Erro: Aluno 'Fantasma' não encontrado" in result
@@ -60,3 +74,35 @@ def test_generate_report_card_tool(mock_services):
     result = generate_report_card_tool("João", "Turma A")
     assert "Boletim gerado com sucesso" in result
     assert "/tmp/boletim.txt" in result
+
+def test_export_class_bundle_tool(mock_services):
+    ds, rs = mock_services
+    rs.export_class_bundle.return_value = "/tmp/pacote.zip"
+    result = export_class_bundle_tool("Turma A")
+    assert "Pacote da turma gerado com sucesso" in result
+    rs.export_class_bundle.assert_called_once_with(class_id=10)
+
+def test_export_bncc_coverage_tool(mock_services):
+    ds, rs = mock_services
+    rs.export_bncc_coverage_csv.return_value = "/tmp/bncc.csv"
+    result = export_bncc_coverage_tool()
+    assert "Cobertura da BNCC exportada com sucesso" in result
+    rs.export_bncc_coverage_csv.assert_called_once_with()
+
+def test_report_tools_outlast_the_job_wait():
+    # O executor não pode desistir antes da ferramenta: ela é quem explica ao modelo que o job demorou.
+    tools = [generate_grade_chart_tool, generate_class_distribution_tool, export_class_grades_tool,
+             generate_report_card_tool, export_class_bundle_tool, export_bncc_coverage_tool]
+    for report_tool in tools:
+        assert report_tool.timeout > report_tools.REPORT_JOB_TIMEOUT
+        assert report_tool.timeout > DEFAULT_TOOL_TIMEOUT
+
+def test_report_job_timeout_is_reported(mock_services, monkeypatch):
+    ds, rs = mock_services
+    monkeypatch.setattr(report_tools, "REPORT_JOB_TIMEOUT", 0.05)
+    release = threading.Event()
+    rs.export_class_grades_csv.side_effect = lambda class_id: release.wait(5) and "/tmp/grades.csv"
+
+    result = export_class_grades_tool("Turma A")
+    release.set()
+    assert "ainda está sendo gerado" in result
@@ -0,0 +1,114 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+
+import asyncio
+import inspect
+import json
+import threading
+import time
+import pytest
+from app.core.tools.tool_decorator import tool
+from app.core.tools.tool_executor import ToolExecutor
+from app.core.tools.tool_registry import ToolRegistry
+
+
+@tool
+def slow_echo(text: str, delay: float = 0.0):
+    """Devolve o texto após uma espera."""
+    time.sleep(delay)
+    return f"{text} ({threading.current_thread().name})"
+
+
+@tool
+async def async_echo(text: str, delay: float = 0.0):
+    """Devolve o texto após uma espera assíncrona."""
+    await asyncio.sleep(delay)
+    return text
+
+
+@tool(timeout=1.0)
+def patient_echo(text: str, delay: float = 0.0):
+    """Devolve o texto após uma espera, com limite de tempo próprio."""
+    time.sleep(delay)
+    return text
+
+
+@tool
+def broken():
+    """Sempre falha."""
+    raise RuntimeError("boom")
+
+
+def _call(call_id, name, **arguments):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+@pytest.fixture
+def executor():
+    registry = ToolRegistry()
+    for func in (slow_echo, async_echo, patient_echo, broken):
+        registry.register(func)
+    executor = ToolExecutor(registry, max_workers=4, timeout=5)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_async_tool_keeps_schema():
+    assert inspect.iscoroutinefunction(async_echo)
+    assert async_echo.schema["function"]["name"] == "async_echo"
+    assert async_echo.schema["function"]["parameters"]["required"] == ["text"]
+
+
+@pytest.mark.anyio
+async def test_tool_calls_run_concurrently_and_keep_call_order(executor):
+    calls = [_call("1", "slow_echo", text="a", delay=0.3),
+             _call("2", "async_echo", text="b", delay=0.3),
+             _call("3", "slow_echo", text="c", delay=0.1),
+             _call("4", "slow_echo", text="d", delay=0.2)]
+
+    start = time.perf_counter()
+    results = await executor.execute_tool_calls(calls)
+    elapsed = time.perf_counter() - start
+
+    assert [r["tool_call_id"] for r in results] == ["1", "2", "3", "4"]
+    assert results[0]["content"].startswith("a (tool-call")
+    assert results[1]["content"] == "b"
+    assert elapsed < 0.6
+
+
+@pytest.mark.anyio
+async def test_tool_call_timeout_and_errors_do_not_affect_other_calls(executor):
+    calls = [_call("1", "slow_echo", text="lento", delay=1.0),
+             _call("2", "broken"),
+             _call("3", "missing_tool"),
+             _call("4", "slow_echo", text="ok")]
+
+    results = await executor.execute_tool_calls(calls, timeout=0.2)
+
+    assert results[0]["content"] == "Error: Tool 'slow_echo' timed out after 0.2 seconds."
+    assert results[1]["content"] == "Error: An unexpected error occurred: boom"
+    assert results[2]["content"] == "Error: Tool 'missing_tool' not found."
+    assert results[3]["content"].startswith("ok")
+
+
+@pytest.mark.anyio
+async def test_tool_own_timeout_overrides_executor_default():
+    registry = ToolRegistry()
+    registry.register(slow_echo)
+    registry.register(patient_echo)
+    executor = ToolExecutor(registry, timeout=0.1)
+
+    results = await executor.execute_tool_calls([_call("1", "patient_echo", text="ok", delay=0.3),
+                                                 _call("2", "slow_echo", text="lento", delay=0.3)])
+    executor.shutdown(wait=True)
+
+    assert results[0]["content"] == "ok"
+    assert results[1]["content"] == "Error: Tool 'slow_echo' timed out after 0.1 seconds."
@@ -0,0 +1,55 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+
+from app.core.tools.tool_router import ALWAYS_INCLUDED
+
+
+def _user(text):
+    return {"role": "user", "content": text}
+
+
+def test_router_selects_tools_matching_the_request(assistant_service):
+    router = assistant_service.tool_router
+
+    schemas = router.select([_user("Quais alunos estão em risco de reprovação na 8B?")])
+
+    names = [s["function"]["name"] for s in schemas]
+    assert "get_students_at_risk_tool" in names
+    assert "add_new_student" not in names and "search_internet" not in names
+    assert set(ALWAYS_INCLUDED) <= set(names)
+    assert router.request_bytes(names) < router.request_bytes() / 2
+
+
+def test_router_sends_every_tool_when_nothing_is_recognized(assistant_service):
+    router = assistant_service.tool_router
+    schemas = router.select([_user("Olá, tudo bem?")])
+    assert schemas == assistant_service.tool_registry.get_all_schemas()
+
+
+def test_router_keeps_tools_used_in_the_previous_turn(assistant_service):
+    router = assistant_service.tool_router
+    call = {"id": "1", "type": "function", "function": {"name": "get_class_roster", "arguments": "{}"}}
+    messages = [_user("Gere o boletim do João"),
+                {"role": "assistant", "tool_calls": [call]},
+                {"role": "tool", "tool_call_id": "1", "name": "get_class_roster", "content": "[]"},
+                {"role": "assistant", "content": "Pronto."},
+                _user("E da Maria?")]
+
+    names = {s["function"]["name"] for s in router.select(messages)}
+
+    # "E da Maria?" não tem palavras úteis: o assunto vem da mensagem anterior e a ferramenta usada continua.
+    assert {"generate_report_card_tool", "get_class_roster"} <= names
+
+
+def test_router_reuses_schema_lists(assistant_service):
+    router = assistant_service.tool_router
+    first = router.select([_user("como está a cobertura da bncc?")])
+    assert router.select([_user("cobertura da BNCC por turma")]) is first
@@ -0,0 +1,97 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import pytest
+from datetime import date
+from app.tools.database_tools import bulk_add_grades_tool, bulk_register_attendance_tool
+
+
+@pytest.fixture
+def school(data_service, mocker):
+    """Turma 7A com três alunos, uma disciplina, uma avaliação e uma aula."""
+    mocker.patch("app.tools.database_tools.data_service", data_service)
+    cls = data_service.create_class("7A")
+    course = data_service.add_course("Matemática", "MAT")
+    subject = data_service.add_subject_to_class(cls["id"], course["id"])
+    assessment = data_service.add_assessment(subject["id"], "Prova 1", 1.0)
+    lesson = data_service.create_lesson(subject["id"], "Frações", "Introdução", date(2026, 10, 19))
+    students = []
+    for number, (first, last) in enumerate([("Ana", "Silva"), ("Bruno", "Costa"), ("Carla", "Souza")], start=1):
+        student = data_service.add_student(first, last)
+        data_service.add_student_to_class(student["id"], cls["id"], number)
+        students.append(student)
+    return data_service, subject, assessment, lesson, students
+
+
+def test_bulk_grades_are_written_in_one_upsert(school, mocker):
+    service, subject, assessment, _, students = school
+    upsert = mocker.spy(service, "upsert_grades_for_subject")
+
+    result = bulk_add_grades_tool("7A", "Matemática", "Prova 1", "Ana Silva: 8,5; bruno costa = 6\n#3: 10")
+
+    assert upsert.call_count == 1
+    assert result.startswith("3 notas registradas em Prova 1 (Matemática, 7A). Média 8.2")
+    scores = {g["student_id"]: g["score"] for g in service.get_all_grades()}
+    assert scores == {students[0]["id"]: 8.5, students[1]["id"]: 6.0, students[2]["id"]: 10.0}
+
+
+def test_bulk_grades_write_nothing_when_a_line_is_invalid(school):
+    service, *_ = school
+
+    result = bulk_add_grades_tool("7A", "Matemática", "Prova 1", "Ana: 8; Pedro Alves: 7; Carla Souza: 11")
+
+    assert result.startswith("Nada foi registrado")
+    assert "'Ana' não encontrado na turma (você quis dizer: Ana Silva?)" in result
+    assert "'Pedro Alves' não encontrado na turma\n" in result
+    assert "fora do intervalo" in result
+    assert service.get_all_grades() == []
+
+
+def test_bulk_attendance_applies_others_status(school, mocker):
+    service, _, _, lesson, students = school
+    register = mocker.spy(service, "register_attendance")
+
+    result = bulk_register_attendance_tool("7A", "Matemática", "Frações", "Bruno Costa: falta", others_status="P")
+
+    assert register.call_count == 1
+    assert result.endswith("3 alunos (P: 2, F: 1).")
+    statuses = {a["student_id"]: a["status"] for a in service.get_lesson_attendance(lesson["id"])}
+    assert statuses == {students[0]["id"]: "P", students[1]["id"]: "F", students[2]["id"]: "P"}
+
+
+def test_bulk_attendance_rejects_unknown_status(school):
+    service, _, _, lesson, _ = school
+
+    result = bulk_register_attendance_tool("7A", "Matemática", "Frações", "Ana Silva: X")
+
+    assert "Status inválido para Ana Silva" in result
+    assert service.get_lesson_attendance(lesson["id"]) == []
+
+
+def test_bulk_names_are_matched_against_the_class_roster(school):
+    service, subject, assessment, _, students = school
+    # "Carla Sousa" existe, mas não é desta turma: só os alunos da turma são aceitos ou sugeridos.
+    service.add_student("Carla", "Sousa")
+    # "Erica Lima" (sem acento, de outra turma) bate exatamente com o texto, mas na turma só há "Érica Lima".
+    service.add_student("Erica", "Lima")
+    erica = service.add_student("Érica", "Lima")
+    service.add_student_to_class(erica["id"], service.get_class_by_name("7A")["id"], 4)
+
+    result = bulk_add_grades_tool("7A", "Matemática", "Prova 1", "ana silva: 7; erica lima: 9; Carla Sousa: 5")
+
+    assert result.startswith("Nada foi registrado")
+    assert "'Carla Sousa' não encontrado na turma (você quis dizer: Carla Souza?)" in result
+    assert service.get_all_grades() == []
+
+    result = bulk_add_grades_tool("7A", "Matemática", "Prova 1", "ana silva: 7; erica lima: 9")
+
+    assert result.startswith("2 notas registradas")
+    scores = {g["student_id"]: g["score"] for g in service.get_all_grades()}
+    assert scores == {students[0]["id"]: 7.0, erica["id"]: 9.0}
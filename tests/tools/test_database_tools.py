@@ -9,15 +9,22 @@
 # License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
 # arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
 import pytest
+from app.services.data.name_service import NameDirectory
 from app.tools import database_tools
 
 class TestDatabaseTools:
     @pytest.fixture
-    def mock_data_service(self, mocker):
-        return mocker.patch('app.tools.database_tools.data_service')
+    def directory(self):
+        # As ferramentas resolvem nomes pelo diretório; cada teste cadastra nele o que precisa.
+        return NameDirectory()
+
+    @pytest.fixture
+    def mock_data_service(self, mocker, directory):
+        mock = mocker.patch('app.tools.database_tools.data_service')
+        mock.get_name_directory.return_value = directory
+        return mock
 
     def test_create_new_class(self, mock_data_service):
-        mock_data_service.get_class_by_name.return_value = None
         mock_data_service.create_class.return_value = {"id": 1, "name": "1A"}
 
         result = database_tools.create_new_class("1A")
@@ -25,8 +32,8 @@ class TestDatabaseTools:
         assert "criada com sucesso" in result
         mock_data_service.create_class.assert_called_with("1A")
 
-    def test_add_subject_to_class(self, mock_data_service):
-        mock_data_service.get_class_by_name.return_value = {"id": 1, "name": "1A"}
+    def test_add_subject_to_class(self, mock_data_service, directory):
+        directory.add_class({"id": 1, "name": "1A"})
         mock_data_service.get_course_by_name.return_value = {"id": 2, "course_name": "Math"}
         mock_data_service.add_subject_to_class.return_value = True
 
@@ -35,9 +42,9 @@ class TestDatabaseTools:
         assert "adicionada à turma" in result
         mock_data_service.add_subject_to_class.assert_called_with(1, 2)
 
-    def test_add_new_lesson(self, mock_data_service):
-        mock_data_service.get_class_by_name.return_value = {"id": 1}
-        mock_data_service.get_subjects_for_class.return_value = [{"id": 10, "course_name": "Math"}]
+    def test_add_new_lesson(self, mock_data_service, directory):
+        directory.add_class({"id": 1, "name": "1A"})
+        directory.add_subject(1, {"id": 10, "course_name": "Math"})
         mock_data_service.create_lesson.return_value = {"id": 100}
 
         result = database_tools.add_new_lesson("1A", "Math", "Algebra", "Basics", "12/12/2024")
@@ -48,9 +55,9 @@ class TestDatabaseTools:
         args, _ = mock_data_service.create_lesson.call_args
         assert args[0] == 10  # subject_id
 
-    def test_create_new_assessment(self, mock_data_service):
-        mock_data_service.get_class_by_name.return_value = {"id": 1}
-        mock_data_service.get_subjects_for_class.return_value = [{"id": 10, "course_name": "History"}]
+    def test_create_new_assessment(self, mock_data_service, directory):
+        directory.add_class({"id": 1, "name": "1A"})
+        directory.add_subject(1, {"id": 10, "course_name": "History"})
         mock_data_service.add_assessment.return_value = {"id": 50}
 
         result = database_tools.create_new_assessment("1A", "History", "Test 1", 1.0)
@@ -58,14 +65,14 @@ class TestDatabaseTools:
         assert "criada para History" in result
         mock_data_service.add_assessment.assert_called_with(10, "Test 1", 1.0)
 
-    def test_add_new_grade(self, mock_data_service):
-        mock_data_service.get_student_by_name.return_value = {"id": 100}
-        mock_data_service.get_class_by_name.return_value = {"id": 1}
-        mock_data_service.get_subjects_for_class.return_value = [{"id": 10, "course_name": "Math"}]
-        mock_data_service.get_assessments_for_subject.return_value = [{"id": 5, "name": "Exam 1"}]
+    def test_add_new_grade(self, mock_data_service, directory):
+        directory.add_student({"id": 100, "first_name": "John", "last_name": "Doe"})
+        directory.add_class({"id": 1, "name": "1A"})
+        directory.add_subject(1, {"id": 10, "course_name": "Math"})
+        directory.add_assessment(10, {"id": 5, "name": "Exam 1"})
         mock_data_service.add_grade.return_value = {"id": 99}
 
-        result = database_tools.add_new_grade("John", "1A", "Math", "Exam 1", 9.5)
+        result = database_tools.add_new_grade("John Doe", "1A", "Math", "Exam 1", 9.5)
 
         assert "Nota 9.5 adicionada" in result
         mock_data_service.add_grade.assert_called_with(100, 5, 9.5)
@@ -84,7 +91,8 @@ class TestDatabaseTools:
         assert "Math, History" in result
 
     def test_get_student_grades_by_course(self, mock_data_service):
-        mock_data_service.get_student_by_name.return_value = {"id": 1, "name": "John"}
+        # Ferramenta de leitura: um nome que não está no diretório segue para a busca aproximada.
+        mock_data_service.resolve_student_name.return_value = {"id": 1, "first_name": "John", "last_name": "Doe"}
         mock_data_service.get_course_by_name.return_value = {"id": 2, "course_name": "Math"}
         mock_data_service.get_all_grades_with_details.return_value = [
             {"student_id": 1, "course_id": 2, "class_name": "1A", "assessment_name": "Test", "score": 10.0},
@@ -12,7 +12,8 @@
 import json
 import pytest
 from unittest.mock import MagicMock
-from app.tools.analysis_tools import get_student_performance_summary_tool, get_students_at_risk_tool
+from app.services.data.name_service import NameDirectory
+from app.tools.analysis_tools import get_student_performance_summary_tool, get_students_at_risk_tool, get_school_bncc_coverage_tool
 from app.tools.pedagogical_tools import suggest_lesson_activities_tool
 
 # Define uma fixture para criar um 'mock' (simulacro) do DataService.
@@ -24,12 +25,12 @@ def mock_data_service():
     # Cria um objeto MagicMock, que pode simular qualquer método ou atributo.
     mock = MagicMock()
 
-    # Configura o mock para simular a busca de um aluno.
-    mock.get_student_by_name.return_value = {"id": 1, "first_name": "John", "last_name": "Doe"}
-
-    # Configura o mock para simular a busca de turmas pelo nome.
+    # As ferramentas resolvem nomes pelo diretório de nomes: cadastra nele o aluno e a turma.
+    directory = NameDirectory()
+    directory.add_student({"id": 1, "first_name": "John", "last_name": "Doe"})
     mock_class_data = {"id": 101, "name": "Math Grade 5"}
-    mock.get_class_by_name.return_value = mock_class_data
+    directory.add_class(mock_class_data)
+    mock.get_name_directory.return_value = directory
 
     # Mantém get_all_classes mockado por precaução, mas as ferramentas atualizadas não devem usá-lo para busca por nome.
     mock.get_all_classes.return_value = [mock_class_data]
@@ -57,8 +58,8 @@ def test_get_student_performance_summary_tool(mocker, mock_data_service):
 
     # --- VERIFICAÇÕES ---
     # Verifica se os métodos mockados foram chamados com os argumentos corretos.
-    mock_data_service.get_student_by_name.assert_called_with("John Doe")
-    mock_data_service.get_class_by_name.assert_called_with("Math Grade 5")
+    # Nome exato: resolvido pelo diretório, sem busca aproximada.
+    mock_data_service.resolve_student_name.assert_not_called()
     mock_data_service.get_student_performance_summary.assert_called_with(1, 101) # Verifica se os IDs corretos foram usados.
     # Verifica se os dados no resultado JSON estão corretos.
     assert result_json["weighted_average"] == 85.5
@@ -77,7 +78,6 @@ def test_get_students_at_risk_tool(mocker, mock_data_service):
     result_json = json.loads(result_str)
 
     # --- VERIFICAÇÕES ---
-    mock_data_service.get_class_by_name.assert_called_with("Math Grade 5")
     mock_data_service.get_students_at_risk.assert_called_with(101)
     assert len(result_json) == 1
     assert result_json[0]["student_name"] == "Jane Doe"
@@ -113,3 +113,17 @@ def test_suggest_lesson_activities_tool():
     assert "2 atividades de aula criativas e envolventes" in result
     assert "'the solar system'" in result
     assert "alunos de 4th grade" in result
+
+def test_get_school_bncc_coverage_tool_filters_by_class(mocker, mock_data_service):
+    mocker.patch('app.tools.analysis_tools.data_service', mock_data_service)
+    mock_data_service.get_school_bncc_coverage.return_value = {"subjects": [
+        {"class_id": 101, "class_name": "Math Grade 5", "course_name": "Matemática", "expected": 2, "covered": 1,
+         "coverage_percentage": 50.0, "missing": ["EF05MA02"]},
+        {"class_id": 102, "class_name": "Outra", "course_name": "Matemática", "expected": 2, "covered": 2,
+         "coverage_percentage": 100.0, "missing": []},
+    ]}
+
+    result = json.loads(get_school_bncc_coverage_tool("Math Grade 5"))
+
+    assert result == [{"turma": "Math Grade 5", "disciplina": "Matemática", "esperadas": 2, "cobertas": 1,
+                       "percentual": 50.0, "pendentes": ["EF05MA02"]}]
@@ -0,0 +1,108 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import pytest
+from app.core.tools.tool_decorator import tool
+from app.services.data.name_service import NameDirectory
+from app.tools import database_tools
+from app.tools.database_tools import get_class_roster, list_all_classes
+
+
+@pytest.fixture
+def tools_db(data_service, mocker):
+    """Aponta as ferramentas para o banco em memória e começa com os caches vazios."""
+    mocker.patch("app.tools.database_tools.data_service", data_service)
+    for cached_tool in (get_class_roster, list_all_classes):
+        cached_tool.cache.clear()
+    cls = data_service.create_class("7A")
+    student = data_service.add_student("Ana", "Silva")
+    data_service.add_student_to_class(student["id"], cls["id"], 1)
+    return data_service, cls
+
+
+def test_repeated_read_is_served_from_cache(tools_db, mocker):
+    service, _ = tools_db
+    spy = mocker.spy(service, "get_enrollments_for_class")
+
+    first = get_class_roster("7A")
+    second = get_class_roster("7A")
+
+    assert first == second
+    assert "Ana Silva" in first
+    assert spy.call_count == 1
+    assert get_class_roster.cache.hits == 1
+    # Argumentos diferentes são outra entrada.
+    get_class_roster("8B")
+    assert get_class_roster.cache.misses == 2
+
+
+def test_write_to_read_table_invalidates_result(tools_db):
+    service, cls = tools_db
+    assert "Bruno" not in get_class_roster("7A")
+
+    student = service.add_student("Bruno", "Costa")
+    service.add_student_to_class(student["id"], cls["id"], 2)
+
+    assert "Bruno Costa" in get_class_roster("7A")
+    assert get_class_roster.cache.hits == 0
+
+
+def test_write_to_unrelated_table_keeps_cache(tools_db):
+    service, _ = tools_db
+    get_class_roster("7A")
+    # get_class_roster não lê a tabela de disciplinas.
+    service.add_course("História", "HIS")
+
+    get_class_roster("7A")
+    assert get_class_roster.cache.hits == 1
+
+
+def test_write_during_execution_is_not_cached(tools_db, mocker):
+    service, cls = tools_db
+    read_enrollments = service.get_enrollments_for_class
+
+    def read_then_write(*args, **kwargs):
+        # Outra escrita chega depois da leitura e antes de a ferramenta retornar.
+        result = read_enrollments(*args, **kwargs)
+        student = service.add_student("Bruno", "Costa")
+        service.add_student_to_class(student["id"], cls["id"], 2)
+        return result
+
+    mocker.patch.object(service, "get_enrollments_for_class", side_effect=read_then_write)
+    assert "Bruno" not in get_class_roster("7A")
+    # O resultado anterior à escrita não chega a ser guardado.
+    assert not get_class_roster.cache._entries
+
+    mocker.patch.object(service, "get_enrollments_for_class", side_effect=read_enrollments)
+    assert "Bruno Costa" in get_class_roster("7A")
+    assert get_class_roster.cache.hits == 0
+
+
+def test_mocked_service_disables_cache(mocker):
+    mock_service = mocker.patch("app.tools.database_tools.data_service")
+    directory = NameDirectory()
+    directory.add_class({"id": 1, "name": "7A"})
+    mock_service.get_name_directory.return_value = directory
+    mock_service.get_enrollments_for_class.return_value = []
+    get_class_roster.cache.clear()
+
+    get_class_roster("7A")
+    get_class_roster("7A")
+
+    assert mock_service.get_enrollments_for_class.call_count == 2
+    assert get_class_roster.cache.hits == 0
+
+
+def test_cacheable_async_tool_is_rejected():
+    async def fetch(name: str) -> str:
+        return name
+
+    with pytest.raises(TypeError):
+        tool(cacheable=True)(fetch)
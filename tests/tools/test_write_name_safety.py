@@ -0,0 +1,80 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import pytest
+from datetime import date
+from app.models.data_version import VERSIONED_TABLES
+from app.tools import database_tools
+
+
+@pytest.fixture
+def school(data_service, mocker):
+    """Turma 7A com alunos de nomes parecidos com outros nomes comuns."""
+    mocker.patch("app.tools.database_tools.data_service", data_service)
+    cls = data_service.create_class("7A")
+    course = data_service.add_course("Matemática", "MAT")
+    subject = data_service.add_subject_to_class(cls["id"], course["id"])
+    data_service.add_assessment(subject["id"], "Prova 1", 1.0)
+    data_service.create_lesson(subject["id"], "Frações", "Introdução", date(2026, 10, 19))
+    students = {}
+    for number, (first, last) in enumerate([("Mariana", "Costa"), ("João", "Pereira"), ("Ana", "Silveira")], start=1):
+        student = data_service.add_student(first, last)
+        data_service.add_student_to_class(student["id"], cls["id"], number)
+        students[f"{first} {last}"] = student
+    return data_service, students
+
+
+@pytest.mark.parametrize("call, typed, suggestion", [
+    (lambda: database_tools.add_new_grade("Maria Costa", "7A", "Matemática", "Prova 1", 9.0), "Maria Costa", "Mariana Costa"),
+    (lambda: database_tools.update_grade_tool("Maria Costa", "7A", "Matemática", "Prova 1", 9.0), "Maria Costa", "Mariana Costa"),
+    (lambda: database_tools.register_incident("Joao Ferreira", "7A", "Conversa", "19/10/2026"), "Joao Ferreira", "João Pereira"),
+    (lambda: database_tools.delete_student("Ana Silva"), "Ana Silva", "Ana Silveira"),
+    (lambda: database_tools.update_student_name("Ana Silva", "Ana", "Souza"), "Ana Silva", "Ana Silveira"),
+    (lambda: database_tools.register_attendance_tool("7A", "Matemática", "Frações", "Maria Costa", "F"), "Maria Costa", "Mariana Costa"),
+])
+def test_near_miss_name_writes_nothing(school, call, typed, suggestion):
+    service, _ = school
+    versions = service.get_data_versions(VERSIONED_TABLES)
+
+    result = call()
+
+    assert result.startswith(f"Erro: Aluno '{typed}' não encontrado")
+    assert f"você quis dizer: {suggestion}" in result
+    assert service.get_data_versions(VERSIONED_TABLES) == versions
+
+
+def test_accent_and_case_insensitive_names_are_accepted(school):
+    service, students = school
+
+    result = database_tools.add_new_grade("joao pereira", "7A", "matemática", "prova 1", 8.0)
+
+    assert result == "Nota 8.0 adicionada para João Pereira em Prova 1 (Matemática)."
+    assert [g["student_id"] for g in service.get_all_grades()] == [students["João Pereira"]["id"]]
+
+
+def test_delete_student_reports_the_student_actually_removed(school, db_session):
+    service, students = school
+
+    result = database_tools.delete_student("ANA SILVEIRA")
+    db_session.flush()
+
+    assert result == "Aluno 'Ana Silveira' e todos os seus registros foram removidos com sucesso."
+    assert service.get_student_by_id(students["Ana Silveira"]["id"]) is None
+
+
+def test_accent_folding_never_picks_between_two_students(school):
+    service, _ = school
+    service.add_student("Joao", "Pereira")
+    versions = service.get_data_versions(VERSIONED_TABLES)
+
+    # "João Pereira" e "Joao Pereira" ficam iguais sem acento: só o nome exato de cada um é aceito.
+    assert "não encontrado" in database_tools.delete_student("JOÃO PEREIRÁ")
+    assert service.get_data_versions(VERSIONED_TABLES) == versions
+    assert database_tools.delete_student("joao pereira").startswith("Aluno 'Joao Pereira'")
@@ -0,0 +1,151 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import itertools
+import os
+import threading
+import time
+from app.utils.artifact_store import ArtifactStore
+
+
+def _write(store, prefix, size):
+    path = store.new_path(prefix, ".bin")
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+def test_new_path_is_unique(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    paths = {store.new_path("boletim_1", ".txt") for _ in range(200)}
+    assert len(paths) == 200
+
+
+def test_get_put_and_missing_file(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    path = _write(store, "a", 10)
+    store.put("k1", path, kind="csv")
+
+    assert store.get("k1") == path
+    assert store.entries(kind="csv")[0]["key"] == "k1"
+
+    # Um novo store no mesmo diretório lê o índice persistido.
+    assert ArtifactStore(str(tmp_path)).get("k1") == path
+
+    os.remove(path)
+    assert store.get("k1") is None
+
+
+def _fake_clock(monkeypatch):
+    # Relógio estritamente crescente: a ordem LRU não depende da resolução do relógio real.
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr("app.utils.artifact_store.time.time", lambda: float(next(ticks)))
+
+
+def test_cleanup_evicts_least_recently_used_over_byte_cap(tmp_path, monkeypatch):
+    _fake_clock(monkeypatch)
+    store = ArtifactStore(str(tmp_path), max_bytes=250)
+    old = _write(store, "old", 100)
+    store.put("old", old)
+    mid = _write(store, "mid", 100)
+    store.put("mid", mid)
+    # Acessar 'old' o torna o mais recente; 'mid' passa a ser o menos usado. Isso precisa
+    # acontecer antes do put que estoura o limite, pois a limpeza agendada pode rodar logo em seguida.
+    assert store.get("old") == old
+    new = _write(store, "new", 100)
+    store.put("new", new)
+    if store._cleanup_thread:
+        store._cleanup_thread.join()
+    store.cleanup()
+
+    # Asserções sobre o estado final: a limpeza agendada pelo put pode ter rodado antes.
+    assert not os.path.exists(mid)
+    assert os.path.exists(old) and os.path.exists(new)
+    assert store.get("mid") is None
+
+
+def test_access_order_survives_reopening_the_store(tmp_path, monkeypatch):
+    _fake_clock(monkeypatch)
+    store = ArtifactStore(str(tmp_path), max_bytes=250)
+    old = _write(store, "old", 100)
+    store.put("old", old)
+    mid = _write(store, "mid", 100)
+    store.put("mid", mid)
+    if store._cleanup_thread:
+        store._cleanup_thread.join()
+    assert store.get("old") == old
+    store.flush()
+
+    # Uma nova instância (ex: próxima execução do app) só conhece o índice em disco.
+    reopened = ArtifactStore(str(tmp_path), max_bytes=250)
+    new = _write(reopened, "new", 100)
+    reopened.put("new", new)
+    if reopened._cleanup_thread:
+        reopened._cleanup_thread.join()
+    reopened.cleanup()
+
+    assert not os.path.exists(mid)
+    assert os.path.exists(old) and os.path.exists(new)
+
+
+def test_get_marks_access_without_writing_the_index(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    path = _write(store, "a", 10)
+    store.put("a", path)
+    if store._cleanup_thread:
+        store._cleanup_thread.join()
+    inode = os.stat(store.index_path).st_ino
+
+    assert store.get("a") == path
+    assert os.stat(store.index_path).st_ino == inode
+
+    store.flush()
+    assert os.stat(store.index_path).st_ino != inode
+
+
+def test_cleanup_expires_by_age_and_adopts_untracked_files(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_age_seconds=60)
+    stray = tmp_path / "chart_legacy.txt"
+    stray.write_text("old report")
+    past = time.time() - 3600
+    os.utime(stray, (past, past))
+    fresh = _write(store, "fresh", 5)
+    store.put("fresh", fresh)
+
+    store.cleanup()
+
+    assert not stray.exists()
+    assert store.get("fresh") == fresh
+
+
+def test_concurrent_writers_keep_index_consistent(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    def worker(n):
+        for i in range(20):
+            path = _write(store, f"w{n}", 1)
+            store.put(f"{n}-{i}", path)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(ArtifactStore(str(tmp_path)).entries()) == 100
+
+
+def test_schedule_cleanup_runs_in_background(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=0)
+    path = _write(store, "a", 10)
+    store.put("a", path)
+    thread = store.schedule_cleanup(force=True)
+    thread.join(timeout=5)
+    assert not os.path.exists(path)
@@ -0,0 +1,68 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import json
+import xml.etree.ElementTree as ET
+from app.utils.seating_chart_render import (
+    CellState, build_cell_states, diff_cells, render_seating_chart_svg
+)
+
+def _chart(layout=None, assignments=None, rows=2, columns=3):
+    return {
+        "id": 1,
+        "name": "Sala <A> & B",
+        "rows": rows,
+        "columns": columns,
+        "layout_config": json.dumps(layout or {}),
+        "assignments": assignments or [],
+    }
+
+def _assignment(student_id, row, col, name="Ana Maria Souza", call_number=3):
+    return {"student_id": student_id, "student_name": name, "row_index": row, "col_index": col, "call_number": call_number}
+
+def test_build_cell_states_uses_layout_and_assignments():
+    cells = build_cell_states(_chart({"0,0": "door", "1,2": "teacher_desk"}, [_assignment(7, 0, 1)]))
+
+    assert len(cells) == 6
+    assert cells[(0, 0)].cell_type == "door"
+    assert cells[(1, 2)].cell_type == "teacher_desk"
+    assert cells[(0, 1)] == CellState(0, 1, "student_seat", 7, "Ana Maria Souza", 3)
+    assert cells[(1, 1)] == CellState(1, 1, "student_seat")
+
+def test_build_cell_states_tolerates_invalid_layout():
+    chart = _chart()
+    chart["layout_config"] = "not json"
+    assert all(c.cell_type == "student_seat" for c in build_cell_states(chart).values())
+
+def test_diff_cells_reports_only_changed_cells():
+    before = build_cell_states(_chart(assignments=[_assignment(7, 0, 1)]))
+    after = build_cell_states(_chart({"1,0": "void"}, [_assignment(7, 1, 2)]))
+
+    assert diff_cells(before, before) == []
+    assert diff_cells(before, after) == [(0, 1), (1, 0), (1, 2)]
+
+def test_diff_cells_requires_full_redraw_when_dimensions_change():
+    before = build_cell_states(_chart())
+    assert diff_cells(None, before) is None
+    assert diff_cells(before, build_cell_states(_chart(rows=3))) is None
+
+def test_render_seating_chart_svg_is_valid_and_escaped():
+    svg = render_seating_chart_svg(_chart({"0,0": "door"}, [_assignment(7, 0, 1, name="Zé <Teste>")]))
+
+    root = ET.fromstring(svg.encode("utf-8"))
+    ns = "{http://www.w3.org/2000/svg}"
+    groups = root.findall(f"{ns}g")
+    assert len(groups) == 6
+    assert root.find(f"{ns}title").text == "Sala <A> & B"
+
+    texts = ["".join(t.itertext()) for t in root.iter(f"{ns}text")]
+    assert "Porta" in texts
+    assert "Zé<Teste>" in texts
+    assert "Vazio" in texts
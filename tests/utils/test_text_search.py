@@ -0,0 +1,66 @@
+# Author: Victor Hugo Garcia de Oliveira
+# Date: 2025-12-21
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+#
+# Este arquivo de código-fonte está sujeito aos termos da Mozilla Public
+# License, v. 2.0. Se uma cópia da MPL não foi distribuída com este
+# arquivo, você pode obter uma em https://mozilla.org/MPL/2.0/.
+import pytest
+from app.utils.text_search import InvertedIndex, TrigramIndex, fold_accents, stem_pt, tokenize, trigrams
+
+def test_fold_accents_and_tokenize():
+    assert fold_accents("Ação É Número") == "acao e numero"
+    assert tokenize("Frações (EF05MA03): números!") == ["fracoes", "ef05ma03", "numeros"]
+
+def test_stem_pt_groups_inflections():
+    assert stem_pt("fracoes") == stem_pt("fracao")
+    assert stem_pt("naturais") == stem_pt("natural")
+    assert stem_pt("matematicas") == stem_pt("matematico")
+    # Palavras curtas não são reduzidas demais.
+    assert stem_pt("ano") == "ano"
+
+def test_inverted_index_fields_and_prefix():
+    index = InvertedIndex(("title", "description"))
+    index.add(0, title="Matemática", description="Frações equivalentes")
+    index.add(1, title="Ciências", description="Matéria e energia")
+    index.add(2, title="Língua Portuguesa", description="Leitura de textos")
+
+    title_bit = index.field_bit("title")
+    result = index.search("matematica")
+    assert set(result) == {0}
+    assert result[0] == [title_bit]
+
+    # Último termo como prefixo ('mat' -> matemática, matéria); com espaço no fim, não.
+    assert set(index.search("mat")) == {0, 1}
+    assert index.search("mat ") == {}
+    assert set(index.search("fracao equiv")) == {0}
+    assert index.search("de") is None
+
+def test_trigrams_mark_word_boundaries():
+    assert trigrams("Aí") == {"  a", " ai", "ai "}
+    assert trigrams("") == set()
+
+def test_trigram_index_ranks_closest_names():
+    index = TrigramIndex()
+    for doc_id, name in enumerate(["João da Silva", "Joana Souza", "Maria Silveira", "Pedro Alves"]):
+        index.add(doc_id, name)
+
+    results = index.search("joao silva", limit=2, min_similarity=0.1)
+    assert results[0][0] == 0 and len(results) == 2
+    assert results[0][1] > results[1][1]
+    assert index.search("jaoo da silvs")[0][0] == 0
+    assert index.search("xyz") == []
+
+    with pytest.raises(RuntimeError):
+        index.add(4, "Ana")
+
+def test_inverted_index_fuzzy_replaces_unknown_words():
+    index = InvertedIndex(("description",))
+    index.add(0, description="Resolver problemas de probabilidade")
+    index.add(1, description="Ler e escrever textos")
+
+    assert index.search("probabilidde ") == {}
+    assert set(index.search("probabilidde ", fuzzy=True)) == {0}